@@ -1,33 +1,263 @@
 import requests
 from bs4 import BeautifulSoup
-from urllib.robotparser import RobotFileParser
+from urllib.parse import urlsplit, unquote
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+import threading
 import time
+import re
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
-def check_robots_txt(url):
+# Robots.txt cache settings
+ROBOTS_DEFAULT_TTL = 24 * 60 * 60   # Seconds a fetched robots.txt is trusted without Cache-Control
+ROBOTS_ERROR_TTL = 5 * 60           # Seconds to keep a "disallow all" verdict after a server/network error
+ROBOTS_MAX_TTL = 7 * 24 * 60 * 60
+ROBOTS_CACHE_SIZE = 10000           # Hosts kept in the cache
+ROBOTS_FETCH_WORKERS = 16           # Concurrent robots.txt fetches when prefetching
+ROBOTS_TIMEOUT = 10
+
+
+class RobotsPolicy:
+    """
+    Parsed robots.txt for one scheme+host with precompiled rule matchers.
+
+    Rules follow RFC 9309: the group whose user-agent matches is used (falling back to '*'),
+    the longest matching path pattern wins and Allow wins ties. '*' and '$' wildcards are supported.
+    """
+
+    def __init__(self, groups=None, allow_all=False, disallow_all=False, expires_at=0.0):
+        self.groups = groups or {}  # user-agent token -> (crawl_delay, [(length, allow, compiled pattern)])
+        self.allow_all = allow_all
+        self.disallow_all = disallow_all
+        self.expires_at = expires_at
+        self._agent_groups = {}
+
+    @staticmethod
+    def _compile(pattern):
+        regex = re.escape(unquote(pattern)).replace(r"\*", ".*")
+        if regex.endswith(r"\$"):
+            regex = regex[:-2] + "$"
+        return re.compile(regex)
+
+    @classmethod
+    def parse(cls, text, expires_at=0.0):
+        """
+        Parse robots.txt content into a policy.
+
+        :param text: robots.txt body
+        :param expires_at: time.monotonic() value after which the policy must be refetched
+        :return: RobotsPolicy
+        """
+        groups = {}
+        current_agents, in_rules = [], False
+        for raw_line in text.splitlines():
+            line = raw_line.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+            field, value = (part.strip() for part in line.split(":", 1))
+            field = field.lower()
+
+            if field == "user-agent":
+                if in_rules:
+                    current_agents, in_rules = [], False
+                agent = value.lower()
+                current_agents.append(agent)
+                groups.setdefault(agent, [None, []])
+            elif field in ("allow", "disallow") and current_agents:
+                in_rules = True
+                if not value:
+                    continue  # An empty Disallow allows everything
+                rule = (len(value), field == "allow", cls._compile(value))
+                for agent in current_agents:
+                    groups[agent][1].append(rule)
+            elif field == "crawl-delay" and current_agents:
+                in_rules = True
+                try:
+                    delay = float(value)
+                except ValueError:
+                    continue
+                for agent in current_agents:
+                    groups[agent][0] = delay
+
+        compiled = {
+            agent: (delay, sorted(rules, key=lambda rule: (-rule[0], not rule[1])))
+            for agent, (delay, rules) in groups.items()
+        }
+        return cls(groups=compiled, expires_at=expires_at)
+
+    def _group(self, user_agent):
+        group = self._agent_groups.get(user_agent)
+        if group is None:
+            product = user_agent.split("/", 1)[0].strip().lower()
+            matches = [agent for agent in self.groups if agent != "*" and agent in product]
+            key = max(matches, key=len) if matches else "*"
+            group = self.groups.get(key, (None, []))
+            self._agent_groups[user_agent] = group
+        return group
+
+    def can_fetch(self, user_agent, url):
+        """
+        :param user_agent: Crawler user-agent string
+        :param url: Full URL (or path) to check
+        :return: True if the URL may be fetched
+        """
+        if self.allow_all:
+            return True
+        if self.disallow_all:
+            return False
+        parts = urlsplit(url)
+        path = unquote(parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        # Rules are sorted longest-first (Allow before Disallow on ties), so the first match decides
+        for _, allow, pattern in self._group(user_agent)[1]:
+            if pattern.match(path):
+                return allow
+        return True
+
+    def crawl_delay(self, user_agent):
+        """
+        :return: Crawl-delay in seconds for the user-agent's group, or None
+        """
+        return self._group(user_agent)[0]
+
+    @property
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+
+class RobotsCache:
+    """
+    Robots.txt policy cache keyed by scheme+host.
+
+    Policies are kept for their Cache-Control max-age (or ROBOTS_DEFAULT_TTL). Each host is
+    fetched by one thread at a time (single-flight); other callers wait for that result.
+    """
+
+    def __init__(self, session=None, capacity=ROBOTS_CACHE_SIZE, default_ttl=ROBOTS_DEFAULT_TTL):
+        self.session = session or requests.Session()
+        self.capacity = capacity
+        self.default_ttl = default_ttl
+        self._policies = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_key(url):
+        parts = urlsplit(url)
+        return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+    def _ttl(self, response):
+        match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+        return min(int(match.group(1)), ROBOTS_MAX_TTL) if match else self.default_ttl
+
+    def _fetch(self, host):
+        try:
+            response = self.session.get(f"{host}/robots.txt", timeout=ROBOTS_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Failed to read robots.txt for {host}: {e}")
+            return RobotsPolicy(disallow_all=True, expires_at=time.monotonic() + ROBOTS_ERROR_TTL)
+
+        if response.status_code >= 500:
+            logging.error(f"robots.txt for {host} returned {response.status_code}")
+            return RobotsPolicy(disallow_all=True, expires_at=time.monotonic() + ROBOTS_ERROR_TTL)
+        expires_at = time.monotonic() + self._ttl(response)
+        if response.status_code >= 400:
+            # No robots.txt: everything is allowed
+            return RobotsPolicy(allow_all=True, expires_at=expires_at)
+        return RobotsPolicy.parse(response.text, expires_at=expires_at)
+
+    def get(self, url):
+        """
+        Return the (cached) policy for the URL's scheme+host, fetching it if needed.
+
+        :param url: Any URL on the host
+        :return: RobotsPolicy
+        """
+        host = self.host_key(url)
+        with self._lock:
+            policy = self._policies.get(host)
+            if policy is not None and not policy.expired:
+                self._policies.move_to_end(host)
+                return policy
+            event = self._inflight.get(host)
+            leader = event is None
+            if leader:
+                event = self._inflight[host] = threading.Event()
+
+        if not leader:
+            event.wait()
+            with self._lock:
+                policy = self._policies.get(host)
+            return policy if policy is not None else self.get(url)
+
+        try:
+            policy = self._fetch(host)
+            with self._lock:
+                self._policies[host] = policy
+                self._policies.move_to_end(host)
+                while len(self._policies) > self.capacity:
+                    self._policies.popitem(last=False)
+            return policy
+        finally:
+            with self._lock:
+                del self._inflight[host]
+            event.set()
+
+    def prefetch(self, urls, max_workers=ROBOTS_FETCH_WORKERS):
+        """
+        Fetch policies for all distinct hosts in the URLs concurrently.
+
+        :param urls: URLs to be checked later
+        """
+        hosts = {self.host_key(url): url for url in urls}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self.get, hosts.values()))
+
+    def can_fetch(self, url, user_agent="*"):
+        return self.get(url).can_fetch(user_agent, url)
+
+    def crawl_delay(self, url, user_agent="*"):
+        return self.get(url).crawl_delay(user_agent)
+
+
+# Process-wide cache shared by every scraper
+robots_cache = RobotsCache()
+
+
+def check_robots_txt(url, user_agent='*'):
     """
     Check whether the URL is allowed to be scraped based on the site's robots.txt file.
+    The host's robots.txt is fetched once and cached (see RobotsCache).
     
     :param url: URL of the site to be scraped
+    :param user_agent: User-agent to check the rules for
     :return: True if scraping is allowed, False otherwise
     """
     try:
-        robots_url = f"{url}/robots.txt"
-        parser = RobotFileParser()
-        parser.set_url(robots_url)
-        parser.read()
-
-        # Check if scraping is allowed for all user-agents
-        return parser.can_fetch('*', url)
+        return robots_cache.can_fetch(url, user_agent)
 
     except Exception as e:
-        logging.error(f"Failed to read robots.txt for {url}: {e}")
+        logging.error(f"Failed to check robots.txt for {url}: {e}")
         return False
 
 
+def get_crawl_delay(url, user_agent='*'):
+    """
+    Crawl-delay requested by the site's robots.txt.
+
+    :param url: URL of the site to be scraped
+    :param user_agent: User-agent to check the rules for
+    :return: Delay in seconds, or None if the site does not set one
+    """
+    try:
+        return robots_cache.crawl_delay(url, user_agent)
+    except Exception as e:
+        logging.error(f"Failed to read crawl-delay for {url}: {e}")
+        return None
+
+
 def fetch_page(url, delay=1):
     """
     Fetch the HTML content of a given page, with optional delay to avoid overwhelming the server.
@@ -89,8 +319,8 @@ def scrape_website(url, tag, attribute=None, value=None, delay=1):
         logging.warning(f"Scraping is disallowed by robots.txt for {url}")
         return []
 
-    # Step 2: Fetch the page content
-    html_content = fetch_page(url, delay=delay)
+    # Step 2: Fetch the page content (honouring the site's crawl-delay if it is longer)
+    html_content = fetch_page(url, delay=max(delay, get_crawl_delay(url) or 0))
     if not html_content:
         logging.error(f"Failed to fetch page: {url}")
         return []
@@ -116,6 +346,8 @@ def scrape_multiple_urls(urls, tag, attribute=None, value=None, delay=1):
     :return: A dictionary where the keys are URLs and values are lists of extracted elements
     """
     results = {}
+    # Load robots.txt for every host up front, concurrently, so each check below is a cache hit
+    robots_cache.prefetch(urls)
     for url in urls:
         logging.info(f"Scraping URL: {url}")
         results[url] = scrape_website(url, tag, attribute, value, delay)
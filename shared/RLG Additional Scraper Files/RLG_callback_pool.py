@@ -0,0 +1,261 @@
+"""
+Process pool for CPU-bound spider callbacks.
+
+Spider callbacks normally run on the Twisted reactor thread, so a spider that does
+heavy HTML parsing keeps one core busy while downloads stall. With
+``SCRAPER_PROCESS_POOL_ENABLED`` set, callbacks decorated with :func:`cpu_bound`
+are run in a bounded pool of worker processes instead: the response is shipped to
+a worker, the callback runs there against a lightweight copy of the spider, and the
+resulting items and requests are sent back to be processed by the Scraper as usual.
+
+Settings:
+
+* ``SCRAPER_PROCESS_POOL_ENABLED`` - opt in (default False)
+* ``SCRAPER_PROCESS_POOL_SIZE`` - worker processes (default: CPU count)
+* ``SCRAPER_PROCESS_POOL_MAX_PENDING`` - offloaded callbacks in flight before the
+  scraper slot backs out (default: 2x pool size)
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from twisted.internet.defer import Deferred
+from twisted.python.failure import Failure
+
+from scrapy import Spider
+from scrapy.http import Request, Response, TextResponse
+from scrapy.utils.request import request_from_dict
+from scrapy.utils.spider import iterate_spider_output
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import Future
+
+    from scrapy.settings import BaseSettings
+
+
+logger = logging.getLogger(__name__)
+
+_F = TypeVar("_F", bound="Callable[..., Any]")
+
+# Spider attributes that are bound to the running crawl and never sent to workers
+_LOCAL_SPIDER_ATTRS = {"crawler", "settings", "state"}
+
+
+def cpu_bound(func: _F) -> _F:
+    """Mark a spider callback as CPU-bound, so it may run in the callback process pool."""
+    func._scrapy_cpu_bound = True  # type: ignore[attr-defined]
+    return func
+
+
+def is_cpu_bound(callback: Any) -> bool:
+    return getattr(callback, "_scrapy_cpu_bound", False)
+
+
+# ---- Worker side ----
+
+_worker_spider: Spider | None = None
+
+
+def _init_worker(spidercls: type[Spider], spider_attrs: dict[str, Any]) -> None:
+    """Build the worker's copy of the spider without running its __init__."""
+    global _worker_spider  # noqa: PLW0603
+    spider = spidercls.__new__(spidercls)
+    spider.__dict__.update(spider_attrs)
+    _worker_spider = spider
+
+
+def _run_callback(payload: dict[str, Any]) -> list[tuple[str, Any]]:
+    """Rebuild the response in the worker, run the callback and serialize its output."""
+    spider = _worker_spider
+    assert spider is not None
+    request = request_from_dict(payload["request"], spider=spider)
+    response = payload["response_cls"](request=request, **payload["response_kwargs"])
+    callback = request.callback or spider.parse
+
+    output: list[tuple[str, Any]] = []
+    for result in iterate_spider_output(callback(response, **request.cb_kwargs)):
+        if isinstance(result, Request):
+            output.append(("request", result.to_dict(spider=spider)))
+        else:
+            output.append(("item", result))
+    return output
+
+
+# ---- Reactor side ----
+
+
+def _picklable_spider_attrs(spider: Spider) -> dict[str, Any]:
+    attrs = {}
+    for name, value in vars(spider).items():
+        if name in _LOCAL_SPIDER_ATTRS:
+            continue
+        try:
+            pickle.dumps(value)
+        except Exception:  # noqa: S112
+            continue
+        attrs[name] = value
+    return attrs
+
+
+def _response_payload(response: Response, request: Request, spider: Spider) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {
+        "url": response.url,
+        "status": response.status,
+        "headers": dict(response.headers),
+        "body": response.body,
+        "flags": list(response.flags),
+        "protocol": response.protocol,
+    }
+    if isinstance(response, TextResponse):
+        kwargs["encoding"] = response.encoding
+    return {
+        "request": request.to_dict(spider=spider),
+        "response_cls": type(response),
+        "response_kwargs": kwargs,
+    }
+
+
+class CallbackProcessPool:
+    """Bounded process pool that runs CPU-bound callbacks off the reactor thread."""
+
+    def __init__(self, spider: Spider, size: int, max_pending: int):
+        self.size: int = size
+        self.max_pending: int = max_pending
+        self.pending: int = 0
+        self.spider: Spider = spider
+        # Forking a process that runs the reactor is unsafe; start clean interpreters
+        self.executor = ProcessPoolExecutor(
+            max_workers=size,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(type(spider), _picklable_spider_attrs(spider)),
+        )
+
+    @classmethod
+    def from_settings(cls, settings: BaseSettings, spider: Spider) -> CallbackProcessPool | None:
+        if not settings.getbool("SCRAPER_PROCESS_POOL_ENABLED"):
+            return None
+        size = settings.getint("SCRAPER_PROCESS_POOL_SIZE") or os.cpu_count() or 1
+        max_pending = settings.getint("SCRAPER_PROCESS_POOL_MAX_PENDING") or 2 * size
+        logger.info(
+            "Running CPU-bound callbacks in %(size)d worker processes",
+            {"size": size},
+            extra={"spider": spider},
+        )
+        return cls(spider, size, max_pending)
+
+    def should_offload(self, response: Response, callback: Any) -> bool:
+        target = self.spider.parse if callback == self.spider._parse else callback
+        return is_cpu_bound(target)
+
+    def submit(self, response: Response, request: Request) -> Deferred[list[Any]]:
+        """Run the request's callback on the response in a worker process.
+
+        The returned Deferred fires on the reactor thread with the callback output
+        (items, and Requests rebuilt for the local spider).
+        """
+        from twisted.internet import reactor
+
+        dfd: Deferred[list[Any]] = Deferred()
+        self.pending += 1
+        future = self.executor.submit(_run_callback, _response_payload(response, request, self.spider))
+        future.add_done_callback(
+            lambda f: reactor.callFromThread(self._finished, f, dfd)  # type: ignore[attr-defined]
+        )
+        return dfd
+
+    def _finished(self, future: Future[list[tuple[str, Any]]], dfd: Deferred[list[Any]]) -> None:
+        self.pending -= 1
+        exc = future.exception()
+        if exc is not None:
+            dfd.errback(Failure(exc))
+            return
+        dfd.callback([
+            request_from_dict(value, spider=self.spider) if kind == "request" else value
+            for kind, value in future.result()
+        ])
+
+    def needs_backout(self) -> bool:
+        return self.pending >= self.max_pending
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def benchmark_callback_pool(
+    spidercls: type[Spider],
+    responses: list[Response],
+    worker_counts: tuple[int, ...] = (1, 2, 4, 8),
+) -> dict[str, float]:
+    """Measure callback throughput (pages/sec) inline and with different pool sizes.
+
+    ``responses`` must carry requests whose callbacks are methods of ``spidercls``
+    (or no callback, to use ``parse``). Run this outside the reactor, e.g.::
+
+        python -c "from RLG_callback_pool import _benchmark_main; _benchmark_main()"
+    """
+    spider = spidercls()
+    results: dict[str, float] = {}
+
+    start = time.perf_counter()
+    for response in responses:
+        callback = response.request.callback or spider.parse
+        for _ in iterate_spider_output(callback(response, **response.request.cb_kwargs)):
+            pass
+    results["inline_pages_per_sec"] = len(responses) / (time.perf_counter() - start)
+
+    payloads = [_response_payload(response, response.request, spider) for response in responses]
+    for workers in worker_counts:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(spidercls, _picklable_spider_attrs(spider)),
+        ) as executor:
+            # Warm up the workers before timing
+            list(executor.map(_run_callback, payloads[:workers]))
+            start = time.perf_counter()
+            list(executor.map(_run_callback, payloads, chunksize=8))
+            results[f"pool_{workers}_pages_per_sec"] = len(responses) / (time.perf_counter() - start)
+    return results
+
+
+class _ParsingHeavySpider(Spider):
+    """Benchmark spider whose callback does a lot of selector work per page."""
+
+    name = "parsing_heavy"
+
+    @cpu_bound
+    def parse(self, response, **kwargs):
+        for row in response.css("table tr"):
+            yield {
+                "cells": row.css("td::text").getall(),
+                "links": row.xpath(".//a/@href").getall(),
+            }
+
+
+def _benchmark_main(pages: int = 400, rows: int = 300) -> None:
+    from scrapy.http import HtmlResponse
+
+    body = (
+        "<html><body><table>"
+        + "".join(
+            f"<tr><td>{i}</td><td>cell {i}</td><td><a href='/item/{i}'>item</a></td></tr>"
+            for i in range(rows)
+        )
+        + "</table></body></html>"
+    ).encode()
+    responses = [
+        HtmlResponse(url=f"https://example.com/{i}", body=body, request=Request(f"https://example.com/{i}"))
+        for i in range(pages)
+    ]
+    for name, value in benchmark_callback_pool(_ParsingHeavySpider, responses).items():
+        print(f"{name}: {value:.1f}")
@@ -0,0 +1,282 @@
+"""
+Bloom-filter request dupefilter for long-running crawls.
+
+The default RFPDupeFilter keeps every fingerprint in a Python set and appends them
+to ``requests.seen`` as hex text, which grows to many GB on multi-day crawls. This
+dupefilter keeps a fixed-size, memory-mapped Bloom filter instead, and only
+consults an exact (SQLite-backed) fingerprint store when the Bloom filter reports
+a probable hit.
+
+Enable it with::
+
+    DUPEFILTER_CLASS = "RLG_dupefilters.BloomDupeFilter"
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import mmap
+import sqlite3
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from scrapy.dupefilters import BaseDupeFilter
+from scrapy.utils.job import job_dir
+
+if TYPE_CHECKING:
+    from twisted.internet.defer import Deferred
+
+    # typing.Self requires Python 3.11
+    from typing_extensions import Self
+
+    from scrapy.crawler import Crawler
+    from scrapy.http.request import Request
+    from scrapy.settings import BaseSettings
+    from scrapy.spiders import Spider
+    from scrapy.statscollectors import StatsCollector
+    from scrapy.utils.request import RequestFingerprinterProtocol
+
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter stored in a (file-backed or anonymous) mmap.
+
+    The bit array is sized for ``capacity`` items at ``error_rate`` false positives.
+    Bit positions are derived from the request fingerprint by double hashing, so no
+    extra hashing is needed. When backed by a file, reopening it is O(1): the pages
+    are mapped, not loaded.
+    """
+
+    MAGIC = b"RLGBLOOM"
+    VERSION = 1
+    HEADER = struct.Struct("<8sIQIQ")  # magic, version, num_bits, num_hashes, count
+    HEADER_SIZE = 64
+
+    def __init__(self, capacity: int, error_rate: float, path: str | None = None):
+        self.num_bits: int = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes: int = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count: int = 0
+        self.path: str | None = path
+        size = self.HEADER_SIZE + (self.num_bits + 7) // 8
+
+        self._file = None
+        if path is None:
+            self._mm = mmap.mmap(-1, size)
+            return
+
+        exists = Path(path).exists()
+        self._file = Path(path).open("r+b" if exists else "w+b")  # noqa: SIM115
+        if exists:
+            magic, version, num_bits, num_hashes, count = self.HEADER.unpack_from(
+                self._file.read(self.HEADER.size)
+            )
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError(f"{path} is not a compatible Bloom filter file")
+            # Resume with the stored geometry, even if the settings changed since
+            self.num_bits, self.num_hashes, self.count = num_bits, num_hashes, count
+            size = self.HEADER_SIZE + (self.num_bits + 7) // 8
+        else:
+            self._file.truncate(size)
+        self._mm = mmap.mmap(self._file.fileno(), size)
+        self._write_header()
+
+    def _write_header(self) -> None:
+        self.HEADER.pack_into(
+            self._mm, 0, self.MAGIC, self.VERSION, self.num_bits, self.num_hashes, self.count
+        )
+
+    def _positions(self, fingerprint: bytes) -> list[int]:
+        h1 = int.from_bytes(fingerprint[:8], "little")
+        h2 = int.from_bytes(fingerprint[8:16], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, fingerprint: bytes) -> bool:
+        mm = self._mm
+        offset = self.HEADER_SIZE
+        return all(
+            mm[offset + (pos >> 3)] & (1 << (pos & 7)) for pos in self._positions(fingerprint)
+        )
+
+    def add(self, fingerprint: bytes) -> None:
+        mm = self._mm
+        offset = self.HEADER_SIZE
+        for pos in self._positions(fingerprint):
+            mm[offset + (pos >> 3)] |= 1 << (pos & 7)
+        self.count += 1
+
+    @property
+    def expected_false_positive_rate(self) -> float:
+        """Theoretical false positive rate at the current fill."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def flush(self) -> None:
+        self._write_header()
+        if self._file is not None:
+            self._mm.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._mm.close()
+        if self._file is not None:
+            self._file.close()
+
+
+class BloomDupeFilter(BaseDupeFilter):
+    """Request fingerprint duplicates filter backed by a Bloom filter.
+
+    Fingerprints that the Bloom filter has definitely not seen are accepted without
+    any further lookup. Probable hits are confirmed against an exact fingerprint store
+    (SQLite in ``JOBDIR``, or in memory) so that Bloom false positives never drop a
+    new request. With :setting:`DUPEFILTER_BLOOM_EXACT` disabled the exact store is
+    skipped and the filter is purely probabilistic.
+
+    Settings:
+
+    * ``DUPEFILTER_BLOOM_CAPACITY`` - expected number of unique requests (default 50M)
+    * ``DUPEFILTER_BLOOM_ERROR_RATE`` - target false positive rate (default 0.001)
+    * ``DUPEFILTER_BLOOM_EXACT`` - confirm probable hits exactly (default True)
+    * ``DUPEFILTER_BLOOM_COMMIT_EVERY`` - new fingerprints per exact-store commit (default 10000)
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        debug: bool = False,
+        *,
+        fingerprinter: RequestFingerprinterProtocol | None = None,
+        capacity: int = 50_000_000,
+        error_rate: float = 0.001,
+        exact: bool = True,
+        commit_every: int = 10_000,
+        stats: StatsCollector | None = None,
+    ) -> None:
+        from scrapy.utils.request import RequestFingerprinter
+
+        self.fingerprinter: RequestFingerprinterProtocol = fingerprinter or RequestFingerprinter()
+        self.debug: bool = debug
+        self.logdupes: bool = True
+        self.stats: StatsCollector | None = stats
+        self.commit_every: int = commit_every
+        self._pending: int = 0
+        self._new_requests: int = 0  # new fingerprints seen in this run
+
+        self.bloom = BloomFilter(
+            capacity, error_rate, str(Path(path, "requests.bloom")) if path else None
+        )
+        self.exact: sqlite3.Connection | None = None
+        if exact:
+            self.exact = sqlite3.connect(str(Path(path, "requests.seen.db")) if path else ":memory:")
+            self.exact.execute("PRAGMA journal_mode=WAL")
+            self.exact.execute("PRAGMA synchronous=NORMAL")
+            self.exact.execute(
+                "CREATE TABLE IF NOT EXISTS seen (fingerprint BLOB PRIMARY KEY) WITHOUT ROWID"
+            )
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: BaseSettings,
+        *,
+        fingerprinter: RequestFingerprinterProtocol | None = None,
+        stats: StatsCollector | None = None,
+    ) -> Self:
+        return cls(
+            job_dir(settings),
+            settings.getbool("DUPEFILTER_DEBUG"),
+            fingerprinter=fingerprinter,
+            capacity=settings.getint("DUPEFILTER_BLOOM_CAPACITY", 50_000_000),
+            error_rate=settings.getfloat("DUPEFILTER_BLOOM_ERROR_RATE", 0.001),
+            exact=settings.getbool("DUPEFILTER_BLOOM_EXACT", True),
+            commit_every=settings.getint("DUPEFILTER_BLOOM_COMMIT_EVERY", 10_000),
+            stats=stats,
+        )
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler) -> Self:
+        assert crawler.request_fingerprinter
+        return cls.from_settings(
+            crawler.settings,
+            fingerprinter=crawler.request_fingerprinter,
+            stats=crawler.stats,
+        )
+
+    def _inc_stat(self, key: str) -> None:
+        if self.stats is not None:
+            self.stats.inc_value(f"dupefilter/bloom/{key}")
+
+    def request_seen(self, request: Request) -> bool:
+        fp = self.fingerprinter.fingerprint(request)
+        if fp not in self.bloom:
+            self.bloom.add(fp)
+            self._remember(fp)
+            self._new_requests += 1
+            return False
+
+        self._inc_stat("probable_hits")
+        if self.exact is None:
+            return True
+        if self.exact.execute("SELECT 1 FROM seen WHERE fingerprint = ?", (fp,)).fetchone():
+            return True
+
+        # Bloom false positive: the request is new after all
+        self._inc_stat("false_positives")
+        self._remember(fp)
+        self._new_requests += 1
+        return False
+
+    def _remember(self, fp: bytes) -> None:
+        if self.exact is None:
+            return
+        self.exact.execute("INSERT OR IGNORE INTO seen (fingerprint) VALUES (?)", (fp,))
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.exact.commit()
+            self.bloom.flush()
+            self._pending = 0
+
+    def close(self, reason: str) -> Deferred[None] | None:
+        if self.stats is not None:
+            probable = self.stats.get_value("dupefilter/bloom/probable_hits", 0)
+            false_positives = self.stats.get_value("dupefilter/bloom/false_positives", 0)
+            self.stats.set_value("dupefilter/bloom/items", self.bloom.count)
+            self.stats.set_value("dupefilter/bloom/size_bytes", (self.bloom.num_bits + 7) // 8)
+            self.stats.set_value(
+                "dupefilter/bloom/expected_fp_rate", round(self.bloom.expected_false_positive_rate, 6)
+            )
+            if self._new_requests and self.exact is not None:
+                # Observed: share of new requests that the Bloom filter wrongly reported as seen
+                self.stats.set_value(
+                    "dupefilter/bloom/observed_fp_rate",
+                    round(false_positives / self._new_requests, 6),
+                )
+            if probable:
+                self.stats.set_value(
+                    "dupefilter/bloom/probable_hit_precision",
+                    round(1 - false_positives / probable, 6),
+                )
+        if self.exact is not None:
+            self.exact.commit()
+            self.exact.close()
+        self.bloom.close()
+        return None
+
+    def log(self, request: Request, spider: Spider) -> None:
+        if self.debug:
+            msg = "Filtered duplicate request: %(request)s (referer: %(referer)s)"
+            args = {"request": request, "referer": request.headers.get("Referer")}
+            logger.debug(msg, args, extra={"spider": spider})
+        elif self.logdupes:
+            msg = (
+                "Filtered duplicate request: %(request)s"
+                " - no more duplicates will be shown"
+                " (see DUPEFILTER_DEBUG to show all duplicates)"
+            )
+            logger.debug(msg, {"request": request}, extra={"spider": spider})
+            self.logdupes = False
+
+        assert spider.crawler.stats
+        spider.crawler.stats.inc_value("dupefilter/filtered", spider=spider)
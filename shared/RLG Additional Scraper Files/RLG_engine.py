@@ -8,22 +8,26 @@ For more information see docs/topics/architecture.rst
 from __future__ import annotations
 
 import logging
-from time import time
+import os
+from collections import Counter, defaultdict, deque
+from time import perf_counter, time
 from typing import TYPE_CHECKING, Any, TypeVar, cast
 
 from itemadapter import is_item
-from twisted.internet.defer import Deferred, inlineCallbacks, succeed
+from twisted.internet.defer import Deferred, DeferredList, inlineCallbacks, succeed
 from twisted.internet.task import LoopingCall
 from twisted.python.failure import Failure
 
 from scrapy import signals
-from scrapy.core.scraper import Scraper, _HandleOutputDeferred
 from scrapy.exceptions import CloseSpider, DontCloseSpider, IgnoreRequest
 from scrapy.http import Request, Response
+from scrapy.utils.httpobj import urlparse_cached
 from scrapy.utils.log import failure_to_exc_info, logformatter_adapter
 from scrapy.utils.misc import build_from_crawler, load_object
 from scrapy.utils.reactor import CallLaterOnce
 
+from RLG_scraper import Scraper, _HandleOutputDeferred
+
 if TYPE_CHECKING:
     from collections.abc import Callable, Generator, Iterable, Iterator
 
@@ -103,6 +107,8 @@ class ExecutionEngine:
             spider_closed_callback
         )
         self.start_time: float | None = None
+        # Set by the CrawlTelemetry extension (RLG_debug), if enabled
+        self.telemetry: Any = getattr(crawler, "telemetry", None)
 
     def _get_scheduler_class(self, settings: BaseSettings) -> type[BaseScheduler]:
         from scrapy.core.scheduler import BaseScheduler
@@ -293,10 +299,12 @@ class ExecutionEngine:
             return False
         return not self.slot.scheduler.has_pending_requests()
 
-    def crawl(self, request: Request) -> None:
+    def crawl(self, request: Request, spider: Spider | None = None) -> None:
         """Inject the request into the spider <-> downloader pipeline"""
         if self.spider is None:
             raise RuntimeError(f"No open spider to crawl: {request}")
+        if spider is not None and spider is not self.spider:
+            raise RuntimeError(f"Spider {spider.name!r} is not the open spider")
         self._schedule_request(request, self.spider)
         self.slot.nextcall.schedule()  # type: ignore[union-attr]
 
@@ -310,6 +318,8 @@ class ExecutionEngine:
         for handler, result in request_scheduled_result:
             if isinstance(result, Failure) and isinstance(result.value, IgnoreRequest):
                 return
+        if self.telemetry is not None:
+            request.meta[self.telemetry.SCHEDULED_META_KEY] = time()
         if not self.slot.scheduler.enqueue_request(request):  # type: ignore[union-attr]
             self.signals.send_catch_log(
                 signals.request_dropped, request=request, spider=spider
@@ -331,6 +341,21 @@ class ExecutionEngine:
         self.slot.remove_request(request)
         return self.download(result) if isinstance(result, Request) else result
 
+    def _observe_download(self, request: Request, dwld: Deferred[_T]) -> None:
+        """Record the scheduler wait and the download latency of a request"""
+        assert self.telemetry is not None
+        telemetry = self.telemetry
+        scheduled = request.meta.pop(telemetry.SCHEDULED_META_KEY, None)
+        if scheduled is not None:
+            telemetry.observe("scheduler_wait", time() - scheduled)
+        start = perf_counter()
+
+        def _observe(_: _T) -> _T:
+            telemetry.observe("download", perf_counter() - start)
+            return _
+
+        dwld.addBoth(_observe)
+
     def _download(self, request: Request) -> Deferred[Response | Request]:
         assert self.slot is not None  # typing
 
@@ -365,6 +390,8 @@ class ExecutionEngine:
 
         assert self.spider is not None
         dwld: Deferred[Response | Request] = self.downloader.fetch(request, self.spider)
+        if self.telemetry is not None:
+            self._observe_download(request, dwld)
         dwld.addCallback(_on_success)
         dwld.addBoth(_on_complete)
         return dwld
@@ -484,4 +511,545 @@ class ExecutionEngine:
 
         dfd.addBoth(lambda _: self._spider_closed_callback(spider))
 
-        return dfd
\ No newline at end of file
+        return dfd
+
+class _SpiderCrawlerView:
+    """Crawler proxy with its own settings, used to build per-spider components
+    (e.g. a scheduler with its own ``JOBDIR``)"""
+
+    def __init__(self, crawler: Crawler, settings: BaseSettings) -> None:
+        self._crawler: Crawler = crawler
+        self.settings: BaseSettings = settings
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._crawler, name)
+
+
+class MultiSpiderSlot(Slot):
+    """Engine slot of one spider in a :class:`MultiSpiderExecutionEngine`.
+
+    Besides the in-progress requests it counts the requests in flight per domain,
+    and parks requests whose domain is at its quota until a download finishes.
+    """
+
+    def __init__(
+        self,
+        start_requests: Iterable[Request],
+        close_if_idle: bool,
+        nextcall: CallLaterOnce[None],
+        scheduler: BaseScheduler,
+        scraper: Scraper,
+    ) -> None:
+        super().__init__(start_requests, close_if_idle, nextcall, scheduler)
+        self.scraper: Scraper = scraper
+        self.domain_active: Counter[str] = Counter()
+        self.parked: defaultdict[str, deque[Request]] = defaultdict(deque)
+        self.parked_count: int = 0
+
+    def park(self, domain: str, request: Request) -> None:
+        self.parked[domain].append(request)
+        self.parked_count += 1
+
+    def _maybe_fire_closing(self) -> None:
+        # nextcall is shared by all spiders, so it is left to the engine
+        if self.closing is not None and not self.inprogress:
+            self.closing.callback(None)
+
+    def unpark(self, domain_limit: int) -> Request | None:
+        for domain, requests in self.parked.items():
+            if self.domain_active[domain] < domain_limit:
+                request = requests.popleft()
+                if not requests:
+                    del self.parked[domain]
+                self.parked_count -= 1
+                return request
+        return None
+
+
+class MultiSpiderExecutionEngine(ExecutionEngine):
+    """Execution engine that runs several spiders at once in one process.
+
+    Every spider gets its own engine slot, scheduler and scraper, while the
+    downloader is shared. Requests are taken from the spiders round-robin, within
+    two quotas:
+
+    * ``ENGINE_SPIDER_CONCURRENCY`` - downloads in flight per spider (default: an
+      equal share of ``CONCURRENT_REQUESTS`` between the open spiders)
+    * ``ENGINE_SPIDER_DOMAIN_CONCURRENCY`` - downloads in flight per spider and
+      domain (default: ``CONCURRENT_REQUESTS_PER_DOMAIN``)
+
+    Requests over the domain quota are parked in the spider slot (up to
+    ``ENGINE_SPIDER_MAX_PARKED`` per spider) rather than sent back to the scheduler.
+    With ``JOBDIR`` set, each spider persists its queue under ``JOBDIR/<spider name>``.
+    Per-spider counters are kept under ``spiders/<spider name>/`` in the stats, and
+    the crawler is only stopped once the last spider is closed. Extensions that
+    keep per-crawler state for a single spider (e.g. ``LogStats``) only track
+    the last spider opened.
+
+    To use it, return it from ``Crawler._create_engine()`` and open the other
+    spiders once the engine has started::
+
+        class MultiSpiderCrawler(Crawler):
+            def _create_engine(self):
+                return MultiSpiderExecutionEngine(self, lambda _: self.stop())
+
+        # e.g. from an engine_started signal handler
+        spider = OtherSpider.from_crawler(crawler)
+        yield crawler.engine.open_spider(spider, spider.start_requests())
+    """
+
+    def __init__(
+        self,
+        crawler: Crawler,
+        spider_closed_callback: Callable[[Spider], Deferred[None] | None],
+    ) -> None:
+        super().__init__(crawler, spider_closed_callback)
+        self.slots: dict[Spider, MultiSpiderSlot] = {}
+        self.spider_concurrency: int = self.settings.getint("ENGINE_SPIDER_CONCURRENCY")
+        self.domain_concurrency: int = self.settings.getint(
+            "ENGINE_SPIDER_DOMAIN_CONCURRENCY",
+            self.settings.getint("CONCURRENT_REQUESTS_PER_DOMAIN"),
+        )
+        self.max_parked: int = self.settings.getint("ENGINE_SPIDER_MAX_PARKED", 1000)
+        self._nextcall: CallLaterOnce[None] = CallLaterOnce(self._next_request)
+        self._heartbeat: LoopingCall = LoopingCall(self._nextcall.schedule)
+        self._rotation: int = 0
+        # Signal receivers are weakly referenced, so keep them alive here
+        self._stat_receivers: list[Callable[..., None]] = []
+        for signal, key in (
+            (signals.request_scheduled, "request_scheduled_count"),
+            (signals.response_received, "response_received_count"),
+            (signals.item_scraped, "item_scraped_count"),
+            (signals.item_dropped, "item_dropped_count"),
+            (signals.spider_error, "spider_exceptions"),
+        ):
+            receiver = self._spider_stat_counter(key)
+            self._stat_receivers.append(receiver)
+            self.signals.connect(receiver, signal=signal)
+
+    def _spider_stat_counter(self, key: str) -> Callable[..., None]:
+        def receiver(spider: Spider, **kwargs: Any) -> None:
+            self._inc_spider_stat(spider, key)
+
+        return receiver
+
+    def _inc_spider_stat(self, spider: Spider, key: str, count: int = 1) -> None:
+        assert self.crawler.stats
+        self.crawler.stats.inc_value(f"spiders/{spider.name}/{key}", count, spider=spider)
+
+    def _spider_quota(self) -> int:
+        if self.spider_concurrency:
+            return self.spider_concurrency
+        return max(1, self.downloader.total_concurrency // max(1, len(self.slots)))
+
+    def _slot_for(self, spider: Spider | None) -> tuple[Spider, MultiSpiderSlot]:
+        if spider is None:
+            if len(self.slots) != 1:
+                raise RuntimeError("A spider must be given when several spiders are open")
+            spider = next(iter(self.slots))
+        if spider not in self.slots:
+            raise RuntimeError(f"Spider {spider.name!r} is not open")
+        return spider, self.slots[spider]
+
+    def _rebind_primary(self) -> None:
+        """Keep the single-spider attributes pointing at one open spider, for
+        components that still expect them"""
+        if self.slots:
+            self.spider, slot = next(iter(self.slots.items()))
+            self.slot, self.scraper = slot, slot.scraper
+        else:
+            self.spider, self.slot = None, None
+
+    def stop(self) -> Deferred[None]:
+        """Gracefully stop the execution engine, closing every open spider"""
+
+        @inlineCallbacks
+        def _finish_stopping_engine(_: Any) -> Generator[Deferred[Any], Any, None]:
+            yield self.signals.send_catch_log_deferred(signal=signals.engine_stopped)
+            self._closewait.callback(None)
+
+        if not self.running:
+            raise RuntimeError("Engine not running")
+
+        self.running = False
+        dfd = self._close_all_spiders("shutdown")
+        return dfd.addBoth(_finish_stopping_engine)
+
+    def close(self) -> Deferred[None]:
+        if self.running:
+            return self.stop()
+        if self.slots:
+            return self._close_all_spiders("shutdown")
+        self.downloader.close()
+        return succeed(None)
+
+    def _close_all_spiders(self, reason: str) -> Deferred[None]:
+        if not self.slots:
+            return succeed(None)
+        dfds = [self.close_spider(spider, reason=reason) for spider in list(self.slots)]
+        return DeferredList(dfds).addCallback(lambda _: None)
+
+    def _next_request(self) -> None:
+        if self.paused or not self.slots:
+            return
+
+        # Start each round with a different spider, then take one request per
+        # spider per pass, so that no spider can starve the others
+        spiders = list(self.slots)
+        self._rotation = (self._rotation + 1) % len(spiders)
+        spiders = spiders[self._rotation :] + spiders[: self._rotation]
+
+        progress = True
+        while progress and not self.downloader.needs_backout():
+            progress = False
+            for spider in spiders:
+                if spider in self.slots and self._next_request_for(spider):
+                    progress = True
+
+        for spider in spiders:
+            slot = self.slots.get(spider)
+            if slot is None:
+                continue
+            if slot.start_requests is not None and not self._needs_backout(spider):
+                self._next_start_request(spider, slot)
+            if self.spider_is_idle(spider) and slot.close_if_idle:
+                self._spider_idle(spider)
+
+    def _next_start_request(self, spider: Spider, slot: MultiSpiderSlot) -> None:
+        assert slot.start_requests is not None
+        try:
+            request_or_item = next(slot.start_requests)
+        except StopIteration:
+            slot.start_requests = None
+        except Exception:
+            slot.start_requests = None
+            logger.error(
+                "Error while obtaining start requests",
+                exc_info=True,
+                extra={"spider": spider},
+            )
+        else:
+            if isinstance(request_or_item, Request):
+                self.crawl(request_or_item, spider)
+            elif is_item(request_or_item):
+                slot.scraper.start_itemproc(request_or_item, response=None)
+            else:
+                logger.error(
+                    f"Got {request_or_item!r} among start requests. Only "
+                    f"requests and items are supported. It will be "
+                    f"ignored.",
+                    extra={"spider": spider},
+                )
+
+    def _needs_backout(self, spider: Spider | None = None) -> bool:
+        spider, slot = self._slot_for(spider)
+        assert slot.scraper.slot is not None  # typing
+        return (
+            not self.running
+            or bool(slot.closing)
+            or self.downloader.needs_backout()
+            or slot.scraper.slot.needs_backout()
+            or len(slot.inprogress) >= self._spider_quota()
+        )
+
+    def _next_request_for(self, spider: Spider) -> bool:
+        """Send the next request of the given spider to the downloader, if its
+        quotas allow it. Return whether a request was sent."""
+        if self._needs_backout(spider):
+            return False
+        slot = self.slots[spider]
+        request = slot.unpark(self.domain_concurrency)
+        while request is None:
+            request = slot.scheduler.next_request()
+            if request is None:
+                return False
+            domain = urlparse_cached(request).hostname or ""
+            if slot.domain_active[domain] >= self.domain_concurrency:
+                slot.park(domain, request)
+                self._inc_spider_stat(spider, "parked")
+                if slot.parked_count >= self.max_parked:
+                    return False
+                request = None
+        self._dispatch(request, spider, slot)
+        return True
+
+    def _dispatch(self, request: Request, spider: Spider, slot: MultiSpiderSlot) -> None:
+        domain = urlparse_cached(request).hostname or ""
+        slot.domain_active[domain] += 1
+
+        d: Deferred[Response | Request] = self._download(request, spider)
+        d.addBoth(self._handle_downloader_output, request, spider)
+        d.addErrback(
+            lambda f: logger.info(
+                "Error while handling downloader output",
+                exc_info=failure_to_exc_info(f),
+                extra={"spider": spider},
+            )
+        )
+
+        def _remove_request(_: Any) -> None:
+            slot.domain_active[domain] -= 1
+            if not slot.domain_active[domain]:
+                del slot.domain_active[domain]
+            slot.remove_request(request)
+
+        d2: Deferred[None] = d.addBoth(_remove_request)
+        d2.addErrback(
+            lambda f: logger.info(
+                "Error while removing request from slot",
+                exc_info=failure_to_exc_info(f),
+                extra={"spider": spider},
+            )
+        )
+        d2.addBoth(lambda _: self._nextcall.schedule())
+
+    def _handle_downloader_output(  # type: ignore[override]
+        self, result: Request | Response | Failure, request: Request, spider: Spider
+    ) -> _HandleOutputDeferred | None:
+        if not isinstance(result, (Request, Response, Failure)):
+            raise TypeError(
+                f"Incorrect type: expected Request, Response or Failure, got {type(result)}: {result!r}"
+            )
+
+        # downloader middleware can return requests (for example, redirects)
+        if isinstance(result, Request):
+            self.crawl(result, spider)
+            return None
+
+        d = self.slots[spider].scraper.enqueue_scrape(result, request, spider)
+        d.addErrback(
+            lambda f: logger.error(
+                "Error while enqueuing downloader output",
+                exc_info=failure_to_exc_info(f),
+                extra={"spider": spider},
+            )
+        )
+        return d
+
+    def spider_is_idle(self, spider: Spider | None = None) -> bool:
+        if spider is None and len(self.slots) != 1:
+            return all(self.spider_is_idle(s) for s in self.slots)
+        spider, slot = self._slot_for(spider)
+        assert slot.scraper.slot is not None  # typing
+        if not slot.scraper.slot.is_idle():
+            return False
+        # The downloader is shared, so look at this spider's requests only
+        if slot.inprogress or slot.parked_count:
+            return False
+        if slot.start_requests is not None:
+            return False
+        return not slot.scheduler.has_pending_requests()
+
+    def crawl(self, request: Request, spider: Spider | None = None) -> None:
+        """Inject the request into the given spider's scheduler"""
+        if not self.slots:
+            raise RuntimeError(f"No open spider to crawl: {request}")
+        spider, slot = self._slot_for(spider)
+        self._schedule_request(request, spider)
+        self._nextcall.schedule()
+
+    def _schedule_request(self, request: Request, spider: Spider) -> None:
+        request_scheduled_result = self.signals.send_catch_log(
+            signals.request_scheduled,
+            request=request,
+            spider=spider,
+            dont_log=IgnoreRequest,
+        )
+        for handler, result in request_scheduled_result:
+            if isinstance(result, Failure) and isinstance(result.value, IgnoreRequest):
+                return
+        if self.telemetry is not None:
+            request.meta[self.telemetry.SCHEDULED_META_KEY] = time()
+        if not self.slots[spider].scheduler.enqueue_request(request):
+            self.signals.send_catch_log(
+                signals.request_dropped, request=request, spider=spider
+            )
+
+    def download(self, request: Request, spider: Spider | None = None) -> Deferred[Response]:
+        """Return a Deferred which fires with a Response as result, only downloader middlewares are applied"""
+        spider, _ = self._slot_for(spider)
+        d: Deferred[Response | Request] = self._download(request, spider)
+        d2: Deferred[Response] = d.addBoth(self._downloaded, request, spider)  # type: ignore[call-overload]
+        return d2
+
+    def _downloaded(  # type: ignore[override]
+        self, result: Response | Request | Failure, request: Request, spider: Spider
+    ) -> Deferred[Response] | Response | Failure:
+        self.slots[spider].remove_request(request)
+        return self.download(result, spider) if isinstance(result, Request) else result
+
+    def _download(  # type: ignore[override]
+        self, request: Request, spider: Spider | None = None
+    ) -> Deferred[Response | Request]:
+        spider, slot = self._slot_for(spider)
+        slot.add_request(request)
+
+        def _on_success(result: Response | Request) -> Response | Request:
+            if not isinstance(result, (Response, Request)):
+                raise TypeError(
+                    f"Incorrect type: expected Response or Request, got {type(result)}: {result!r}"
+                )
+            if isinstance(result, Response):
+                if result.request is None:
+                    result.request = request
+                logkws = self.logformatter.crawled(result.request, result, spider)
+                if logkws is not None:
+                    logger.log(*logformatter_adapter(logkws), extra={"spider": spider})
+                self.signals.send_catch_log(
+                    signal=signals.response_received,
+                    response=result,
+                    request=result.request,
+                    spider=spider,
+                )
+            return result
+
+        def _on_complete(_: _T) -> _T:
+            self._nextcall.schedule()
+            return _
+
+        dwld: Deferred[Response | Request] = self.downloader.fetch(request, spider)
+        if self.telemetry is not None:
+            self._observe_download(request, dwld)
+        dwld.addCallback(_on_success)
+        dwld.addBoth(_on_complete)
+        return dwld
+
+    def _build_scheduler(self, spider: Spider) -> BaseScheduler:
+        jobdir = self.settings.get("JOBDIR")
+        if not jobdir:
+            return build_from_crawler(self.scheduler_cls, self.crawler)
+        # Spiders must not share queue and dupefilter files
+        settings = self.settings.copy()
+        settings.frozen = False
+        settings.set("JOBDIR", os.path.join(jobdir, spider.name), priority="spider")
+        view = cast("Crawler", _SpiderCrawlerView(self.crawler, settings))
+        return build_from_crawler(self.scheduler_cls, view)
+
+    @inlineCallbacks
+    def open_spider(
+        self,
+        spider: Spider,
+        start_requests: Iterable[Request] = (),
+        close_if_idle: bool = True,
+    ) -> Generator[Deferred[Any], Any, None]:
+        if spider in self.slots or any(s.name == spider.name for s in self.slots):
+            raise RuntimeError(f"Spider {spider.name!r} is already open")
+        logger.info("Spider opened", extra={"spider": spider})
+        first = not self.slots
+        scheduler = self._build_scheduler(spider)
+        scraper = Scraper(self.crawler)
+        start_requests = yield scraper.spidermw.process_start_requests(
+            start_requests, spider
+        )
+        slot = MultiSpiderSlot(
+            start_requests, close_if_idle, self._nextcall, scheduler, scraper
+        )
+        if hasattr(scheduler, "open") and (d := scheduler.open(spider)):
+            yield d
+        yield scraper.open_spider(spider)
+        # Only visible to _next_request once its scheduler and scraper are open
+        self.slots[spider] = slot
+        self._rebind_primary()
+        assert self.crawler.stats
+        if first:
+            self.crawler.stats.open_spider(spider)
+        yield self.signals.send_catch_log_deferred(signals.spider_opened, spider=spider)
+        self._nextcall.schedule()
+        if not self._heartbeat.running:
+            self._heartbeat.start(5)
+
+    def _spider_idle(self, spider: Spider | None = None) -> None:
+        spider, _ = self._slot_for(spider)
+        expected_ex = (DontCloseSpider, CloseSpider)
+        res = self.signals.send_catch_log(
+            signals.spider_idle, spider=spider, dont_log=expected_ex
+        )
+        detected_ex = {
+            ex: x.value
+            for _, x in res
+            for ex in expected_ex
+            if isinstance(x, Failure) and isinstance(x.value, ex)
+        }
+        if DontCloseSpider in detected_ex:
+            return
+        if self.spider_is_idle(spider):
+            ex = detected_ex.get(CloseSpider, CloseSpider(reason="finished"))
+            assert isinstance(ex, CloseSpider)  # typing
+            self.close_spider(spider, reason=ex.reason)
+
+    def close_spider(self, spider: Spider, reason: str = "cancelled") -> Deferred[None]:
+        """Close (cancel) one spider and clear all its outstanding requests.
+
+        The downloader, the stats and the crawler are only closed with the last spider.
+        """
+        slot = self.slots.get(spider)
+        if slot is None:
+            raise RuntimeError(f"Spider {spider.name!r} is not open")
+
+        if slot.closing is not None:
+            return slot.closing
+
+        logger.info(
+            "Closing spider (%(reason)s)", {"reason": reason}, extra={"spider": spider}
+        )
+
+        dfd = slot.close()
+
+        def log_failure(msg: str) -> Callable[[Failure], None]:
+            def errback(failure: Failure) -> None:
+                logger.error(
+                    msg, exc_info=failure_to_exc_info(failure), extra={"spider": spider}
+                )
+
+            return errback
+
+        dfd.addBoth(lambda _: slot.scraper.close_spider(spider))
+        dfd.addErrback(log_failure("Scraper close failure"))
+
+        if hasattr(slot.scheduler, "close"):
+            dfd.addBoth(lambda _: slot.scheduler.close(reason))
+            dfd.addErrback(log_failure("Scheduler close failure"))
+
+        dfd.addBoth(
+            lambda _: self.signals.send_catch_log_deferred(
+                signal=signals.spider_closed,
+                spider=spider,
+                reason=reason,
+            )
+        )
+        dfd.addErrback(log_failure("Error while sending spider_close signal"))
+
+        def unassign_slot(_: Any) -> None:
+            assert self.crawler.stats
+            self.crawler.stats.set_value(
+                f"spiders/{spider.name}/finish_reason", reason, spider=spider
+            )
+            del self.slots[spider]
+            self._rebind_primary()
+
+        dfd.addBoth(unassign_slot)
+        dfd.addErrback(log_failure("Error while unassigning slot"))
+
+        dfd.addBoth(
+            lambda _: logger.info(
+                "Spider closed (%(reason)s)",
+                {"reason": reason},
+                extra={"spider": spider},
+            )
+        )
+
+        def close_engine_if_last(_: Any) -> Deferred[None] | None:
+            if self.slots:
+                return None
+            if self._heartbeat.running:
+                self._heartbeat.stop()
+            self._nextcall.cancel()
+            self.downloader.close()
+            assert self.crawler.stats
+            self.crawler.stats.close_spider(spider, reason=reason)
+            return self._spider_closed_callback(spider)
+
+        dfd.addBoth(close_engine_if_last)
+        dfd.addErrback(log_failure("Error while closing the engine"))
+
+        return dfd
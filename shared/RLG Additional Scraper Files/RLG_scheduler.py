@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import logging
+import time
 from abc import abstractmethod
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, cast
@@ -174,6 +175,13 @@ class Scheduler(BaseScheduler):
 
     :param crawler: The crawler object corresponding to the current crawl.
     :type crawler: :class:`scrapy.crawler.Crawler`
+
+    :param checkpoint_interval: Seconds between checkpoints of the disk queues, which
+                                commit their buffered requests (if they support it, like
+                                :class:`RLG_squeues.SegmentDiskQueue`) and rewrite the queue
+                                state. ``0`` checkpoints only on close.
+                                The value for the ``SCHEDULER_CHECKPOINT_INTERVAL`` setting is used by default.
+    :type checkpoint_interval: float
     """
 
     def __init__(
@@ -186,6 +194,7 @@ class Scheduler(BaseScheduler):
         stats: StatsCollector | None = None,
         pqclass: type[ScrapyPriorityQueue] | None = None,
         crawler: Crawler | None = None,
+        checkpoint_interval: float = 0,
     ):
         self.df: BaseDupeFilter = dupefilter
         self.dqdir: str | None = self._dqdir(jobdir)
@@ -195,6 +204,8 @@ class Scheduler(BaseScheduler):
         self.logunser: bool = logunser
         self.stats: StatsCollector | None = stats
         self.crawler: Crawler | None = crawler
+        self.checkpoint_interval: float = checkpoint_interval
+        self._last_checkpoint: float = time.monotonic()
 
     @classmethod
     def from_crawler(cls, crawler: Crawler) -> Self:
@@ -211,6 +222,7 @@ class Scheduler(BaseScheduler):
             stats=crawler.stats,
             pqclass=load_object(crawler.settings["SCHEDULER_PRIORITY_QUEUE"]),
             crawler=crawler,
+            checkpoint_interval=crawler.settings.getfloat("SCHEDULER_CHECKPOINT_INTERVAL", 10.0),
         )
 
     def has_pending_requests(self) -> bool:
@@ -252,6 +264,8 @@ class Scheduler(BaseScheduler):
             self.df.log(request, self.spider)
             return False
         dqok = self._dqpush(request)
+        if dqok:
+            self._maybe_checkpoint()
         assert self.stats is not None
         if dqok:
             self.stats.inc_value("scheduler/enqueued/disk", spider=self.spider)
@@ -278,6 +292,7 @@ class Scheduler(BaseScheduler):
             request = self._dqpop()
             if request is not None:
                 self.stats.inc_value("scheduler/dequeued/disk", spider=self.spider)
+                self._maybe_checkpoint()
         if request is not None:
             self.stats.inc_value("scheduler/dequeued", spider=self.spider)
         return request
@@ -312,6 +327,30 @@ class Scheduler(BaseScheduler):
             return False
         return True
 
+    def _maybe_checkpoint(self) -> None:
+        if not self.checkpoint_interval or self.dqs is None:
+            return
+        if time.monotonic() - self._last_checkpoint < self.checkpoint_interval:
+            return
+        assert isinstance(self.dqdir, str)
+        self._write_dqs_state(self.dqdir, self._checkpoint_dqs(self.dqs))
+        self._last_checkpoint = time.monotonic()
+        assert self.stats is not None
+        self.stats.inc_value("scheduler/checkpoints", spider=self.spider)
+
+    def _checkpoint_dqs(self, pq: Any) -> Any:
+        """Commit the disk queues and return the same state as closing them would,
+        without closing them"""
+        if hasattr(pq, "pqueues"):  # DownloaderAwarePriorityQueue
+            return {slot: self._checkpoint_dqs(q) for slot, q in pq.pqueues.items()}
+        active = []
+        for priority, queue in pq.queues.items():
+            if hasattr(queue, "commit"):
+                queue.commit()
+            if queue:
+                active.append(priority)
+        return active
+
     def _mqpush(self, request: Request) -> None:
         self.mqs.push(request)
 
@@ -369,5 +408,9 @@ class Scheduler(BaseScheduler):
             return cast(list[int], json.load(f))
 
     def _write_dqs_state(self, dqdir: str, state: list[int]) -> None:
-        with Path(dqdir, "active.json").open("w", encoding="utf-8") as f:
-            json.dump(state, f)
\ No newline at end of file
+        # Write aside and rename, so a crash never leaves a truncated state file
+        path = Path(dqdir, "active.json")
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(state, f)
+        tmp.replace(path)
\ No newline at end of file
@@ -4,11 +4,13 @@ extracts information from them"""
 from __future__ import annotations
 
 import logging
+import time
 from collections import deque
-from collections.abc import AsyncIterable, Iterator
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
 from typing import TYPE_CHECKING, Any, TypeVar, Union, cast
 
 from itemadapter import is_item
+from twisted.internet import task
 from twisted.internet.defer import Deferred, inlineCallbacks
 from twisted.python.failure import Failure
 
@@ -28,8 +30,10 @@ from scrapy.utils.log import failure_to_exc_info, logformatter_adapter
 from scrapy.utils.misc import load_object, warn_on_generator_with_return_value
 from scrapy.utils.spider import iterate_spider_output
 
+from RLG_callback_pool import CallbackProcessPool
+
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterable
+    from collections.abc import Callable, Generator
 
     from scrapy.crawler import Crawler
     from scrapy.logformatter import LogFormatter
@@ -37,6 +41,11 @@ if TYPE_CHECKING:
     from scrapy.signalmanager import SignalManager
 
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -58,6 +67,7 @@ class Slot:
         self.active_size: int = 0
         self.itemproc_size: int = 0
         self.closing: Deferred[Spider] | None = None
+        self.callback_pool: CallbackProcessPool | None = None
 
     def add_response_request(
         self, result: Response | Failure, request: Request
@@ -86,12 +96,234 @@ class Slot:
         return not (self.queue or self.active)
 
     def needs_backout(self) -> bool:
+        if self.callback_pool is not None and self.callback_pool.needs_backout():
+            return True
         return self.active_size > self.max_active_size
 
 
+class AdaptiveBackoutController:
+    """AIMD controller for the scraper slot size and the downloader concurrency.
+
+    Every ``SCRAPER_ADAPTIVE_INTERVAL`` seconds it samples the process RSS, the item
+    pipeline backlog (``Slot.itemproc_size``) and the smoothed per-stage latencies.
+    If any of them is over its limit, ``Slot.max_active_size`` and the downloader
+    ``total_concurrency`` are cut multiplicatively; otherwise they grow additively
+    back towards their configured values. Each decision is recorded in the
+    ``scraper/adaptive/*`` stats.
+
+    Settings:
+
+    * ``SCRAPER_ADAPTIVE_BACKOUT_ENABLED`` - opt in (default False)
+    * ``SCRAPER_ADAPTIVE_INTERVAL`` - seconds between decisions (default 5)
+    * ``SCRAPER_ADAPTIVE_TARGET_RSS_MB`` - RSS limit (default 80% of
+      ``MEMUSAGE_LIMIT_MB``, no limit if neither is set or psutil is missing)
+    * ``SCRAPER_ADAPTIVE_MAX_ITEMPROC`` - pipeline backlog limit (default
+      10x ``CONCURRENT_ITEMS``)
+    * ``SCRAPER_ADAPTIVE_LATENCY_TOLERANCE`` - a stage is congested when its latency
+      exceeds this multiple of its baseline, the best latency seen for it over the
+      last ``SCRAPER_ADAPTIVE_BASELINE_WINDOW`` intervals (defaults 3 and 12)
+    * ``SCRAPER_ADAPTIVE_DECREASE_FACTOR`` - multiplicative decrease (default 0.5)
+    """
+
+    EWMA_ALPHA = 0.2
+    STAGES = ("download", "callback", "itemproc")
+
+    def __init__(self, crawler: Crawler, slot: Slot):
+        settings = crawler.settings
+        self.crawler: Crawler = crawler
+        self.slot: Slot = slot
+        self.interval: float = settings.getfloat("SCRAPER_ADAPTIVE_INTERVAL", 5.0)
+        self.decrease_factor: float = settings.getfloat("SCRAPER_ADAPTIVE_DECREASE_FACTOR", 0.5)
+        self.latency_tolerance: float = settings.getfloat(
+            "SCRAPER_ADAPTIVE_LATENCY_TOLERANCE", 3.0
+        )
+        self.max_itemproc: int = settings.getint(
+            "SCRAPER_ADAPTIVE_MAX_ITEMPROC", 10 * settings.getint("CONCURRENT_ITEMS")
+        )
+        self.target_rss: int = 1024 * 1024 * settings.getint(
+            "SCRAPER_ADAPTIVE_TARGET_RSS_MB", int(0.8 * settings.getint("MEMUSAGE_LIMIT_MB"))
+        )
+        if self.target_rss and psutil is None:
+            logger.warning("psutil is not installed, adaptive backout will ignore RSS")
+            self.target_rss = 0
+
+        # Ceilings are the configured values, floors keep the crawl moving
+        self.max_active_ceiling: int = slot.max_active_size
+        self.min_active_size: int = max(Slot.MIN_RESPONSE_SIZE, slot.max_active_size // 64)
+        self.active_step: int = max(Slot.MIN_RESPONSE_SIZE, slot.max_active_size // 20)
+        self.concurrency_ceiling: int = settings.getint("CONCURRENT_REQUESTS")
+
+        self.latency: dict[str, float] = {}
+        # Per-interval best latencies, so that one unusually fast sample ages out
+        self.best_latency: dict[str, float] = {}
+        self._baseline_history: deque[dict[str, float]] = deque(
+            maxlen=max(1, settings.getint("SCRAPER_ADAPTIVE_BASELINE_WINDOW", 12))
+        )
+        self._process = psutil.Process() if psutil is not None else None
+        self._task: task.LoopingCall | None = None
+
+    @classmethod
+    def from_crawler(cls, crawler: Crawler, slot: Slot) -> AdaptiveBackoutController | None:
+        if not crawler.settings.getbool("SCRAPER_ADAPTIVE_BACKOUT_ENABLED"):
+            return None
+        return cls(crawler, slot)
+
+    def start(self) -> None:
+        self._task = task.LoopingCall(self.adjust)
+        self._task.start(self.interval, now=False)
+
+    def stop(self) -> None:
+        if self._task and self._task.running:
+            self._task.stop()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Feed one latency sample (in seconds) for a pipeline stage."""
+        previous = self.latency.get(stage)
+        value = seconds if previous is None else previous + self.EWMA_ALPHA * (seconds - previous)
+        self.latency[stage] = value
+        self.best_latency[stage] = min(self.best_latency.get(stage, value), value)
+
+    def baseline(self, stage: str) -> float | None:
+        """Return the best latency seen for *stage* within the baseline window."""
+        values = [best[stage] for best in self._baseline_history if stage in best]
+        if stage in self.best_latency:
+            values.append(self.best_latency[stage])
+        return min(values, default=None)
+
+    def _congestion(self, rss: int | None) -> str | None:
+        if self.target_rss and rss is not None and rss > self.target_rss:
+            return "rss"
+        if self.slot.itemproc_size > self.max_itemproc:
+            return "itemproc"
+        for stage, value in self.latency.items():
+            baseline = self.baseline(stage)
+            if baseline is not None and value > self.latency_tolerance * baseline:
+                return f"latency/{stage}"
+        return None
+
+    def adjust(self) -> str:
+        """Take one AIMD step and return the decision (``decrease:<reason>`` or ``increase``)."""
+        rss = self._process.memory_info().rss if self._process is not None else None
+        reason = self._congestion(rss)
+        downloader = self.crawler.engine.downloader if self.crawler.engine else None
+        slot = self.slot
+
+        if reason is not None:
+            decision = f"decrease:{reason}"
+            slot.max_active_size = max(
+                self.min_active_size, int(slot.max_active_size * self.decrease_factor)
+            )
+            if downloader is not None:
+                downloader.total_concurrency = max(
+                    1, int(downloader.total_concurrency * self.decrease_factor)
+                )
+            # Forget the latency history, so that a one-off spike is not punished twice
+            self.latency.clear()
+        else:
+            decision = "increase"
+            slot.max_active_size = min(
+                self.max_active_ceiling, slot.max_active_size + self.active_step
+            )
+            if downloader is not None:
+                downloader.total_concurrency = min(
+                    self.concurrency_ceiling, downloader.total_concurrency + 1
+                )
+        self._baseline_history.append(self.best_latency)
+        self.best_latency = {}
+
+        stats = self.crawler.stats
+        if stats is not None:
+            spider = self.crawler.spider
+            stats.inc_value(f"scraper/adaptive/{decision.split(':')[0]}_count", spider=spider)
+            if reason is not None:
+                stats.inc_value(f"scraper/adaptive/reason/{reason}", spider=spider)
+            stats.set_value("scraper/adaptive/last_decision", decision, spider=spider)
+            stats.set_value("scraper/adaptive/max_active_size", slot.max_active_size, spider=spider)
+            stats.set_value("scraper/adaptive/itemproc_size", slot.itemproc_size, spider=spider)
+            if downloader is not None:
+                stats.set_value(
+                    "scraper/adaptive/concurrency", downloader.total_concurrency, spider=spider
+                )
+            if rss is not None:
+                stats.set_value("scraper/adaptive/rss", rss, spider=spider)
+            for stage, value in self.latency.items():
+                stats.set_value(f"scraper/adaptive/latency/{stage}", round(value, 4), spider=spider)
+        return decision
+
+
+def _timed_iterable(
+    iterable: Iterable[_T] | AsyncIterable[_T],
+    elapsed: list[float],
+    done: Callable[[float], None] | None = None,
+) -> Iterable[_T] | AsyncIterable[_T]:
+    """Wrap *iterable*, adding the time spent in each step to ``elapsed[0]``.
+
+    *done* is called with the total once the iterable is exhausted, fails or
+    is closed.
+    """
+    if isinstance(iterable, AsyncIterable):
+
+        async def atimed() -> AsyncIterator[_T]:
+            try:
+                it = iterable.__aiter__()
+                while True:
+                    step = time.perf_counter()
+                    try:
+                        output = await it.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        elapsed[0] += time.perf_counter() - step
+                    yield output
+            finally:
+                if done is not None:
+                    done(elapsed[0])
+
+        return atimed()
+
+    def timed() -> Iterator[_T]:
+        try:
+            it = iter(iterable)
+            while True:
+                step = time.perf_counter()
+                try:
+                    output = next(it)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed[0] += time.perf_counter() - step
+                yield output
+        finally:
+            if done is not None:
+                done(elapsed[0])
+
+    return timed()
+
+
+class _CallbackTimer:
+    """Times a spider callback, including the iteration of the output it returns."""
+
+    def __init__(self) -> None:
+        self.started: float = time.perf_counter()
+        self.elapsed: list[float] = [0.0]
+
+    def start(self, result: _T) -> _T:
+        self.started = time.perf_counter()
+        return result
+
+    def stop(self, result: _T) -> _T:
+        self.elapsed[0] = time.perf_counter() - self.started
+        if isinstance(result, (Iterable, AsyncIterable)):
+            # A generator callback does its work while its output is consumed
+            return cast(_T, _timed_iterable(result, self.elapsed))
+        return result
+
+
 class Scraper:
     def __init__(self, crawler: Crawler) -> None:
         self.slot: Slot | None = None
+        # Set when opened, so that several Scrapers can share a crawler (see MultiSpiderExecutionEngine)
+        self.spider: Spider | None = None
         self.spidermw: SpiderMiddlewareManager = SpiderMiddlewareManager.from_crawler(
             crawler
         )
@@ -104,11 +336,24 @@ class Scraper:
         self.signals: SignalManager = crawler.signals
         assert crawler.logformatter
         self.logformatter: LogFormatter = crawler.logformatter
+        self.backout_controller: AdaptiveBackoutController | None = None
+        # Set by the CrawlTelemetry extension (RLG_debug), if enabled
+        self.telemetry: Any = getattr(crawler, "telemetry", None)
+        self._callback_timers: dict[Request, _CallbackTimer] = {}
 
     @inlineCallbacks
     def open_spider(self, spider: Spider) -> Generator[Deferred[Any], Any, None]:
         """Open the given spider for scraping and allocate resources for it"""
+        self.spider = spider
         self.slot = Slot(self.crawler.settings.getint("SCRAPER_SLOT_MAX_ACTIVE_SIZE"))
+        self.slot.callback_pool = CallbackProcessPool.from_settings(
+            self.crawler.settings, spider
+        )
+        self.backout_controller = AdaptiveBackoutController.from_crawler(
+            self.crawler, self.slot
+        )
+        if self.backout_controller is not None:
+            self.backout_controller.start()
         yield self.itemproc.open_spider(spider)
 
     def close_spider(self, spider: Spider) -> Deferred[Spider]:
@@ -116,10 +361,19 @@ class Scraper:
         if self.slot is None:
             raise RuntimeError("Scraper slot not assigned")
         self.slot.closing = Deferred()
+        if self.backout_controller is not None:
+            self.backout_controller.stop()
         self.slot.closing.addCallback(self.itemproc.close_spider)
+        if self.slot.callback_pool is not None:
+            self.slot.closing.addBoth(self._close_callback_pool)
         self._check_if_closing(spider)
         return self.slot.closing
 
+    def _close_callback_pool(self, result: _T) -> _T:
+        assert self.slot is not None and self.slot.callback_pool is not None
+        self.slot.callback_pool.close()
+        return result
+
     def is_idle(self) -> bool:
         """Return True if there isn't any more spiders to process"""
         return not self.slot
@@ -171,15 +425,69 @@ class Scraper:
             raise TypeError(
                 f"Incorrect type: expected Response or Failure, got {type(result)}: {result!r}"
             )
+        start = time.perf_counter()
         dfd: Deferred[Iterable[Any] | AsyncIterable[Any]] = self._scrape2(
             result, request, spider
         )  # returns spider's processed output
+        # process_spider_input; the callback itself runs on a later reactor iteration
+        input_seconds = time.perf_counter() - start
         dfd.addErrback(self.handle_spider_error, request, result, spider)
+        if self._timed:
+            dfd.addCallback(self._time_spider_output, request, input_seconds)
         dfd2: _HandleOutputDeferred = dfd.addCallback(
             self.handle_spider_output, request, cast(Response, result), spider
         )
+        if self.backout_controller is not None and "download_latency" in request.meta:
+            self.backout_controller.observe("download", request.meta["download_latency"])
         return dfd2
 
+    @property
+    def _timed(self) -> bool:
+        """Whether callback and spider middleware time is measured"""
+        return self.telemetry is not None or self.backout_controller is not None
+
+    def _time_spider_output(
+        self,
+        result: Iterable[_T] | AsyncIterable[_T] | None,
+        request: Request,
+        input_seconds: float,
+    ) -> Iterable[_T] | AsyncIterable[_T] | None:
+        """Time the spider middleware output up to the point where it is exhausted.
+
+        Only the time spent producing each output counts; item processing, which
+        runs between two outputs, is left to the item_pipeline stage.
+        """
+        timer = self._callback_timers.pop(request, None)
+        elapsed = [input_seconds]
+        if timer is not None:
+            # The callback, and wrapping its output in process_spider_output
+            elapsed[0] += time.perf_counter() - timer.started
+        if not result:
+            self._observe_spidermw(timer, elapsed[0])
+            return result
+        return _timed_iterable(
+            result, elapsed, lambda total: self._observe_spidermw(timer, total)
+        )
+
+    def _observe_spidermw(self, timer: _CallbackTimer | None, total: float) -> None:
+        """Split the time spent producing the spider output into the callback and the rest"""
+        callback = timer.elapsed[0] if timer is not None else 0.0
+        if self.backout_controller is not None:
+            self.backout_controller.observe("callback", callback)
+        if self.telemetry is not None:
+            self.telemetry.observe("callback", callback)
+            self.telemetry.observe("spider_middleware", max(0.0, total - callback))
+
+    def _observe_latency(self, dfd: Deferred[Any], stage: str, start: float) -> None:
+        assert self.backout_controller is not None
+        controller = self.backout_controller
+
+        def observe(result: _T) -> _T:
+            controller.observe(stage, time.perf_counter() - start)
+            return result
+
+        dfd.addBoth(observe)
+
     def _scrape2(
         self, result: Response | Failure, request: Request, spider: Spider
     ) -> Deferred[Iterable[Any] | AsyncIterable[Any]]:
@@ -199,6 +507,9 @@ class Scraper:
     def call_spider(
         self, result: Response | Failure, request: Request, spider: Spider
     ) -> Deferred[Iterable[Any] | AsyncIterable[Any]]:
+        timer: _CallbackTimer | None = None
+        if self._timed:
+            timer = self._callback_timers[request] = _CallbackTimer()
         dfd: Deferred[Any]
         if isinstance(result, Response):
             if getattr(result, "request", None) is None:
@@ -206,20 +517,35 @@ class Scraper:
             assert result.request
             callback = result.request.callback or spider._parse
             warn_on_generator_with_return_value(spider, callback)
-            dfd = defer_succeed(result)
-            dfd.addCallbacks(
-                callback=callback, callbackKeywords=result.request.cb_kwargs
-            )
+            assert self.slot is not None
+            pool = self.slot.callback_pool
+            if pool is not None and pool.should_offload(result, callback):
+                # The output comes back as a list, and is handled like inline output
+                assert self.crawler.stats
+                self.crawler.stats.inc_value("scraper/offloaded_callbacks", spider=spider)
+                dfd = pool.submit(result, result.request)
+            else:
+                dfd = defer_succeed(result)
+                if timer is not None:
+                    # defer_succeed fires on a later reactor iteration
+                    dfd.addBoth(timer.start)
+                dfd.addCallbacks(
+                    callback=callback, callbackKeywords=result.request.cb_kwargs
+                )
         else:  # result is a Failure
             # TODO: properly type adding this attribute to a Failure
             result.request = request  # type: ignore[attr-defined]
             dfd = defer_fail(result)
+            if timer is not None:
+                dfd.addBoth(timer.start)
             if request.errback:
                 warn_on_generator_with_return_value(spider, request.errback)
                 dfd.addErrback(request.errback)
         dfd2: Deferred[Iterable[Any] | AsyncIterable[Any]] = dfd.addCallback(
             iterate_spider_output
         )
+        if timer is not None:
+            dfd2.addBoth(timer.stop)
         return dfd2
 
     def handle_spider_error(
@@ -297,7 +623,7 @@ class Scraper:
         """
         if isinstance(output, Request):
             assert self.crawler.engine is not None  # typing
-            self.crawler.engine.crawl(request=output)
+            self.crawler.engine.crawl(request=output, spider=spider)
         elif is_item(output):
             return self.start_itemproc(output, response=response)
         elif output is None:
@@ -318,10 +644,22 @@ class Scraper:
         from response data, e.g. it was hard-coded, set it to ``None``.
         """
         assert self.slot is not None  # typing
-        assert self.crawler.spider is not None  # typing
+        spider = self.spider or self.crawler.spider
+        assert spider is not None  # typing
         self.slot.itemproc_size += 1
-        dfd = self.itemproc.process_item(item, self.crawler.spider)
-        dfd.addBoth(self._itemproc_finished, item, response, self.crawler.spider)
+        start = time.perf_counter()
+        dfd = self.itemproc.process_item(item, spider)
+        dfd.addBoth(self._itemproc_finished, item, response, spider)
+        if self.backout_controller is not None:
+            self._observe_latency(dfd, "itemproc", start)
+        if self.telemetry is not None:
+            telemetry = self.telemetry
+
+            def observe_itemproc(output: _T) -> _T:
+                telemetry.observe("item_pipeline", time.perf_counter() - start)
+                return output
+
+            dfd.addBoth(observe_itemproc)
         return dfd
 
     def _log_download_errors(
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import hashlib
 import pickle
+import struct
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+
+from twisted.internet.task import LoopingCall
 
 from scrapy import Spider, signals
 from scrapy.exceptions import NotConfigured
@@ -15,11 +19,25 @@ if TYPE_CHECKING:
     from scrapy.crawler import Crawler
 
 
+_RECORD_LENGTH = struct.Struct("<I")
+
+
 class SpiderState:
-    """Store and load spider state during a scraping job"""
+    """Store and load spider state during a scraping job
+
+    Besides the full snapshot written when the spider closes, the keys of
+    ``spider.state`` that changed are appended to a journal every
+    ``SPIDERSTATE_CHECKPOINT_INTERVAL`` seconds (default 30, ``0`` disables it), so a
+    crashed crawl resumes with recent state. The journal is folded into the
+    snapshot once it outgrows it.
+    """
 
-    def __init__(self, jobdir: str | None = None):
+    def __init__(self, jobdir: str | None = None, checkpoint_interval: float = 0):
         self.jobdir: str | None = jobdir
+        self.checkpoint_interval: float = checkpoint_interval
+        self._digests: dict[Any, bytes] = {}
+        self._snapshot_size: int = 0
+        self._task: LoopingCall | None = None
 
     @classmethod
     def from_crawler(cls, crawler: Crawler) -> Self:
@@ -27,25 +45,109 @@ class SpiderState:
         if not jobdir:
             raise NotConfigured
 
-        obj = cls(jobdir)
+        obj = cls(jobdir, crawler.settings.getfloat("SPIDERSTATE_CHECKPOINT_INTERVAL", 30.0))
         crawler.signals.connect(obj.spider_closed, signal=signals.spider_closed)
         crawler.signals.connect(obj.spider_opened, signal=signals.spider_opened)
         return obj
 
     def spider_closed(self, spider: Spider) -> None:
+        if self._task is not None and self._task.running:
+            self._task.stop()
         if self.jobdir:
-            with Path(self.statefn).open("wb") as f:
-                assert hasattr(spider, "state")  # set in spider_opened
-                pickle.dump(spider.state, f, protocol=4)
+            assert hasattr(spider, "state")  # set in spider_opened
+            self._write_snapshot(spider.state)
 
     def spider_opened(self, spider: Spider) -> None:
         if self.jobdir and Path(self.statefn).exists():
             with Path(self.statefn).open("rb") as f:
                 spider.state = pickle.load(f)  # type: ignore[attr-defined]  # noqa: S301
+            self._snapshot_size = Path(self.statefn).stat().st_size
         else:
             spider.state = {}  # type: ignore[attr-defined]
+        if self.jobdir and Path(self.journalfn).exists():
+            self._replay_journal(spider.state)  # type: ignore[attr-defined]
+        self._digests = self._digest_state(spider.state)  # type: ignore[attr-defined]
+
+        if self.jobdir and self.checkpoint_interval:
+            self._task = LoopingCall(self.checkpoint, spider)
+            self._task.start(self.checkpoint_interval, now=False)
+
+    def checkpoint(self, spider: Spider) -> None:
+        """Append the keys of ``spider.state`` that changed since the last checkpoint
+        to the journal."""
+        state = spider.state  # type: ignore[attr-defined]
+        if not isinstance(state, dict):
+            self._write_snapshot(state)
+            return
+
+        records = []
+        digests = {}
+        for key, value in state.items():
+            data = pickle.dumps(value, protocol=4)
+            digests[key] = digest = hashlib.blake2b(data, digest_size=16).digest()
+            if self._digests.get(key) != digest:
+                records.append(pickle.dumps(("set", key, value), protocol=4))
+        records.extend(
+            pickle.dumps(("del", key), protocol=4) for key in self._digests.keys() - digests.keys()
+        )
+        self._digests = digests
+        if not records:
+            return
+
+        with Path(self.journalfn).open("ab") as f:
+            for record in records:
+                f.write(_RECORD_LENGTH.pack(len(record)) + record)
+            journal_size = f.tell()
+        if journal_size > max(self._snapshot_size, 1024 * 1024):
+            self._write_snapshot(state)
+
+    def _replay_journal(self, state: dict[Any, Any]) -> None:
+        """Apply the complete journal records to ``state`` and cut off a torn tail,
+        so that later checkpoints are appended right after the last good record."""
+        data = Path(self.journalfn).read_bytes()
+        offset = 0
+        while offset + _RECORD_LENGTH.size <= len(data):
+            (length,) = _RECORD_LENGTH.unpack_from(data, offset)
+            end = offset + _RECORD_LENGTH.size + length
+            if end > len(data):
+                break  # torn write from a crash
+            try:
+                record = pickle.loads(data[offset + _RECORD_LENGTH.size : end])  # noqa: S301
+            except Exception:
+                break
+            offset = end
+            if record[0] == "set":
+                state[record[1]] = record[2]
+            else:
+                state.pop(record[1], None)
+        if offset < len(data):
+            with Path(self.journalfn).open("r+b") as f:
+                f.truncate(offset)
+
+    def _digest_state(self, state: Any) -> dict[Any, bytes]:
+        if not isinstance(state, dict):
+            return {}
+        return {
+            key: hashlib.blake2b(pickle.dumps(value, protocol=4), digest_size=16).digest()
+            for key, value in state.items()
+        }
+
+    def _write_snapshot(self, state: Any) -> None:
+        path = Path(self.statefn)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(state, f, protocol=4)
+        tmp.replace(path)
+        self._snapshot_size = path.stat().st_size
+        Path(self.journalfn).unlink(missing_ok=True)
+        self._digests = self._digest_state(state)
 
     @property
     def statefn(self) -> str:
         assert self.jobdir
-        return str(Path(self.jobdir, "spider.state"))
\ No newline at end of file
+        return str(Path(self.jobdir, "spider.state"))
+
+    @property
+    def journalfn(self) -> str:
+        assert self.jobdir
+        return str(Path(self.jobdir, "spider.state.journal"))
@@ -24,11 +24,13 @@ import schedule
 import smtplib
 import numpy as np
 import pandas as pd
+import redis
 import telebot
 import geoip2.database
 import lightgbm as lgb
 from flask import Flask, request, jsonify, render_template
 from sklearn.preprocessing import StandardScaler
+from backend.ip_blocklist import get_shared_blocklist, get_shared_sync, start_shared_sync
 
 # Flask App
 app = Flask(__name__)
@@ -42,6 +44,9 @@ bot = telebot.TeleBot(TELEGRAM_BOT_TOKEN)
 GEOIP_DB_PATH = "GeoLite2-City.mmdb"
 geo_reader = geoip2.database.Reader(GEOIP_DB_PATH)
 
+# Redis backing the IP blocklist shared with the security modules
+REDIS_URL = "redis://localhost:6379/0"
+
 # VPN & Proxy Blacklist API
 VPN_CHECK_API = "https://vpnapi.io/api/{ip}?key=your-vpn-api-key"
 
@@ -77,6 +82,17 @@ def init_db():
 
 init_db()
 
+# Blocked IPs are checked in-process; every write goes through the shared sync
+blocked_ips = get_shared_blocklist()
+blocklist_sync = get_shared_sync()
+
+def load_blocked_ips():
+    """Publishes the blocked_users table to the shared IP blocklist."""
+    conn = sqlite3.connect(DB_NAME)
+    rows = conn.execute("SELECT user_ip, reason FROM blocked_users").fetchall()
+    conn.close()
+    return blocklist_sync.bulk_block((user_ip, None, reason or "") for user_ip, reason in rows)
+
 # Get Location Data from IP
 def get_location(ip):
     """Returns the city and country of an IP address using GeoIP2."""
@@ -102,17 +118,15 @@ def track_referral(referral_code):
     user_ip = request.remote_addr
 
     # Check if user is blocked
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM blocked_users WHERE user_ip = ?", (user_ip,))
-    if cursor.fetchone():
-        conn.close()
+    if user_ip in blocked_ips:
         return jsonify({"status": "error", "message": "This IP is blocked due to fraudulent activity."}), 403
 
     location = get_location(user_ip)
     user_device = request.headers.get("User-Agent", "Unknown Device")
     vpn_flag = is_vpn_or_proxy(user_ip)
 
+    conn = sqlite3.connect(DB_NAME)
+    cursor = conn.cursor()
     cursor.execute("""
     INSERT INTO referral_activity (referral_code, user_ip, location, device)
     VALUES (?, ?, ?, ?)
@@ -177,6 +191,7 @@ def block_users(flagged_df):
                        (row["user_ip"], "High fraud score detected"))
     conn.commit()
     conn.close()
+    blocklist_sync.bulk_block((user_ip, None, "High fraud score detected") for user_ip in flagged_df["user_ip"])
 
 # Real-Time Fraud Dashboard
 @app.route("/dashboard", methods=["GET"])
@@ -193,4 +208,6 @@ schedule.every(1).hours.do(detect_fraud)
 # Run Flask App
 if __name__ == "__main__":
     print("Starting Enhanced RLG AI-Driven Referral Fraud Detection System...")
+    start_shared_sync(redis.Redis.from_url(REDIS_URL))
+    load_blocked_ips()
     app.run(debug=True)
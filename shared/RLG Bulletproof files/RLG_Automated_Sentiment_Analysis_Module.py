@@ -15,7 +15,7 @@ import torch
 import numpy as np
 import pandas as pd
 import nltk
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+from RLG_ONNX_Inference_Backend import build_inference_pipeline
 from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
 from sklearn.naive_bayes import MultinomialNB
 from langdetect import detect
@@ -28,11 +28,9 @@ nltk.download('stopwords')
 # Load English stopwords
 STOPWORDS = set(stopwords.words('english'))
 
-# Load the pre-trained Transformer sentiment model
+# Load the pre-trained Transformer sentiment model (PyTorch or ONNX int8, see RLG_ONNX_Inference_Backend)
 transformer_model_name = "nlptown/bert-base-multilingual-uncased-sentiment"
-tokenizer = AutoTokenizer.from_pretrained(transformer_model_name)
-transformer_model = AutoModelForSequenceClassification.from_pretrained(transformer_model_name)
-sentiment_pipeline = pipeline("sentiment-analysis", model=transformer_model, tokenizer=tokenizer)
+sentiment_pipeline = build_inference_pipeline("sentiment-analysis", transformer_model_name)
 
 # Naïve Bayes Backup Model
 class SentimentClassifierNB:
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+RLG Compact Graph Engine
+----------------------------------------
+Memory-compact, incremental graph storage for RLG Data and RLG Fans mention and entity graphs.
+- Node labels are interned to integer ids once; edges are stored as integer arrays
+- Edge appends go to compact buffers and are merged into CSR adjacency lazily on query
+- Node attributes are stored column-wise (interned strings / float arrays), not per-node dicts
+- Fast degree, PageRank (sparse power iteration) and label-propagation community queries
+- Export to NetworkX only when a caller needs the NetworkX API (drawing, layouts)
+"""
+
+import threading
+import logging
+from array import array
+import numpy as np
+import scipy.sparse as sp
+
+# ---------------------------- Configuration ----------------------------
+
+PAGERANK_ALPHA = 0.85
+PAGERANK_MAX_ITER = 100
+PAGERANK_TOL = 1.0e-6
+COMMUNITY_MAX_ITER = 20
+
+logger = logging.getLogger("rlg_compact_graph_engine")
+
+# ---------------------------- Compact Graph ----------------------------
+
+class CompactGraph:
+    """
+    Weighted graph with interned integer node ids and CSR adjacency.
+    Repeated edges accumulate weight, so mention counts are kept without duplicate storage.
+    """
+    def __init__(self, directed=False):
+        self.directed = directed
+        self._ids = {}                # node label -> int id
+        self._labels = []             # int id -> node label
+        self._strings = {}            # interned attribute / relation strings
+        self._string_values = []
+        self._node_columns = {}       # attribute name -> (kind, array)
+        self._edge_labels = {}        # packed (u, v) -> interned relation label
+        self._src = array("q")        # edges appended since the last compaction
+        self._dst = array("q")
+        self._weights = array("d")
+        self._csr = sp.csr_matrix((0, 0), dtype=np.float64)
+        self._lock = threading.RLock()
+
+    # ---- Interning ----
+
+    def _intern_string(self, value):
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = len(self._string_values)
+            self._strings[value] = string_id
+            self._string_values.append(value)
+        return string_id
+
+    def _intern_node(self, label):
+        node_id = self._ids.get(label)
+        if node_id is None:
+            node_id = len(self._labels)
+            self._ids[label] = node_id
+            self._labels.append(label)
+            for kind, column in self._node_columns.values():
+                column.append(-1 if kind == "s" else float("nan"))
+        return node_id
+
+    def _edge_key(self, u, v):
+        if not self.directed and u > v:
+            u, v = v, u
+        return (u << 32) | v
+
+    # ---- Appends ----
+
+    def add_node(self, node, **attrs):
+        """Adds (or updates) a node. String attributes are interned; numbers are stored as floats."""
+        with self._lock:
+            node_id = self._intern_node(node)
+            for name, value in attrs.items():
+                kind = "s" if isinstance(value, str) else "f"
+                if name not in self._node_columns:
+                    fill = -1 if kind == "s" else float("nan")
+                    self._node_columns[name] = (kind, array("i" if kind == "s" else "d", [fill] * len(self._labels)))
+                column_kind, column = self._node_columns[name]
+                column[node_id] = self._intern_string(value) if column_kind == "s" else float(value)
+            return node_id
+
+    def add_edge(self, u, v, weight=1.0, label=None):
+        """Appends an edge; weight accumulates if the edge already exists."""
+        with self._lock:
+            a, b = self._intern_node(u), self._intern_node(v)
+            self._src.append(a)
+            self._dst.append(b)
+            self._weights.append(weight)
+            if label is not None:
+                self._edge_labels[self._edge_key(a, b)] = self._intern_string(label)
+
+    def add_edges_from(self, edges):
+        """Appends (u, v) or (u, v, weight) tuples."""
+        for edge in edges:
+            self.add_edge(*edge)
+
+    def add_edges_from_ids(self, src_ids, dst_ids, weights=None):
+        """Bulk-appends edges between already interned node ids (NumPy arrays, no per-edge Python work)."""
+        src_ids = np.asarray(src_ids, dtype=np.int64)
+        dst_ids = np.asarray(dst_ids, dtype=np.int64)
+        weights = np.ones(len(src_ids)) if weights is None else np.asarray(weights, dtype=np.float64)
+        if not len(src_ids) == len(dst_ids) == len(weights):
+            raise ValueError("src_ids, dst_ids and weights must have the same length")
+        with self._lock:
+            n = len(self._labels)
+            for ids in (src_ids, dst_ids):
+                if len(ids) and (ids.min() < 0 or ids.max() >= n):
+                    raise ValueError(f"Edge endpoints must be interned node ids in [0, {n})")
+            self._src.frombytes(src_ids.tobytes())
+            self._dst.frombytes(dst_ids.tobytes())
+            self._weights.frombytes(weights.tobytes())
+
+    def node_id(self, label):
+        return self._ids[label]
+
+    def __contains__(self, label):
+        return label in self._ids
+
+    # ---- Compaction ----
+
+    def _compact(self):
+        """Merges pending edge appends into the CSR adjacency."""
+        n = len(self._labels)
+        if self._csr.shape != (n, n):
+            self._csr.resize((n, n))
+        if not len(self._src):
+            return self._csr
+
+        src = np.frombuffer(self._src, dtype=np.int64)
+        dst = np.frombuffer(self._dst, dtype=np.int64)
+        weights = np.frombuffer(self._weights, dtype=np.float64)
+        keep = src != dst
+        src, dst, weights = src[keep], dst[keep], weights[keep]
+        if not self.directed:
+            src, dst, weights = np.concatenate([src, dst]), np.concatenate([dst, src]), np.concatenate([weights, weights])
+
+        # coo -> csr sums duplicate edges, so repeated mentions accumulate weight
+        pending = sp.coo_matrix((weights, (src, dst)), shape=(n, n)).tocsr()
+        self._csr = (self._csr + pending).tocsr()
+        self._src, self._dst, self._weights = array("q"), array("q"), array("d")
+        return self._csr
+
+    @property
+    def adjacency(self):
+        """CSR adjacency matrix (row = source id, column = target id, value = accumulated weight)."""
+        with self._lock:
+            return self._compact()
+
+    # ---- Basic queries ----
+
+    @property
+    def nodes(self):
+        return list(self._labels)
+
+    def number_of_nodes(self):
+        return len(self._labels)
+
+    def number_of_edges(self):
+        nnz = self.adjacency.nnz
+        return nnz if self.directed else nnz // 2
+
+    def edges(self, data=False):
+        """Iterates edges as (u, v) or (u, v, {"weight": ..., "label": ...}) like NetworkX."""
+        matrix = self.adjacency if self.directed else sp.triu(self.adjacency)
+        coo = matrix.tocoo()
+        for a, b, weight in zip(coo.row.tolist(), coo.col.tolist(), coo.data.tolist()):
+            if not data:
+                yield self._labels[a], self._labels[b]
+                continue
+            attrs = {"weight": weight}
+            label_id = self._edge_labels.get(self._edge_key(a, b))
+            if label_id is not None:
+                attrs["label"] = self._string_values[label_id]
+            yield self._labels[a], self._labels[b], attrs
+
+    def neighbors(self, label):
+        matrix = self.adjacency
+        node_id = self._ids[label]
+        return [self._labels[i] for i in matrix.indices[matrix.indptr[node_id]:matrix.indptr[node_id + 1]]]
+
+    def node_attribute(self, label, name):
+        kind, column = self._node_columns[name]
+        value = column[self._ids[label]]
+        if kind == "s":
+            return None if value < 0 else self._string_values[value]
+        return None if np.isnan(value) else value
+
+    def degrees(self, weighted=False):
+        """Degree of every node as an array indexed by node id."""
+        matrix = self.adjacency
+        if weighted:
+            return np.asarray(matrix.sum(axis=1)).ravel()
+        return np.diff(matrix.indptr)
+
+    def degree(self, label, weighted=False):
+        return self.degrees(weighted)[self._ids[label]]
+
+    def top_nodes(self, scores, k=10):
+        """Returns the k highest-scoring nodes as (label, score) pairs."""
+        scores = np.asarray(scores)
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._labels[i], float(scores[i])) for i in top]
+
+    # ---- Analytics ----
+
+    def pagerank(self, alpha=PAGERANK_ALPHA, max_iter=PAGERANK_MAX_ITER, tol=PAGERANK_TOL):
+        """Weighted PageRank by sparse power iteration. Returns an array indexed by node id."""
+        matrix = self.adjacency
+        n = matrix.shape[0]
+        if n == 0:
+            return np.array([])
+
+        out_weight = np.asarray(matrix.sum(axis=1)).ravel()
+        inverse = np.divide(1.0, out_weight, out=np.zeros_like(out_weight), where=out_weight > 0)
+        transition_t = (sp.diags(inverse) @ matrix).T.tocsr()
+        dangling = out_weight == 0
+
+        scores = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            previous = scores
+            scores = alpha * (transition_t @ previous + previous[dangling].sum() / n) + (1 - alpha) / n
+            if np.abs(scores - previous).sum() < n * tol:
+                break
+        return scores
+
+    def communities(self, max_iter=COMMUNITY_MAX_ITER):
+        """
+        Label propagation communities. Each round, every node adopts the label with the
+        largest total edge weight among its neighbours (its own label breaks ties).
+        Returns an array of community ids indexed by node id.
+        """
+        matrix = self.adjacency
+        n = matrix.shape[0]
+        labels = np.arange(n)
+        if n == 0:
+            return labels
+
+        rows = np.arange(n)
+        for _ in range(max_iter):
+            membership = sp.csr_matrix((np.ones(n), (rows, labels)), shape=(n, n))
+            # Small self weight keeps isolated nodes stable and breaks ties in favour of the current label
+            votes = (matrix @ membership + membership * 1e-3).tocsr()
+            new_labels = np.asarray(votes.argmax(axis=1)).ravel()
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+
+        _, compact_ids = np.unique(labels, return_inverse=True)
+        return compact_ids
+
+    def community_members(self, max_iter=COMMUNITY_MAX_ITER):
+        """Returns communities as lists of node labels, largest first."""
+        community_ids = self.communities(max_iter)
+        order = np.argsort(community_ids, kind="stable")
+        boundaries = np.flatnonzero(np.diff(community_ids[order])) + 1
+        groups = [[self._labels[i] for i in group] for group in np.split(order, boundaries)] if len(order) else []
+        return sorted(groups, key=len, reverse=True)
+
+    # ---- Export ----
+
+    def to_networkx(self):
+        """Exports to a NetworkX graph (only for callers that need the NetworkX API)."""
+        import networkx as nx
+        G = nx.DiGraph() if self.directed else nx.Graph()
+        for node_id, label in enumerate(self._labels):
+            attrs = {name: self.node_attribute(label, name) for name in self._node_columns}
+            G.add_node(label, **{name: value for name, value in attrs.items() if value is not None})
+        G.add_edges_from(self.edges(data=True))
+        return G
+
+# Example Usage
+if __name__ == "__main__":
+    graph = CompactGraph()
+    for user, mention in [("alice", "bob"), ("bob", "carol"), ("alice", "carol"), ("dave", "erin")]:
+        graph.add_edge(user, mention)
+    print(graph.number_of_nodes(), graph.number_of_edges())
+    print(graph.top_nodes(graph.pagerank(), k=3))
+    print(graph.community_members())
@@ -25,8 +25,7 @@ import pandas as pd
 from datetime import datetime
 from textblob import TextBlob
 from sklearn.ensemble import IsolationForest
-from keras.models import Sequential
-from keras.layers import Dense, LSTM
+from RLG_Forecast_Model_Service import forecast_service
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from twilio.rest import Client  # SMS & WhatsApp Alerting
@@ -97,19 +96,10 @@ def analyze_sentiment(text):
         logging.error(f"Sentiment analysis failed: {e}")
         return 0
 
-def train_lstm_model(sentiment_data):
-    """Trains an LSTM model for predictive crisis detection."""
-    sentiment_data = np.array(sentiment_data).reshape(-1, 1, 1)
-    
-    model = Sequential([
-        LSTM(50, activation='relu', input_shape=(1, 1)),
-        Dense(1)
-    ])
-    
-    model.compile(optimizer='adam', loss='mse')
-    model.fit(sentiment_data, sentiment_data, epochs=20, verbose=0)
-    
-    return model
+def train_lstm_model(sentiment_data, series_id="crisis_sentiment"):
+    """Trains an LSTM model for predictive crisis detection (cached and warm-started per series)."""
+    model, _ = forecast_service.get_model(series_id, "autoencoder_lstm", sentiment_data)
+    return model["model"]
 
 def predict_crisis(sentiment_scores, model):
     """Uses LSTM model to predict sentiment trends and detect crisis risks."""
@@ -21,6 +21,7 @@ import logging
 import json
 import spacy
 import networkx as nx
+from RLG_Compact_Graph_Engine import CompactGraph
 import matplotlib.pyplot as plt
 import pandas as pd
 import torch
@@ -77,21 +78,23 @@ def extract_relationships(text):
 
 # ------------------------- KNOWLEDGE GRAPH CREATION -------------------------
 
-def build_knowledge_graph(entities, relationships):
-    """Builds a knowledge graph from entities and their relationships."""
-    G = nx.Graph()
+def build_knowledge_graph(entities, relationships, graph=None):
+    """Builds (or extends) a compact knowledge graph from entities and their relationships."""
+    G = CompactGraph() if graph is None else graph
 
     for entity, entity_type in entities:
         G.add_node(entity, label=entity_type)
 
     for subj, obj, relation in relationships:
-        if subj in G.nodes and obj in G.nodes:
+        if subj in G and obj in G:
             G.add_edge(subj, obj, label=relation)
 
     return G
 
 def visualize_knowledge_graph(G):
     """Visualizes the entity knowledge graph."""
+    if isinstance(G, CompactGraph):
+        G = G.to_networkx()
     plt.figure(figsize=(12, 8))
     pos = nx.spring_layout(G)
     labels = nx.get_edge_attributes(G, "label")
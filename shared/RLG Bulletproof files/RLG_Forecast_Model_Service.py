@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+RLG Forecast Model Service
+----------------------------------------
+Shared forecasting service for RLG Data and RLG Fans trend, anomaly and crisis models.
+- Persists fitted models per (series, model type) instead of training on every call
+- Refits when enough new points have arrived since the last fit, or when the fitted
+  history no longer matches the start of the data (e.g. a sliding window moved)
+- Warm-starts refits from the previous parameters (ARIMA start_params, Prophet init,
+  continued LSTM training, XGBoost boosting on top of the previous booster)
+- Refreshes many series in parallel across a process pool
+- Reports refresh latency and per-model fit time
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+import joblib
+
+# ---------------------------- Configuration ----------------------------
+
+FORECAST_MODEL_DIR = os.getenv("RLG_FORECAST_MODEL_DIR", "forecast_models")
+REFIT_MIN_NEW_POINTS = int(os.getenv("RLG_FORECAST_REFIT_POINTS", "10"))
+MAX_FORECAST_WORKERS = int(os.getenv("RLG_FORECAST_WORKERS", str(os.cpu_count() or 1)))
+
+ARIMA_ORDER = (5, 1, 0)
+LSTM_WINDOW = 10
+LSTM_EPOCHS = 10
+LSTM_WARM_EPOCHS = 3           # Epochs used when continuing from a persisted LSTM
+AUTOENCODER_EPOCHS = 20
+AUTOENCODER_WARM_EPOCHS = 5
+XGB_ESTIMATORS = 100
+XGB_WARM_ESTIMATORS = 20       # Trees added on top of the previous booster
+XGB_MAX_ESTIMATORS = 200       # Past this many trees, refit from scratch instead of growing the booster
+
+logger = logging.getLogger("rlg_forecast_model_service")
+
+# ---------------------------- Model Types ----------------------------
+# Each model type provides fit(data, previous) -> model and predict(model, data, steps, fitted_points).
+# "previous" is the last persisted model for the series (None on the first fit) and is used to warm-start.
+
+def _series_values(data):
+    if isinstance(data, pd.DataFrame) and "y" in data.columns:
+        return data["y"].to_numpy(dtype=float)
+    return np.asarray(data, dtype=float).ravel()
+
+def _data_digest(data, n_points):
+    """Digest of the first n_points of a series, used to check that data still extends the fitted history."""
+    if isinstance(data, pd.DataFrame):
+        payload = pd.util.hash_pandas_object(data.iloc[:n_points], index=False).to_numpy().tobytes()
+    else:
+        payload = np.ascontiguousarray(_series_values(data)[:n_points]).tobytes()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def _fit_arima(data, previous):
+    from statsmodels.tsa.arima.model import ARIMA
+    model = ARIMA(_series_values(data), order=ARIMA_ORDER)
+    if previous is not None:
+        return model.fit(start_params=previous.params)
+    return model.fit()
+
+def _predict_arima(model_fit, data, steps, fitted_points):
+    # Fold in points that arrived since the fit without re-estimating parameters
+    new_points = _series_values(data)[fitted_points:]
+    if len(new_points):
+        model_fit = model_fit.append(new_points, refit=False)
+    return model_fit.forecast(steps=steps)
+
+def _prophet_init(model):
+    """Extracts fitted Prophet parameters in the form accepted by Prophet.fit(init=...)."""
+    init = {name: model.params[name][0][0] for name in ("k", "m", "sigma_obs")}
+    init.update({name: model.params[name][0] for name in ("delta", "beta")})
+    return init
+
+def _fit_prophet(data, previous):
+    from prophet import Prophet
+    model = Prophet()
+    if previous is not None:
+        return model.fit(data, init=_prophet_init(previous))
+    return model.fit(data)
+
+def _predict_prophet(model, data, steps, fitted_points):
+    # Forecast the steps after the last point of the data, not of the fitted history
+    ds = pd.to_datetime(data["ds"])
+    freq = pd.infer_freq(ds) or "D"
+    future = pd.DataFrame({"ds": pd.date_range(ds.max(), periods=steps + 1, freq=freq)[1:]})
+    return model.predict(future)
+
+def _lstm_windows(scaled):
+    X, y = [], []
+    for i in range(LSTM_WINDOW, len(scaled) - 1):
+        X.append(scaled[i - LSTM_WINDOW:i, 0])
+        y.append(scaled[i, 0])
+    X = np.array(X)
+    return X.reshape(X.shape[0], X.shape[1], 1), np.array(y)
+
+def _fit_lstm(data, previous):
+    from sklearn.preprocessing import MinMaxScaler
+    from keras.models import Sequential
+    from keras.layers import Dense, LSTM, Dropout
+
+    scaler = MinMaxScaler(feature_range=(0, 1))
+    scaled = scaler.fit_transform(_series_values(data).reshape(-1, 1))
+    X_train, y_train = _lstm_windows(scaled)
+
+    if previous is not None:
+        model, epochs = previous["model"], LSTM_WARM_EPOCHS
+    else:
+        model = Sequential([
+            LSTM(50, return_sequences=True, input_shape=(X_train.shape[1], 1)),
+            LSTM(50, return_sequences=False),
+            Dropout(0.2),
+            Dense(25),
+            Dense(1)
+        ])
+        model.compile(optimizer="adam", loss="mean_squared_error")
+        epochs = LSTM_EPOCHS
+
+    model.fit(X_train, y_train, epochs=epochs, batch_size=1, verbose=0)
+    return {"model": model, "scaler": scaler}
+
+def _predict_lstm(fitted, data, steps, fitted_points):
+    scaler = fitted["scaler"]
+    X, _ = _lstm_windows(scaler.transform(_series_values(data).reshape(-1, 1)))
+    predictions = fitted["model"].predict(X, verbose=0)
+    return scaler.inverse_transform(predictions)[-steps:]
+
+def _fit_autoencoder_lstm(data, previous):
+    """Single-step LSTM that reconstructs each point (used by the anomaly and crisis modules)."""
+    from keras.models import Sequential
+    from keras.layers import Dense, LSTM
+
+    values = _series_values(data).reshape(-1, 1, 1)
+    if previous is not None:
+        model, epochs = previous["model"], AUTOENCODER_WARM_EPOCHS
+    else:
+        model = Sequential([
+            LSTM(50, activation='relu', input_shape=(1, 1)),
+            Dense(1)
+        ])
+        model.compile(optimizer='adam', loss='mse')
+        epochs = AUTOENCODER_EPOCHS
+
+    model.fit(values, values, epochs=epochs, verbose=0)
+    return {"model": model}
+
+def _predict_autoencoder_lstm(fitted, data, steps, fitted_points):
+    values = _series_values(data)[-steps:].reshape(-1, 1, 1)
+    return fitted["model"].predict(values, verbose=0).ravel()
+
+def _fit_xgboost(data, previous):
+    from xgboost import XGBRegressor
+    y = _series_values(data)
+    X = np.arange(len(y)).reshape(-1, 1)
+    if previous is not None and previous.get_booster().num_boosted_rounds() + XGB_WARM_ESTIMATORS <= XGB_MAX_ESTIMATORS:
+        model = XGBRegressor(objective="reg:squarederror", n_estimators=XGB_WARM_ESTIMATORS)
+        return model.fit(X, y, xgb_model=previous.get_booster())
+    model = XGBRegressor(objective="reg:squarederror", n_estimators=XGB_ESTIMATORS)
+    return model.fit(X, y)
+
+def _predict_xgboost(model, data, steps, fitted_points):
+    n = len(_series_values(data))
+    return model.predict(np.arange(n, n + steps).reshape(-1, 1))
+
+# Model types keyed by name. "format" selects how the fitted model is persisted:
+# joblib (pickled), keras (network in a .keras file, the rest pickled) or prophet (Prophet's JSON serializer).
+MODEL_TYPES = {
+    "arima": {"fit": _fit_arima, "predict": _predict_arima, "format": "joblib"},
+    "prophet": {"fit": _fit_prophet, "predict": _predict_prophet, "format": "prophet"},
+    "lstm": {"fit": _fit_lstm, "predict": _predict_lstm, "format": "keras"},
+    "autoencoder_lstm": {"fit": _fit_autoencoder_lstm, "predict": _predict_autoencoder_lstm, "format": "keras"},
+    "xgboost": {"fit": _fit_xgboost, "predict": _predict_xgboost, "format": "joblib"},
+}
+
+# ---------------------------- Model Store ----------------------------
+
+class ForecastModelStore:
+    """Persists fitted models and their fit metadata under FORECAST_MODEL_DIR."""
+    def __init__(self, model_dir=FORECAST_MODEL_DIR):
+        self.model_dir = model_dir
+
+    def _base_path(self, series_id, model_type):
+        safe_id = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(series_id))
+        return os.path.join(self.model_dir, f"{safe_id}__{model_type}")
+
+    def load(self, series_id, model_type):
+        """Returns (model, metadata) or (None, None) if the series has never been fitted."""
+        base = self._base_path(series_id, model_type)
+        if not os.path.exists(base + ".json"):
+            return None, None
+        with open(base + ".json", "r") as f:
+            metadata = json.load(f)
+        model_format = MODEL_TYPES[model_type]["format"]
+        if model_format == "prophet":
+            from prophet.serialize import model_from_json
+            with open(base + ".prophet.json", "r") as f:
+                return model_from_json(f.read()), metadata
+
+        model = joblib.load(base + ".joblib")
+        if model_format == "keras":
+            from keras.models import load_model
+            model["model"] = load_model(base + ".keras")
+        return model, metadata
+
+    def save(self, series_id, model_type, model, metadata):
+        # Created on first save, so importing the service does not create directories
+        os.makedirs(self.model_dir, exist_ok=True)
+        base = self._base_path(series_id, model_type)
+        model_format = MODEL_TYPES[model_type]["format"]
+        if model_format == "prophet":
+            from prophet.serialize import model_to_json
+            with open(base + ".prophet.json", "w") as f:
+                f.write(model_to_json(model))
+        else:
+            if model_format == "keras":
+                model["model"].save(base + ".keras")
+                model = {key: value for key, value in model.items() if key != "model"}
+            joblib.dump(model, base + ".joblib")
+        # Metadata is written last so a crash mid-save never points at a half-written model
+        tmp_path = base + ".json.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(metadata, f)
+        os.replace(tmp_path, base + ".json")
+
+# ---------------------------- Forecast Service ----------------------------
+
+class ForecastModelService:
+    """
+    Returns forecasts from persisted models, refitting (with warm start) when at least
+    REFIT_MIN_NEW_POINTS new points have arrived for the series, or when the data no
+    longer starts with the fitted history.
+    """
+    def __init__(self, model_dir=FORECAST_MODEL_DIR, refit_min_new_points=REFIT_MIN_NEW_POINTS):
+        self.store = ForecastModelStore(model_dir)
+        self.refit_min_new_points = refit_min_new_points
+        self.metrics = {}
+        self._memory = {}
+        self._lock = threading.Lock()                      # guards _memory, _series_locks and metrics
+        self._series_locks = defaultdict(threading.Lock)   # one fit at a time per (series, model type)
+
+    def _is_current(self, metadata, data):
+        """True if the data extends the fitted history by fewer than refit_min_new_points points."""
+        if metadata is None or "data_digest" not in metadata:
+            return False
+        fitted_points = metadata["fitted_points"]
+        if not 0 <= len(data) - fitted_points < self.refit_min_new_points:
+            return False
+        return _data_digest(data, fitted_points) == metadata["data_digest"]
+
+    def get_model(self, series_id, model_type, data):
+        """Returns (model, metadata) for the series, refitting when the fitted model no longer matches the data."""
+        if model_type not in MODEL_TYPES:
+            raise ValueError(f"Unsupported forecast model type: {model_type}")
+
+        key = (series_id, model_type)
+        n_points = len(data)
+        with self._lock:
+            series_lock = self._series_locks[key]
+        with series_lock:
+            with self._lock:
+                cached = self._memory.get(key)
+            model, metadata = cached or self.store.load(series_id, model_type)
+
+            if self._is_current(metadata, data):
+                with self._lock:
+                    self._record(key, cache_hit=True)
+                    self._memory[key] = (model, metadata)
+                return model, metadata
+
+            start = time.perf_counter()
+            model = MODEL_TYPES[model_type]["fit"](data, model)
+            fit_seconds = time.perf_counter() - start
+
+            metadata = {
+                "series_id": series_id,
+                "model_type": model_type,
+                "fitted_points": n_points,
+                "data_digest": _data_digest(data, n_points),
+                "fit_seconds": fit_seconds,
+                "warm_start": metadata is not None,
+                "fitted_at": time.time(),
+            }
+            self.store.save(series_id, model_type, model, metadata)
+            with self._lock:
+                self._memory[key] = (model, metadata)
+                self._record(key, fit_seconds=fit_seconds)
+            logger.info(f"Fitted {model_type} for {series_id} on {n_points} points in {fit_seconds:.2f}s (warm_start={metadata['warm_start']})")
+            return model, metadata
+
+    def forecast(self, series_id, model_type, data, steps=5):
+        """Forecasts the next steps of a series from its persisted (or refreshed) model."""
+        model, metadata = self.get_model(series_id, model_type, data)
+        return MODEL_TYPES[model_type]["predict"](model, data, steps, metadata["fitted_points"])
+
+    def _record(self, key, fit_seconds=None, cache_hit=False):
+        stats = self.metrics.setdefault(key, {"fits": 0, "cache_hits": 0, "last_fit_seconds": None, "total_fit_seconds": 0.0})
+        if cache_hit:
+            stats["cache_hits"] += 1
+        else:
+            stats["fits"] += 1
+            stats["last_fit_seconds"] = fit_seconds
+            stats["total_fit_seconds"] += fit_seconds
+
+    def refresh_many(self, jobs, max_workers=MAX_FORECAST_WORKERS):
+        """
+        Refreshes forecasts for many series in parallel across a process pool.
+        Each job is a dict with series_id, model_type, data and optional steps.
+        Returns {"results": {(series_id, model_type): forecast}, "refresh_seconds": ..., "fit_seconds": {...}}.
+        """
+        start = time.perf_counter()
+        results, fit_seconds = {}, {}
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_refresh_job, self.store.model_dir, self.refit_min_new_points, job): (job["series_id"], job["model_type"])
+                for job in jobs
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    forecast, metadata, refitted = future.result()
+                    results[key] = forecast
+                    fit_seconds[key] = metadata["fit_seconds"] if refitted else 0.0
+                    with self._lock:
+                        self._record(key, fit_seconds=metadata["fit_seconds"], cache_hit=not refitted)
+                except Exception as e:
+                    logger.error(f"Forecast refresh failed for {key}: {e}")
+
+        refresh_seconds = time.perf_counter() - start
+        logger.info(f"Refreshed {len(results)}/{len(jobs)} forecasts in {refresh_seconds:.2f}s")
+        return {"results": results, "refresh_seconds": refresh_seconds, "fit_seconds": fit_seconds}
+
+    def get_metrics(self):
+        """Returns per-(series, model type) fit counts, cache hits and fit times."""
+        with self._lock:
+            return {f"{series_id}:{model_type}": dict(stats) for (series_id, model_type), stats in self.metrics.items()}
+
+def _refresh_job(model_dir, refit_min_new_points, job):
+    """Process pool entry point: forecasts one series with a worker-local service."""
+    service = ForecastModelService(model_dir=model_dir, refit_min_new_points=refit_min_new_points)
+    model, metadata = service.get_model(job["series_id"], job["model_type"], job["data"])
+    forecast = MODEL_TYPES[job["model_type"]]["predict"](model, job["data"], job.get("steps", 5), metadata["fitted_points"])
+    refitted = service.metrics[(job["series_id"], job["model_type"])]["fits"] > 0
+    return forecast, metadata, refitted
+
+# Process-wide service shared by the trend, anomaly and crisis modules
+forecast_service = ForecastModelService()
+
+# Example Usage
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    jobs = [
+        {"series_id": f"keyword_{i}", "model_type": "xgboost", "data": list(np.random.randint(50, 100, 50))}
+        for i in range(8)
+    ]
+    report = forecast_service.refresh_many(jobs)
+    print(f"Refresh latency: {report['refresh_seconds']:.2f}s")
+    print(json.dumps(forecast_service.get_metrics(), indent=2))
@@ -34,7 +34,8 @@ from transformers import pipeline
 from geopy.geocoders import Nominatim
 import tweepy
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import networkx as nx
+import numpy as np
+from RLG_Compact_Graph_Engine import CompactGraph
 
 # ------------------------- CONFIGURATION -------------------------
 
@@ -150,18 +151,22 @@ def analyze_named_entities(keywords, locations):
 
 # ------------------------- ENTITY RELATIONSHIP MAPPING -------------------------
 
-def build_entity_relationship_graph(entities):
-    """Builds a relationship graph for named entities to analyze connections."""
-    graph = nx.Graph()
+def build_entity_relationship_graph(entities, graph=None):
+    """Builds (or extends) a compact relationship graph for named entities to analyze connections."""
+    graph = CompactGraph() if graph is None else graph
     
-    for entity in entities:
+    node_ids = np.array([
         graph.add_node(entity["text"], type=entity["type"], score=entity["reputation_score"])
+        for entity in entities
+    ], dtype=np.int64)
+    types = np.array([entity["type"] for entity in entities], dtype=object)
     
-    # Example: Creating connections based on co-occurrence in the same dataset
-    for i, entity in enumerate(entities):
-        for j in range(i + 1, len(entities)):
-            if entity["type"] == entities[j]["type"]:
-                graph.add_edge(entity["text"], entities[j]["text"])
+    # Example: Creating connections based on co-occurrence in the same dataset.
+    # All same-type pairs are appended in bulk per type instead of one add_edge call per pair.
+    for entity_type in set(types.tolist()):
+        members = node_ids[types == entity_type]
+        first, second = np.triu_indices(len(members), k=1)
+        graph.add_edges_from_ids(members[first], members[second])
 
     return graph
 
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+RLG ONNX Inference Backend
+----------------------------------------
+CPU inference backend for the Hugging Face transformer models used by RLG Data and RLG Fans.
+- Exports sequence classification models to ONNX once and caches the graph on disk
+- Applies dynamic int8 quantization (int8 weights, activations quantized at runtime)
+- Runs the graph with ONNX Runtime using all available CPU cores
+- Backend is selectable per model (pytorch | onnx | onnx-int8) through configuration
+- Returns results in the same format as the transformers pipeline, so callers do not change
+"""
+
+import os
+import json
+import time
+import logging
+import numpy as np
+import torch
+from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+
+# ---------------------------- Configuration ----------------------------
+
+BACKEND_PYTORCH = "pytorch"
+BACKEND_ONNX = "onnx"
+BACKEND_ONNX_INT8 = "onnx-int8"
+SUPPORTED_BACKENDS = (BACKEND_PYTORCH, BACKEND_ONNX, BACKEND_ONNX_INT8)
+
+# Default backend for models that are not listed in the configuration file
+DEFAULT_BACKEND = os.getenv("RLG_INFERENCE_BACKEND", BACKEND_PYTORCH)
+
+# JSON file mapping model names to backends, e.g.
+# {"nlptown/bert-base-multilingual-uncased-sentiment": "onnx-int8"}
+INFERENCE_CONFIG_FILE = os.getenv("RLG_INFERENCE_CONFIG", "rlg_inference_backends.json")
+
+# Exported and quantized graphs are cached here, one folder per model
+ONNX_CACHE_DIR = os.getenv("RLG_ONNX_CACHE_DIR", "onnx_models")
+
+ONNX_OPSET = 14
+MAX_SEQUENCE_LENGTH = 512
+DEFAULT_BATCH_SIZE = 16
+
+# Pipelines already built in this process, keyed by (task, model_name, backend)
+_PIPELINE_CACHE = {}
+
+logger = logging.getLogger("rlg_onnx_inference_backend")
+
+# ---------------------------- Backend Selection ----------------------------
+
+def load_backend_config():
+    """
+    Loads the per-model backend configuration.
+    Entries in RLG_INFERENCE_BACKENDS ("model=backend,model=backend") override the JSON file.
+    """
+    config = {}
+    if os.path.exists(INFERENCE_CONFIG_FILE):
+        with open(INFERENCE_CONFIG_FILE, "r") as f:
+            config.update(json.load(f))
+
+    overrides = os.getenv("RLG_INFERENCE_BACKENDS", "")
+    for entry in overrides.split(","):
+        if "=" in entry:
+            model_name, backend = entry.rsplit("=", 1)
+            config[model_name.strip()] = backend.strip()
+
+    return config
+
+def get_backend_for_model(model_name):
+    """Returns the configured backend for a model, falling back to DEFAULT_BACKEND."""
+    backend = load_backend_config().get(model_name, DEFAULT_BACKEND)
+    if backend not in SUPPORTED_BACKENDS:
+        logger.warning(f"Unknown inference backend '{backend}' for {model_name}, using {BACKEND_PYTORCH}")
+        return BACKEND_PYTORCH
+    return backend
+
+# ---------------------------- Export & Quantization ----------------------------
+
+def _model_cache_dir(model_name):
+    return os.path.join(ONNX_CACHE_DIR, model_name.replace("/", "__"))
+
+def export_onnx_model(model_name, quantize=True):
+    """
+    Exports a sequence classification model to ONNX and optionally applies dynamic int8 quantization.
+    Returns the path of the graph to load. Export only happens once per model; later calls reuse the cache.
+    Graphs are written to a temporary file and renamed, so an interrupted export is never reused.
+    """
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    export_dir = _model_cache_dir(model_name)
+    fp32_path = os.path.join(export_dir, "model.onnx")
+    int8_path = os.path.join(export_dir, "model_int8.onnx")
+    os.makedirs(export_dir, exist_ok=True)
+
+    if not os.path.exists(fp32_path):
+        logger.info(f"Exporting {model_name} to ONNX...")
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model.eval()
+
+        dummy = tokenizer(["RLG export sample"], return_tensors="pt")
+        input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+
+        # Tokenizer and config first: the graph's presence marks a complete export
+        tokenizer.save_pretrained(export_dir)
+        model.config.save_pretrained(export_dir)
+        tmp_path = f"{fp32_path}.tmp"
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(dummy[name] for name in input_names),
+                tmp_path,
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=ONNX_OPSET,
+            )
+        os.replace(tmp_path, fp32_path)
+
+    if not quantize:
+        return fp32_path
+
+    if not os.path.exists(int8_path):
+        logger.info(f"Quantizing {model_name} to int8...")
+        tmp_path = f"{int8_path}.tmp"
+        quantize_dynamic(fp32_path, tmp_path, weight_type=QuantType.QInt8)
+        os.replace(tmp_path, int8_path)
+
+    return int8_path
+
+# ---------------------------- ONNX Runtime Pipeline ----------------------------
+
+class ONNXClassificationPipeline:
+    """
+    Drop-in replacement for a transformers text-classification pipeline backed by ONNX Runtime.
+    Accepts a single string or a list of strings and returns [{"label": ..., "score": ...}, ...].
+    """
+    def __init__(self, model_name, quantize=True, batch_size=DEFAULT_BATCH_SIZE):
+        import onnxruntime as ort
+        from transformers import AutoConfig
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model_path = export_onnx_model(model_name, quantize=quantize)
+
+        export_dir = os.path.dirname(self.model_path)
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        self.id2label = AutoConfig.from_pretrained(export_dir).id2label
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = os.cpu_count() or 1
+        self.session = ort.InferenceSession(self.model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [inp.name for inp in self.session.get_inputs()]
+
+    def _run_batch(self, texts):
+        encoded = self.tokenizer(
+            texts, padding=True, truncation=True, max_length=MAX_SEQUENCE_LENGTH, return_tensors="np"
+        )
+        feeds = {name: encoded[name].astype(np.int64) for name in self.input_names}
+        logits = self.session.run(["logits"], feeds)[0]
+
+        # Softmax over the class dimension
+        logits = logits - logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+
+        best = probs.argmax(axis=1)
+        return [
+            {"label": self.id2label[int(idx)], "score": float(probs[row, idx])}
+            for row, idx in enumerate(best)
+        ]
+
+    def __call__(self, texts, batch_size=None):
+        if isinstance(texts, str):
+            texts = [texts]
+        batch_size = batch_size or self.batch_size
+
+        results = []
+        for start in range(0, len(texts), batch_size):
+            results.extend(self._run_batch(texts[start:start + batch_size]))
+        return results
+
+# ---------------------------- Public API ----------------------------
+
+def build_inference_pipeline(task, model_name, backend=None, fallback=True):
+    """
+    Returns a text classification pipeline for the model on the configured backend.
+    If the ONNX export or session creation fails, falls back to the PyTorch eager pipeline
+    (or raises, if fallback is False). A fallback is not cached under the ONNX backend, so
+    the next call tries ONNX again.
+    """
+    backend = backend or get_backend_for_model(model_name)
+    cache_key = (task, model_name, backend)
+    if cache_key in _PIPELINE_CACHE:
+        return _PIPELINE_CACHE[cache_key]
+
+    if backend in (BACKEND_ONNX, BACKEND_ONNX_INT8):
+        try:
+            pipe = ONNXClassificationPipeline(model_name, quantize=(backend == BACKEND_ONNX_INT8))
+            _PIPELINE_CACHE[cache_key] = pipe
+            logger.info(f"Loaded {model_name} on {backend} backend")
+            return pipe
+        except Exception as e:
+            if not fallback:
+                raise
+            logger.error(f"ONNX backend failed for {model_name}, using PyTorch. Error: {e}")
+            return build_inference_pipeline(task, model_name, backend=BACKEND_PYTORCH)
+
+    pipe = pipeline(task, model=model_name, tokenizer=model_name)
+    _PIPELINE_CACHE[cache_key] = pipe
+    return pipe
+
+def compare_backends(model_name, texts, task="sentiment-analysis", backend=BACKEND_ONNX_INT8):
+    """
+    Measures accuracy parity between the eager PyTorch pipeline and an ONNX backend.
+    Returns the label agreement rate and the largest score difference on matching labels.
+    Raises if the ONNX backend cannot be loaded, rather than comparing PyTorch with itself.
+    """
+    reference = build_inference_pipeline(task, model_name, backend=BACKEND_PYTORCH)(texts)
+    candidate = build_inference_pipeline(task, model_name, backend=backend, fallback=False)(texts)
+
+    agreements = [ref["label"] == cand["label"] for ref, cand in zip(reference, candidate)]
+    score_diffs = [
+        abs(ref["score"] - cand["score"])
+        for ref, cand, same in zip(reference, candidate, agreements) if same
+    ]
+    return {
+        "model": model_name,
+        "backend": backend,
+        "samples": len(texts),
+        "label_agreement": sum(agreements) / len(texts) if texts else 1.0,
+        "max_score_diff": max(score_diffs) if score_diffs else 0.0,
+    }
+
+def benchmark_backend(model_name, texts, task="sentiment-analysis", backend=BACKEND_ONNX_INT8, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Benchmarks single-text latency and batched throughput of a backend on CPU.
+    """
+    pipe = build_inference_pipeline(task, model_name, backend=backend)
+    pipe(texts[:1])  # Warm-up run
+
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        pipe(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    pipe(texts, batch_size=batch_size)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "model": model_name,
+        "backend": backend,
+        "latency_p50_ms": float(np.percentile(latencies, 50)),
+        "latency_p95_ms": float(np.percentile(latencies, 95)),
+        "throughput_texts_per_sec": len(texts) / batch_seconds if batch_seconds else 0.0,
+    }
+
+# Example Usage
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sample_model = "nlptown/bert-base-multilingual-uncased-sentiment"
+    sample_texts = [
+        "I love the RLG Super Tool, it makes my job so much easier!",
+        "The compliance system is terrible and slow.",
+        "Not sure how I feel about this platform.",
+    ] * 20
+
+    print(compare_backends(sample_model, sample_texts))
+    for name in SUPPORTED_BACKENDS:
+        print(benchmark_backend(sample_model, sample_texts, backend=name))
@@ -30,12 +30,7 @@ import matplotlib.pyplot as plt
 from datetime import datetime
 from deep_translator import GoogleTranslator
 from transformers import pipeline
-from statsmodels.tsa.arima.model import ARIMA
-from prophet import Prophet
-from xgboost import XGBRegressor
-from sklearn.preprocessing import MinMaxScaler
-from keras.models import Sequential
-from keras.layers import Dense, LSTM, Dropout
+from RLG_Forecast_Model_Service import forecast_service
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 # ------------------------- CONFIGURATION -------------------------
@@ -131,49 +126,17 @@ def perform_competitor_swot(keyword):
 
 # ------------------------- ADVANCED TREND FORECASTING -------------------------
 
-def arima_forecast(data_series):
-    """Predicts future trends using ARIMA time-series analysis."""
-    model = ARIMA(data_series, order=(5,1,0))
-    model_fit = model.fit()
-    return model_fit.forecast(steps=5)
-
-def lstm_forecast(data_series):
-    """Predicts future trends using LSTM deep learning model."""
-    scaler = MinMaxScaler(feature_range=(0, 1))
-    scaled_data = scaler.fit_transform(np.array(data_series).reshape(-1,1))
-
-    X_train, y_train = [], []
-    for i in range(10, len(scaled_data)-1):
-        X_train.append(scaled_data[i-10:i, 0])
-        y_train.append(scaled_data[i, 0])
-
-    X_train, y_train = np.array(X_train), np.array(y_train)
-    X_train = np.reshape(X_train, (X_train.shape[0], X_train.shape[1], 1))
-
-    model = Sequential([
-        LSTM(50, return_sequences=True, input_shape=(X_train.shape[1], 1)),
-        LSTM(50, return_sequences=False),
-        Dropout(0.2),
-        Dense(25),
-        Dense(1)
-    ])
-
-    model.compile(optimizer="adam", loss="mean_squared_error")
-    model.fit(X_train, y_train, epochs=10, batch_size=1, verbose=2)
-
-    predictions = model.predict(X_train)
-    return scaler.inverse_transform(predictions)[-5:]
-
-def xgboost_forecast(data_series):
-    """Predicts trends using XGBoost regression."""
-    X = np.arange(len(data_series)).reshape(-1, 1)
-    y = np.array(data_series)
-    
-    model = XGBRegressor(objective="reg:squarederror", n_estimators=100)
-    model.fit(X, y)
+def arima_forecast(data_series, series_id):
+    """Predicts future trends using ARIMA time-series analysis (cached and warm-started per series)."""
+    return forecast_service.forecast(series_id, "arima", data_series, steps=5)
+
+def lstm_forecast(data_series, series_id):
+    """Predicts future trends using LSTM deep learning model (cached and warm-started per series)."""
+    return forecast_service.forecast(series_id, "lstm", data_series, steps=5)
 
-    future_X = np.arange(len(data_series), len(data_series) + 5).reshape(-1, 1)
-    return model.predict(future_X)
+def xgboost_forecast(data_series, series_id):
+    """Predicts trends using XGBoost regression (cached and warm-started per series)."""
+    return forecast_service.forecast(series_id, "xgboost", data_series, steps=5)
 
 # ------------------------- MAIN EXECUTION -------------------------
 
@@ -185,6 +148,6 @@ if __name__ == "__main__":
             "keyword": keyword,
             "sentiment_score": analyze_trend_sentiment(fetch_twitter_trends(keyword)),
             "competitor_swot": perform_competitor_swot(keyword),
-            "trend_predictions": xgboost_forecast([np.random.randint(50, 100) for _ in range(50)])
+            "trend_predictions": xgboost_forecast([np.random.randint(50, 100) for _ in range(50)], series_id=keyword)
         }
         logging.info(f"📈 AI-Powered Trend Report: {json.dumps(trend_report, indent=2)}")
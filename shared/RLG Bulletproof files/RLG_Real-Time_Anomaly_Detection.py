@@ -27,8 +27,7 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from datetime import datetime
-from keras.models import Sequential
-from keras.layers import Dense, LSTM
+from RLG_Forecast_Model_Service import forecast_service
 from transformers import pipeline
 from sklearn.ensemble import IsolationForest
 import xgboost as xgb
@@ -103,22 +102,13 @@ def detect_anomalies(data):
     data["is_anomaly"] = predictions == -1
     return data[data["is_anomaly"] == True]
 
-def train_lstm_model(data):
-    """Trains an LSTM model to predict future anomalies."""
+def train_lstm_model(data, series_id="anomaly_metrics"):
+    """Trains an LSTM model to predict future anomalies (cached and warm-started per series)."""
     if data.empty:
         return None
     
-    data = np.array(data).reshape(-1, 1, 1)
-
-    model = Sequential([
-        LSTM(50, activation='relu', input_shape=(1, 1)),
-        Dense(1)
-    ])
-    
-    model.compile(optimizer='adam', loss='mse')
-    model.fit(data, data, epochs=20, verbose=0)
-    
-    return model
+    model, _ = forecast_service.get_model(series_id, "autoencoder_lstm", data)
+    return model["model"]
 
 def predict_anomalies(data):
     """Uses XGBoost to predict future anomalies."""
@@ -23,7 +23,7 @@ import nltk
 import torch
 import seaborn as sns
 from flask import Flask, request, jsonify, render_template
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+from RLG_ONNX_Inference_Backend import build_inference_pipeline
 from googletrans import Translator
 from langdetect import detect
 from textblob import TextBlob
@@ -40,10 +40,9 @@ app = Flask(__name__)
 # ---------------------------- Configuration & Setup ----------------------------
 
 # Pre-trained model for general tagging (XLM-RoBERTa for sentiment and general context)
+# The backend (PyTorch or ONNX int8) is selected per model, see RLG_ONNX_Inference_Backend
 MODEL_NAME = "cardiffnlp/twitter-xlm-roberta-base-sentiment"
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
-tagging_pipeline = pipeline("text-classification", model=model, tokenizer=tokenizer)
+tagging_pipeline = build_inference_pipeline("text-classification", MODEL_NAME)
 
 # Initialize Google Translator
 translator = Translator()
@@ -21,7 +21,7 @@ import logging
 import requests
 import json
 import time
-import networkx as nx  # Social Network Graph Analytics
+from RLG_Compact_Graph_Engine import CompactGraph  # Social Network Graph Analytics
 from flask import Flask, request, jsonify
 import tweepy  # Twitter API
 import facebook  # Facebook Graph API
@@ -33,6 +33,7 @@ from discord_webhook import DiscordWebhook
 from wechatpy import WeChatClient  # WeChat API
 from twilio.rest import Client  # WhatsApp API
 from dotenv import load_dotenv
+from RLG_Batch_Spam_Scoring_Engine import PostBatch, fake_engagement_mask
 
 # ------------------------- CONFIGURATION -------------------------
 
@@ -122,9 +123,9 @@ def send_whatsapp_message(message, recipient):
 
 # ------------------------- AI-POWERED SOCIAL NETWORK ANALYTICS -------------------------
 
-def build_social_network_graph(posts):
-    """Creates a social network graph from social media interactions."""
-    G = nx.Graph()
+def build_social_network_graph(posts, graph=None):
+    """Builds a social network graph from posts, or appends them to the given graph."""
+    G = CompactGraph() if graph is None else graph
 
     for post in posts:
         user = post["user"]
@@ -134,18 +135,17 @@ def build_social_network_graph(posts):
             for mention in post["mentions"]:
                 G.add_edge(user, mention, weight=1)
 
-    logging.info(f"📊 Social Network Graph Built with {len(G.nodes)} nodes & {len(G.edges)} edges")
+    logging.info(f"📊 Social Network Graph Updated: {G.number_of_nodes()} nodes & {G.number_of_edges()} edges")
     return G
 
 def detect_fake_engagement(posts):
     """Detects fake engagement & bot activity."""
-    suspicious_activity = []
-    
-    for post in posts:
-        engagement_ratio = (post.get("likes", 0) + post.get("retweets", 0)) / max(1, post.get("comments", 1))
-        
-        if engagement_ratio > 50:  # High like/comment ratio suggests artificial engagement
-            suspicious_activity.append(post)
+    if not posts:
+        return []
+
+    # High like/comment ratio suggests artificial engagement; scored for all posts at once
+    flags = fake_engagement_mask(PostBatch.from_posts(posts), amplifiers=("retweets",))
+    suspicious_activity = [post for post, flagged in zip(posts, flags) if flagged]
     
     logging.info(f"🚨 Fake Engagement Detected: {len(suspicious_activity)} cases")
     return suspicious_activity
@@ -173,7 +173,12 @@ def social_graph_analysis():
     data = request.json
     posts = data.get("posts", [])
     G = build_social_network_graph(posts)
-    return jsonify({"nodes": list(G.nodes), "edges": list(G.edges)})
+    return jsonify({
+        "nodes": G.nodes,
+        "edges": list(G.edges()),
+        "top_influencers": G.top_nodes(G.pagerank(), k=10),
+        "communities": len(G.community_members()),
+    })
 
 @app.route("/api/social/fraud-detection", methods=["POST"])
 def detect_fake_engagement_api():
@@ -183,6 +188,16 @@ def detect_fake_engagement_api():
     fake_engagements = detect_fake_engagement(posts)
     return jsonify(fake_engagements)
 
+@app.route("/api/social/fraud-detection/batch", methods=["POST"])
+def detect_fake_engagement_batch_api():
+    """API endpoint for batch fake engagement detection over columnar likes/comments/retweets arrays."""
+    try:
+        batch = PostBatch.from_columns(request.get_json(silent=True), required=("likes", "comments", "retweets"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    flags = fake_engagement_mask(batch, amplifiers=("retweets",))
+    return jsonify({"fake_engagement": flags.tolist(), "flagged": int(flags.sum())})
+
 # ------------------------- MAIN EXECUTION -------------------------
 
 if __name__ == "__main__":
@@ -30,6 +30,7 @@ from discord_webhook import DiscordWebhook
 from twilio.rest import Client  # WhatsApp API
 from wechatpy import WeChatClient  # WeChat API
 from dotenv import load_dotenv
+from RLG_Batch_Spam_Scoring_Engine import PostBatch, SPAM_LABELS, NOT_SPAM_LABEL, classify_texts, fake_engagement_mask
 
 # ------------------------- CONFIGURATION -------------------------
 
@@ -72,8 +73,7 @@ app = Flask(__name__)
 def detect_spam_text(text):
     """AI-powered text spam detection using NLP models."""
     try:
-        labels = ["spam", "not spam", "phishing", "fake news", "scam"]
-        result = spam_pipeline(text, candidate_labels=labels)
+        result = spam_pipeline(text, candidate_labels=SPAM_LABELS)
         
         label = result["labels"][0]
         confidence = round(result["scores"][0], 4)
@@ -161,6 +161,34 @@ def detect_fake_engagement_api():
     is_fake = detect_fake_engagement(likes, comments, shares)
     return jsonify({"fake_engagement": is_fake})
 
+@app.route("/api/spam/detect/batch", methods=["POST"])
+def detect_spam_batch_api():
+    """API endpoint for batch text spam detection (the /api/spam/detect classifier, batched in one call)."""
+    data = request.json
+    texts = data.get("texts", [])
+    try:
+        labels, confidences = classify_texts(texts, spam_pipeline)
+    except Exception as e:
+        logging.error(f"❌ Batch spam detection failed: {str(e)}")
+        return jsonify({"error": "Batch spam detection failed"}), 500
+    flags = labels != NOT_SPAM_LABEL
+    return jsonify({
+        "labels": labels.tolist(),
+        "confidences": confidences.tolist(),
+        "spam": flags.tolist(),
+        "flagged": int(flags.sum()),
+    })
+
+@app.route("/api/spam/engagement/batch", methods=["POST"])
+def detect_fake_engagement_batch_api():
+    """API endpoint for batch fake engagement detection over columnar likes/comments/shares arrays."""
+    try:
+        batch = PostBatch.from_columns(request.get_json(silent=True), required=("likes", "comments", "shares"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    flags = fake_engagement_mask(batch, amplifiers=("shares",))
+    return jsonify({"fake_engagement": flags.tolist(), "flagged": int(flags.sum())})
+
 @app.route("/api/spam/whatsapp", methods=["POST"])
 def send_whatsapp():
     """API endpoint to send a WhatsApp message."""
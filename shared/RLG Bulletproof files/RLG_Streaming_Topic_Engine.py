@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+RLG Streaming Topic Engine
+----------------------------------------
+Maintains trending topics for RLG Data and RLG Fans incrementally as new mentions arrive.
+- Hashing vectorizer with a fixed feature space (no vocabulary refit per refresh)
+- Online LDA updated with partial_fit on each new batch of mentions
+- Bounded hashed-index -> term lookup so topics stay human readable
+- Texts already folded in are skipped, so re-sent mentions are not overweighted
+- One engine per region, so topics from different regions never mix
+- Model state persisted to disk periodically (atomic rename) and restored on startup
+- "Current trending topics" are served from the maintained model without refitting
+"""
+
+import os
+import re
+import time
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+import numpy as np
+import joblib
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.utils import murmurhash3_32
+
+# ---------------------------- Configuration ----------------------------
+
+TOPIC_MODEL_FILE = os.getenv("RLG_TOPIC_MODEL_FILE", "rlg_topic_model.joblib")
+HASH_FEATURES = 2 ** 18          # Fixed vocabulary space shared by every update
+DEFAULT_NUM_TOPICS = 5
+TOP_WORDS_PER_TOPIC = 5
+MINIBATCH_SIZE = 512
+EXPECTED_CORPUS_SIZE = 1_000_000  # Used by online LDA to scale the variational update
+SEEN_TEXTS_LIMIT = 1_000_000      # Digests of folded-in texts kept for de-duplication
+SAVE_INTERVAL_SECONDS = 300       # Minimum time between periodic saves
+DEFAULT_REGION = "global"
+
+logger = logging.getLogger("rlg_streaming_topic_engine")
+
+# ---------------------------- Streaming Topic Engine ----------------------------
+
+class StreamingTopicEngine:
+    """
+    Online topic model over a fixed hashed feature space.
+    Call update() as mentions land and get_trending_topics() to read the current topics.
+    """
+    def __init__(self, num_topics=DEFAULT_NUM_TOPICS, n_features=HASH_FEATURES, model_file=TOPIC_MODEL_FILE):
+        self.num_topics = num_topics
+        self.n_features = n_features
+        self.model_file = model_file
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, stop_words="english", alternate_sign=False, norm=None
+        )
+        self._analyzer = self.vectorizer.build_analyzer()
+        self.lda = LatentDirichletAllocation(
+            n_components=num_topics,
+            learning_method="online",
+            batch_size=MINIBATCH_SIZE,
+            total_samples=EXPECTED_CORPUS_SIZE,
+            random_state=42,
+        )
+        self.index_to_term = {}
+        self.documents_seen = 0
+        self._seen = OrderedDict()
+        self._topics = []
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(text):
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+    def _take_new(self, texts):
+        """Keeps only texts not folded in before (nor repeated within the batch) and marks them seen."""
+        new_texts = []
+        for text in texts:
+            digest = self._digest(text)
+            if digest in self._seen:
+                continue
+            self._seen[digest] = None
+            new_texts.append(text)
+        while len(self._seen) > SEEN_TEXTS_LIMIT:
+            self._seen.popitem(last=False)
+        return new_texts
+
+    def _feature_index(self, term):
+        # Same hashing as HashingVectorizer: signed murmurhash3, seed 0, abs modulo feature space
+        return abs(murmurhash3_32(term, seed=0)) % self.n_features
+
+    def _record_terms(self, texts):
+        """Remembers which term maps to each hashed column; one entry per column keeps memory bounded."""
+        for text in texts:
+            for term in self._analyzer(text):
+                index = self._feature_index(term)
+                if index not in self.index_to_term:
+                    self.index_to_term[index] = term
+
+    def update(self, texts):
+        """Folds the mentions not seen before into the topic model; re-sent texts are skipped."""
+        texts = [text for text in texts if text and text.strip()]
+        with self._lock:
+            texts = self._take_new(texts)
+            if not texts:
+                return list(self._topics)
+
+            matrix = self.vectorizer.transform(texts)
+            self._record_terms(texts)
+            for start in range(0, len(texts), MINIBATCH_SIZE):
+                self.lda.partial_fit(matrix[start:start + MINIBATCH_SIZE])
+            self.documents_seen += len(texts)
+            self._topics = self._describe_topics()
+            self._dirty = True
+            return list(self._topics)
+
+    def _describe_topics(self):
+        topics = []
+        for topic_idx, topic in enumerate(self.lda.components_):
+            top_words = []
+            # Only columns we have a term for can be named; take the strongest of those
+            for index in np.argsort(topic)[::-1]:
+                term = self.index_to_term.get(int(index))
+                if term is not None:
+                    top_words.append(term)
+                if len(top_words) == TOP_WORDS_PER_TOPIC:
+                    break
+            topics.append(f"Topic {topic_idx+1}: {', '.join(top_words)}")
+        return topics
+
+    def get_trending_topics(self):
+        """Returns the current topics from the maintained model (no refit)."""
+        return list(self._topics)
+
+    def save(self):
+        """Persists model state so a restart resumes from the same topics; the file is replaced atomically."""
+        tmp_file = f"{self.model_file}.tmp"
+        with self._lock:
+            joblib.dump({
+                "num_topics": self.num_topics,
+                "n_features": self.n_features,
+                "lda": self.lda,
+                "index_to_term": self.index_to_term,
+                "documents_seen": self.documents_seen,
+                "seen": list(self._seen),
+                "topics": self._topics,
+            }, tmp_file)
+            os.replace(tmp_file, self.model_file)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        logger.info(f"Topic model saved to {self.model_file} ({self.documents_seen} documents)")
+
+    def save_if_due(self, interval=SAVE_INTERVAL_SECONDS):
+        """Saves only when the model changed and `interval` seconds passed since the last save."""
+        if self._dirty and time.monotonic() - self._last_save >= interval:
+            self.save()
+            return True
+        return False
+
+    @classmethod
+    def load(cls, model_file=TOPIC_MODEL_FILE, num_topics=DEFAULT_NUM_TOPICS):
+        """Restores a persisted engine, or returns a fresh one if no compatible state exists."""
+        if os.path.exists(model_file):
+            state = joblib.load(model_file)
+            if state["num_topics"] == num_topics:
+                engine = cls(num_topics=num_topics, n_features=state["n_features"], model_file=model_file)
+                engine.lda = state["lda"]
+                engine.index_to_term = state["index_to_term"]
+                engine.documents_seen = state["documents_seen"]
+                engine._seen = OrderedDict.fromkeys(state.get("seen", []))
+                engine._topics = state["topics"]
+                return engine
+            logger.warning(f"Persisted topic model has {state['num_topics']} topics, starting a new {num_topics}-topic model")
+        return cls(num_topics=num_topics, model_file=model_file)
+
+# ---------------------------- Shared Engine ----------------------------
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+def _model_file(region, num_topics):
+    base = os.path.splitext(TOPIC_MODEL_FILE)[0]
+    if region != DEFAULT_REGION:
+        base = f"{base}_{re.sub(r'[^A-Za-z0-9_-]', '_', region)}"
+    if num_topics != DEFAULT_NUM_TOPICS:
+        base = f"{base}_{num_topics}"
+    return f"{base}.joblib"
+
+def get_topic_engine(num_topics=DEFAULT_NUM_TOPICS, region=DEFAULT_REGION):
+    """Returns the process-wide engine for a region and topic count, loading persisted state once."""
+    key = (region, num_topics)
+    with _engines_lock:
+        if key not in _engines:
+            _engines[key] = StreamingTopicEngine.load(model_file=_model_file(region, num_topics), num_topics=num_topics)
+        return _engines[key]
+
+# Example Usage
+if __name__ == "__main__":
+    engine = get_topic_engine()
+    engine.update([
+        "AI is transforming the media industry!", "Privacy laws are affecting data scraping.",
+        "Social media trends change every week.", "Brandwatch released a new feature.",
+        "Compliance with GDPR is a growing concern."
+    ])
+    engine.save()
+    for topic in engine.get_trending_topics():
+        print(topic)
@@ -17,17 +17,17 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from langdetect import detect
 from textblob import TextBlob
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.decomposition import LatentDirichletAllocation
-from prophet import Prophet
-from transformers import pipeline
+from RLG_Streaming_Topic_Engine import get_topic_engine
+from RLG_Forecast_Model_Service import forecast_service
+from RLG_ONNX_Inference_Backend import build_inference_pipeline
 
 # Download necessary NLP resources
 nltk.download('stopwords')
 nltk.download('punkt')
 
-# Initialize sentiment analysis model
-sentiment_pipeline = pipeline("sentiment-analysis")
+# Initialize sentiment analysis model (PyTorch or ONNX int8, see RLG_ONNX_Inference_Backend)
+SENTIMENT_MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+sentiment_pipeline = build_inference_pipeline("sentiment-analysis", SENTIMENT_MODEL_NAME)
 
 # Stopwords list
 STOPWORDS = set(nltk.corpus.stopwords.words('english'))
@@ -40,30 +40,29 @@ def clean_text(text):
     text = ' '.join([word for word in text.split() if word not in STOPWORDS])
     return text.strip()
 
-# Topic Modeling with LDA
-def extract_trending_topics(texts, num_topics=5):
+# Topic Modeling with online LDA
+def extract_trending_topics(texts, num_topics=5, region="global"):
     """
-    Identifies top emerging topics using Latent Dirichlet Allocation (LDA).
+    Folds texts into the region's streaming LDA topic model and returns its current trending topics.
+    The model is maintained across calls (see RLG_Streaming_Topic_Engine): texts it has already seen are
+    skipped and its state is saved periodically rather than on every call.
     """
-    vectorizer = CountVectorizer(stop_words='english')
-    text_matrix = vectorizer.fit_transform(texts)
-    
-    lda = LatentDirichletAllocation(n_components=num_topics, random_state=42)
-    lda.fit(text_matrix)
-    
-    terms = vectorizer.get_feature_names_out()
-    topics = []
-    
-    for topic_idx, topic in enumerate(lda.components_):
-        top_words = [terms[i] for i in topic.argsort()[:-6:-1]]
-        topics.append(f"Topic {topic_idx+1}: {', '.join(top_words)}")
-    
+    engine = get_topic_engine(num_topics, region=region)
+    topics = engine.update(texts)
+    engine.save_if_due()
     return topics
 
+def get_current_trending_topics(num_topics=5, region="global"):
+    """
+    Returns the region's trending topics from the maintained model instantly, without processing any texts.
+    """
+    return get_topic_engine(num_topics, region=region).get_trending_topics()
+
 # Sentiment-Based Trend Analysis
-def analyze_sentiment_trends(texts, dates):
+def analyze_sentiment_trends(texts, dates, series_id="sentiment"):
     """
     Analyzes sentiment trends over time using Prophet.
+    The fitted model is cached per series and only refitted (warm-started) once enough new points arrive.
     """
     sentiment_scores = []
     
@@ -81,12 +80,8 @@ def analyze_sentiment_trends(texts, dates):
     
     df = pd.DataFrame({"ds": dates, "y": sentiment_scores})
     
-    # Train a forecasting model
-    model = Prophet()
-    model.fit(df)
-    
-    future = model.make_future_dataframe(periods=30)
-    forecast = model.predict(future)
+    # Forecast from the cached model for this series
+    forecast = forecast_service.forecast(series_id, "prophet", df, steps=30)
     
     return df, forecast
 
@@ -98,10 +93,10 @@ def trend_analysis(texts, dates, region="global"):
     texts = [clean_text(text) for text in texts if text.strip()]
     
     # Extract trending topics
-    topics = extract_trending_topics(texts)
+    topics = extract_trending_topics(texts, region=region)
     
     # Analyze sentiment trends
-    df, forecast = analyze_sentiment_trends(texts, dates)
+    df, forecast = analyze_sentiment_trends(texts, dates, series_id=f"sentiment_{region}")
     
     # Generate a visualization
     plt.figure(figsize=(12, 6))
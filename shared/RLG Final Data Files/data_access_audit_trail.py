@@ -1,10 +1,15 @@
 import os
+import hmac
+import atexit
 import json
+import queue
 import hashlib
 import logging
 import sqlite3
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 # Configure Logging
 logging.basicConfig(
@@ -16,20 +21,82 @@ logging.basicConfig(
 # Database File
 DB_FILE = "data_access_audit.db"
 
+# prev_hash of the first chained entry
+GENESIS_HASH = "0" * 64
+
+# Backoff between attempts to commit a batch that failed; on close a batch gets CLOSE_WRITE_RETRIES attempts
+WRITE_RETRY_DELAY = 0.1
+MAX_WRITE_RETRY_DELAY = 5.0
+CLOSE_WRITE_RETRIES = 3
+
+LOG_FIELDS = (
+    "timestamp", "user_id", "username", "role", "action",
+    "data_id", "data_type", "reason", "ip_address", "region"
+)
+
 class DataAccessAuditTrail:
     """
     Logs and tracks all data access events for RLG Data & RLG Fans.
     Ensures compliance with security regulations and provides tamper-proof audit trails.
+
+    Every entry's hash covers the previous entry's hash, so editing, inserting or
+    deleting a row breaks the chain, and the HMAC-signed chain head written with every
+    batch exposes deleted newest rows. Events are queued and written by a background
+    writer in group commits over one WAL-mode connection; a batch that fails is rolled
+    back and retried. Every `checkpoint_every` entries the writer stores an HMAC-signed
+    checkpoint of the chain head, and `detect_tampering` resumes verification from the
+    last verified checkpoint. Without a signing key checkpoints could be forged, so
+    verification always starts from the genesis hash.
     """
 
-    def __init__(self):
-        """Initialize the audit trail system and create database if not exists."""
+    def __init__(
+        self,
+        db_file: str = DB_FILE,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        checkpoint_every: int = 1000,
+        signing_key: Optional[str] = None,
+    ):
+        """
+        Initialize the audit trail system and create database if not exists.
+
+        Args:
+            db_file (str): Path of the SQLite database.
+            batch_size (int): Maximum number of events written per commit.
+            flush_interval (float): Seconds the writer waits to fill a batch.
+            checkpoint_every (int): Entries between signed checkpoints.
+            signing_key (Optional[str]): HMAC key for checkpoints (default: AUDIT_CHECKPOINT_KEY env var).
+        """
+        self.db_file = db_file
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.checkpoint_every = checkpoint_every
+        key = signing_key or os.getenv("AUDIT_CHECKPOINT_KEY")
+        if not key:
+            logging.warning("AUDIT_CHECKPOINT_KEY is not set; tamper detection will always scan the full log.")
+        self._signed = bool(key)
+        self._signing_key = (key or "rlg-audit-unsigned").encode()
+
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._lock = threading.Lock()
         self._initialize_db()
 
+        self._last_hash = self._chain_head()
+        self._since_checkpoint = self._count_since_checkpoint()
+        self.last_verification_scanned = 0
+
+        self._queue: "queue.Queue[Optional[Dict]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="audit-writer", daemon=True)
+        self._writer.start()
+        # The writer is a daemon thread; flush queued events if the process exits without close()
+        atexit.register(self.close)
+
     def _initialize_db(self):
         """Create the audit log database if it does not exist."""
-        with sqlite3.connect(DB_FILE) as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS audit_log (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -43,10 +110,36 @@ class DataAccessAuditTrail:
                     reason TEXT NOT NULL,
                     ip_address TEXT NOT NULL,
                     region TEXT NOT NULL,
-                    hash TEXT NOT NULL
+                    hash TEXT NOT NULL,
+                    prev_hash TEXT
+                )
+            """)
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(audit_log)")}
+            if "prev_hash" not in columns:
+                # Rows written before chaining keep prev_hash NULL and are checked individually
+                cursor.execute("ALTER TABLE audit_log ADD COLUMN prev_hash TEXT")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_user_time ON audit_log (user_id, timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_time ON audit_log (timestamp)")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS audit_checkpoint (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    last_log_id INTEGER NOT NULL,
+                    last_hash TEXT NOT NULL,
+                    entry_count INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    signature TEXT NOT NULL,
+                    verified_at TEXT
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS audit_head (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    last_log_id INTEGER NOT NULL,
+                    last_hash TEXT NOT NULL,
+                    signature TEXT NOT NULL
                 )
             """)
-            conn.commit()
+            self._conn.commit()
         logging.info("Audit log database initialized.")
 
     def _generate_hash(self, log_entry: Dict) -> str:
@@ -54,13 +147,33 @@ class DataAccessAuditTrail:
         log_string = json.dumps(log_entry, sort_keys=True)
         return hashlib.sha256(log_string.encode()).hexdigest()
 
+    def _sign_checkpoint(self, last_log_id: int, last_hash: str, entry_count: int) -> str:
+        message = f"{last_log_id}:{last_hash}:{entry_count}".encode()
+        return hmac.new(self._signing_key, message, hashlib.sha256).hexdigest()
+
+    def _chain_head(self) -> str:
+        with self._lock:
+            row = self._conn.execute("SELECT hash FROM audit_log ORDER BY id DESC LIMIT 1").fetchone()
+        return row[0] if row else GENESIS_HASH
+
+    def _count_since_checkpoint(self) -> int:
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT COUNT(*) FROM audit_log
+                WHERE id > COALESCE((SELECT MAX(last_log_id) FROM audit_checkpoint), 0)
+            """).fetchone()
+        return row[0]
+
     def log_access(
-        self, user_id: str, username: str, role: str, action: str, 
+        self, user_id: str, username: str, role: str, action: str,
         data_id: str, data_type: str, reason: str, ip_address: str, region: str
     ):
         """
         Log a data access event.
 
+        The event is queued and committed by the background writer; call `flush()`
+        to wait until it is durable.
+
         Args:
             user_id (str): Unique identifier of the user.
             username (str): Username of the person accessing the data.
@@ -75,9 +188,8 @@ class DataAccessAuditTrail:
         Returns:
             None
         """
-        timestamp = datetime.utcnow().isoformat()
         log_entry = {
-            "timestamp": timestamp,
+            "timestamp": datetime.utcnow().isoformat(),
             "user_id": user_id,
             "username": username,
             "role": role,
@@ -88,38 +200,152 @@ class DataAccessAuditTrail:
             "ip_address": ip_address,
             "region": region
         }
-        log_hash = self._generate_hash(log_entry)
+        self._queue.put(log_entry)
+        logging.debug(f"Queued data access event for user {username} ({role}) on {data_type}.")
 
-        with sqlite3.connect(DB_FILE) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO audit_log (timestamp, user_id, username, role, action, 
-                data_id, data_type, reason, ip_address, region, hash) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                timestamp, user_id, username, role, action, data_id, data_type, reason, 
-                ip_address, region, log_hash
-            ))
-            conn.commit()
-        logging.info(f"Logged data access event for user {username} ({role}) on {data_type}.")
-
-    def get_logs(self, limit: Optional[int] = 100) -> list:
+    def _write_loop(self):
+        """Drain the queue in batches; each batch is chained and committed at once.
+
+        A batch that fails to commit is retried with backoff until it succeeds, so
+        `flush()` only returns once events are durable. Only on close is a batch
+        dropped, after CLOSE_WRITE_RETRIES failed attempts.
+        """
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                self._queue.task_done()
+                return
+            batch = [entry]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    entry = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+            attempt = 0
+            while True:
+                try:
+                    self._write_batch(batch)
+                    break
+                except sqlite3.Error as e:
+                    attempt += 1
+                    if stop and attempt >= CLOSE_WRITE_RETRIES:
+                        logging.error(f"Dropping {len(batch)} audit events after {attempt} failed writes: {e}")
+                        break
+                    delay = min(WRITE_RETRY_DELAY * 2 ** (attempt - 1), MAX_WRITE_RETRY_DELAY)
+                    logging.error(f"Failed to write {len(batch)} audit events (attempt {attempt}), retrying in {delay:.1f}s: {e}")
+                    time.sleep(delay)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[Dict]):
+        """
+        Chain and insert a batch in one transaction, with a checkpoint every `checkpoint_every`
+        entries and the signed chain head. On failure the transaction is rolled back.
+        """
+        last_hash = self._last_hash
+        since_checkpoint = self._since_checkpoint
+        with self._lock:
+            cursor = self._conn.cursor()
+            try:
+                rows = []
+                for i, log_entry in enumerate(batch):
+                    log_entry["prev_hash"] = last_hash
+                    last_hash = self._generate_hash(log_entry)
+                    rows.append(tuple(log_entry[field] for field in LOG_FIELDS) + (last_hash, log_entry["prev_hash"]))
+                    since_checkpoint += 1
+                    if since_checkpoint < self.checkpoint_every and i < len(batch) - 1:
+                        continue
+                    cursor.executemany("""
+                        INSERT INTO audit_log (timestamp, user_id, username, role, action,
+                        data_id, data_type, reason, ip_address, region, hash, prev_hash)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, rows)
+                    rows = []
+                    if since_checkpoint >= self.checkpoint_every:
+                        self._insert_checkpoint(cursor, last_hash)
+                        since_checkpoint = 0
+                self._update_head(cursor, last_hash)
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+        self._last_hash = last_hash
+        self._since_checkpoint = since_checkpoint
+        logging.info(f"Committed {len(batch)} data access events.")
+
+    def _insert_checkpoint(self, cursor: sqlite3.Cursor, last_hash: str):
+        last_log_id = cursor.execute("SELECT MAX(id) FROM audit_log").fetchone()[0]
+        entry_count = cursor.execute("SELECT COUNT(*) FROM audit_log").fetchone()[0]
+        cursor.execute("""
+            INSERT INTO audit_checkpoint (last_log_id, last_hash, entry_count, created_at, signature)
+            VALUES (?, ?, ?, ?, ?)
+        """, (
+            last_log_id, last_hash, entry_count, datetime.utcnow().isoformat(),
+            self._sign_checkpoint(last_log_id, last_hash, entry_count)
+        ))
+
+    def _update_head(self, cursor: sqlite3.Cursor, last_hash: str):
+        last_log_id = cursor.execute("SELECT MAX(id) FROM audit_log").fetchone()[0]
+        cursor.execute(
+            "INSERT OR REPLACE INTO audit_head (id, last_log_id, last_hash, signature) VALUES (1, ?, ?, ?)",
+            (last_log_id, last_hash, self._sign_checkpoint(last_log_id, last_hash, 0))
+        )
+
+    def flush(self):
+        """Block until every queued event has been committed."""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending events and close the database connection."""
+        atexit.unregister(self.close)
+        self._queue.put(None)
+        self._writer.join()
+        with self._lock:
+            self._conn.close()
+
+    def get_logs(
+        self, limit: Optional[int] = 100, user_id: Optional[str] = None,
+        since: Optional[str] = None, until: Optional[str] = None
+    ) -> list:
         """
         Retrieve audit logs.
 
         Args:
             limit (Optional[int]): Number of logs to fetch (default 100).
+            user_id (Optional[str]): Only logs of this user.
+            since (Optional[str]): Only logs at or after this ISO timestamp.
+            until (Optional[str]): Only logs before this ISO timestamp.
 
         Returns:
             list: A list of dictionaries containing log entries.
         """
-        with sqlite3.connect(DB_FILE) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT timestamp, user_id, username, role, action, data_id, 
-                data_type, reason, ip_address, region, hash 
-                FROM audit_log ORDER BY timestamp DESC LIMIT ?
-            """, (limit,))
+        self.flush()
+        conditions, params = [], []
+        if user_id is not None:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("timestamp < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute(f"""
+                SELECT timestamp, user_id, username, role, action, data_id,
+                data_type, reason, ip_address, region, hash
+                FROM audit_log {where} ORDER BY timestamp DESC LIMIT ?
+            """, (*params, -1 if limit is None else limit))
             logs = cursor.fetchall()
 
         return [
@@ -139,44 +365,77 @@ class DataAccessAuditTrail:
             for log in logs
         ]
 
-    def detect_tampering(self) -> list:
+    def detect_tampering(self, full: bool = False) -> list:
         """
         Detect any tampered audit logs.
 
+        Checks the signature and anchor row of every checkpoint and that the newest row
+        is the signed chain head, then re-verifies the chain from the last verified
+        checkpoint onwards (or from the genesis hash, if `full` or there is no signing key).
+        Rows covered by an earlier verification are only re-hashed when `full` is set.
+
+        Args:
+            full (bool): Re-verify the whole log instead of resuming from a checkpoint.
+
         Returns:
-            list: A list of tampered records.
+            list: A list of tampered records, each with an "issue" description.
         """
+        self.flush()
         tampered_logs = []
-        with sqlite3.connect(DB_FILE) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT timestamp, user_id, username, role, action, data_id, 
-                data_type, reason, ip_address, region, hash 
-                FROM audit_log
-            """)
-            logs = cursor.fetchall()
+        with self._lock:
+            checkpoints = self._conn.execute("""
+                SELECT c.id, c.last_log_id, c.last_hash, c.entry_count, c.signature, c.verified_at, l.hash
+                FROM audit_checkpoint c LEFT JOIN audit_log l ON l.id = c.last_log_id
+                ORDER BY c.id
+            """).fetchall()
+            head = self._conn.execute("SELECT last_log_id, last_hash, signature FROM audit_head").fetchone()
+            newest = self._conn.execute("SELECT id, hash FROM audit_log ORDER BY id DESC LIMIT 1").fetchone()
 
-        for log in logs:
-            log_entry = {
-                "timestamp": log[0],
-                "user_id": log[1],
-                "username": log[2],
-                "role": log[3],
-                "action": log[4],
-                "data_id": log[5],
-                "data_type": log[6],
-                "reason": log[7],
-                "ip_address": log[8],
-                "region": log[9]
-            }
-            recalculated_hash = self._generate_hash(log_entry)
+        if head is not None:
+            head_id, head_hash, head_signature = head
+            if not hmac.compare_digest(head_signature, self._sign_checkpoint(head_id, head_hash, 0)):
+                tampered_logs.append({"id": head_id, "issue": "chain head signature mismatch"})
+            elif newest is None or tuple(newest) != (head_id, head_hash):
+                tampered_logs.append({"id": head_id, "issue": "chain head mismatch (newest rows deleted or appended)"})
 
-            if recalculated_hash != log[10]:
-                tampered_logs.append(log_entry)
+        resume_id, resume_hash = 0, GENESIS_HASH
+        for cp_id, last_log_id, last_hash, entry_count, signature, verified_at, row_hash in checkpoints:
+            if not hmac.compare_digest(signature, self._sign_checkpoint(last_log_id, last_hash, entry_count)):
+                tampered_logs.append({"id": last_log_id, "issue": f"checkpoint {cp_id} signature mismatch"})
+            elif row_hash != last_hash:
+                tampered_logs.append({"id": last_log_id, "issue": f"checkpoint {cp_id} anchor row altered or deleted"})
+            elif verified_at and not full and self._signed and not tampered_logs:
+                resume_id, resume_hash = last_log_id, last_hash
+
+        with self._lock:
+            logs = self._conn.execute(f"""
+                SELECT id, {', '.join(LOG_FIELDS)}, hash, prev_hash
+                FROM audit_log WHERE id > ? ORDER BY id
+            """, (resume_id,)).fetchall()
+        self.last_verification_scanned = len(logs)
+
+        expected_prev = resume_hash
+        for log in logs:
+            log_entry = dict(zip(LOG_FIELDS, log[1:11]))
+            stored_hash, prev_hash = log[11], log[12]
+            if prev_hash is not None:
+                log_entry["prev_hash"] = prev_hash
+            if self._generate_hash(log_entry) != stored_hash:
+                tampered_logs.append({"id": log[0], **log_entry, "issue": "hash mismatch"})
+            elif prev_hash is not None and prev_hash != expected_prev:
+                tampered_logs.append({"id": log[0], **log_entry, "issue": "chain broken (row deleted or inserted before it)"})
+            expected_prev = stored_hash
 
         if tampered_logs:
             logging.warning(f"⚠️ Detected {len(tampered_logs)} tampered records!")
         else:
+            with self._lock:
+                # Only checkpoints covered by this scan; the writer may have added more since
+                self._conn.execute(
+                    "UPDATE audit_checkpoint SET verified_at = ? WHERE verified_at IS NULL AND last_log_id <= ?",
+                    (datetime.utcnow().isoformat(), logs[-1][0] if logs else resume_id)
+                )
+                self._conn.commit()
             logging.info("✅ No tampered records detected.")
 
         return tampered_logs
@@ -208,3 +467,5 @@ if __name__ == "__main__":
     if tampered:
         print("\n⚠️ Tampered Records Found:")
         print(json.dumps(tampered, indent=4))
+
+    audit_trail.close()
@@ -11,7 +11,8 @@ from datetime import datetime
 from kafka import KafkaProducer, KafkaConsumer
 from celery import Celery
 from typing import Dict, List, Optional
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
+from backend.db_helpers import bulk_ingest
 
 # Configure Logging
 logging.basicConfig(
@@ -106,13 +107,16 @@ class DataAggregationPipeline:
         return normalized_data
 
     def store_data(self, data: List[Dict]):
-        """Stores normalized data in PostgreSQL."""
+        """Stores normalized data in PostgreSQL using batched COPY."""
         if not data:
             return
 
-        df = pd.DataFrame(data)
-        df.to_sql("aggregated_data", con=engine, if_exists="append", index=False)
-        logging.info(f"✅ Stored {len(data)} records in database.")
+        if not inspect(engine).has_table("aggregated_data"):
+            pd.DataFrame(data).head(0).to_sql("aggregated_data", con=engine, index=False)
+        # Like to_sql, keep every key that appears in any record, not just the first
+        columns = list(dict.fromkeys(key for record in data for key in record))
+        batch_counts = bulk_ingest("aggregated_data", data, columns=columns, bind=engine)
+        logging.info(f"✅ Stored {sum(batch_counts)} records in database ({len(batch_counts)} batches).")
 
     def push_to_kafka(self, data: List[Dict]):
         """Pushes data to Kafka for distributed processing."""
@@ -129,6 +129,72 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def add_rlg_data_bulk(self, records, batch_size=10000):
+        """
+        Adds many RLGData records, committing once per batch instead of once per record.
+
+        Parameters:
+            records (iterable): Dictionaries with a 'title' and optional 'sentiment' and 'region'.
+            batch_size (int): Number of records inserted per multi-row INSERT and commit.
+
+        Returns:
+            list: Number of records inserted per batch.
+        """
+        defaults = {"sentiment": "neutral", "region": "default"}
+        return self._bulk_insert(RLGData, records, defaults, batch_size)
+
+    def add_rlg_fans_bulk(self, records, batch_size=10000):
+        """
+        Adds many RLGFans records, committing once per batch instead of once per record.
+
+        Parameters:
+            records (iterable): Dictionaries with 'content' and optional 'engagement' and 'region'.
+            batch_size (int): Number of records inserted per multi-row INSERT and commit.
+
+        Returns:
+            list: Number of records inserted per batch.
+        """
+        defaults = {"engagement": 0.0, "region": "default"}
+        return self._bulk_insert(RLGFans, records, defaults, batch_size)
+
+    def _bulk_insert(self, model, records, defaults, batch_size):
+        """
+        Inserts records through a Core INSERT, which SQLAlchemy sends as multi-row VALUES batches.
+
+        Parameters:
+            model: The model class to insert into.
+            records (iterable): Dictionaries of column values.
+            defaults (dict): Values of columns missing from a record.
+            batch_size (int): Number of records per batch.
+
+        Returns:
+            list: Number of records inserted per batch.
+        """
+        counts = []
+        session = self.get_session()
+        statement = model.__table__.insert()
+        try:
+            batch = []
+            for record in records:
+                batch.append({**defaults, "scraped_at": datetime.utcnow(), **record})
+                if len(batch) >= batch_size:
+                    session.execute(statement, batch)
+                    session.commit()
+                    counts.append(len(batch))
+                    batch = []
+            if batch:
+                session.execute(statement, batch)
+                session.commit()
+                counts.append(len(batch))
+            logger.info(f"Bulk added {sum(counts)} {model.__name__} records in {len(counts)} batches.")
+            return counts
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error bulk adding {model.__name__} records after {sum(counts)} records: {e}")
+            raise
+        finally:
+            session.close()
+
     def add_rlg_fans(self, content, engagement=0.0, region="default"):
         """
         Adds a new RLGFans record to the database.
@@ -155,12 +221,13 @@ class DatabaseManager:
         finally:
             session.close()
 
-    def query_rlg_data(self, region=None):
+    def query_rlg_data(self, region=None, since=None):
         """
         Queries RLGData records from the database.
 
         Parameters:
             region (str, optional): Filter results by region.
+            since (datetime, optional): Only return records scraped at or after this time.
         
         Returns:
             list: List of RLGData records.
@@ -170,6 +237,8 @@ class DatabaseManager:
             query = session.query(RLGData)
             if region:
                 query = query.filter(RLGData.region == region)
+            if since:
+                query = query.filter(RLGData.scraped_at >= since)
             results = query.all()
             logger.info(f"Queried {len(results)} RLGData records for region: {region}")
             return results
@@ -179,12 +248,13 @@ class DatabaseManager:
         finally:
             session.close()
 
-    def query_rlg_fans(self, region=None):
+    def query_rlg_fans(self, region=None, since=None):
         """
         Queries RLGFans records from the database.
 
         Parameters:
             region (str, optional): Filter results by region.
+            since (datetime, optional): Only return records scraped at or after this time.
         
         Returns:
             list: List of RLGFans records.
@@ -194,6 +264,8 @@ class DatabaseManager:
             query = session.query(RLGFans)
             if region:
                 query = query.filter(RLGFans.region == region)
+            if since:
+                query = query.filter(RLGFans.scraped_at >= since)
             results = query.all()
             logger.info(f"Queried {len(results)} RLGFans records for region: {region}")
             return results
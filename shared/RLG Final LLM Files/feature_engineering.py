@@ -5,7 +5,9 @@ import numpy as np
 from sklearn.preprocessing import LabelEncoder, StandardScaler, MinMaxScaler
 from sklearn.decomposition import PCA
 from sklearn.feature_selection import SelectKBest, f_classif
+import os
 import logging
+import joblib
 from your_project_name.config import FEATURE_ENGINEERING_CONFIG
 from your_project_name.data_cleaning import clean_data
 from your_project_name.error_handling import handle_error
@@ -18,11 +20,190 @@ logger = logging.getLogger(__name__)
 PLATFORM_LIST = ['OnlyFans', 'Patreon', 'Fansly', 'Instagram', 'TikTok', 'YouTube']
 SCALING_METHOD = 'standard'  # Options: 'standard', 'minmax'
 FEATURE_SELECTION_METHOD = 'kbest'  # Options: 'kbest', 'pca'
+FEATURE_SELECTION_K = 'all'  # Number of features kept by 'kbest'
+PCA_VARIANCE = 0.95  # Variance preserved by 'pca'
+TRANSFORM_CHUNK_SIZE = 100_000  # Rows per chunk for chunked transforms
+PIPELINE_PATH = FEATURE_ENGINEERING_CONFIG.get('PIPELINE_PATH', FEATURE_ENGINEERING_CONFIG['FEATURES_PATH'])
 
 
-def generate_features(platforms=PLATFORM_LIST, start_date=None, end_date=None, scaling_method=SCALING_METHOD, feature_selection_method=FEATURE_SELECTION_METHOD):
+class FeaturePipeline:
+    """
+    Fit-once feature pipeline shared by training and inference.
+
+    fit() learns the scaling parameters and the selected features from training data.
+    transform() only applies them, using vectorized NumPy operations on a single output
+    array (no intermediate DataFrame copies), so single-row inference payloads get exactly
+    the same features the model was trained on. The fitted pipeline is saved with the
+    model version it was trained for.
+    """
+
+    DERIVED_FEATURES = ['engagement_rate', 'avg_interaction_per_post']
+
+    def __init__(self, scaling_method=SCALING_METHOD, feature_selection_method=FEATURE_SELECTION_METHOD, k=FEATURE_SELECTION_K):
+        if scaling_method not in ('standard', 'minmax'):
+            raise ValueError("Invalid scaling method. Use 'standard' or 'minmax'.")
+        if feature_selection_method not in ('kbest', 'pca'):
+            raise ValueError("Invalid feature selection method. Use 'kbest' or 'pca'.")
+
+        self.scaling_method = scaling_method
+        self.feature_selection_method = feature_selection_method
+        self.k = k
+        self.input_columns = None
+        self.offset_ = None
+        self.scale_ = None
+        self.selected_indices_ = None
+        self.pca_ = None
+        self.output_columns = None
+
+    @property
+    def is_fitted(self):
+        return self.offset_ is not None
+
+    def _feature_matrix(self, data):
+        """
+        Build the raw feature matrix (input numeric columns + derived features) in one array.
+        """
+        n_inputs = len(self.input_columns)
+        matrix = np.empty((len(data), n_inputs + len(self.DERIVED_FEATURES)), dtype=np.float64)
+        for position, column in enumerate(self.input_columns):
+            matrix[:, position] = data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        likes = data['likes'].to_numpy(dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(likes, data['followers'].to_numpy(dtype=np.float64), out=matrix[:, n_inputs])
+            np.divide(likes, data['posts'].to_numpy(dtype=np.float64), out=matrix[:, n_inputs + 1])
+        return matrix
+
+    def fit(self, data, target=None):
+        """
+        Learn scaling parameters and feature selection from training data.
+
+        Args:
+            data (DataFrame): Cleaned training data.
+            target (array-like): Optional labels used by 'kbest' selection.
+
+        Returns:
+            FeaturePipeline: The fitted pipeline.
+        """
+        self.input_columns = [
+            column for column in data.select_dtypes(include=np.number).columns
+            if column not in self.DERIVED_FEATURES
+        ]
+        matrix = self._feature_matrix(data)
+        feature_names = self.input_columns + self.DERIVED_FEATURES
+
+        if self.scaling_method == 'standard':
+            self.offset_ = np.nanmean(matrix, axis=0)
+            scale = np.nanstd(matrix, axis=0)
+        else:
+            self.offset_ = np.nanmin(matrix, axis=0)
+            scale = np.nanmax(matrix, axis=0) - self.offset_
+        scale[scale == 0] = 1.0  # Constant columns are left unscaled, as sklearn does
+        self.scale_ = scale
+
+        scaled = (matrix - self.offset_) / self.scale_
+
+        if self.feature_selection_method == 'kbest':
+            if target is None or self.k == 'all':
+                self.selected_indices_ = np.arange(len(feature_names))
+            else:
+                selector = SelectKBest(score_func=f_classif, k=self.k).fit(np.nan_to_num(scaled), target)
+                self.selected_indices_ = np.flatnonzero(selector.get_support())
+            self.output_columns = [feature_names[i] for i in self.selected_indices_]
+        else:
+            self.pca_ = PCA(n_components=PCA_VARIANCE).fit(np.nan_to_num(scaled))
+            self.output_columns = [f'PCA_{i+1}' for i in range(self.pca_.n_components_)]
+
+        logger.info(f"Feature pipeline fitted on {len(data)} rows with {len(self.output_columns)} output features")
+        return self
+
+    def transform(self, data):
+        """
+        Apply the fitted pipeline (transform only).
+
+        Args:
+            data (DataFrame): Data with the same input columns used at fit time.
+
+        Returns:
+            DataFrame: Engineered features in the training column order.
+        """
+        if not self.is_fitted:
+            raise RuntimeError("FeaturePipeline must be fitted before transform.")
+
+        matrix = self._feature_matrix(data)
+        matrix -= self.offset_
+        matrix /= self.scale_
+
+        if self.pca_ is not None:
+            np.nan_to_num(matrix, copy=False)
+            matrix -= self.pca_.mean_
+            output = matrix @ self.pca_.components_.T
+        else:
+            output = matrix[:, self.selected_indices_]
+
+        return pd.DataFrame(output, columns=self.output_columns, index=data.index)
+
+    def fit_transform(self, data, target=None):
+        return self.fit(data, target).transform(data)
+
+    def transform_chunked(self, data, chunk_size=TRANSFORM_CHUNK_SIZE):
+        """
+        Transform a large DataFrame in row chunks to bound peak memory.
+
+        Args:
+            data (DataFrame): Data to transform.
+            chunk_size (int): Rows per chunk.
+
+        Yields:
+            DataFrame: Engineered features for each chunk.
+        """
+        for start in range(0, len(data), chunk_size):
+            yield self.transform(data.iloc[start:start + chunk_size])
+
+
+def save_feature_pipeline(pipeline, model_version):
+    """
+    Save a fitted feature pipeline next to the model version it was trained for.
+
+    Args:
+        pipeline (FeaturePipeline): The fitted pipeline.
+        model_version (int): Version of the model trained on its features.
+
+    Returns:
+        str: Path of the saved pipeline.
+    """
+    os.makedirs(PIPELINE_PATH, exist_ok=True)
+    pipeline_path = os.path.join(PIPELINE_PATH, f"feature_pipeline_v{model_version}.pkl")
+    tmp_path = f"{pipeline_path}.tmp"
+    joblib.dump(pipeline, tmp_path)
+    os.replace(tmp_path, pipeline_path)
+    logger.info(f"Feature pipeline for model version {model_version} saved to: {pipeline_path}")
+    return pipeline_path
+
+
+def load_feature_pipeline(model_version):
+    """
+    Load the feature pipeline saved for a model version.
+
+    Args:
+        model_version (int): Model version.
+
+    Returns:
+        FeaturePipeline: The pipeline, or None if none was saved for that version.
+    """
+    pipeline_path = os.path.join(PIPELINE_PATH, f"feature_pipeline_v{model_version}.pkl")
+    if not os.path.exists(pipeline_path):
+        return None
+    return joblib.load(pipeline_path)
+
+
+def generate_features(platforms=PLATFORM_LIST, start_date=None, end_date=None, scaling_method=SCALING_METHOD, feature_selection_method=FEATURE_SELECTION_METHOD, pipeline=None, return_pipeline=False):
     """
     Generate engineered features for specified platforms and date range.
+
+    All platforms go through one pipeline, so the features match what a deployed model
+    sees at inference. The features DataFrame holds exactly the pipeline's output columns;
+    the platform of each row is kept in its index.
     
     Args:
         platforms (list): List of platforms to analyze.
@@ -30,14 +211,17 @@ def generate_features(platforms=PLATFORM_LIST, start_date=None, end_date=None, s
         end_date (str): Optional end date for filtering the data (format: 'YYYY-MM-DD').
         scaling_method (str): Method for scaling data ('standard' or 'minmax').
         feature_selection_method (str): Method for feature selection ('kbest' or 'pca').
+        pipeline (FeaturePipeline): Optional fitted pipeline; if given, features are transform-only.
+        return_pipeline (bool): Also return the pipeline, to deploy it with a model trained on the features.
     
     Returns:
-        features_df (DataFrame): DataFrame with engineered features.
+        features_df (DataFrame): DataFrame with engineered features, or
+        (features_df, pipeline) if return_pipeline is set.
     """
     try:
         logger.info(f"Generating features for platforms: {', '.join(platforms)}")
 
-        all_features = []
+        all_data = []
 
         for platform in platforms:
             # Step 1: Fetch and clean data for the platform
@@ -47,24 +231,22 @@ def generate_features(platforms=PLATFORM_LIST, start_date=None, end_date=None, s
                 logger.warning(f"No valid data available for platform: {platform}")
                 continue
 
-            # Step 2: Feature engineering
-            features = perform_feature_engineering(platform_data, platform, scaling_method, feature_selection_method)
-
-            if features is not None:
-                features['platform'] = platform
-                all_features.append(features)
+            all_data.append(platform_data.set_axis(pd.Index([platform] * len(platform_data), name='platform')))
 
-        # Step 3: Combine features from all platforms
-        features_df = pd.concat(all_features, ignore_index=True)
+        # Step 2: Feature engineering over all platforms with one pipeline
+        data = pd.concat(all_data)
+        features_df, pipeline = perform_feature_engineering(
+            data, ', '.join(platforms), scaling_method, feature_selection_method, pipeline, return_pipeline=True
+        )
 
-        # Step 4: Save the engineered features
+        # Step 3: Save the engineered features
         save_engineered_features(features_df)
 
-        return features_df
+        return (features_df, pipeline) if return_pipeline else features_df
 
     except Exception as e:
         handle_error(e)
-        return None
+        return (None, None) if return_pipeline else None
 
 
 def fetch_and_clean_data(platform, start_date=None, end_date=None):
@@ -98,36 +280,39 @@ def fetch_and_clean_data(platform, start_date=None, end_date=None):
         return pd.DataFrame()
 
 
-def perform_feature_engineering(data, platform, scaling_method='standard', feature_selection_method='kbest'):
+def perform_feature_engineering(data, platform, scaling_method='standard', feature_selection_method='kbest', pipeline=None, return_pipeline=False, target=None):
     """
     Perform feature engineering on the cleaned data.
+
+    With a fitted pipeline (inference), the training-time scaling and feature selection are
+    applied transform-only. Without one (training), a new pipeline is fitted on the data;
+    pass return_pipeline to get it back and deploy it with the model.
     
     Args:
         data (DataFrame): The cleaned data for feature engineering.
         platform (str): The platform name for which the feature engineering is performed.
         scaling_method (str): The scaling method ('standard' or 'minmax').
         feature_selection_method (str): The feature selection method ('kbest' or 'pca').
+        pipeline (FeaturePipeline): Optional fitted pipeline to apply.
+        return_pipeline (bool): Also return the (fitted) pipeline.
+        target (array-like): Optional labels for 'kbest' selection when fitting.
     
     Returns:
-        engineered_features (DataFrame): DataFrame with engineered features.
+        engineered_features (DataFrame): DataFrame with engineered features, or
+        (engineered_features, pipeline) if return_pipeline is set.
     """
     try:
         logger.info(f"Performing feature engineering for platform: {platform}")
 
-        # Step 1: Basic feature extraction (e.g., creating new columns or aggregations)
-        engineered_data = extract_basic_features(data)
-
-        # Step 2: Scaling the features
-        scaled_data = scale_data(engineered_data, scaling_method)
-
-        # Step 3: Feature selection
-        final_features = select_features(scaled_data, feature_selection_method)
-
-        return final_features
+        if pipeline is None or not pipeline.is_fitted:
+            # Basic feature extraction, scaling and feature selection in one fitted pipeline
+            pipeline = FeaturePipeline(scaling_method, feature_selection_method).fit(data, target)
+        features = pipeline.transform(data)
+        return (features, pipeline) if return_pipeline else features
 
     except Exception as e:
         handle_error(e)
-        return pd.DataFrame()
+        return (pd.DataFrame(), None) if return_pipeline else pd.DataFrame()
 
 
 def extract_basic_features(data):
@@ -243,7 +428,7 @@ def save_engineered_features(features_df):
         file_name = f"engineered_features_{pd.Timestamp.now().strftime('%Y-%m-%d_%H-%M-%S')}.csv"
         features_path = f"{FEATURE_ENGINEERING_CONFIG['FEATURES_PATH']}/{file_name}"
         
-        features_df.to_csv(features_path, index=False)
+        features_df.to_csv(features_path, index=features_df.index.name is not None)
 
         logger.info(f"Engineered features saved to: {features_path}")
 
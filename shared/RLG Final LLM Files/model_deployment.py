@@ -3,13 +3,15 @@
 import os
 import pickle
 import logging
-from sklearn.externals import joblib
+import joblib
+import pandas as pd
 from flask import Flask, request, jsonify
 from your_project_name.config import MODEL_DEPLOYMENT_CONFIG
-from your_project_name.feature_engineering import generate_features
+from your_project_name.feature_engineering import generate_features, save_feature_pipeline
 from your_project_name.model_training import load_trained_model, retrain_model
 from your_project_name.error_handling import handle_error
 from your_project_name.analytics_dashboard import update_dashboard_with_model_metrics
+from your_project_name.model_server import model_server
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -47,25 +49,39 @@ def load_model():
         return None
 
 
-def deploy_model(model):
+def deploy_model(model, feature_pipeline=None):
     """
     Deploy the trained model by saving it to the appropriate directory.
 
     Args:
         model: The trained model object to be deployed.
+        feature_pipeline (FeaturePipeline): Optional fitted feature pipeline, versioned with the model.
     """
     try:
         model_file_path = os.path.join(MODEL_PATH, CURRENT_MODEL_FILE)
-        joblib.dump(model, model_file_path)
+
+        # Write to a temporary file and rename, so the model server never loads a partial file.
+        # The dump is left uncompressed so the server can memory-map its arrays.
+        tmp_model_path = f"{model_file_path}.tmp"
+        joblib.dump(model, tmp_model_path)
+        os.replace(tmp_model_path, model_file_path)
         logger.info(f"Model deployed and saved to {model_file_path}")
 
-        # Update the model version file
+        # Update the model version file (the model server watches this file to hot-swap)
         model_version = get_model_version() + 1
-        with open(os.path.join(MODEL_PATH, MODEL_VERSION_FILE), 'w') as version_file:
+        if feature_pipeline is not None:
+            # Saved before the version bump so the server always finds the matching pipeline
+            save_feature_pipeline(feature_pipeline, model_version)
+        version_file_path = os.path.join(MODEL_PATH, MODEL_VERSION_FILE)
+        with open(f"{version_file_path}.tmp", 'w') as version_file:
             version_file.write(str(model_version))
+        os.replace(f"{version_file_path}.tmp", version_file_path)
 
         logger.info(f"Model version updated to {model_version}")
 
+        # Swap the new model in immediately rather than waiting for the next version poll
+        model_server.reload()
+
         # Optionally update dashboard or system with new model metrics
         update_dashboard_with_model_metrics(model)
     
@@ -96,7 +112,10 @@ def get_model_version():
 @app.route('/predict', methods=['POST'])
 def predict():
     """
-    API endpoint to handle predictions using the deployed model.
+    API endpoint to handle predictions using the memory-resident model.
+
+    Accepts either a single "platform_data" object or a "batch" list of them.
+    Concurrent requests are micro-batched into one model call by the model server.
 
     Returns:
         json: The prediction result as a JSON response.
@@ -108,19 +127,28 @@ def predict():
         if not data:
             return jsonify({"error": "No input data provided."}), 400
         
-        # Generate features from the input data
-        platform_data = data.get('platform_data', {})
-        model = load_model()
-        
-        if model is None:
+        model_server.start()
+        if model_server.version is None:
             return jsonify({"error": "Model not found."}), 500
-        
-        features = generate_features(platform_data=platform_data)
+
+        # Generate features from the input data. With a deployed feature pipeline the
+        # training-time scaling/selection is applied transform-only.
+        feature_pipeline = model_server.feature_pipeline
+        if feature_pipeline is not None:
+            rows = data['batch'] if 'batch' in data else [data.get('platform_data', {})]
+            features = feature_pipeline.transform(pd.DataFrame.from_records(rows))
+        elif 'batch' in data:
+            features = pd.concat(
+                [generate_features(platform_data=platform_data) for platform_data in data['batch']],
+                ignore_index=True
+            )
+        else:
+            features = generate_features(platform_data=data.get('platform_data', {}))
         
         # Perform prediction
-        prediction = model.predict(features)
+        prediction, model_version = model_server.predict(features)
         
-        return jsonify({"prediction": prediction.tolist()}), 200
+        return jsonify({"prediction": prediction.tolist(), "model_version": model_version}), 200
 
     except Exception as e:
         handle_error(e)
@@ -145,10 +173,12 @@ def retrain():
         
         # Load the new training data (this could be from a database or new batch of features)
         training_data = new_data.get('training_data', {})
-        retrained_model = retrain_model(training_data)
+        retrained = retrain_model(training_data)
+        if retrained is None:
+            return jsonify({"error": "Retraining failed."}), 500
         
-        # Deploy the retrained model
-        deploy_model(retrained_model)
+        # Deploy the retrained model with the feature pipeline it was trained on
+        deploy_model(retrained['model'], retrained['feature_pipeline'])
 
         return jsonify({"message": "Model retrained and deployed successfully."}), 200
 
@@ -171,7 +201,9 @@ def model_status():
         
         return jsonify({
             "model_version": model_version,
-            "status": model_status
+            "served_model_version": model_server.version,
+            "status": model_status,
+            "serving_metrics": model_server.get_metrics()
         }), 200
 
     except Exception as e:
@@ -197,4 +229,5 @@ def update_model_metrics():
 if __name__ == "__main__":
     # Run the Flask app for the model deployment API
     logger.info("Starting model deployment API server...")
+    model_server.start()
     app.run(host='0.0.0.0', port=5000, debug=True)
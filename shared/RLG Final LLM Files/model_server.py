@@ -0,0 +1,275 @@
+# model_server.py
+
+import os
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+import pandas as pd
+import joblib
+from your_project_name.config import MODEL_DEPLOYMENT_CONFIG
+from your_project_name.error_handling import handle_error
+from your_project_name.feature_engineering import load_feature_pipeline
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Model locations (shared with model_deployment)
+MODEL_PATH = MODEL_DEPLOYMENT_CONFIG['MODEL_PATH']
+CURRENT_MODEL_FILE = 'current_model.pkl'
+MODEL_VERSION_FILE = 'model_version.txt'
+
+# Serving settings
+VERSION_POLL_INTERVAL = MODEL_DEPLOYMENT_CONFIG.get('VERSION_POLL_INTERVAL', 1.0)  # seconds
+MAX_BATCH_SIZE = MODEL_DEPLOYMENT_CONFIG.get('MAX_BATCH_SIZE', 64)  # rows per model.predict call
+MAX_BATCH_WAIT_MS = MODEL_DEPLOYMENT_CONFIG.get('MAX_BATCH_WAIT_MS', 5)  # how long to wait for more requests
+LATENCY_WINDOW = 1000  # latency samples kept per model version
+
+
+class ModelServer:
+    """
+    Keeps the current model memory-resident and hot-swaps new versions.
+
+    The model is loaded with joblib memory-mapping, so large NumPy arrays are paged in from
+    the file instead of copied onto the heap. A watcher thread polls MODEL_VERSION_FILE and
+    atomically swaps in a new model when the version changes. Concurrent prediction requests
+    with the same columns are micro-batched into a single model.predict call; if that call
+    fails, each request is predicted on its own so one bad request only fails itself.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, max_batch_size=MAX_BATCH_SIZE, max_batch_wait_ms=MAX_BATCH_WAIT_MS,
+                 poll_interval=VERSION_POLL_INTERVAL):
+        self.model_path = model_path
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait_ms / 1000.0
+        self.poll_interval = poll_interval
+
+        # (version, model, feature pipeline) is swapped as a single reference,
+        # so readers never see a half-loaded model or a pipeline from another version
+        self._current = (None, None, None)
+        self._swap_lock = threading.Lock()
+        self._requests = queue.Queue()
+        self._metrics = {}
+        self._metrics_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        """
+        Load the current model and start the batching and version-watcher threads (idempotent).
+        """
+        with self._start_lock:
+            if self._threads:
+                return
+            self.reload()
+            for target in (self._batch_loop, self._watch_loop):
+                thread = threading.Thread(target=target, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        logger.info(f"Model server started with model version {self.version}")
+
+    def stop(self):
+        """
+        Stop the batching and version-watcher threads and wait for them to exit; start() can be called again.
+        """
+        with self._start_lock:
+            if not self._threads:
+                return
+            self._stop.set()
+            self._requests.put(None)  # wakes the batch loop if it is waiting for a request
+            for thread in self._threads:
+                thread.join()
+            self._threads = []
+            self._stop.clear()
+        logger.info("Model server stopped")
+
+    @property
+    def version(self):
+        return self._current[0]
+
+    @property
+    def feature_pipeline(self):
+        """The fitted feature pipeline saved with the served model version (None if there is none)."""
+        return self._current[2]
+
+    def _read_version(self):
+        version_file_path = os.path.join(self.model_path, MODEL_VERSION_FILE)
+        if not os.path.exists(version_file_path):
+            return 0
+        with open(version_file_path, 'r') as version_file:
+            return int(version_file.read().strip() or 0)
+
+    def reload(self):
+        """
+        Load the deployed model if its version differs from the one being served.
+
+        Returns:
+            bool: True if a new model was swapped in.
+        """
+        try:
+            with self._swap_lock:
+                version = self._read_version()
+                if version == self.version:
+                    return False
+
+                model_file_path = os.path.join(self.model_path, CURRENT_MODEL_FILE)
+                if not os.path.exists(model_file_path):
+                    raise FileNotFoundError(f"Model file {CURRENT_MODEL_FILE} not found at {self.model_path}.")
+
+                start = time.perf_counter()
+                # mmap_mode only applies to uncompressed dumps; other objects load normally
+                model = joblib.load(model_file_path, mmap_mode='r')
+                self._current = (version, model, load_feature_pipeline(version))
+                logger.info(f"Model version {version} loaded in {time.perf_counter() - start:.3f}s")
+                return True
+
+        except Exception as e:
+            handle_error(e)
+            return False
+
+    def _watch_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            self.reload()
+
+    def predict(self, features, timeout=None):
+        """
+        Predict a batch of rows, sharing a model call with other concurrent requests.
+
+        Args:
+            features (DataFrame or array-like): One or more feature rows.
+            timeout (float): Optional seconds to wait for the result.
+
+        Returns:
+            tuple: (predictions as a NumPy array, model version used).
+
+        Raises:
+            ValueError: If the features are empty or not a 2-D table of rows.
+        """
+        features = self._validate(features)
+        future = Future()
+        self._requests.put((features, future, time.perf_counter()))
+        return future.result(timeout=timeout)
+
+    @staticmethod
+    def _validate(features):
+        """Rejects a malformed request before it can share a batch with others."""
+        if not isinstance(features, pd.DataFrame):
+            features = np.asarray(features)
+            if features.ndim != 2:
+                raise ValueError(f"Expected 2-D feature rows, got an array of shape {features.shape}.")
+        if len(features) == 0:
+            raise ValueError("No feature rows to predict.")
+        return features
+
+    @staticmethod
+    def _signature(features):
+        """Requests can only be stacked with others that have the same columns."""
+        if isinstance(features, pd.DataFrame):
+            return ("columns", tuple(features.columns))
+        return ("width", features.shape[1])
+
+    def _collect_batch(self):
+        first = self._requests.get()
+        if first is None:
+            return []
+        batch, rows = [first], len(first[0])
+        deadline = time.perf_counter() + self.max_batch_wait
+        while rows < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    def _batch_loop(self):
+        while not self._stop.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            version, model, _ = self._current
+            if model is None:
+                error = RuntimeError("Model not found.")
+                for _, future, _ in batch:
+                    future.set_exception(error)
+                continue
+
+            groups = {}
+            for item in batch:
+                groups.setdefault(self._signature(item[0]), []).append(item)
+            for group in groups.values():
+                self._predict_group(model, version, group)
+
+    def _predict_group(self, model, version, group):
+        """Predicts requests with the same columns in one call, falling back to one call per request."""
+        inputs = [features for features, _, _ in group]
+        try:
+            if isinstance(inputs[0], pd.DataFrame):
+                stacked = pd.concat(inputs, ignore_index=True)
+            else:
+                stacked = np.vstack(inputs)
+            predictions = np.asarray(model.predict(stacked))
+            if len(predictions) != len(stacked):
+                raise ValueError(f"Model returned {len(predictions)} predictions for {len(stacked)} rows.")
+        except Exception as e:
+            if len(group) == 1:
+                group[0][1].set_exception(e)
+                return
+            logger.warning(f"Batched predict of {len(group)} requests failed ({e}); predicting them one by one.")
+            for item in group:
+                self._predict_group(model, version, [item])
+            return
+
+        offset = 0
+        for features, future, _ in group:
+            future.set_result((predictions[offset:offset + len(features)], version))
+            offset += len(features)
+        finished = time.perf_counter()
+        self._record(version, [finished - enqueued for _, _, enqueued in group], len(stacked))
+
+    def _record(self, version, latencies, rows):
+        with self._metrics_lock:
+            stats = self._metrics.setdefault(version, {
+                "requests": 0, "rows": 0, "batches": 0, "latencies": deque(maxlen=LATENCY_WINDOW)
+            })
+            stats["requests"] += len(latencies)
+            stats["rows"] += rows
+            stats["batches"] += 1
+            stats["latencies"].extend(latencies)
+
+    def get_metrics(self):
+        """
+        Per-version request counts, rows, batches and latency percentiles (milliseconds).
+
+        Returns:
+            dict: Metrics keyed by model version.
+        """
+        with self._metrics_lock:
+            metrics = {}
+            for version, stats in self._metrics.items():
+                latencies = np.array(stats["latencies"]) * 1000
+                metrics[str(version)] = {
+                    "requests": stats["requests"],
+                    "rows": stats["rows"],
+                    "batches": stats["batches"],
+                    "avg_batch_rows": stats["rows"] / stats["batches"],
+                    "latency_p50_ms": float(np.percentile(latencies, 50)),
+                    "latency_p95_ms": float(np.percentile(latencies, 95)),
+                    "latency_p99_ms": float(np.percentile(latencies, 99)),
+                }
+            return metrics
+
+
+# Shared server instance used by the deployment API
+model_server = ModelServer()
@@ -8,7 +8,8 @@ from sklearn.metrics import accuracy_score, classification_report
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.externals import joblib
-from your_project_name.feature_engineering import generate_features
+import pandas as pd
+from your_project_name.feature_engineering import generate_features, perform_feature_engineering
 from your_project_name.config import MODEL_TRAINING_CONFIG
 from your_project_name.data_ingestion import load_data
 from your_project_name.error_handling import handle_error
@@ -49,21 +50,22 @@ def load_and_prepare_data():
         return None, None, None, None
 
 
-def train_model(X_train, y_train):
+def train_model(X_train, y_train, scale=True):
     """
     Trains a machine learning model using the training data.
     
     Args:
         X_train (array-like): Features for training.
         y_train (array-like): Target labels for training.
+        scale (bool): Standardize the features first. Off when a feature pipeline already scaled them.
     
     Returns:
         model: The trained machine learning model.
     """
     try:
         # Standardize the data (important for many machine learning algorithms)
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
+        scaler = StandardScaler() if scale else None
+        X_train_scaled = scaler.fit_transform(X_train) if scaler is not None else X_train
         
         # Initialize the model (Random Forest as an example, can be replaced with other models)
         model = RandomForestClassifier(n_estimators=100, random_state=42)
@@ -95,7 +97,7 @@ def evaluate_model(model, scaler, X_test, y_test):
     """
     try:
         # Scale the test data using the same scaler as the training data
-        X_test_scaled = scaler.transform(X_test)
+        X_test_scaled = scaler.transform(X_test) if scaler is not None else X_test
         
         # Make predictions using the trained model
         predictions = model.predict(X_test_scaled)
@@ -144,24 +146,32 @@ def retrain_model(new_data):
     """
     Retrains the model with new data.
 
+    A feature pipeline is fitted on the training split, and the model is trained on its
+    output, so the pipeline must be deployed with the model.
+
     Args:
-        new_data (dict): New training data (features and labels).
+        new_data (dict): New training data: 'features' (platform data records, as sent to
+            /predict) and 'target' (labels).
     
     Returns:
-        model: The retrained machine learning model.
+        dict: The retrained model, its fitted feature pipeline and evaluation metrics.
     """
     try:
         logger.info("Retraining model with new data...")
         
         # Extract features and target from new data
-        features = new_data.get('features', [])
+        features = pd.DataFrame.from_records(new_data.get('features', []))
         target = new_data.get('target', [])
         
         # Split the new data into training and testing sets
         X_train, X_test, y_train, y_test = train_test_split(features, target, test_size=0.2, random_state=42)
+
+        # Fit the feature pipeline on the training split only; the test split is transform-only
+        X_train, feature_pipeline = perform_feature_engineering(X_train, 'retraining', target=y_train, return_pipeline=True)
+        X_test = perform_feature_engineering(X_test, 'retraining', pipeline=feature_pipeline)
         
-        # Train the model with the new data
-        model, scaler = train_model(X_train, y_train)
+        # Train the model with the new data (already scaled by the pipeline)
+        model, scaler = train_model(X_train, y_train, scale=False)
         
         # Evaluate the retrained model
         evaluation_metrics = evaluate_model(model, scaler, X_test, y_test)
@@ -171,6 +181,7 @@ def retrain_model(new_data):
         
         return {
             'model': model,
+            'feature_pipeline': feature_pipeline,
             'evaluation_metrics': evaluation_metrics
         }
     
@@ -7,6 +7,7 @@ from firebase_admin import messaging, credentials
 import logging
 import os
 from typing import List, Dict, Optional
+from backend.notification_dispatcher import NotificationDispatcher, SMTPConnectionPool
 
 
 class NotificationSystem:
@@ -32,6 +33,16 @@ class NotificationSystem:
             cred = credentials.Certificate(self.firebase_credentials_path)
             firebase_admin.initialize_app(cred)
 
+        # Bulk sends reuse SMTP sessions and use batch provider APIs on bounded worker pools
+        self.dispatcher = NotificationDispatcher(
+            smtp_pool=SMTPConnectionPool(self.email_server, self.email_port, self.email_username, self.email_password),
+            sender=self.email_username,
+            sms_client=Client(self.twilio_sid, self.twilio_auth_token) if self.twilio_sid else None,
+            sms_from=self.twilio_phone_number,
+            notify_service_sid=os.getenv("TWILIO_NOTIFY_SERVICE_SID"),
+            push_client=messaging,
+        )
+
         # Set up logging
         logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
 
@@ -119,7 +130,7 @@ class NotificationSystem:
 
     def bulk_send_email(self, recipients: List[str], subject: str, body: str, html: Optional[str] = None) -> Dict[str, bool]:
         """
-        Send emails to multiple recipients.
+        Send emails to multiple recipients, reusing pooled SMTP sessions across the batch.
 
         Args:
             recipients: List of recipient email addresses.
@@ -130,14 +141,11 @@ class NotificationSystem:
         Returns:
             A dictionary with recipient email addresses as keys and success status as values.
         """
-        results = {}
-        for recipient in recipients:
-            results[recipient] = self.send_email(recipient, subject, body, html)
-        return results
+        return self.dispatcher.submit_emails(recipients, subject, body, html).result()
 
     def bulk_send_sms(self, recipients: List[str], message: str) -> Dict[str, bool]:
         """
-        Send SMS to multiple recipients.
+        Send SMS to multiple recipients (batched through Twilio Notify when TWILIO_NOTIFY_SERVICE_SID is set).
 
         Args:
             recipients: List of recipient phone numbers.
@@ -146,14 +154,14 @@ class NotificationSystem:
         Returns:
             A dictionary with recipient phone numbers as keys and success status as values.
         """
-        results = {}
-        for recipient in recipients:
-            results[recipient] = self.send_sms(recipient, message)
-        return results
+        if not self.twilio_sid:
+            logging.error("Failed to send SMS: Twilio credentials are not configured")
+            return dict.fromkeys(recipients, False)
+        return self.dispatcher.submit_sms(recipients, message).result()
 
     def bulk_send_push_notifications(self, device_tokens: List[str], title: str, body: str, data: Optional[Dict] = None) -> Dict[str, bool]:
         """
-        Send push notifications to multiple devices.
+        Send push notifications to multiple devices using FCM multicast.
 
         Args:
             device_tokens: List of device tokens.
@@ -164,10 +172,7 @@ class NotificationSystem:
         Returns:
             A dictionary with device tokens as keys and success status as values.
         """
-        results = {}
-        for token in device_tokens:
-            results[token] = self.send_push_notification(token, title, body, data)
-        return results
+        return self.dispatcher.submit_push(device_tokens, title, body, data).result()
 
 
 # Example Usage
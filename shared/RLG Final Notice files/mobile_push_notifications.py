@@ -4,11 +4,15 @@ from datetime import datetime
 from firebase_admin import messaging, initialize_app, credentials
 from models import User, NotificationLog
 from utils import validate_request_data
+from backend.notification_dispatcher import NotificationDispatcher
 
 # Initialize Firebase Admin SDK
 cred = credentials.Certificate("path/to/firebase_credentials.json")
 initialize_app(cred)
 
+# Bulk sends go through FCM multicast on a bounded worker pool
+push_dispatcher = NotificationDispatcher(push_client=messaging)
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -96,7 +100,7 @@ class MobilePushNotifications:
     @staticmethod
     def send_bulk_notifications(user_ids, title, body, data=None):
         """
-        Sends push notifications to multiple users.
+        Sends push notifications to multiple users using FCM multicast.
         Args:
             user_ids (list): List of recipient user IDs.
             title (str): Notification title.
@@ -105,14 +109,27 @@ class MobilePushNotifications:
         Returns:
             dict: Bulk notification delivery summary.
         """
+        users = User.query.filter(User.id.in_(user_ids)).all()
+        device_tokens = {user.id: user.device_token for user in users if user.device_token}
+        results = push_dispatcher.submit_push(list(set(device_tokens.values())), title, body, data).result()
+
         responses = []
         for user_id in user_ids:
-            try:
-                response = MobilePushNotifications.send_notification(user_id, title, body, data)
-                responses.append({"user_id": user_id, "status": "success", "response": response})
-            except Exception as e:
-                logging.error(f"Failed to send notification to user {user_id}: {e}")
-                responses.append({"user_id": user_id, "status": "failed", "error": str(e)})
+            device_token = device_tokens.get(user_id)
+            if device_token is None or not results.get(device_token):
+                error = "User not found or device token not registered." if device_token is None else "Push delivery failed."
+                logging.error(f"Failed to send notification to user {user_id}: {error}")
+                responses.append({"user_id": user_id, "status": "failed", "error": error})
+                continue
+
+            NotificationLog.create(
+                user_id=user_id,
+                title=title,
+                body=body,
+                data=json.dumps(data or {}),
+                timestamp=datetime.utcnow(),
+            )
+            responses.append({"user_id": user_id, "status": "success", "response": {"message": "Notification sent successfully"}})
 
         return {"summary": responses}
 
@@ -0,0 +1,623 @@
+"""
+Batched multi-channel notification dispatch for RLG Data and RLG Fans.
+
+Bulk email, SMS and push sends are split into batches and handed to a bounded worker
+pool per channel, so the caller gets a Future back immediately and retries (with
+jittered exponential backoff) run on the workers:
+
+- Email reuses pooled SMTP sessions across a batch instead of one session per message.
+- Push uses FCM multicast, up to 500 device tokens per call.
+- SMS uses a Twilio Notify service when one is configured, otherwise one call per
+  recipient spread over the SMS workers.
+
+LocalSMTPSink is a minimal in-process SMTP server used by the throughput benchmark.
+"""
+
+import os
+import json
+import time
+import queue
+import random
+import smtplib
+import logging
+import threading
+import socketserver
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from email.message import Message
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from firebase_admin import messaging
+except ImportError:  # push notifications are optional
+    messaging = None
+
+try:
+    from twilio.rest import Client as TwilioClient
+except ImportError:  # SMS is optional
+    TwilioClient = None
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+FCM_MULTICAST_LIMIT = 500
+TWILIO_NOTIFY_BATCH_SIZE = 1000
+TRANSIENT_PROVIDER_CODES = {"UNAVAILABLE", "INTERNAL", "RESOURCE_EXHAUSTED", "DEADLINE_EXCEEDED", "QUOTA_EXCEEDED"}
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """
+    Decide whether a failed send is worth retrying.
+
+    Args:
+        exc: The exception raised by (or reported for) a send.
+
+    Returns:
+        True for dropped connections, timeouts, SMTP 4xx replies, FCM unavailable/quota
+        errors and HTTP 429/5xx responses, otherwise False.
+    """
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)):
+        return True
+    if getattr(exc, "code", None) in TRANSIENT_PROVIDER_CODES:
+        return True
+    status = getattr(exc, "status", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+def build_email_message(sender: str, recipient: str, subject: str, body: str, html: Optional[str] = None) -> Message:
+    """
+    Build a MIME email message.
+
+    Args:
+        sender: The sender's email address.
+        recipient: The recipient's email address.
+        subject: The subject of the email.
+        body: The plain text body of the email.
+        html: Optional HTML content for the email.
+
+    Returns:
+        The email message.
+    """
+    msg = MIMEMultipart()
+    msg["From"] = sender
+    msg["To"] = recipient
+    msg["Subject"] = subject
+    msg.attach(MIMEText(body, "plain"))
+    if html:
+        msg.attach(MIMEText(html, "html"))
+    return msg
+
+
+class PooledSMTPConnection:
+    """
+    An SMTP session that is reused across messages and reconnects lazily.
+    """
+
+    def __init__(self, pool: "SMTPConnectionPool"):
+        self.pool = pool
+        self.server: Optional[smtplib.SMTP] = None
+        self.sent = 0
+        self.last_used = 0.0
+
+    def send(self, msg: Message) -> None:
+        """
+        Send a message, opening a new session if there is none, the current one has hit
+        the per-session message limit or has been idle long enough to have been dropped.
+
+        Args:
+            msg: The email message to send.
+        """
+        stale = time.monotonic() - self.last_used > self.pool.idle_timeout
+        if self.server is None or self.sent >= self.pool.max_messages_per_connection or stale:
+            self.close()
+            self.server = self.pool.connect()
+            self.sent = 0
+        try:
+            self.server.send_message(msg)
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            raise  # the server rejected this message; the session itself is still usable
+        except (smtplib.SMTPException, OSError):
+            self.close()
+            raise
+        self.sent += 1
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        """Close the session, if open."""
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+        self.server = None
+
+
+class SMTPConnectionPool:
+    """
+    A pool of reusable, authenticated SMTP sessions.
+    """
+
+    def __init__(self, host: str, port: int = 587, username: Optional[str] = None, password: Optional[str] = None,
+                 use_tls: bool = True, timeout: float = 30.0, max_messages_per_connection: int = 100,
+                 idle_timeout: float = 60.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.max_messages_per_connection = max_messages_per_connection
+        self.idle_timeout = idle_timeout
+        self.connections_opened = 0
+        self._idle: "queue.LifoQueue[PooledSMTPConnection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+    def connect(self) -> smtplib.SMTP:
+        """
+        Open and authenticate a new SMTP session.
+
+        Returns:
+            The connected SMTP client.
+        """
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except (smtplib.SMTPException, OSError):
+            server.close()
+            raise
+        with self._lock:
+            self.connections_opened += 1
+        return server
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a session from the pool for the duration of a batch.
+
+        Yields:
+            A PooledSMTPConnection, returned to the pool afterwards.
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = PooledSMTPConnection(self)
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close every idle session."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _gather(futures: List[Future]) -> Future:
+    """Combine futures that each resolve to a dict into one future of the merged dict."""
+    combined: Future = Future()
+    results: Dict = {}
+    errors: List[BaseException] = []
+    remaining = [len(futures)]
+    lock = threading.Lock()
+    if not futures:
+        combined.set_result(results)
+        return combined
+
+    def on_done(future: Future) -> None:
+        with lock:
+            if future.exception() is not None:
+                errors.append(future.exception())
+            else:
+                results.update(future.result())
+            remaining[0] -= 1
+            finished = remaining[0] == 0
+        if finished:
+            if errors:
+                combined.set_exception(errors[0])
+            else:
+                combined.set_result(results)
+
+    for future in futures:
+        future.add_done_callback(on_done)
+    return combined
+
+
+class NotificationDispatcher:
+    """
+    Dispatches bulk email, SMS and push notifications in batches on bounded per-channel worker pools.
+
+    Every submit_* method returns a Future resolving to a dictionary of recipient -> success status.
+    """
+
+    CHANNELS = ("email", "sms", "push")
+
+    def __init__(self, smtp_pool: Optional[SMTPConnectionPool] = None, sender: Optional[str] = None,
+                 sms_client=None, sms_from: Optional[str] = None, notify_service_sid: Optional[str] = None,
+                 push_client=None, concurrency: Optional[Dict[str, int]] = None, email_batch_size: int = 50,
+                 retries: int = 3, base_delay: float = 0.5, max_delay: float = 30.0):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            smtp_pool: Pool of SMTP sessions used for email.
+            sender: The "From" address of emails.
+            sms_client: A Twilio client used for SMS.
+            sms_from: The phone number SMS are sent from.
+            notify_service_sid: Optional Twilio Notify service used to batch SMS.
+            push_client: The FCM messaging module (defaults to firebase_admin.messaging).
+            concurrency: Maximum concurrent workers per channel, e.g. {"email": 4}.
+            email_batch_size: Number of emails sent over one SMTP session per worker task.
+            retries: Number of retries of a transient failure.
+            base_delay: Base delay in seconds of the exponential backoff.
+            max_delay: Upper bound of a single backoff delay, in seconds.
+        """
+        self.smtp_pool = smtp_pool
+        self.sender = sender
+        self.sms_client = sms_client
+        self.sms_from = sms_from
+        self.notify_service_sid = notify_service_sid
+        self.push_client = push_client if push_client is not None else messaging
+        self.email_batch_size = email_batch_size
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        concurrency = {**dict.fromkeys(self.CHANNELS, 4), **(concurrency or {})}
+        self._executors = {
+            channel: ThreadPoolExecutor(max_workers=concurrency[channel], thread_name_prefix=f"notify-{channel}")
+            for channel in self.CHANNELS
+        }
+
+    @classmethod
+    def from_env(cls) -> "NotificationDispatcher":
+        """
+        Create a dispatcher configured from the same environment variables as NotificationSystem.
+
+        Returns:
+            The configured dispatcher.
+        """
+        smtp_pool = SMTPConnectionPool(
+            os.getenv("EMAIL_SERVER", "smtp.gmail.com"),
+            int(os.getenv("EMAIL_PORT", 587)),
+            os.getenv("EMAIL_USERNAME"),
+            os.getenv("EMAIL_PASSWORD"),
+        )
+        sms_client = None
+        if TwilioClient is not None and os.getenv("TWILIO_SID"):
+            sms_client = TwilioClient(os.getenv("TWILIO_SID"), os.getenv("TWILIO_AUTH_TOKEN"))
+        return cls(
+            smtp_pool=smtp_pool,
+            sender=os.getenv("EMAIL_USERNAME"),
+            sms_client=sms_client,
+            sms_from=os.getenv("TWILIO_PHONE_NUMBER"),
+            notify_service_sid=os.getenv("TWILIO_NOTIFY_SERVICE_SID"),
+            concurrency={channel: int(os.getenv(f"NOTIFY_{channel.upper()}_CONCURRENCY", 4)) for channel in cls.CHANNELS},
+        )
+
+    def _backoff(self, attempt: int) -> None:
+        time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+
+    def call_with_retries(self, func: Callable, *args, description: str = "notification", **kwargs) -> bool:
+        """
+        Call a send function, retrying transient failures with full-jitter exponential backoff.
+
+        Args:
+            func: The send function.
+            description: What is being sent, for log messages.
+
+        Returns:
+            True if the send eventually succeeded, False otherwise.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                func(*args, **kwargs)
+                return True
+            except Exception as e:
+                if attempt == self.retries or not is_transient_error(e):
+                    logging.error(f"Failed to send {description}: {e}")
+                    return False
+                logging.warning(f"Retrying {description} after transient error: {e}")
+                self._backoff(attempt)
+        return False
+
+    # Email
+
+    def submit_emails(self, recipients: Sequence[str], subject: str, body: str, html: Optional[str] = None) -> Future:
+        """
+        Send the same email to multiple recipients.
+
+        Args:
+            recipients: List of recipient email addresses.
+            subject: The subject of the email.
+            body: The plain text body of the email.
+            html: Optional HTML content for the email.
+
+        Returns:
+            A Future of a dictionary with recipient email addresses as keys and success status as values.
+        """
+        messages = [(recipient, build_email_message(self.sender, recipient, subject, body, html)) for recipient in recipients]
+        return self.submit_email_messages(messages)
+
+    def submit_email_messages(self, messages: Sequence[Tuple[str, Message]]) -> Future:
+        """
+        Send prepared email messages, one pooled SMTP session per batch.
+
+        Args:
+            messages: List of (recipient, message) pairs.
+
+        Returns:
+            A Future of a dictionary with recipients as keys and success status as values.
+        """
+        if self.smtp_pool is None:
+            raise ValueError("An SMTP connection pool is required to send emails.")
+        return _gather([
+            self._executors["email"].submit(self._send_email_batch, batch)
+            for batch in _chunks(list(messages), self.email_batch_size)
+        ])
+
+    def _send_email_batch(self, batch: Sequence[Tuple[str, Message]]) -> Dict[str, bool]:
+        results = {}
+        with self.smtp_pool.connection() as conn:
+            for recipient, msg in batch:
+                results[recipient] = self.call_with_retries(conn.send, msg, description=f"email to {recipient}")
+        return results
+
+    # SMS
+
+    def submit_sms(self, recipients: Sequence[str], message: str) -> Future:
+        """
+        Send the same SMS to multiple recipients.
+
+        Args:
+            recipients: List of recipient phone numbers.
+            message: The message to be sent.
+
+        Returns:
+            A Future of a dictionary with recipient phone numbers as keys and success status as values.
+        """
+        if self.sms_client is None:
+            raise ValueError("A Twilio client is required to send SMS.")
+        executor = self._executors["sms"]
+        if self.notify_service_sid:
+            futures = [executor.submit(self._send_sms_batch, batch, message)
+                       for batch in _chunks(list(recipients), TWILIO_NOTIFY_BATCH_SIZE)]
+        else:
+            futures = [executor.submit(self._send_sms, recipient, message) for recipient in recipients]
+        return _gather(futures)
+
+    def _send_sms(self, recipient: str, message: str) -> Dict[str, bool]:
+        success = self.call_with_retries(
+            self.sms_client.messages.create, to=recipient, from_=self.sms_from, body=message,
+            description=f"SMS to {recipient}",
+        )
+        return {recipient: success}
+
+    def _send_sms_batch(self, recipients: Sequence[str], message: str) -> Dict[str, bool]:
+        bindings = [json.dumps({"binding_type": "sms", "address": recipient}) for recipient in recipients]
+        notifications = self.sms_client.notify.v1.services(self.notify_service_sid).notifications
+        success = self.call_with_retries(
+            notifications.create, to_binding=bindings, body=message,
+            description=f"SMS batch of {len(recipients)}",
+        )
+        return dict.fromkeys(recipients, success)
+
+    # Any channel
+
+    def submit_calls(self, channel: str, send: Callable, recipients: Sequence[str], *args, **kwargs) -> Future:
+        """
+        Call an existing single-recipient send function for each recipient on a channel's worker pool.
+
+        Lets callers keep their own transport (and its configuration) while getting the bounded
+        concurrency and retries of the dispatcher.
+
+        Args:
+            channel: The worker pool to use ("email", "sms" or "push").
+            send: Called as send(recipient, *args, **kwargs); returns a truthy value on success.
+            recipients: List of recipients.
+
+        Returns:
+            A Future of a dictionary with recipients as keys and success status as values.
+        """
+        executor = self._executors[channel]
+        return _gather([executor.submit(self._call, send, recipient, *args, **kwargs) for recipient in recipients])
+
+    def _call(self, send: Callable, recipient: str, *args, **kwargs) -> Dict[str, bool]:
+        def send_or_raise() -> None:
+            if not send(recipient, *args, **kwargs):
+                raise RuntimeError("send function reported a failure")
+
+        return {recipient: self.call_with_retries(send_or_raise, description=f"notification to {recipient}")}
+
+    # Push
+
+    def submit_push(self, device_tokens: Sequence[str], title: str, body: str, data: Optional[Dict] = None) -> Future:
+        """
+        Send the same push notification to multiple devices using FCM multicast.
+
+        Args:
+            device_tokens: List of device tokens.
+            title: The title of the notification.
+            body: The body of the notification.
+            data: Optional additional data to include.
+
+        Returns:
+            A Future of a dictionary with device tokens as keys and success status as values.
+        """
+        if self.push_client is None:
+            raise ValueError("firebase_admin is required to send push notifications.")
+        return _gather([
+            self._executors["push"].submit(self._send_push_batch, batch, title, body, data)
+            for batch in _chunks(list(device_tokens), FCM_MULTICAST_LIMIT)
+        ])
+
+    def _send_multicast(self, tokens: Sequence[str], title: str, body: str, data: Optional[Dict]):
+        message = self.push_client.MulticastMessage(
+            tokens=list(tokens),
+            notification=self.push_client.Notification(title=title, body=body),
+            data=data or {},
+        )
+        send = getattr(self.push_client, "send_each_for_multicast", None) or self.push_client.send_multicast
+        return send(message)
+
+    def _send_push_batch(self, tokens: Sequence[str], title: str, body: str, data: Optional[Dict]) -> Dict[str, bool]:
+        results = {}
+        pending = list(tokens)
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                response = self._send_multicast(pending, title, body, data)
+            except Exception as e:
+                if last_attempt or not is_transient_error(e):
+                    logging.error(f"Failed to send push notifications to {len(pending)} devices: {e}")
+                    break
+                logging.warning(f"Retrying push notifications after transient error: {e}")
+                self._backoff(attempt)
+                continue
+
+            retry = []
+            for token, token_response in zip(pending, response.responses):
+                if token_response.success:
+                    results[token] = True
+                elif not last_attempt and is_transient_error(token_response.exception):
+                    retry.append(token)
+                else:
+                    results[token] = False
+            if not retry:
+                break
+            pending = retry
+            self._backoff(attempt)
+        for token in tokens:
+            results.setdefault(token, False)
+        logging.info(f"Push notifications sent: {sum(results.values())}/{len(results)}")
+        return results
+
+    def close(self) -> None:
+        """Wait for queued notifications and release worker threads and SMTP sessions."""
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+        if self.smtp_pool is not None:
+            self.smtp_pool.close()
+
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self) -> None:
+        self.server.count("connections")
+        self._reply("220 localhost RLG SMTP sink")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii", "replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self._reply("250 localhost")
+            elif command == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.server.count("messages")
+                self._reply("250 OK")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("250 OK")
+
+
+class LocalSMTPSink(socketserver.ThreadingTCPServer):
+    """
+    A minimal SMTP server on localhost that accepts and discards every message.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _SMTPSinkHandler)
+        self.messages = 0
+        self.connections = 0
+        self._counter_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def count(self, name: str) -> None:
+        with self._counter_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def start(self) -> "LocalSMTPSink":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "LocalSMTPSink":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def benchmark_email_dispatch(n_messages: int = 1000, concurrency: int = 4, batch_size: int = 50) -> Dict[str, float]:
+    """
+    Compare one SMTP session per email against the batched dispatcher, using a local SMTP sink.
+
+    Args:
+        n_messages: Number of emails to send with each approach.
+        concurrency: Email workers of the dispatcher.
+        batch_size: Emails sent per pooled SMTP session per worker task.
+
+    Returns:
+        Messages per second of both approaches and the SMTP sessions opened by the dispatcher.
+    """
+    recipients = [f"user{i}@example.com" for i in range(n_messages)]
+    with LocalSMTPSink() as sink:
+        start = time.perf_counter()
+        for recipient in recipients:
+            with smtplib.SMTP(sink.server_address[0], sink.port) as server:
+                server.send_message(build_email_message("noreply@example.com", recipient, "Benchmark", "Hello"))
+        per_message = n_messages / (time.perf_counter() - start)
+
+        pool = SMTPConnectionPool(sink.server_address[0], sink.port, use_tls=False, max_messages_per_connection=batch_size * 10)
+        dispatcher = NotificationDispatcher(smtp_pool=pool, sender="noreply@example.com",
+                                            concurrency={"email": concurrency}, email_batch_size=batch_size)
+        start = time.perf_counter()
+        results = dispatcher.submit_emails(recipients, "Benchmark", "Hello").result()
+        batched = n_messages / (time.perf_counter() - start)
+        dispatcher.close()
+
+    return {
+        "per_message_session_msgs_per_sec": round(per_message, 1),
+        "batched_msgs_per_sec": round(batched, 1),
+        "batched_delivered": sum(results.values()),
+        "batched_smtp_sessions": pool.connections_opened,
+    }
+
+
+# Example Usage
+if __name__ == "__main__":
+    print(benchmark_email_dispatch())
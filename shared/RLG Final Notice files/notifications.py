@@ -3,10 +3,15 @@ from datetime import datetime
 from models import User, NotificationLog
 from utils import validate_request_data, send_email, send_sms
 from mobile_push_notifications import MobilePushNotifications
+from backend.notification_dispatcher import NotificationDispatcher
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+# Bulk email and SMS go through the same send_email/send_sms as single sends (so the same
+# server and credentials), on bounded worker pools with retries
+dispatcher = NotificationDispatcher()
+
 class NotificationsManager:
     """
     Centralized system to handle all types of notifications.
@@ -100,16 +105,15 @@ class NotificationsManager:
         Returns:
             dict: Summary of bulk notification delivery.
         """
+        if notification_type == "push":
+            return MobilePushNotifications.send_bulk_notifications(user_ids, content["title"], content["body"], data)
+        if notification_type in ("email", "sms"):
+            return NotificationsManager._send_batched(user_ids, notification_type, content)
+
         responses = []
         for user_id in user_ids:
             try:
-                if notification_type == "email":
-                    response = NotificationsManager.send_email_notification(user_id, content["subject"], content["body"])
-                elif notification_type == "sms":
-                    response = NotificationsManager.send_sms_notification(user_id, content["message"])
-                elif notification_type == "push":
-                    response = NotificationsManager.send_push_notification(user_id, content["title"], content["body"], data)
-                elif notification_type == "in-app":
+                if notification_type == "in-app":
                     response = NotificationsManager.send_in_app_notification(user_id, content["message"])
                 else:
                     raise ValueError(f"Unsupported notification type: {notification_type}")
@@ -121,6 +125,51 @@ class NotificationsManager:
 
         return {"summary": responses}
 
+    @staticmethod
+    def _send_batched(user_ids, notification_type, content):
+        """
+        Sends bulk email or SMS notifications through the batched dispatcher.
+        Args:
+            user_ids (list): List of recipient user IDs.
+            notification_type (str): Type of notification ('email' or 'sms').
+            content (dict): Notification content. For emails, requires 'subject' and 'body'.
+        Returns:
+            dict: Summary of bulk notification delivery.
+        """
+        field = "email" if notification_type == "email" else "phone_number"
+        users = User.query.filter(User.id.in_(user_ids)).all()
+        addresses = {user.id: getattr(user, field) for user in users if getattr(user, field)}
+        recipients = list(set(addresses.values()))
+        if notification_type == "email":
+            subject, body = content["subject"], content["body"]
+        else:
+            subject, body = None, content["message"]
+        if notification_type == "email":
+            results = dispatcher.submit_calls(
+                "email", lambda to: send_email(to=to, subject=subject, body=body), recipients
+            ).result()
+            confirmation = "Email sent successfully"
+        else:
+            results = dispatcher.submit_calls("sms", lambda to: send_sms(to=to, message=body), recipients).result()
+            confirmation = "SMS sent successfully"
+
+        responses = []
+        for user_id in user_ids:
+            address = addresses.get(user_id)
+            if address is None:
+                error = f"User not found or {field.replace('_', ' ')} not registered."
+            elif not results.get(address):
+                error = f"Failed to send {notification_type} to user {user_id}."
+            else:
+                NotificationsManager.log_notification(user_id, notification_type, subject, body)
+                response = {"message": confirmation, field: address}
+                responses.append({"user_id": user_id, "status": "success", "response": response})
+                continue
+            logging.error(f"Failed to send {notification_type} notification to user {user_id}: {error}")
+            responses.append({"user_id": user_id, "status": "failed", "error": error})
+
+        return {"summary": responses}
+
     @staticmethod
     def schedule_notification(user_id, notification_type, content, send_at, data=None):
         """
@@ -1,10 +1,12 @@
 # cross_platform_report_generator.py
 
+import time
 import pandas as pd
 import json
 import logging
 from datetime import datetime
-from sqlalchemy import create_engine
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sqlalchemy import create_engine, select, table, column, func, literal, literal_column, distinct
 from your_project_name.data_ingestion import get_platform_data
 from your_project_name.data_cleaning import clean_data
 from your_project_name.analytics_engine import run_analytics
@@ -20,64 +22,168 @@ logger = logging.getLogger(__name__)
 PLATFORM_LIST = ['OnlyFans', 'Patreon', 'Fansly', 'FANfix', 'Instagram', 'TikTok', 'YouTube']
 REPORT_PATH = "/path/to/save/reports/"
 REPORT_FILE_NAME = "cross_platform_report_{}.csv".format(datetime.now().strftime("%Y-%m-%d_%H-%M-%S"))
+REPORT_MAX_WORKERS = 8  # Concurrent per-platform queries (keep within the engine's connection pool)
+
+# Columns the pushdown aggregates need; pass as fetch_platform_data(columns=...) to project raw rows
+REPORT_COLUMNS = ['date', 'user_id', 'revenue', 'engagement']
 
 # Initialize database connection (SQLAlchemy)
 engine = create_engine(DATABASE_URI)
 
-def generate_cross_platform_report(platforms=PLATFORM_LIST, start_date=None, end_date=None):
+class StageTimer:
+    """
+    Records wall-clock time per (platform, stage) so report time can be broken down.
+    """
+
+    def __init__(self):
+        self.timings = {}
+
+    def measure(self, platform, stage, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.timings.setdefault(platform, {})[stage] = round(time.perf_counter() - start, 4)
+
+
+def _platform_table(platform, columns):
+    """
+    Build a SQLAlchemy table reference for a supported platform. Table names cannot be bound
+    parameters, so they are only ever taken from PLATFORM_LIST and quoted by SQLAlchemy.
+    """
+    if platform not in PLATFORM_LIST:
+        raise ValueError(f"Platform {platform} not supported")
+    return table(f"{platform.lower()}_data", *[column(name) for name in columns])
+
+
+def _date_filtered(query, platform_table, start_date=None, end_date=None):
+    """
+    Add bound (parameterized) date predicates to a query.
+    """
+    if start_date:
+        query = query.where(platform_table.c.date >= start_date)
+    if end_date:
+        query = query.where(platform_table.c.date <= end_date)
+    return query
+
+
+def fetch_platform_aggregates(platform, start_date=None, end_date=None):
+    """
+    Compute per-platform report metrics inside the database (aggregation pushdown).
+    
+    Args:
+        platform (str): The name of the platform (e.g., 'OnlyFans', 'Patreon').
+        start_date (str): Optional start date for filtering the data.
+        end_date (str): Optional end date for filtering the data.
+    
+    Returns:
+        data (DataFrame): One row with platform, records, revenue, engagement, users and revenue_per_user.
+    """
+    platform_table = _platform_table(platform, REPORT_COLUMNS)
+    query = select(
+        literal(platform).label('platform'),
+        func.count().label('records'),
+        func.coalesce(func.sum(platform_table.c.revenue), 0).label('revenue'),
+        func.coalesce(func.sum(platform_table.c.engagement), 0).label('engagement'),
+        func.count(distinct(platform_table.c.user_id)).label('users'),
+    ).select_from(platform_table)
+    query = _date_filtered(query, platform_table, start_date, end_date)
+
+    with engine.connect() as connection:
+        data = pd.read_sql(query, connection)
+
+    data['revenue_per_user'] = data['revenue'] / data['users'].where(data['users'] > 0)
+    return data
+
+
+def _build_platform_report(platform, start_date, end_date, pushdown, timer):
+    """
+    Produce one platform's section of the report, timing each stage.
+    
+    Returns:
+        DataFrame: The platform's report rows (empty if there is no data).
+    """
+    if pushdown:
+        aggregates = timer.measure(platform, 'query', fetch_platform_aggregates, platform, start_date, end_date)
+        return aggregates if int(aggregates['records'].iloc[0]) > 0 else pd.DataFrame()
+
+    platform_data = timer.measure(platform, 'fetch', get_platform_data, platform, start_date, end_date)
+    if platform_data.empty:
+        return pd.DataFrame()
+
+    cleaned_data = timer.measure(platform, 'clean', clean_data, platform_data, platform)
+    if cleaned_data.empty:
+        return pd.DataFrame()
+
+    return timer.measure(platform, 'analytics', run_analytics, cleaned_data, platform)
+
+
+def generate_cross_platform_report(platforms=PLATFORM_LIST, start_date=None, end_date=None, pushdown=False):
     """
     Generate a cross-platform performance report.
+
+    Platforms are processed concurrently through the fetch/clean/analytics path. With pushdown
+    enabled, each platform's metrics are instead aggregated in SQL (projected columns, bound date
+    predicates). That produces a different report schema (records, revenue, engagement, users,
+    revenue_per_user) and requires the REPORT_COLUMNS columns, so callers opt in explicitly. Platform results are merged
+    as they complete, and per-stage timings are attached as report_df.attrs['stage_timings'].
     
     Args:
         platforms (list): List of platforms to include in the report.
         start_date (str): Optional start date for filtering the data (format: 'YYYY-MM-DD').
         end_date (str): Optional end date for filtering the data (format: 'YYYY-MM-DD').
+        pushdown (bool): Aggregate in the database instead of cleaning and analyzing in pandas.
     
     Returns:
         report_df (DataFrame): The generated report as a Pandas DataFrame.
     """
     try:
         logger.info("Starting report generation process...")
+        report_start = time.perf_counter()
+        timer = StageTimer()
 
-        # Initialize an empty list to collect data from each platform
+        # Collect each platform's section as soon as its worker finishes
         report_data = []
 
-        for platform in platforms:
-            # Fetch platform data (could be API or database query)
-            platform_data = get_platform_data(platform, start_date, end_date)
-            
-            if platform_data.empty:
-                logger.warning(f"No data found for platform: {platform}")
-                continue
-            
-            # Clean the fetched data
-            cleaned_data = clean_data(platform_data, platform)
-            
-            if cleaned_data.empty:
-                logger.warning(f"Cleaned data is empty for platform: {platform}")
-                continue
-            
-            # Run analytics and generate insights
-            analytics_result = run_analytics(cleaned_data, platform)
-            
-            # Add the analytics result to the report data list
-            report_data.append(analytics_result)
+        with ThreadPoolExecutor(max_workers=min(REPORT_MAX_WORKERS, max(1, len(platforms)))) as executor:
+            futures = {
+                executor.submit(_build_platform_report, platform, start_date, end_date, pushdown, timer): platform
+                for platform in platforms
+            }
+            for future in as_completed(futures):
+                platform = futures[future]
+                try:
+                    platform_report = future.result()
+                except Exception as e:
+                    handle_error(e)
+                    continue
+
+                if platform_report is None or platform_report.empty:
+                    logger.warning(f"No data found for platform: {platform}")
+                    continue
+
+                report_data.append(platform_report)
+                logger.info(f"Merged report section for {platform} ({len(report_data)}/{len(platforms)})")
 
         if not report_data:
             logger.error("No data to generate report.")
             return None
 
         # Combine all platform data into a single DataFrame
-        report_df = pd.concat(report_data, ignore_index=True)
+        report_df = timer.measure('report', 'merge', pd.concat, report_data, ignore_index=True)
 
         # Save the generated report to CSV
         report_file_path = REPORT_PATH + REPORT_FILE_NAME
-        report_df.to_csv(report_file_path, index=False)
+        timer.measure('report', 'save', report_df.to_csv, report_file_path, index=False)
 
         logger.info(f"Cross-platform report generated and saved to: {report_file_path}")
 
         # Send the report via email
-        send_report_email(report_file_path, EMAIL_CONFIG)
+        timer.measure('report', 'email', send_report_email, report_file_path, EMAIL_CONFIG)
+
+        timer.timings['report']['total'] = round(time.perf_counter() - report_start, 4)
+        report_df.attrs['stage_timings'] = timer.timings
+        logger.info(f"Report stage timings: {json.dumps(timer.timings)}")
 
         return report_df
 
@@ -85,7 +191,7 @@ def generate_cross_platform_report(platforms=PLATFORM_LIST, start_date=None, end
         handle_error(e)
         return None
 
-def fetch_platform_data(platform, start_date=None, end_date=None):
+def fetch_platform_data(platform, start_date=None, end_date=None, columns=None):
     """
     Helper function to fetch platform-specific data from database or APIs.
     
@@ -93,6 +199,7 @@ def fetch_platform_data(platform, start_date=None, end_date=None):
         platform (str): The name of the platform (e.g., 'OnlyFans', 'Patreon').
         start_date (str): Optional start date for filtering the data.
         end_date (str): Optional end date for filtering the data.
+        columns (list): Optional columns to select (only these are transferred). Defaults to all columns.
     
     Returns:
         data (DataFrame): The platform's data as a Pandas DataFrame.
@@ -100,12 +207,17 @@ def fetch_platform_data(platform, start_date=None, end_date=None):
     try:
         logger.info(f"Fetching data for platform: {platform}")
 
-        if platform not in PLATFORM_LIST:
-            raise ValueError(f"Platform {platform} not supported")
+        # Projected columns with bound date parameters (no string-built SQL)
+        if columns is None:
+            platform_table = _platform_table(platform, ['date'])
+            query = select(literal_column('*')).select_from(platform_table)
+        else:
+            platform_table = _platform_table(platform, columns)
+            query = select(*platform_table.c)
+        query = _date_filtered(query, platform_table, start_date, end_date)
 
-        # Example: Fetch data from database
-        query = f"SELECT * FROM {platform.lower()}_data WHERE date >= '{start_date}' AND date <= '{end_date}'"
-        data = pd.read_sql(query, engine)
+        with engine.connect() as connection:
+            data = pd.read_sql(query, connection)
 
         if data.empty:
             logger.warning(f"No data found for {platform} in the specified date range.")
@@ -2,14 +2,16 @@
 report_generator.py
 
 This module generates HTML reports for both RLG Data (media articles) and RLG Fans (social posts).
-It queries data using the DatabaseManager (SQLAlchemy-based), computes summary statistics with pandas,
-and outputs the reports as HTML files saved in a designated reports directory.
+Summary statistics are composed from the incremental daily rollups maintained by report_rollups.py;
+raw rows are read only for the current (partial) day. Reports are output as HTML files saved in a
+designated reports directory.
 
 Reports include:
     - Total record counts.
     - Sentiment distribution for RLG Data.
     - Average engagement and record counts for RLG Fans.
     - Date range of the scraped data.
+    - A per-day breakdown and today's detailed records.
 
 For production, customize the report templates and extend the metrics as needed.
 """
@@ -22,6 +24,7 @@ import pandas as pd
 
 # Import the DatabaseManager from our database_manager.py module.
 from database_manager import DatabaseManager
+from report_rollups import RollupManager, day_start
 
 # Configure logging for the report generator.
 logger = logging.getLogger("ReportGenerator")
@@ -50,6 +53,7 @@ class ReportGenerator:
         self.region = region
         # Initialize the database manager (ensure DATABASE_URL or equivalent is configured).
         self.db_manager = DatabaseManager()
+        self.rollups = RollupManager(self.db_manager)
         logger.info(f"ReportGenerator initialized for region: {self.region}")
 
     def generate_rlg_data_report(self) -> str:
@@ -60,18 +64,22 @@ class ReportGenerator:
             - Total number of articles.
             - Distribution of sentiment (e.g., positive, neutral, negative).
             - Time span of data (earliest and latest scrape timestamps).
+            - Per-day breakdown and today's records.
 
         Returns:
             str: File path to the generated HTML report.
         """
         try:
-            # Query RLG Data records, optionally filtering by region.
-            records = self.db_manager.query_rlg_data(region=self.region)
-            if not records:
+            # Fold newly landed rows into the rollups, then compose the summary from them.
+            report_time = datetime.utcnow()
+            self.rollups.refresh("rlg_data")
+            totals, daily = self.rollups.summarize("rlg_data", region=self.region, as_of=report_time)
+            if not totals.record_count:
                 logger.warning("No RLG Data records found for report generation.")
                 return ""
 
-            # Convert SQLAlchemy records to a list of dictionaries.
+            # Only the current partial day is read row by row.
+            records = self.db_manager.query_rlg_data(region=self.region, since=day_start(report_time.date()))
             data_list = [
                 {
                     "id": record.id,
@@ -82,14 +90,14 @@ class ReportGenerator:
                 }
                 for record in records
             ]
-            df = pd.DataFrame(data_list)
-            logger.info(f"Retrieved {len(df)} RLG Data records for report.")
+            df = pd.DataFrame(data_list, columns=["id", "title", "sentiment", "region", "scraped_at"])
+            logger.info(f"Composed RLG Data report from rollups ({totals.record_count} records, {len(df)} from today).")
 
-            # Compute summary statistics.
-            total_articles = len(df)
-            sentiment_distribution = df["sentiment"].value_counts().to_dict()
-            min_date = df["scraped_at"].min()
-            max_date = df["scraped_at"].max()
+            # Summary statistics from the rollups.
+            total_articles = totals.record_count
+            sentiment_distribution = dict(sorted(totals.sentiment_counts.items(), key=lambda item: -item[1]))
+            min_date = totals.first_scraped_at
+            max_date = totals.last_scraped_at
 
             # Prepare a summary DataFrame.
             summary = pd.DataFrame({
@@ -116,7 +124,9 @@ class ReportGenerator:
                     {summary.to_html(index=False, justify="center")}
                     <h2>Sentiment Distribution</h2>
                     {pd.DataFrame(list(sentiment_distribution.items()), columns=["Sentiment", "Count"]).to_html(index=False, justify="center")}
-                    <h2>Detailed Records</h2>
+                    <h2>Daily Breakdown</h2>
+                    {daily.to_html(index=False, justify="center")}
+                    <h2>Today's Records</h2>
                     {df.to_html(index=False, justify="center")}
                     <p>Report generated on: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
                 </body>
@@ -145,17 +155,23 @@ class ReportGenerator:
             - Average engagement score.
             - Distribution of engagement (e.g., histogram data summary).
             - Time span of data (earliest and latest scrape timestamps).
+            - Per-day breakdown and today's records.
 
         Returns:
             str: File path to the generated HTML report.
         """
         try:
-            # Query RLG Fans records, optionally filtering by region.
-            records = self.db_manager.query_rlg_fans(region=self.region)
-            if not records:
+            # Fold newly landed rows into the rollups, then compose the summary from them.
+            report_time = datetime.utcnow()
+            self.rollups.refresh("rlg_fans")
+            totals, daily = self.rollups.summarize("rlg_fans", region=self.region, as_of=report_time)
+            if not totals.record_count:
                 logger.warning("No RLG Fans records found for report generation.")
                 return ""
 
+            # Only the current partial day is read row by row.
+            records = self.db_manager.query_rlg_fans(region=self.region, since=day_start(report_time.date()))
+
             # Convert records to a list of dictionaries.
             data_list = [
                 {
@@ -167,18 +183,20 @@ class ReportGenerator:
                 }
                 for record in records
             ]
-            df = pd.DataFrame(data_list)
-            logger.info(f"Retrieved {len(df)} RLG Fans records for report.")
+            df = pd.DataFrame(data_list, columns=["id", "content", "engagement", "region", "scraped_at"])
+            logger.info(f"Composed RLG Fans report from rollups ({totals.record_count} records, {len(df)} from today).")
 
-            # Compute summary statistics.
-            total_posts = len(df)
-            average_engagement = df["engagement"].mean() if total_posts > 0 else 0.0
-            min_date = df["scraped_at"].min()
-            max_date = df["scraped_at"].max()
+            # Summary statistics from the rollups.
+            total_posts = totals.record_count
+            average_engagement = totals.engagement_mean
+            min_date = totals.first_scraped_at
+            max_date = totals.last_scraped_at
 
             summary = pd.DataFrame({
-                "Metric": ["Total Posts", "Average Engagement", "Earliest Record", "Latest Record"],
-                "Value": [total_posts, f"{average_engagement:.2f}", min_date, max_date]
+                "Metric": ["Total Posts", "Average Engagement", "Engagement Std Dev", "Min Engagement",
+                           "Max Engagement", "Earliest Record", "Latest Record"],
+                "Value": [total_posts, f"{average_engagement:.2f}", f"{totals.engagement_std:.2f}",
+                          totals.engagement_min, totals.engagement_max, min_date, max_date]
             })
 
             # Build an HTML report.
@@ -198,7 +216,9 @@ class ReportGenerator:
                     <h1>RLG Fans Report - Region: {self.region.capitalize()}</h1>
                     <h2>Summary Statistics</h2>
                     {summary.to_html(index=False, justify="center")}
-                    <h2>Detailed Records</h2>
+                    <h2>Daily Breakdown</h2>
+                    {daily.to_html(index=False, justify="center")}
+                    <h2>Today's Records</h2>
                     {df.to_html(index=False, justify="center")}
                     <p>Report generated on: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
                 </body>
@@ -0,0 +1,568 @@
+"""
+report_rollups.py
+
+This module maintains incremental, materialized daily aggregates ("rollups") for RLG Data and RLG Fans
+so reports do not have to recompute every metric from raw rows each time they are scheduled.
+
+Rollups are stored per dataset (rlg_data / rlg_fans), per day and per region, and hold:
+    - Record counts and first/last scrape timestamps.
+    - Sentiment distributions (RLG Data).
+    - Engagement sum, sum of squares, min and max (RLG Fans), from which mean and std are derived.
+
+Rows are folded in incrementally: a per-dataset watermark records the highest raw row id already
+scanned, so each refresh only scans rows that landed since the previous refresh. Ids from concurrent
+transactions can commit out of order, so ids below the watermark that were not visible yet are kept
+as pending ranges and picked up by later refreshes (ranges still empty after ROLLUP_PENDING_TTL
+seconds are assumed to be rolled-back inserts and dropped). Refreshes lock the watermark row
+(SELECT ... FOR UPDATE), so concurrent processes never fold the same batch twice. Reports compose
+closed days from the rollups and aggregate raw rows only for the current (partial) day.
+
+Raw rows that are updated or deleted after being rolled up are not tracked by the watermark; use
+`backfill` to rebuild the affected days and `verify` to compare rollups against a full recompute.
+"""
+
+import json
+import math
+import time as clock
+import logging
+import threading
+from datetime import datetime, date, time, timedelta
+
+import pandas as pd
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Float, UniqueConstraint, func, and_, or_
+
+from database_manager import Base, RLGData, RLGFans
+
+# Configure logging for the rollup subsystem.
+logger = logging.getLogger("ReportRollups")
+logger.setLevel(logging.DEBUG)
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.DEBUG)
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    ch.setFormatter(formatter)
+    logger.addHandler(ch)
+
+# Raw tables that can be rolled up, keyed by dataset name.
+ROLLUP_DATASETS = {
+    "rlg_data": RLGData,
+    "rlg_fans": RLGFans,
+}
+
+# Relative tolerance used when comparing float sums in `verify`.
+VERIFY_TOLERANCE = 1e-6
+
+# Seconds an id range below the watermark may stay empty before it is treated as rolled back.
+ROLLUP_PENDING_TTL = 3600
+
+# -------------------------------
+# Rollup Tables
+# -------------------------------
+
+class DailyRollup(Base):
+    """
+    Materialized per-day, per-region aggregates for one dataset.
+    """
+    __tablename__ = "report_daily_rollups"
+    __table_args__ = (UniqueConstraint("dataset", "day", "region", name="uq_report_daily_rollup"),)
+
+    id = Column(Integer, primary_key=True)
+    dataset = Column(String(20), nullable=False, index=True)
+    day = Column(Date, nullable=False, index=True)
+    region = Column(String(50), nullable=False)
+    record_count = Column(Integer, nullable=False, default=0)
+    sentiment_counts = Column(Text, nullable=False, default="{}")  # JSON {sentiment: count}
+    engagement_sum = Column(Float, nullable=False, default=0.0)
+    engagement_sq_sum = Column(Float, nullable=False, default=0.0)
+    engagement_min = Column(Float, nullable=True)
+    engagement_max = Column(Float, nullable=True)
+    first_scraped_at = Column(DateTime, nullable=True)
+    last_scraped_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DailyRollup(dataset={self.dataset}, day={self.day}, region={self.region}, count={self.record_count})>"
+
+class RollupWatermark(Base):
+    """
+    Highest raw row id already scanned, per dataset, and the id ranges below it that were not
+    committed yet when they were scanned.
+    """
+    __tablename__ = "report_rollup_watermarks"
+
+    dataset = Column(String(20), primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    pending_ranges = Column(Text, nullable=False, default="[]")  # JSON [[first_id, last_id, first_seen], ...]
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# -------------------------------
+# Aggregate Values
+# -------------------------------
+
+class RollupAggregate:
+    """
+    Mergeable aggregate for one (day, region) bucket. Every field combines by addition or min/max,
+    so partial aggregates from rollups, incremental refreshes and the live day compose exactly.
+    """
+
+    def __init__(self):
+        self.record_count = 0
+        self.sentiment_counts = {}
+        self.engagement_sum = 0.0
+        self.engagement_sq_sum = 0.0
+        self.engagement_min = None
+        self.engagement_max = None
+        self.first_scraped_at = None
+        self.last_scraped_at = None
+
+    @staticmethod
+    def _pick(a, b, pick):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return pick(a, b)
+
+    def merge(self, other):
+        """
+        Adds another aggregate (or DailyRollup row) into this one.
+
+        Parameters:
+            other (RollupAggregate | DailyRollup): Aggregate to fold in.
+
+        Returns:
+            RollupAggregate: self, for chaining.
+        """
+        sentiment_counts = other.sentiment_counts
+        if isinstance(sentiment_counts, str):
+            sentiment_counts = json.loads(sentiment_counts or "{}")
+
+        self.record_count += other.record_count or 0
+        for sentiment, count in sentiment_counts.items():
+            self.sentiment_counts[sentiment] = self.sentiment_counts.get(sentiment, 0) + count
+        self.engagement_sum += other.engagement_sum or 0.0
+        self.engagement_sq_sum += other.engagement_sq_sum or 0.0
+        self.engagement_min = self._pick(self.engagement_min, other.engagement_min, min)
+        self.engagement_max = self._pick(self.engagement_max, other.engagement_max, max)
+        self.first_scraped_at = self._pick(self.first_scraped_at, other.first_scraped_at, min)
+        self.last_scraped_at = self._pick(self.last_scraped_at, other.last_scraped_at, max)
+        return self
+
+    def apply_to(self, rollup):
+        """
+        Writes this aggregate's values onto a DailyRollup row.
+        """
+        rollup.record_count = self.record_count
+        rollup.sentiment_counts = json.dumps(self.sentiment_counts, sort_keys=True)
+        rollup.engagement_sum = self.engagement_sum
+        rollup.engagement_sq_sum = self.engagement_sq_sum
+        rollup.engagement_min = self.engagement_min
+        rollup.engagement_max = self.engagement_max
+        rollup.first_scraped_at = self.first_scraped_at
+        rollup.last_scraped_at = self.last_scraped_at
+
+    @property
+    def engagement_mean(self):
+        return self.engagement_sum / self.record_count if self.record_count else 0.0
+
+    @property
+    def engagement_std(self):
+        if not self.record_count:
+            return 0.0
+        variance = self.engagement_sq_sum / self.record_count - self.engagement_mean ** 2
+        return math.sqrt(max(variance, 0.0))
+
+    def differences(self, other, tolerance=VERIFY_TOLERANCE):
+        """
+        Lists the fields that differ from another aggregate.
+
+        Returns:
+            list: Names of mismatching fields (empty if equal).
+        """
+        mismatches = []
+        for field in ("record_count", "sentiment_counts", "first_scraped_at", "last_scraped_at"):
+            if getattr(self, field) != getattr(other, field):
+                mismatches.append(field)
+        for field in ("engagement_sum", "engagement_sq_sum", "engagement_min", "engagement_max"):
+            mine, theirs = getattr(self, field), getattr(other, field)
+            if (mine is None) != (theirs is None):
+                mismatches.append(field)
+            elif mine is not None and not math.isclose(mine, theirs, rel_tol=tolerance, abs_tol=tolerance):
+                mismatches.append(field)
+        return mismatches
+
+def _as_date(value):
+    """
+    Normalizes the day column (SQLite returns 'YYYY-MM-DD' strings, PostgreSQL returns dates).
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+def _as_datetime(value):
+    """
+    Normalizes timestamps returned by aggregate functions (SQLite returns strings for MIN/MAX).
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    return pd.Timestamp(value).to_pydatetime()
+
+def day_start(day):
+    """
+    Returns the midnight datetime for a date.
+    """
+    return datetime.combine(day, time.min)
+
+def _subtract_ids(ranges, ids):
+    """
+    Removes sorted ids from inclusive [first, last, first_seen] ranges.
+
+    Returns:
+        list: The remaining (non-empty) ranges, keeping each piece's first_seen.
+    """
+    remaining = []
+    position = 0
+    for first, last, first_seen in sorted(ranges):
+        while position < len(ids) and ids[position] < first:
+            position += 1
+        start = first
+        while position < len(ids) and ids[position] <= last:
+            if ids[position] > start:
+                remaining.append([start, ids[position] - 1, first_seen])
+            start = ids[position] + 1
+            position += 1
+        if start <= last:
+            remaining.append([start, last, first_seen])
+    return remaining
+
+# -------------------------------
+# Rollup Manager
+# -------------------------------
+
+class RollupManager:
+    def __init__(self, db_manager):
+        """
+        Initializes the RollupManager.
+
+        Parameters:
+            db_manager (DatabaseManager): Database manager whose engine holds the raw and rollup tables.
+        """
+        self.db_manager = db_manager
+        # Serializes refresh/backfill within this process; across processes the watermark row is locked.
+        self._lock = threading.Lock()
+        Base.metadata.create_all(self.db_manager.engine, tables=[DailyRollup.__table__, RollupWatermark.__table__])
+
+    @staticmethod
+    def _model(dataset):
+        if dataset not in ROLLUP_DATASETS:
+            raise ValueError(f"Unknown rollup dataset: {dataset}")
+        return ROLLUP_DATASETS[dataset]
+
+    def _aggregate_raw(self, session, dataset, *filters):
+        """
+        Aggregates raw rows in SQL, grouped by day and region.
+
+        Parameters:
+            session (Session): Active SQLAlchemy session.
+            dataset (str): 'rlg_data' or 'rlg_fans'.
+            filters: Extra SQLAlchemy filter expressions on the raw table.
+
+        Returns:
+            dict: {(day, region): RollupAggregate}
+        """
+        model = self._model(dataset)
+        day = func.date(model.scraped_at).label("day")
+        columns = [
+            day,
+            model.region,
+            func.count(model.id).label("record_count"),
+            func.min(model.scraped_at).label("first_scraped_at"),
+            func.max(model.scraped_at).label("last_scraped_at"),
+        ]
+        group_by = [day, model.region]
+        if model is RLGData:
+            columns.append(model.sentiment)
+            group_by.append(model.sentiment)
+        else:
+            columns += [
+                func.sum(model.engagement).label("engagement_sum"),
+                func.sum(model.engagement * model.engagement).label("engagement_sq_sum"),
+                func.min(model.engagement).label("engagement_min"),
+                func.max(model.engagement).label("engagement_max"),
+            ]
+
+        rows = (
+            session.query(*columns)
+            .filter(model.scraped_at.isnot(None), *filters)
+            .group_by(*group_by)
+            .all()
+        )
+
+        buckets = {}
+        for row in rows:
+            partial = RollupAggregate()
+            partial.record_count = row.record_count
+            partial.first_scraped_at = _as_datetime(row.first_scraped_at)
+            partial.last_scraped_at = _as_datetime(row.last_scraped_at)
+            if model is RLGData:
+                partial.sentiment_counts = {row.sentiment: row.record_count}
+            else:
+                partial.engagement_sum = float(row.engagement_sum or 0.0)
+                partial.engagement_sq_sum = float(row.engagement_sq_sum or 0.0)
+                partial.engagement_min = row.engagement_min
+                partial.engagement_max = row.engagement_max
+            key = (_as_date(row.day), row.region)
+            buckets.setdefault(key, RollupAggregate()).merge(partial)
+        return buckets
+
+    def _upsert(self, session, dataset, buckets, replace=False):
+        """
+        Merges (or replaces) aggregates into the rollup table.
+        """
+        for (day, region), aggregate in buckets.items():
+            rollup = (
+                session.query(DailyRollup)
+                .filter_by(dataset=dataset, day=day, region=region)
+                .one_or_none()
+            )
+            if rollup is None:
+                rollup = DailyRollup(dataset=dataset, day=day, region=region)
+                session.add(rollup)
+            elif not replace:
+                aggregate = RollupAggregate().merge(rollup).merge(aggregate)
+            aggregate.apply_to(rollup)
+
+    def _watermark(self, session, dataset):
+        """
+        Returns the dataset's watermark, locked (SELECT ... FOR UPDATE) until the session commits.
+        """
+        watermark = session.query(RollupWatermark).filter_by(dataset=dataset).with_for_update().one_or_none()
+        if watermark is None:
+            watermark = RollupWatermark(dataset=dataset, last_id=0, pending_ranges="[]")
+            session.add(watermark)
+            # A concurrent first refresh fails here on the primary key instead of folding rows twice.
+            session.flush()
+        return watermark
+
+    @staticmethod
+    def _folded_filters(model, watermark):
+        """
+        Filters selecting the raw rows already folded into the rollups.
+        """
+        last_id = watermark.last_id if watermark else 0
+        pending = json.loads(watermark.pending_ranges or "[]") if watermark else []
+        return [model.id <= last_id] + [~model.id.between(first, last) for first, last, _ in pending]
+
+    def refresh(self, dataset):
+        """
+        Folds raw rows that landed since the last refresh into the rollups, including rows below the
+        watermark whose transactions committed after an earlier refresh scanned past their ids.
+
+        Parameters:
+            dataset (str): 'rlg_data' or 'rlg_fans'.
+
+        Returns:
+            int: Number of raw rows folded in.
+        """
+        model = self._model(dataset)
+        with self._lock:
+            session = self.db_manager.get_session()
+            try:
+                watermark = self._watermark(session, dataset)
+                now = clock.time()
+                pending = [
+                    entry for entry in json.loads(watermark.pending_ranges or "[]")
+                    if now - entry[2] < ROLLUP_PENDING_TTL
+                ]
+                # Bound the batch by the max id read up front, so rows inserted mid-refresh wait for the next run.
+                max_id = max(session.query(func.max(model.id)).scalar() or 0, watermark.last_id)
+                candidates = [[watermark.last_id + 1, max_id, now]] if max_id > watermark.last_id else []
+                candidates += pending
+                if not candidates:
+                    session.commit()
+                    return 0
+
+                in_candidates = or_(*[model.id.between(first, last) for first, last, _ in candidates])
+                ids = [row[0] for row in session.query(model.id).filter(in_candidates).order_by(model.id)]
+                # Ids that are not visible yet stay pending; excluding them by range keeps the
+                # aggregate to exactly the rows listed above, even if they commit in between.
+                gaps = _subtract_ids(candidates, ids)
+                if ids:
+                    visible = and_(in_candidates, *[~model.id.between(first, last) for first, last, _ in gaps])
+                    buckets = self._aggregate_raw(session, dataset, visible)
+                    self._upsert(session, dataset, buckets)
+                else:
+                    buckets = {}
+                folded = sum(aggregate.record_count for aggregate in buckets.values())
+                watermark.last_id = max_id
+                watermark.pending_ranges = json.dumps(gaps)
+                session.commit()
+                logger.info(f"Refreshed {dataset} rollups: {folded} new rows across {len(buckets)} day/region buckets.")
+                return folded
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Error refreshing {dataset} rollups: {e}")
+                raise
+            finally:
+                session.close()
+
+    def backfill(self, dataset, start_day=None, end_day=None):
+        """
+        Rebuilds rollups for a day range from raw rows (e.g. initial load, or after raw rows were edited).
+
+        Parameters:
+            dataset (str): 'rlg_data' or 'rlg_fans'.
+            start_day (date, optional): First day to rebuild (inclusive). Defaults to the beginning of the data.
+            end_day (date, optional): Last day to rebuild (inclusive). Defaults to the end of the data.
+
+        Returns:
+            int: Number of day/region buckets written.
+        """
+        model = self._model(dataset)
+        with self._lock:
+            session = self.db_manager.get_session()
+            try:
+                watermark = self._watermark(session, dataset)
+                if not watermark.last_id:
+                    # First backfill: everything that exists now becomes part of the rollups.
+                    watermark.last_id = session.query(func.max(model.id)).scalar() or 0
+
+                filters = self._folded_filters(model, watermark)
+                rollup_filters = [DailyRollup.dataset == dataset]
+                if start_day:
+                    filters.append(model.scraped_at >= day_start(start_day))
+                    rollup_filters.append(DailyRollup.day >= start_day)
+                if end_day:
+                    filters.append(model.scraped_at < day_start(end_day + timedelta(days=1)))
+                    rollup_filters.append(DailyRollup.day <= end_day)
+
+                session.query(DailyRollup).filter(*rollup_filters).delete(synchronize_session=False)
+                buckets = self._aggregate_raw(session, dataset, *filters)
+                self._upsert(session, dataset, buckets, replace=True)
+                session.commit()
+                logger.info(f"Backfilled {len(buckets)} {dataset} rollup buckets ({start_day or 'start'} to {end_day or 'end'}).")
+                return len(buckets)
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Error backfilling {dataset} rollups: {e}")
+                raise
+            finally:
+                session.close()
+
+    def verify(self, dataset, start_day=None, end_day=None):
+        """
+        Compares the rollups against a full recompute from raw rows (up to the watermark).
+
+        Parameters:
+            dataset (str): 'rlg_data' or 'rlg_fans'.
+            start_day (date, optional): First day to check (inclusive).
+            end_day (date, optional): Last day to check (inclusive).
+
+        Returns:
+            list: Mismatches as dicts with day, region and the differing fields (empty if consistent).
+        """
+        model = self._model(dataset)
+        session = self.db_manager.get_session()
+        try:
+            filters = self._folded_filters(model, session.get(RollupWatermark, dataset))
+            rollup_query = session.query(DailyRollup).filter(DailyRollup.dataset == dataset)
+            if start_day:
+                filters.append(model.scraped_at >= day_start(start_day))
+                rollup_query = rollup_query.filter(DailyRollup.day >= start_day)
+            if end_day:
+                filters.append(model.scraped_at < day_start(end_day + timedelta(days=1)))
+                rollup_query = rollup_query.filter(DailyRollup.day <= end_day)
+
+            expected = self._aggregate_raw(session, dataset, *filters)
+            actual = {(row.day, row.region): RollupAggregate().merge(row) for row in rollup_query.all()}
+
+            mismatches = []
+            for key in sorted(set(expected) | set(actual), key=lambda k: (k[0], k[1] or "")):
+                if key not in actual or key not in expected:
+                    fields = ["missing_rollup" if key not in actual else "unexpected_rollup"]
+                else:
+                    fields = actual[key].differences(expected[key])
+                if fields:
+                    mismatches.append({"day": key[0], "region": key[1], "fields": fields})
+
+            if mismatches:
+                logger.warning(f"{dataset} rollups differ from full recompute in {len(mismatches)} buckets.")
+            else:
+                logger.info(f"{dataset} rollups match full recompute.")
+            return mismatches
+        finally:
+            session.close()
+
+    def summarize(self, dataset, region=None, as_of=None):
+        """
+        Composes report aggregates: closed days from the rollups plus the current day from raw rows.
+
+        Parameters:
+            dataset (str): 'rlg_data' or 'rlg_fans'.
+            region (str, optional): Filter by region.
+            as_of (datetime, optional): Report time; defaults to now (UTC).
+
+        Returns:
+            tuple: (total RollupAggregate, DataFrame of per-day aggregates).
+        """
+        model = self._model(dataset)
+        today = (as_of or datetime.utcnow()).date()
+        session = self.db_manager.get_session()
+        try:
+            rollup_query = session.query(DailyRollup).filter(DailyRollup.dataset == dataset, DailyRollup.day < today)
+            live_filters = [model.scraped_at >= day_start(today)]
+            if region:
+                rollup_query = rollup_query.filter(DailyRollup.region == region)
+                live_filters.append(model.region == region)
+
+            days = {}
+            for row in rollup_query.all():
+                days.setdefault(row.day, RollupAggregate()).merge(row)
+            for (day, _), aggregate in self._aggregate_raw(session, dataset, *live_filters).items():
+                days.setdefault(day, RollupAggregate()).merge(aggregate)
+        finally:
+            session.close()
+
+        total = RollupAggregate()
+        for aggregate in days.values():
+            total.merge(aggregate)
+
+        daily = pd.DataFrame([
+            {
+                "Day": day,
+                "Records": aggregate.record_count,
+                **({"Sentiment": json.dumps(aggregate.sentiment_counts, sort_keys=True)} if model is RLGData else {
+                    "Average Engagement": round(aggregate.engagement_mean, 2),
+                    "Max Engagement": aggregate.engagement_max,
+                }),
+            }
+            for day, aggregate in sorted(days.items())
+        ])
+        return total, daily
+
+# -------------------------------
+# Standalone Backfill / Verification
+# -------------------------------
+if __name__ == "__main__":
+    import argparse
+    from database_manager import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Backfill and verify RLG report rollups.")
+    parser.add_argument("command", choices=["refresh", "backfill", "verify"])
+    parser.add_argument("--dataset", choices=sorted(ROLLUP_DATASETS), default=None,
+                        help="Dataset to process (default: all).")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="First day (YYYY-MM-DD).")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="Last day (YYYY-MM-DD).")
+    args = parser.parse_args()
+
+    manager = RollupManager(DatabaseManager())
+    for name in ([args.dataset] if args.dataset else sorted(ROLLUP_DATASETS)):
+        if args.command == "refresh":
+            print(f"{name}: folded {manager.refresh(name)} rows")
+        elif args.command == "backfill":
+            print(f"{name}: rebuilt {manager.backfill(name, args.start, args.end)} buckets")
+        else:
+            problems = manager.verify(name, args.start, args.end)
+            print(f"{name}: {'OK' if not problems else problems}")
@@ -52,6 +52,34 @@ class ReportScheduler:
         }
         logging.info(f"Scheduled job '{job_id}' for {schedule_time}.")
 
+    def add_rollup_refresh_job(self, job_id, rollup_manager, interval_minutes=15, datasets=("rlg_data", "rlg_fans")):
+        """
+        Periodically folds newly landed rows into the report rollups, so scheduled
+        reports only have to aggregate the rows since the last refresh.
+        Args:
+            job_id (str): Unique identifier for the job.
+            rollup_manager (RollupManager): Rollup manager from report_rollups.
+            interval_minutes (int): Minutes between refreshes.
+            datasets (tuple): Datasets to refresh.
+        """
+        if job_id in self.jobs:
+            raise SchedulerError(f"Job ID '{job_id}' already exists.")
+
+        def job():
+            for dataset in datasets:
+                try:
+                    rollup_manager.refresh(dataset)
+                except Exception as e:
+                    logging.error(f"Failed to refresh {dataset} rollups for job '{job_id}': {e}")
+
+        schedule.every(interval_minutes).minutes.do(job).tag(job_id)
+        self.jobs[job_id] = {
+            "report_type": "rollup_refresh",
+            "interval_minutes": interval_minutes,
+            "datasets": list(datasets),
+        }
+        logging.info(f"Scheduled rollup refresh job '{job_id}' every {interval_minutes} minutes.")
+
     def update_job(self, job_id, report_type=None, schedule_time=None, email_recipients=None, **kwargs):
         """
         Updates an existing scheduled job.
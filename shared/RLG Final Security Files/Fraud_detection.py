@@ -1,44 +1,85 @@
-import os
 import logging
 import json
 import time
+import threading
+import tracemalloc
 import requests
 import joblib
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import OrderedDict
 from config import FRAUD_DETECTION_CONFIG
 from geolocation_service import get_user_location
 from api_limits_and_throttling import rate_limit_check
 from anti_scraping_protection import detect_scraping_activity
+from ip_blocklist import CIDRBlocklist, get_shared_blocklist, get_shared_sync
+from fraud_scoring import FRAUD_FEATURES, MicroBatchScorer, UserActivityAggregates, is_fitted, load_anomaly_model
 from sklearn.ensemble import IsolationForest
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+class IPReputationCache:
+    """TTL + LRU cache in front of the geolocation / IP reputation lookup."""
+
+    def __init__(self, lookup, maxsize=100_000, ttl_seconds=3600):
+        self.lookup = lookup
+        self.maxsize = maxsize
+        self.ttl = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, ip):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(ip)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(ip)
+                self.hits += 1
+                return entry[1]
+        self.misses += 1
+        value = self.lookup(ip)
+        with self._lock:
+            self._entries[ip] = (now + self.ttl, value)
+            self._entries.move_to_end(ip)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+
 class FraudDetection:
     """AI-powered fraud detection system for RLG Data and RLG Fans."""
 
     def __init__(self):
-        self.blacklist_ips = set(FRAUD_DETECTION_CONFIG.get("blacklist_ips", []))
-        self.whitelist_ips = set(FRAUD_DETECTION_CONFIG.get("whitelist_ips", []))
+        # Both lists accept single IPs and CIDR ranges; the blacklist is shared with the other security modules.
+        # Config entries are seeded locally in every process; runtime changes go through the sync.
+        self.blacklist_ips = get_shared_blocklist()
+        self.blocklist_sync = get_shared_sync()
+        self.blacklist_ips.bulk_load(FRAUD_DETECTION_CONFIG.get("blacklist_ips", []))
+        self.whitelist_ips = CIDRBlocklist()
+        self.whitelist_ips.bulk_load(FRAUD_DETECTION_CONFIG.get("whitelist_ips", []))
         self.anomaly_model = self._load_model()
-        self.user_activity_log = defaultdict(list)
+        self.user_activity = UserActivityAggregates(FRAUD_DETECTION_CONFIG.get("activity_half_life_seconds", 3600))
+        self.scorer = MicroBatchScorer(self.anomaly_model, FRAUD_DETECTION_CONFIG.get("scoring_max_batch", 256))
+        self.ip_reputation = IPReputationCache(
+            get_user_location,
+            maxsize=FRAUD_DETECTION_CONFIG.get("ip_cache_size", 100_000),
+            ttl_seconds=FRAUD_DETECTION_CONFIG.get("ip_cache_ttl_seconds", 3600),
+        )
         self.suspicious_users = set()
 
     def _load_model(self):
-        """Loads or trains an anomaly detection model."""
-        model_path = FRAUD_DETECTION_CONFIG.get("anomaly_model_path", "fraud_model.pkl")
-        if os.path.exists(model_path):
-            return joblib.load(model_path)
-        else:
-            return IsolationForest(contamination=0.02, random_state=42)
+        """Loads the anomaly model, or a new one (trained by update_model) if the saved one is missing or outdated."""
+        return load_anomaly_model(FRAUD_DETECTION_CONFIG.get("anomaly_model_path", "fraud_model.pkl"))
 
     def update_model(self, data):
-        """Updates the fraud detection model with new data."""
-        df = pd.DataFrame(data)
-        self.anomaly_model.fit(df)
+        """Updates the fraud detection model with new data (rows with the FRAUD_FEATURES columns)."""
+        df = pd.DataFrame(data, columns=FRAUD_FEATURES)
+        self.anomaly_model.fit(df.to_numpy(dtype=np.float64))
+        self.scorer.model = self.anomaly_model
         joblib.dump(self.anomaly_model, FRAUD_DETECTION_CONFIG.get("anomaly_model_path", "fraud_model.pkl"))
 
     def is_fraudulent_request(self, user_id, ip, transaction_amount, request_type, user_agent):
@@ -51,15 +92,14 @@ class FraudDetection:
             return False
 
         # 2. Check for geolocation inconsistencies
-        location_data = get_user_location(ip)
+        location_data = self.ip_reputation.get(ip)
         if location_data and location_data["country"] not in FRAUD_DETECTION_CONFIG["allowed_countries"]:
             logging.warning(f"Fraud detected: Unauthorized region {location_data['country']}")
             return True
 
-        # 3. Check for high-risk user behavior (ML-based)
-        user_data = np.array([[transaction_amount, len(self.user_activity_log[user_id]), time.time()]])
-        anomaly_score = self.anomaly_model.predict(user_data)
-        if anomaly_score[0] == -1:
+        # 3. Check for high-risk user behavior (ML-based, micro-batched across threads; skipped until the model is trained)
+        user_data = self.user_activity.features(user_id, transaction_amount)
+        if is_fitted(self.anomaly_model) and self.scorer.predict(user_data) == -1:
             logging.warning(f"Fraud detected: Anomalous transaction behavior for user {user_id}")
             self.suspicious_users.add(user_id)
             return True
@@ -75,31 +115,65 @@ class FraudDetection:
             return True
 
         # 6. Logging user activity
-        self.user_activity_log[user_id].append({
-            "timestamp": time.time(),
-            "ip": ip,
-            "transaction_amount": transaction_amount,
-            "request_type": request_type
-        })
+        self.user_activity.record(user_id, transaction_amount)
 
         return False
 
+    def get_user_profile(self, user_id):
+        """Returns the rolling activity aggregates of a user."""
+        return self.user_activity.profile(user_id)
+
     def report_fraud(self, user_id, ip):
         """Manually report and blacklist fraudulent users."""
         self.suspicious_users.add(user_id)
-        self.blacklist_ips.add(ip)
+        self.blocklist_sync.block(ip, reason=f"fraud report for user {user_id}")
         logging.warning(f"User {user_id} and IP {ip} added to blacklist.")
 
     def remove_from_blacklist(self, ip):
         """Removes an IP from the blacklist (if false positive detected)."""
-        if ip in self.blacklist_ips:
-            self.blacklist_ips.remove(ip)
+        if self.blocklist_sync.unblock(ip):
             logging.info(f"IP {ip} removed from blacklist.")
 
     def get_suspicious_users(self):
         """Returns a list of flagged suspicious users."""
         return list(self.suspicious_users)
 
+def benchmark_fraud_scoring(n_users=1_000_000, n_requests=200_000, batch_size=256, seed=42):
+    """Measures aggregate updates + batched model scoring (requests/sec) and memory per million users."""
+    rng = np.random.default_rng(seed)
+    model = IsolationForest(contamination=0.02, random_state=seed)
+    model.fit(np.column_stack([
+        rng.exponential(50, 5000), rng.integers(0, 100, 5000), rng.exponential(5, 5000), rng.exponential(50, 5000)
+    ]))
+    scorer = MicroBatchScorer(model, batch_size)
+
+    tracemalloc.start()
+    aggregates = UserActivityAggregates()
+    start = time.time()
+    for i in range(n_users):
+        aggregates.record(f"user-{i}", 10.0, now=start)
+    memory_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    user_ids = rng.integers(0, n_users, n_requests)
+    amounts = rng.exponential(50, n_requests)
+    started = time.perf_counter()
+    for offset in range(0, n_requests, batch_size):
+        rows = []
+        for user, amount in zip(user_ids[offset:offset + batch_size], amounts[offset:offset + batch_size]):
+            user_id = f"user-{user}"
+            rows.append(aggregates.features(user_id, amount, now=start))
+            aggregates.record(user_id, amount, now=start)
+        scorer.predict_many(rows)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests_per_sec": n_requests / elapsed,
+        "memory_mb_per_million_users": memory_bytes / n_users,
+        "array_bytes_per_user": aggregates.nbytes() / aggregates.capacity,
+    }
+
+
 # Example Usage
 if __name__ == "__main__":
     fraud_detector = FraudDetection()
@@ -7,6 +7,7 @@ from flask import request, jsonify, abort
 import redis  # For rate limiting and caching
 import requests  # For third-party security API integrations
 from config import REDIS_CONFIG, SECURITY_CONFIG
+from ip_blocklist import get_shared_blocklist, get_shared_sync, start_shared_sync
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -14,8 +15,12 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 # Connect to Redis
 redis_client = redis.StrictRedis(host=REDIS_CONFIG["host"], port=REDIS_CONFIG["port"], db=0)
 
+# Shared in-process IP blocklist, kept in sync with every worker through Redis once
+# start_shared_sync() runs at startup
+BLOCKED_IPS = get_shared_blocklist()
+blocklist_sync = get_shared_sync()
+
 # Security settings
-BLOCKED_IPS = set()
 KNOWN_BOTS = [
     "AhrefsBot", "SemrushBot", "Googlebot", "Bingbot", "MJ12bot", "DotBot", "Screaming Frog", "YandexBot"
 ]
@@ -61,13 +66,12 @@ class AntiScrapingProtection:
         return hashlib.sha256(data.encode()).hexdigest()
 
     def block_ip(self, ip: str) -> None:
-        """Blocks an IP address by adding it to the blacklist."""
-        self.redis_client.setex(f"blocked_ip:{ip}", BLOCK_DURATION, "blocked")
-        self.blocked_ips.add(ip)
+        """Blocks an IP address (or CIDR range) for BLOCK_DURATION seconds across all workers."""
+        blocklist_sync.block(ip, ttl=BLOCK_DURATION, reason="anti_scraping")
 
     def is_blocked(self, ip: str) -> bool:
-        """Checks if an IP is currently blocked."""
-        return self.redis_client.exists(f"blocked_ip:{ip}")
+        """Checks if an IP is currently blocked, including by a blocked range."""
+        return ip in self.blocked_ips
 
     def honeypot_check(self, request_path: str) -> bool:
         """Detects scrapers using honeypot traps."""
@@ -146,4 +150,5 @@ def protected_endpoint():
     return jsonify({"data": "Protected RLG Data content"})
 
 if __name__ == "__main__":
+    start_shared_sync(redis_client)
     app.run(debug=True)
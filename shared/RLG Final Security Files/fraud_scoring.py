@@ -0,0 +1,164 @@
+"""
+Activity aggregates and micro-batched anomaly scoring for fraud detection.
+
+UserActivityAggregates keeps constant-size, exponentially decayed counters per user,
+and MicroBatchScorer groups concurrent feature rows into one model call. Both are
+thread-safe and only need numpy, so they are used by Fraud_detection and benchmarked
+without its service dependencies. load_anomaly_model only reuses a persisted model
+trained on the current FRAUD_FEATURES.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+import numpy as np
+
+# Feature row fed to the anomaly model, built by UserActivityAggregates.features
+FRAUD_FEATURES = ["amount", "request_count", "recent_requests", "recent_mean_amount"]
+
+
+def load_anomaly_model(model_path, contamination=0.02):
+    """Loads the persisted anomaly model if it was trained on FRAUD_FEATURES, otherwise returns a new unfitted one."""
+    import joblib
+    from sklearn.ensemble import IsolationForest
+
+    if os.path.exists(model_path):
+        model = joblib.load(model_path)
+        n_features = getattr(model, "n_features_in_", None)
+        if n_features == len(FRAUD_FEATURES):
+            return model
+        logging.warning(
+            f"{model_path} was trained on {n_features} features, not {len(FRAUD_FEATURES)}; "
+            "starting a new model, retrained on the next update"
+        )
+    return IsolationForest(contamination=contamination, random_state=42)
+
+
+def is_fitted(model):
+    """True once the model has been fitted (sklearn estimators set n_features_in_ in fit)."""
+    return hasattr(model, "n_features_in_")
+
+
+class UserActivityAggregates:
+    """Fixed-size rolling activity aggregates per user, stored in compact arrays.
+
+    Each user gets a row index into parallel numpy arrays holding exponentially
+    decayed request and amount counters, so memory per user is constant no matter
+    how many requests they make.
+    """
+
+    def __init__(self, half_life_seconds=3600.0, initial_capacity=1024):
+        self.half_life = float(half_life_seconds)
+        # Guards slot allocation and array growth; MicroBatchScorer callers record from many threads
+        self._lock = threading.Lock()
+        self.index = {}
+        self.capacity = initial_capacity
+        self.request_count = np.zeros(initial_capacity, dtype=np.uint32)
+        self.decayed_requests = np.zeros(initial_capacity, dtype=np.float32)
+        self.decayed_amount = np.zeros(initial_capacity, dtype=np.float32)
+        self.last_seen = np.zeros(initial_capacity, dtype=np.float64)
+
+    def _slot(self, user_id):
+        slot = self.index.get(user_id)
+        if slot is None:
+            slot = len(self.index)
+            if slot == self.capacity:
+                self._grow()
+            self.index[user_id] = slot
+        return slot
+
+    def _grow(self):
+        self.capacity *= 2
+        for name in ("request_count", "decayed_requests", "decayed_amount", "last_seen"):
+            old = getattr(self, name)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def record(self, user_id, amount, now=None):
+        """Add one request to the user's aggregates."""
+        now = time.time() if now is None else now
+        with self._lock:
+            slot = self._slot(user_id)
+            decay = 2.0 ** (-(now - self.last_seen[slot]) / self.half_life) if self.last_seen[slot] else 0.0
+            self.decayed_requests[slot] = self.decayed_requests[slot] * decay + 1.0
+            self.decayed_amount[slot] = self.decayed_amount[slot] * decay + amount
+            self.request_count[slot] += 1
+            self.last_seen[slot] = now
+
+    def activity_count(self, user_id):
+        with self._lock:
+            slot = self.index.get(user_id)
+            return 0 if slot is None else int(self.request_count[slot])
+
+    def profile(self, user_id, now=None):
+        """Decayed request rate and mean amount for a user, as of `now`."""
+        now = time.time() if now is None else now
+        with self._lock:
+            slot = self.index.get(user_id)
+            if slot is None:
+                return {"request_count": 0, "recent_requests": 0.0, "recent_mean_amount": 0.0}
+            decay = 2.0 ** (-(now - self.last_seen[slot]) / self.half_life)
+            return {
+                "request_count": int(self.request_count[slot]),
+                "recent_requests": float(self.decayed_requests[slot]) * decay,
+                "recent_mean_amount": float(self.decayed_amount[slot] / self.decayed_requests[slot]),
+            }
+
+    def features(self, user_id, amount, now=None):
+        """Model feature row for a request, in FRAUD_FEATURES order."""
+        profile = self.profile(user_id, now)
+        return [amount, profile["request_count"], profile["recent_requests"], profile["recent_mean_amount"]]
+
+    def nbytes(self):
+        """Bytes held by the aggregate arrays (the user index dict comes on top)."""
+        return sum(getattr(self, name).nbytes for name in ("request_count", "decayed_requests", "decayed_amount", "last_seen"))
+
+
+class MicroBatchScorer:
+    """Scores feature rows with the anomaly model in micro-batches.
+
+    Callers from any thread submit one row and wait for its prediction. A single
+    worker takes every row queued at that moment (up to `max_batch`) and runs one
+    `predict` call for all of them, so batches form under concurrency without adding
+    latency to a lone request.
+    """
+
+    def __init__(self, model, max_batch=256):
+        self.model = model
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="fraud-scorer", daemon=True)
+        self._worker.start()
+
+    def submit(self, features):
+        future = Future()
+        self._queue.put((features, future))
+        return future
+
+    def predict(self, features):
+        return self.submit(features).result()
+
+    def predict_many(self, rows):
+        """Score a block of rows directly in the calling thread."""
+        return self.model.predict(np.asarray(rows, dtype=np.float64))
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                predictions = self.predict_many([features for features, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), prediction in zip(batch, predictions):
+                future.set_result(prediction)
@@ -0,0 +1,276 @@
+"""
+Shared IP blocklist for the RLG security modules.
+
+One in-process store of blocked IPv4/IPv6 addresses and CIDR ranges, with optional
+expiry per entry, used by anti-scraping protection, fraud detection, threat detection
+and referral fraud detection. Lookups are longest-prefix matches done in memory, and
+RedisBlocklistSync keeps every process in step through a Redis hash plus pub/sub
+change notifications, so checking an IP is never a Redis round trip. Modules write
+through `get_shared_sync()`; the process entry point attaches Redis with
+`start_shared_sync(redis_client)`.
+"""
+
+import json
+import math
+import time
+import socket
+import logging
+import ipaddress
+import threading
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+REDIS_ENTRIES_KEY = "ip_blocklist:entries"
+REDIS_CHANNEL = "ip_blocklist:changes"
+
+
+def _parse_ip(ip: str) -> Tuple[int, int]:
+    """Returns (version, integer value) of an address; IPv4-mapped IPv6 is treated as IPv4."""
+    try:
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, ip), "big")
+    except OSError:
+        value = int.from_bytes(socket.inet_pton(socket.AF_INET6, ip.split("%", 1)[0]), "big")
+        if value >> 32 == 0xFFFF:
+            return 4, value & 0xFFFFFFFF
+        return 6, value
+
+
+class CIDRBlocklist:
+    """
+    Longest-prefix-match table of blocked IPv4/IPv6 networks.
+
+    Networks are indexed by prefix length: a lookup masks the address once per
+    prefix length in use and probes a dict, longest first. That gives the same
+    answers as a radix trie with a handful of dict probes instead of one node hop
+    per address bit. Entries can expire; expired entries are ignored on lookup and
+    dropped by `purge_expired`.
+    """
+
+    BITS = {4: 32, 6: 128}
+
+    def __init__(self):
+        # version -> prefix length -> network int -> (expires_at, reason)
+        self._tables: Dict[int, Dict[int, Dict[int, Tuple[float, str]]]] = {4: {}, 6: {}}
+        self._lengths: Dict[int, list] = {4: [], 6: []}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _network(cidr: str) -> Tuple[int, int, int]:
+        network = ipaddress.ip_network(cidr.strip(), strict=False)
+        if network.version == 6 and network.network_address.ipv4_mapped and network.prefixlen >= 96:
+            network = ipaddress.ip_network(f"{network.network_address.ipv4_mapped}/{network.prefixlen - 96}")
+        return network.version, network.prefixlen, int(network.network_address)
+
+    @staticmethod
+    def _format(version: int, length: int, network: int) -> str:
+        return f"{ipaddress.ip_address(network) if version == 4 else ipaddress.IPv6Address(network)}/{length}"
+
+    @classmethod
+    def normalize(cls, cidr: str) -> str:
+        """Returns the key an address or range is stored under, e.g. "1.2.3.4" -> "1.2.3.4/32"."""
+        return cls._format(*cls._network(cidr))
+
+    def add(self, cidr: str, ttl: Optional[float] = None, reason: str = "", expires_at: Optional[float] = None) -> None:
+        """Blocks an address or CIDR range, optionally for `ttl` seconds."""
+        version, length, network = self._network(cidr)
+        if expires_at is None:
+            expires_at = time.time() + ttl if ttl else math.inf
+        with self._lock:
+            table = self._tables[version].get(length)
+            if table is None:
+                table = self._tables[version][length] = {}
+                self._lengths[version] = sorted(self._tables[version], reverse=True)
+            table[network] = (expires_at, reason)
+
+    def bulk_load(self, entries: Iterable[Union[str, Tuple[str, Optional[float], str]]], ttl: Optional[float] = None) -> int:
+        """Loads a threat feed of CIDR strings or (cidr, ttl, reason) tuples; returns the number loaded."""
+        loaded = 0
+        for entry in entries:
+            try:
+                if isinstance(entry, str):
+                    self.add(entry, ttl=ttl)
+                else:
+                    self.add(*entry)
+                loaded += 1
+            except ValueError:
+                logging.warning(f"Skipping invalid blocklist entry: {entry!r}")
+        return loaded
+
+    def remove(self, cidr: str) -> bool:
+        """Unblocks exactly this address or range; returns False if it was not listed."""
+        version, length, network = self._network(cidr)
+        with self._lock:
+            table = self._tables[version].get(length)
+            if not table or table.pop(network, None) is None:
+                return False
+            if not table:
+                del self._tables[version][length]
+                self._lengths[version] = sorted(self._tables[version], reverse=True)
+            return True
+
+    def match(self, ip: str) -> Optional[Dict]:
+        """Returns the most specific active entry covering `ip`, or None."""
+        try:
+            version, value = _parse_ip(ip)
+        except (OSError, TypeError, AttributeError):
+            return None
+        bits = self.BITS[version]
+        tables = self._tables[version]
+        now = time.time()
+        # Lock-free read: a concurrent remove/purge_expired may drop a table we are about to probe
+        for length in self._lengths[version]:
+            table = tables.get(length)
+            if table is None:
+                continue
+            network = value >> (bits - length) << (bits - length) if length else 0
+            entry = table.get(network)
+            if entry is not None and entry[0] > now:
+                return {
+                    "network": self._format(version, length, network),
+                    "expires_at": None if entry[0] == math.inf else entry[0],
+                    "reason": entry[1],
+                }
+        return None
+
+    def __contains__(self, ip: str) -> bool:
+        return self.match(ip) is not None
+
+    def purge_expired(self) -> int:
+        """Drops expired entries; returns how many were removed."""
+        now = time.time()
+        removed = 0
+        with self._lock:
+            for version, tables in self._tables.items():
+                for length in list(tables):
+                    expired = [network for network, (expires_at, _) in tables[length].items() if expires_at <= now]
+                    for network in expired:
+                        del tables[length][network]
+                    removed += len(expired)
+                    if not tables[length]:
+                        del tables[length]
+                self._lengths[version] = sorted(tables, reverse=True)
+        return removed
+
+    def __len__(self) -> int:
+        return sum(len(table) for tables in self._tables.values() for table in tables.values())
+
+
+class RedisBlocklistSync:
+    """
+    Keeps a CIDRBlocklist in sync across processes through Redis.
+
+    Entries live in a Redis hash (cidr -> {"expires_at", "reason"}); every change is
+    also published on a channel that each process applies to its local blocklist.
+    Without a Redis client, writes only apply to the local blocklist.
+    """
+
+    def __init__(self, blocklist: CIDRBlocklist, redis_client, entries_key: str = REDIS_ENTRIES_KEY, channel: str = REDIS_CHANNEL):
+        self.blocklist = blocklist
+        self.redis_client = redis_client
+        self.entries_key = entries_key
+        self.channel = channel
+        self._listener = None
+
+    def load(self) -> int:
+        """Bulk loads every unexpired entry from Redis into the local blocklist."""
+        now = time.time()
+        entries = []
+        for cidr, data in self.redis_client.hscan_iter(self.entries_key, count=10000):
+            info = json.loads(data)
+            expires_at = info.get("expires_at")
+            if expires_at is not None and expires_at <= now:
+                self.redis_client.hdel(self.entries_key, cidr)
+                continue
+            cidr = cidr.decode() if isinstance(cidr, bytes) else cidr
+            entries.append((cidr, None, info.get("reason", ""), expires_at or math.inf))
+        for cidr, _, reason, expires_at in entries:
+            self.blocklist.add(cidr, reason=reason, expires_at=expires_at)
+        logging.info(f"Loaded {len(entries)} blocklist entries from Redis.")
+        return len(entries)
+
+    def start(self) -> None:
+        """Loads the blocklist and starts applying change notifications in the background."""
+        if self._listener is not None:
+            return
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.channel: self._on_message})
+        self.load()
+        self._listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def _on_message(self, message) -> None:
+        try:
+            change = json.loads(message["data"])
+            if change["op"] == "add":
+                self.blocklist.add(change["cidr"], reason=change.get("reason", ""), expires_at=change.get("expires_at") or math.inf)
+            elif change["op"] == "remove":
+                self.blocklist.remove(change["cidr"])
+        except (ValueError, KeyError, TypeError) as e:
+            logging.error(f"Ignoring malformed blocklist change {message!r}: {e}")
+
+    def block(self, cidr: str, ttl: Optional[float] = None, reason: str = "") -> None:
+        """Blocks an address or range in every process."""
+        self.bulk_block([(cidr, ttl, reason)])
+
+    def bulk_block(self, entries: Iterable[Union[str, Tuple[str, Optional[float], str]]], ttl: Optional[float] = None) -> int:
+        """Blocks a feed of CIDR strings or (cidr, ttl, reason) tuples in every process; returns the number blocked."""
+        now = time.time()
+        pipe = self.redis_client.pipeline() if self.redis_client is not None else None
+        blocked = 0
+        for entry in entries:
+            cidr, entry_ttl, reason = (entry, ttl, "") if isinstance(entry, str) else entry
+            expires_at = now + entry_ttl if entry_ttl else None
+            try:
+                cidr = self.blocklist.normalize(cidr)
+                self.blocklist.add(cidr, reason=reason, expires_at=expires_at or math.inf)
+            except ValueError:
+                logging.warning(f"Skipping invalid blocklist entry: {entry!r}")
+                continue
+            blocked += 1
+            if pipe is not None:
+                pipe.hset(self.entries_key, cidr, json.dumps({"expires_at": expires_at, "reason": reason}))
+                pipe.publish(self.channel, json.dumps({"op": "add", "cidr": cidr, "expires_at": expires_at, "reason": reason}))
+        if pipe is not None and blocked:
+            pipe.execute()
+        return blocked
+
+    def unblock(self, cidr: str) -> bool:
+        """Unblocks an address or range in every process; returns False if it was not listed locally."""
+        removed = self.blocklist.remove(cidr)
+        if self.redis_client is not None:
+            # Keys are normalized, so "1.2.3.4" and "1.2.3.4/32" are the same entry
+            key = self.blocklist.normalize(cidr)
+            pipe = self.redis_client.pipeline()
+            pipe.hdel(self.entries_key, key)
+            pipe.publish(self.channel, json.dumps({"op": "remove", "cidr": key}))
+            pipe.execute()
+        return removed
+
+
+_shared_blocklist = CIDRBlocklist()
+
+
+def get_shared_blocklist() -> CIDRBlocklist:
+    """Returns the process-wide blocklist shared by the security modules."""
+    return _shared_blocklist
+
+
+_shared_sync = RedisBlocklistSync(_shared_blocklist, redis_client=None)
+
+
+def get_shared_sync() -> RedisBlocklistSync:
+    """Returns the sync object every security module writes the shared blocklist through."""
+    return _shared_sync
+
+
+def start_shared_sync(redis_client) -> RedisBlocklistSync:
+    """Attaches Redis to the shared blocklist and starts syncing; call once from the process entry point."""
+    _shared_sync.redis_client = redis_client
+    _shared_sync.start()
+    return _shared_sync
@@ -14,6 +14,7 @@ from shared.config import (
     ENABLE_FIREWALL_BLOCK,
     SOCIAL_MEDIA_PLATFORMS,
 )
+from ip_blocklist import get_shared_sync
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +25,9 @@ logging.basicConfig(
     ],
 )
 
+# Feed entries expire unless a later refresh lists them again
+THREAT_FEED_TTL = int(os.getenv("THREAT_FEED_TTL", 24 * 60 * 60))
+
 
 class SecurityThreatDetection:
     """
@@ -32,6 +36,7 @@ class SecurityThreatDetection:
 
     def __init__(self):
         self.suspicious_ip_cache = set()
+        self.blocklist_sync = get_shared_sync()
         self.suspicious_patterns = [
             re.compile(r"(DROP\s+TABLE|DELETE\s+FROM)", re.IGNORECASE),
             re.compile(r"(SELECT.*FROM.*WHERE.*;)", re.IGNORECASE),
@@ -90,7 +95,8 @@ class SecurityThreatDetection:
             response.raise_for_status()
             ip_list = response.json()
             self.suspicious_ip_cache.update(ip_list)
-            log_info(f"Fetched {len(ip_list)} suspicious IPs from external source.")
+            loaded = self.blocklist_sync.bulk_block((ip, THREAT_FEED_TTL, "threat_feed") for ip in ip_list)
+            log_info(f"Fetched {len(ip_list)} suspicious IPs from external source ({loaded} loaded into the blocklist).")
             return list(self.suspicious_ip_cache)
         except Exception as e:
             log_error(f"Error fetching suspicious IP list: {e}")
@@ -1,10 +1,17 @@
+import heapq
 import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
 from datetime import datetime
 import json
 import time
+from scraping_utils import RobotsCache
 
 # Configure logging
 logging.basicConfig(
@@ -16,21 +23,110 @@ logging.basicConfig(
     ]
 )
 
+# Crawler settings
+MAX_IN_FLIGHT = 32          # Concurrent requests across all domains
+POOL_CONNECTIONS = 256      # Distinct hosts kept in each thread's keep-alive connection pool
+REQUEST_TIMEOUT = 10
+
+
+class ThreadLocalSession:
+    """
+    One pooled requests.Session per thread, since a Session is not safe to share between threads.
+    """
+
+    def __init__(self, headers: Dict[str, str], pool_maxsize: int):
+        self.headers = headers
+        self.pool_maxsize = pool_maxsize
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=self.pool_maxsize)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.session.get(url, **kwargs)
+
+
+class DomainScheduler:
+    """
+    Per-domain politeness scheduler. Each domain has its own URL queue and next-allowed time;
+    at most one request per domain is in flight, while different domains proceed in parallel.
+    """
+
+    def __init__(self):
+        self._queues = OrderedDict()
+        self._ready = []  # heap of (ready_at, sequence, domain)
+        self._sequence = 0
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+    def add(self, url: str):
+        domain = self.domain_of(url)
+        if domain not in self._queues:
+            self._queues[domain] = deque()
+            self._push(domain, 0.0)
+        self._queues[domain].append(url)
+
+    def _push(self, domain: str, ready_at: float):
+        self._sequence += 1
+        heapq.heappush(self._ready, (ready_at, self._sequence, domain))
+
+    def next_ready(self, now: float) -> Optional[Tuple[str, str]]:
+        """Returns (domain, url) for a domain whose delay has elapsed, or None."""
+        if self._ready and self._ready[0][0] <= now:
+            _, _, domain = heapq.heappop(self._ready)
+            return domain, self._queues[domain].popleft()
+        return None
+
+    def seconds_until_ready(self, now: float) -> Optional[float]:
+        return max(self._ready[0][0] - now, 0.0) if self._ready else None
+
+    def release(self, domain: str, delay: float):
+        """Marks a domain's request as finished; its next URL becomes ready after `delay` seconds."""
+        if self._queues[domain]:
+            self._push(domain, time.monotonic() + delay)
+        else:
+            del self._queues[domain]
+
+    def __bool__(self):
+        return bool(self._queues)
+
+
 class MediaScraperService:
     """
     Service for scraping mainstream and community media websites for RLG Data and RLG Fans.
     """
 
-    def __init__(self, user_agent: str = "RLG Media Scraper/1.0", rate_limit: float = 1.0):
+    def __init__(self, user_agent: str = "RLG Media Scraper/1.0", rate_limit: float = 1.0,
+                 max_in_flight: int = MAX_IN_FLIGHT):
         """
         Initialize the MediaScraperService.
 
         Args:
             user_agent: The User-Agent string to use for HTTP requests.
-            rate_limit: Minimum time in seconds between requests to avoid overloading servers.
+            rate_limit: Minimum time in seconds between requests to the same domain.
+            max_in_flight: Maximum number of concurrent requests across all domains.
         """
         self.headers = {"User-Agent": user_agent}
+        self.user_agent = user_agent
         self.rate_limit = rate_limit
+        self.max_in_flight = max_in_flight
+
+        # Pooled keep-alive connections, one session per crawler thread
+        self.session = ThreadLocalSession(self.headers, pool_maxsize=max_in_flight)
+        # robots.txt policies with TTLs and single-flight fetches (see scraping_utils.RobotsCache)
+        self.robots_cache = RobotsCache(session=self.session)
         logging.info("MediaScraperService initialized with rate limit: %.2f seconds", rate_limit)
 
     def fetch_html(self, url: str) -> Optional[str]:
@@ -44,7 +140,7 @@ class MediaScraperService:
             The HTML content of the page or None if the request fails.
         """
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             logging.info("Successfully fetched content from %s", url)
             return response.text
@@ -111,40 +207,138 @@ class MediaScraperService:
             logging.error("Failed to scrape article from %s: %s", url, e)
             return None
 
-    def batch_scrape(self, urls: List[str], content_selector: str) -> List[Dict]:
+    def _crawl_one(self, domain: str, url: str, content_selector: str) -> Tuple[Optional[Dict], float]:
+        """
+        Scrape one URL if robots.txt allows it.
+
+        Returns:
+            (article data or None, delay before the next request to this domain)
+        """
+        policy = self.robots_cache.get(url)
+        delay = self.rate_limit
+        crawl_delay = policy.crawl_delay(self.user_agent)
+        if crawl_delay:
+            delay = max(delay, float(crawl_delay))
+        if not policy.can_fetch(self.user_agent, url):
+            logging.info("Skipping %s (disallowed by robots.txt)", url)
+            return None, delay
+        return self.scrape_article(url, content_selector), delay
+
+    def crawl(self, urls: Iterable[str], content_selector: str) -> Iterator[Dict]:
+        """
+        Concurrently scrape articles with per-domain politeness.
+
+        Different domains are fetched in parallel (up to max_in_flight requests); each domain gets
+        one request at a time, spaced by max(rate_limit, robots.txt crawl-delay). Articles are
+        yielded as soon as they are scraped.
+
+        Args:
+            urls: Article URLs to scrape.
+            content_selector: CSS selector for the article content.
+
+        Yields:
+            Dictionaries containing scraped article data.
+        """
+        scheduler = DomainScheduler()
+        for url in urls:
+            scheduler.add(url)
+
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            while scheduler or in_flight:
+                # Dispatch every domain whose delay has elapsed, within the in-flight budget
+                while len(in_flight) < self.max_in_flight:
+                    ready = scheduler.next_ready(time.monotonic())
+                    if ready is None:
+                        break
+                    domain, url = ready
+                    in_flight[executor.submit(self._crawl_one, domain, url, content_selector)] = domain
+
+                timeout = scheduler.seconds_until_ready(time.monotonic())
+                if not in_flight:
+                    time.sleep(timeout or 0)
+                    continue
+
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    domain = in_flight.pop(future)
+                    try:
+                        article, delay = future.result()
+                    except Exception as e:
+                        logging.error("Crawler task for %s failed: %s", domain, e)
+                        article, delay = None, self.rate_limit
+                    scheduler.release(domain, delay)
+                    if article:
+                        yield article
+
+    def batch_scrape(self, urls: List[str], content_selector: str, output_path: Optional[str] = None,
+                     concurrent: bool = True) -> List[Dict]:
         """
         Scrape multiple articles.
 
+        With concurrent=True (the default) articles come back in the order they finish
+        scraping, not in the order of `urls`; pass concurrent=False to keep input order.
+
         Args:
             urls: A list of article URLs to scrape.
             content_selector: CSS selector for the article content.
+            output_path: If given, articles are streamed to this JSON file as they are scraped
+                and are not kept in memory.
+            concurrent: Use the per-domain concurrent crawler (False scrapes serially).
 
         Returns:
-            A list of dictionaries containing scraped article data.
+            A list of dictionaries containing scraped article data (empty when output_path is given).
         """
-        articles = []
+        if concurrent:
+            source = self.crawl(urls, content_selector)
+        else:
+            source = self._scrape_serially(urls, content_selector)
+
+        if output_path:
+            count = self.save_scraped_data(source, output_path)
+            logging.info("Batch scraping complete. Scraped %d articles.", count)
+            return []
+
+        articles = list(source)
+        logging.info("Batch scraping complete. Scraped %d articles.", len(articles))
+        return articles
+
+    def _scrape_serially(self, urls: List[str], content_selector: str) -> Iterator[Dict]:
         for url in urls:
             time.sleep(self.rate_limit)  # Respect rate limiting
             article = self.scrape_article(url, content_selector)
             if article:
-                articles.append(article)
-        logging.info("Batch scraping complete. Scraped %d articles.", len(articles))
-        return articles
+                yield article
 
-    def save_scraped_data(self, data: List[Dict], output_path: str):
+    def save_scraped_data(self, data: Iterable[Dict], output_path: str):
         """
-        Save scraped data to a JSON file.
+        Save scraped data to a JSON file. Items are written as they arrive, so a
+        generator (e.g. from crawl) is streamed to disk without being held in memory.
 
         Args:
-            data: The list of scraped article data.
+            data: The scraped article data (list or iterable).
             output_path: Path to the output JSON file.
+
+        Returns:
+            The number of items written.
+
+        Raises:
+            Exception: Any error from writing the file or from producing the data is logged and re-raised.
         """
+        count = 0
         try:
             with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            logging.info("Scraped data saved to %s", output_path)
+                f.write("[")
+                for item in data:
+                    f.write(",\n" if count else "\n")
+                    f.write(json.dumps(item, indent=4, ensure_ascii=False))
+                    count += 1
+                f.write("\n]" if count else "]")
+            logging.info("Scraped data (%d items) saved to %s", count, output_path)
+            return count
         except Exception as e:
-            logging.error("Failed to save scraped data to %s: %s", output_path, e)
+            logging.error("Failed to save scraped data to %s after %d items: %s", output_path, count, e)
+            raise
 
 # Example usage
 if __name__ == "__main__":
@@ -160,8 +354,7 @@ if __name__ == "__main__":
     if homepage_html:
         article_links = scraper.parse_article_links(homepage_html, test_url, article_page_selector)
 
-        # Scrape articles
-        scraped_articles = scraper.batch_scrape(article_links[:5], article_content_selector)
-
-        # Save results
-        scraper.save_scraped_data(scraped_articles, "scraped_articles.json")
+        # Scrape articles concurrently, streaming results to disk as they arrive
+        scraper.batch_scrape(
+            article_links[:5], article_content_selector, output_path="scraped_articles.json"
+        )
@@ -1,5 +1,12 @@
+import os
+import zlib
+import pickle
+import shutil
 import logging
-from typing import List, Dict, Any
+import tempfile
+from decimal import Decimal, InvalidOperation
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from datetime import datetime
 
 # Configure logging
@@ -12,14 +19,107 @@ logging.basicConfig(
     ]
 )
 
+# Reconciliation settings
+PROVIDER_PAGE_SIZE = 1000          # Provider transactions fetched per page
+MAX_IN_MEMORY_TRANSACTIONS = 500_000  # Above this many system transactions, partition to disk
+SPILL_PARTITIONS = 64              # Number of on-disk hash partitions when spilling
+AMOUNT_PRECISION = Decimal("0.01")  # Amounts are compared to the cent
+
+
+def _normalize_amount(amount: Any) -> Optional[Decimal]:
+    """
+    Convert an amount to a Decimal rounded to the cent (None if it is not numeric).
+    """
+    try:
+        return Decimal(str(amount)).quantize(AMOUNT_PRECISION)
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+
+
+def _partition(transaction_id: str, partitions: int) -> int:
+    """
+    Stable hash partition for a transaction id (the same id always lands in the same partition).
+    """
+    return zlib.crc32(str(transaction_id).encode("utf-8")) % partitions
+
+
+class ReconciliationResult:
+    """
+    Accumulates missing, extra and amount-mismatched transactions for one provider.
+    """
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.total_provider_transactions = 0
+        self.total_system_transactions = 0
+        self.missing_in_system = []
+        self.extra_in_system = []
+        self.amount_mismatches = []
+        self.duplicate_provider_transactions = []
+
+    def join(self, index: Dict[str, Dict[str, Any]], provider_transactions: Iterable[Dict[str, Any]]) -> None:
+        """
+        Probe the system-side hash index with provider transactions, in one pass.
+        Matched entries are removed from the index; whatever remains afterwards is extra in the system,
+        but only if it is tagged with this provider (an untagged transaction may belong to another one).
+
+        Args:
+            index (Dict[str, Dict[str, Any]]): System transactions keyed by transaction_id.
+            provider_transactions (Iterable[Dict[str, Any]]): Provider transactions to match.
+        """
+        matched = set()
+        for provider_txn in provider_transactions:
+            self.total_provider_transactions += 1
+            transaction_id = provider_txn["transaction_id"]
+            system_txn = index.pop(transaction_id, None)
+            if system_txn is None:
+                if transaction_id in matched:
+                    self.duplicate_provider_transactions.append(provider_txn)
+                else:
+                    self.missing_in_system.append(provider_txn)
+                continue
+
+            matched.add(transaction_id)
+            if _normalize_amount(system_txn["amount"]) != _normalize_amount(provider_txn["amount"]):
+                self.amount_mismatches.append({
+                    "transaction_id": transaction_id,
+                    "provider_amount": provider_txn["amount"],
+                    "system_amount": system_txn["amount"],
+                    "provider_transaction": provider_txn,
+                })
+
+        self.extra_in_system.extend(txn for txn in index.values() if txn.get("provider") == self.provider)
+
+    def to_report(self) -> Dict[str, Any]:
+        """
+        Build the reconciliation report. "mismatched_transactions" keeps its original meaning:
+        provider transactions that are missing from the system or whose amount differs.
+        """
+        mismatched_transactions = self.missing_in_system + [m["provider_transaction"] for m in self.amount_mismatches]
+        has_issues = mismatched_transactions or self.extra_in_system or self.duplicate_provider_transactions
+        return {
+            "provider": self.provider,
+            "total_provider_transactions": self.total_provider_transactions,
+            "total_system_transactions": self.total_system_transactions,
+            "mismatched_transactions": mismatched_transactions,
+            "missing_in_system": self.missing_in_system,
+            "extra_in_system": self.extra_in_system,
+            "amount_mismatches": self.amount_mismatches,
+            "duplicate_provider_transactions": self.duplicate_provider_transactions,
+            "reconciliation_status": "Issues Found" if has_issues else "Complete"
+        }
+
+
 class PaymentReconciliationService:
     """
     Service class for managing payment reconciliation for RLG Data and RLG Fans.
     Handles reconciliation of payment transactions across multiple payment platforms.
     """
 
-    def __init__(self):
+    def __init__(self, max_in_memory: int = MAX_IN_MEMORY_TRANSACTIONS, spill_dir: Optional[str] = None):
         self.payment_providers = ["PayPal", "Stripe", "PayFast", "Square"]
+        self.max_in_memory = max_in_memory
+        self.spill_dir = spill_dir
         logging.info("PaymentReconciliationService initialized with providers: %s", self.payment_providers)
 
     def fetch_transactions(self, provider: str, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
@@ -60,55 +160,136 @@ class PaymentReconciliationService:
         logging.info("Fetched %d transactions from %s.", len(transactions), provider)
         return transactions
 
-    def reconcile_transactions(self, provider: str, system_transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def fetch_transaction_pages(self, provider: str, start_date: datetime, end_date: datetime,
+                                page_size: int = PROVIDER_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream transactions from a payment provider page by page.
+
+        Placeholder: until the provider APIs are integrated, the pages are slices of the full
+        fetch_transactions list, so the provider side is still held in memory for the whole period.
+
+        Args:
+            provider (str): The payment provider name.
+            start_date (datetime): The start date for transaction fetching.
+            end_date (datetime): The end date for transaction fetching.
+            page_size (int): Transactions per page.
+
+        Yields:
+            List[Dict[str, Any]]: One page of transactions.
+        """
+        transactions = self.fetch_transactions(provider, start_date, end_date)
+        for offset in range(0, len(transactions), page_size):
+            yield transactions[offset:offset + page_size]
+
+    @staticmethod
+    def _provider_system_transactions(provider: str, system_transactions: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        System transactions that may belong to a provider: those tagged with it, and untagged ones
+        (which are matched against every provider but never reported as extra).
+        """
+        for txn in system_transactions:
+            if txn.get("provider", provider) == provider:
+                yield txn
+
+    def _reconcile_in_memory(self, result: ReconciliationResult, system_transactions: List[Dict[str, Any]],
+                             pages: Iterator[List[Dict[str, Any]]]) -> None:
+        index = {txn["transaction_id"]: txn for txn in system_transactions}
+        result.join(index, (txn for page in pages for txn in page))
+
+    def _reconcile_spilled(self, result: ReconciliationResult, system_transactions: List[Dict[str, Any]],
+                           pages: Iterator[List[Dict[str, Any]]]) -> None:
+        """
+        Grace hash join: partition both sides to disk by transaction_id, then join one partition at a time,
+        so only 1/SPILL_PARTITIONS of the system index is in memory at once. Rows are pickled, so Decimal
+        and datetime values come back unchanged and the report matches the in-memory join.
+        """
+        spill_dir = tempfile.mkdtemp(prefix=f"reconcile_{result.provider}_", dir=self.spill_dir)
+        try:
+            for side, transactions in (("system", iter(system_transactions)),
+                                       ("provider", (txn for page in pages for txn in page))):
+                files = [open(os.path.join(spill_dir, f"{side}_{i}.pkl"), "wb") for i in range(SPILL_PARTITIONS)]
+                try:
+                    for txn in transactions:
+                        pickle.dump(txn, files[_partition(txn["transaction_id"], SPILL_PARTITIONS)], pickle.HIGHEST_PROTOCOL)
+                finally:
+                    for spill_file in files:
+                        spill_file.close()
+
+            for i in range(SPILL_PARTITIONS):
+                index = {txn["transaction_id"]: txn for txn in self._read_partition(spill_dir, "system", i)}
+                result.join(index, self._read_partition(spill_dir, "provider", i))
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+    @staticmethod
+    def _read_partition(spill_dir: str, side: str, partition: int) -> Iterator[Dict[str, Any]]:
+        with open(os.path.join(spill_dir, f"{side}_{partition}.pkl"), "rb") as spill_file:
+            while True:
+                try:
+                    yield pickle.load(spill_file)
+                except EOFError:
+                    return
+
+    def reconcile_transactions(self, provider: str, system_transactions: List[Dict[str, Any]],
+                               start_date: datetime = datetime(2025, 1, 1),
+                               end_date: datetime = datetime(2025, 1, 31)) -> Dict[str, Any]:
         """
         Reconcile transactions between the payment provider and the internal system.
 
+        System transactions are indexed by transaction_id and provider pages are streamed through
+        the index, detecting missing, extra and amount-mismatched transactions in a single pass.
+        If the provider's system transactions exceed max_in_memory, both sides are hash-partitioned
+        to disk and joined partition by partition.
+
         Args:
             provider (str): The payment provider name.
             system_transactions (List[Dict[str, Any]]): Transactions from the internal system.
+            start_date (datetime): The start of the reconciliation period.
+            end_date (datetime): The end of the reconciliation period.
 
         Returns:
             Dict[str, Any]: A reconciliation report.
         """
-        provider_transactions = self.fetch_transactions(
-            provider,
-            start_date=datetime(2025, 1, 1),
-            end_date=datetime(2025, 1, 31)
-        )
+        result = ReconciliationResult(provider)
+        provider_system_transactions = list(self._provider_system_transactions(provider, system_transactions))
+        result.total_system_transactions = len(provider_system_transactions)
+        pages = self.fetch_transaction_pages(provider, start_date, end_date)
 
-        mismatched_transactions = []
-        for provider_txn in provider_transactions:
-            match = next((txn for txn in system_transactions if txn["transaction_id"] == provider_txn["transaction_id"]), None)
-            if not match or match["amount"] != provider_txn["amount"]:
-                mismatched_transactions.append(provider_txn)
-
-        reconciliation_report = {
-            "provider": provider,
-            "total_provider_transactions": len(provider_transactions),
-            "total_system_transactions": len(system_transactions),
-            "mismatched_transactions": mismatched_transactions,
-            "reconciliation_status": "Complete" if not mismatched_transactions else "Issues Found"
-        }
+        if len(provider_system_transactions) > self.max_in_memory:
+            logging.info("Reconciling %s with on-disk partitions (%d system transactions).",
+                         provider, len(provider_system_transactions))
+            self._reconcile_spilled(result, provider_system_transactions, pages)
+        else:
+            self._reconcile_in_memory(result, provider_system_transactions, pages)
 
-        logging.info("Reconciliation report for %s: %s", provider, reconciliation_report)
+        reconciliation_report = result.to_report()
+        logging.info(
+            "Reconciliation for %s: %d provider / %d system transactions, %d missing, %d extra, %d amount mismatches.",
+            provider, result.total_provider_transactions, result.total_system_transactions,
+            len(result.missing_in_system), len(result.extra_in_system), len(result.amount_mismatches)
+        )
         return reconciliation_report
 
-    def generate_reconciliation_report(self, providers: List[str], system_transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def generate_reconciliation_report(self, providers: List[str], system_transactions: List[Dict[str, Any]],
+                                       max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Generate reconciliation reports for all providers.
 
+        Providers run on a thread pool, which only overlaps waiting on the provider APIs; the joins
+        themselves are CPU-bound and still run one at a time under the GIL.
+
         Args:
             providers (List[str]): List of payment providers.
             system_transactions (List[Dict[str, Any]]): Transactions from the internal system.
+            max_workers (int, optional): Providers reconciled concurrently (default: one per provider).
 
         Returns:
-            List[Dict[str, Any]]: A list of reconciliation reports.
+            List[Dict[str, Any]]: A list of reconciliation reports, in the order of providers.
         """
-        reports = []
-        for provider in providers:
-            report = self.reconcile_transactions(provider, system_transactions)
-            reports.append(report)
+        if not providers:
+            return []
+        with ThreadPoolExecutor(max_workers=max_workers or len(providers)) as executor:
+            reports = list(executor.map(lambda provider: self.reconcile_transactions(provider, system_transactions), providers))
 
         logging.info("Generated reconciliation reports for all providers.")
         return reports
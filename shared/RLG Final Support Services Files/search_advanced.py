@@ -1,9 +1,85 @@
 import re
+import json
+import time
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Union, Tuple, Optional
 from utils import DatabaseConnection, DataSanitizer
 from exceptions import SearchError
 
+# Identifiers (tables, columns) cannot be bound as parameters, so they are whitelisted by shape
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+SORT_DIRECTIONS = {"ASC", "DESC"}
+
+# Unique, non-NULL column appended to every sort so keyset cursors are stable across ties
+# (override per dataset with AdvancedSearch(key_columns=...))
+KEYSET_TIEBREAKER = "id"
+DEFAULT_PAGE_LIMIT = 10
+MAX_PAGE_LIMIT = 500
+
+# Count modes: exact (cached COUNT(*)), estimated (planner statistics) or none
+COUNT_MODES = {"exact", "estimated", "none"}
+COUNT_CACHE_TTL = 60  # seconds
+COUNT_CACHE_SIZE = 1024
+
+
+class CountCache:
+    """
+    Thread-safe TTL/LRU cache of total counts keyed on (dataset, normalized predicate, parameters).
+    """
+
+    def __init__(self, ttl: float = COUNT_CACHE_TTL, max_entries: int = COUNT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(dataset: str, conditions: str, params: Dict[str, Any]) -> str:
+        payload = json.dumps([dataset, conditions, sorted(params.items())], default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            count, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return count
+
+    def set(self, key: str, count: int) -> None:
+        with self._lock:
+            self._entries[key] = (count, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drops all cached counts (e.g. after bulk writes to a searched dataset).
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
 
 class AdvancedSearch:
     """
@@ -11,13 +87,27 @@ class AdvancedSearch:
     and full-text search across various data sources.
     """
 
-    def __init__(self, db_connection: DatabaseConnection):
+    def __init__(self, db_connection: DatabaseConnection, key_columns: Optional[Dict[str, Optional[str]]] = None):
         """
         Initialize the AdvancedSearch class with a database connection.
         Args:
             db_connection (DatabaseConnection): A database connection instance.
+            key_columns (dict): Unique, non-NULL column of each dataset used as the keyset tiebreaker
+                (KEYSET_TIEBREAKER when not listed). Map a dataset to None if it has no such column;
+                it is then paged by offset only.
         """
         self.db = db_connection
+        self.count_cache = CountCache()
+        self.key_columns = {
+            dataset: key if key is None else self.validate_identifier(key)
+            for dataset, key in (key_columns or {}).items()
+        }
+
+    def key_column(self, dataset: str) -> Optional[str]:
+        """
+        Unique column used to break sort ties in a dataset, or None if cursors are unavailable for it.
+        """
+        return self.key_columns.get(dataset, KEYSET_TIEBREAKER)
 
     def validate_query(self, query: Dict[str, Any]) -> None:
         """
@@ -38,108 +128,311 @@ class AdvancedSearch:
             raise SearchError("Sort must be a dictionary.")
         if not isinstance(query["pagination"], dict):
             raise SearchError("Pagination must be a dictionary.")
+        for field in list(query["filters"]) + list(query["sort"]):
+            self.validate_identifier(field)
+        for direction in query["sort"].values():
+            if str(direction).upper() not in SORT_DIRECTIONS:
+                raise SearchError(f"Invalid sort direction: {direction}")
+        if query["pagination"].get("count", "exact") not in COUNT_MODES:
+            raise SearchError(f"Count mode must be one of {sorted(COUNT_MODES)}.")
+        for name in ("limit", "offset"):
+            value = query["pagination"].get(name)
+            if value is None:
+                continue
+            try:
+                int(value)
+            except (TypeError, ValueError):
+                raise SearchError(f"Pagination {name} must be an integer.")
+
+    @staticmethod
+    def validate_identifier(name: str) -> str:
+        """
+        Ensures a table or column name is a plain identifier (it is interpolated, not bound).
+        Args:
+            name (str): Identifier to check.
+        Returns:
+            str: The identifier.
+        Raises:
+            SearchError: If the name is not a plain identifier.
+        """
+        if not isinstance(name, str) or not IDENTIFIER_PATTERN.match(name):
+            raise SearchError(f"Invalid identifier: {name!r}")
+        return name
 
     def perform_search(
         self, query: Dict[str, Any], dataset: str
-    ) -> Dict[str, Union[List[Dict[str, Any]], int]]:
+    ) -> Dict[str, Union[List[Dict[str, Any]], int, str, bool, None]]:
         """
         Perform the search based on the provided query.
+
+        Pagination accepts {"limit": n, "cursor": token} for keyset paging (pass the returned
+        next_cursor to get the following page); {"offset": n} is still honoured without a cursor.
+        NULLs in a sort column always sort last. Datasets without a key column (see key_columns)
+        return no next_cursor and are paged by offset.
+        "count" selects "exact" (cached COUNT(*)), "estimated" (planner statistics) or "none".
         Args:
             query (dict): The search query parameters.
             dataset (str): The dataset to search in.
         Returns:
-            dict: Search results, including the data and total count.
+            dict: Search results, total count, whether the count is an estimate, and the next cursor.
         """
         self.validate_query(query)
+        dataset = self.validate_identifier(dataset)
         keywords = DataSanitizer.sanitize(query["keywords"])
         filters = query["filters"]
         sort = query["sort"]
         pagination = query["pagination"]
 
         # Build the search query
-        search_conditions = self.build_conditions(keywords, filters)
-        order_clause = self.build_sort_clause(sort)
-        limit_clause = self.build_pagination_clause(pagination)
+        conditions, params = self.build_conditions(keywords, filters)
+        key_column = self.key_column(dataset)
+        if pagination.get("cursor") and key_column is None:
+            raise SearchError(f"Cursor pagination is not available for {dataset}; use offset.")
+        sort_columns = self.build_sort_columns(sort, key_column)
+        cursor_conditions, cursor_params = self.build_cursor_conditions(
+            pagination.get("cursor"), sort_columns, dataset, conditions, params
+        )
+        limit = min(max(int(pagination.get("limit", DEFAULT_PAGE_LIMIT)), 1), MAX_PAGE_LIMIT)
+        offset = 0 if pagination.get("cursor") else max(int(pagination.get("offset", 0)), 0)
 
         # Perform the database query
-        results, total_count = self.query_database(dataset, search_conditions, order_clause, limit_clause)
+        page_conditions = f"{conditions} AND {cursor_conditions}" if cursor_conditions else conditions
+        results = self.query_database(
+            dataset, page_conditions, {**params, **cursor_params}, self.build_sort_clause(sort_columns), limit, offset
+        )
+        has_more = len(results) > limit
+        results = results[:limit]
+        next_cursor = (
+            self.encode_cursor(results[-1], sort_columns, dataset, conditions, params)
+            if has_more and key_column is not None else None
+        )
 
-        return {"results": results, "total_count": total_count}
+        count_mode = pagination.get("count", "exact")
+        total_count = self.count_results(dataset, conditions, params, count_mode)
+
+        return {
+            "results": results,
+            "total_count": total_count,
+            "count_is_estimate": count_mode == "estimated",
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
 
-    def build_conditions(self, keywords: str, filters: Dict[str, Any]) -> str:
+    def build_conditions(self, keywords: str, filters: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         """
-        Build search conditions based on keywords and filters.
+        Build parameterized search conditions based on keywords and filters.
+        Filters are emitted in sorted field order (list values sorted too), so equivalent
+        queries produce the same predicate and share a cached count.
         Args:
             keywords (str): Search keywords.
             filters (dict): Search filters.
         Returns:
-            str: SQL WHERE clause or equivalent.
+            tuple: SQL WHERE clause with named placeholders, and the bound parameters.
         """
         conditions = []
+        params = {}
 
         # Full-text search on keywords
         if keywords:
-            conditions.append(f"FULLTEXT MATCH(content) AGAINST('{keywords}')")
+            conditions.append("MATCH(content) AGAINST(:keywords)")
+            params["keywords"] = keywords
 
         # Add filter conditions
-        for field, value in filters.items():
+        for field in sorted(filters):
+            value = filters[field]
+            self.validate_identifier(field)
             if isinstance(value, list):
-                sanitized_values = [DataSanitizer.sanitize(v) for v in value]
-                conditions.append(f"{field} IN ({', '.join(sanitized_values)})")
+                if not value:
+                    conditions.append("1=0")
+                    continue
+                placeholders = []
+                for item in sorted(value, key=str):
+                    name = f"f_{len(params)}"
+                    params[name] = item
+                    placeholders.append(f":{name}")
+                conditions.append(f"{field} IN ({', '.join(placeholders)})")
             else:
-                sanitized_value = DataSanitizer.sanitize(value)
-                conditions.append(f"{field} = '{sanitized_value}'")
+                name = f"f_{len(params)}"
+                params[name] = value
+                conditions.append(f"{field} = :{name}")
 
-        return " AND ".join(conditions) if conditions else "1=1"
+        return (" AND ".join(conditions) if conditions else "1=1"), params
 
-    def build_sort_clause(self, sort: Dict[str, str]) -> str:
+    def build_sort_columns(
+        self, sort: Dict[str, str], key_column: Optional[str] = KEYSET_TIEBREAKER
+    ) -> List[Tuple[str, str]]:
         """
-        Build the sort clause based on user preferences.
+        Resolve sort preferences into (column, direction) pairs ending with the unique key column.
         Args:
             sort (dict): Sorting parameters (field and direction).
+            key_column (str): Unique tiebreaker column, or None if the dataset has none.
+        Returns:
+            list: (column, "ASC"/"DESC") pairs.
+        """
+        columns = [(self.validate_identifier(field), direction.upper()) for field, direction in sort.items()]
+        if key_column is not None and key_column not in sort:
+            columns.append((key_column, columns[-1][1] if columns else "ASC"))
+        return columns
+
+    def build_sort_clause(self, sort_columns: List[Tuple[str, str]]) -> str:
+        """
+        Build the sort clause based on user preferences.
+        Each column is preceded by "column IS NULL" so NULLs sort last in every direction and
+        database, which is the order the keyset predicate assumes.
+        Args:
+            sort_columns (list): (column, direction) pairs from build_sort_columns.
         Returns:
             str: SQL ORDER BY clause or equivalent.
         """
-        sort_clauses = [f"{field} {direction.upper()}" for field, direction in sort.items()]
+        sort_clauses = [f"{field} IS NULL, {field} {direction}" for field, direction in sort_columns]
         return f"ORDER BY {', '.join(sort_clauses)}" if sort_clauses else ""
 
-    def build_pagination_clause(self, pagination: Dict[str, int]) -> str:
+    @staticmethod
+    def _cursor_signature(
+        sort_columns: List[Tuple[str, str]], dataset: str, conditions: str, params: Dict[str, Any]
+    ) -> str:
+        payload = json.dumps([dataset, conditions, sorted(params.items()), sort_columns], default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def encode_cursor(
+        self, row: Dict[str, Any], sort_columns: List[Tuple[str, str]], dataset: str, conditions: str,
+        params: Dict[str, Any]
+    ) -> str:
         """
-        Build the pagination clause.
+        Encode the sort-column values of the last row on a page as an opaque cursor.
         Args:
-            pagination (dict): Pagination parameters (offset and limit).
+            row (dict): Last row of the current page.
+            sort_columns (list): (column, direction) pairs used for the page.
+            dataset (str): The dataset queried.
+            conditions (str): WHERE clause of the search (without cursor predicate).
+            params (dict): Parameters of the WHERE clause.
         Returns:
-            str: SQL LIMIT clause or equivalent.
+            str: URL-safe cursor token.
         """
-        offset = pagination.get("offset", 0)
-        limit = pagination.get("limit", 10)
-        return f"LIMIT {offset}, {limit}"
+        try:
+            values = [_encode_value(row[field]) for field, _ in sort_columns]
+        except KeyError as e:
+            raise SearchError(f"Sort column {e} is missing from the results.")
+        payload = {"s": self._cursor_signature(sort_columns, dataset, conditions, params), "v": values}
+        return base64.urlsafe_b64encode(json.dumps(payload, default=str).encode("utf-8")).decode("ascii")
+
+    def build_cursor_conditions(
+        self, cursor: Optional[str], sort_columns: List[Tuple[str, str]], dataset: str, conditions: str,
+        params: Dict[str, Any]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Turn a cursor into a keyset predicate that seeks past the previous page.
+        For a sort of (a ASC, b DESC) this is: (a > :k_0 OR a IS NULL) OR (a = :k_0 AND (b < :k_1 OR b IS NULL)).
+        NULLs sort last, so a NULL cursor value matches with IS NULL and nothing sorts strictly after it.
+        Args:
+            cursor (str): Cursor from a previous page, or None for the first page.
+            sort_columns (list): (column, direction) pairs.
+            dataset (str): The dataset queried.
+            conditions (str): WHERE clause of the search.
+            params (dict): Parameters of the WHERE clause.
+        Returns:
+            tuple: Keyset predicate (empty for the first page) and its parameters.
+        Raises:
+            SearchError: If the cursor is malformed or belongs to a different search.
+        """
+        if not cursor:
+            return "", {}
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            values = [_decode_value(value) for value in payload["v"]]
+        except Exception:
+            raise SearchError("Invalid pagination cursor.")
+        if payload.get("s") != self._cursor_signature(sort_columns, dataset, conditions, params):
+            raise SearchError("Pagination cursor does not match this search.")
+
+        if len(values) != len(sort_columns):
+            raise SearchError("Invalid pagination cursor.")
+
+        cursor_params = {f"k_{index}": value for index, value in enumerate(values) if value is not None}
+        clauses = []
+        equal_prefix = []
+        for index, (field, direction) in enumerate(sort_columns):
+            if values[index] is None:
+                equal_prefix.append(f"{field} IS NULL")
+                continue
+            operator = ">" if direction == "ASC" else "<"
+            seek = f"({field} {operator} :k_{index} OR {field} IS NULL)"
+            clauses.append("(" + " AND ".join(equal_prefix + [seek]) + ")")
+            equal_prefix.append(f"{field} = :k_{index}")
+        return ("(" + " OR ".join(clauses) + ")" if clauses else "1=0"), cursor_params
 
     def query_database(
-        self, dataset: str, conditions: str, order_clause: str, limit_clause: str
-    ) -> (List[Dict[str, Any]], int):
+        self, dataset: str, conditions: str, params: Dict[str, Any], order_clause: str, limit: int, offset: int = 0
+    ) -> List[Dict[str, Any]]:
         """
         Query the database with the constructed clauses.
+        One extra row is fetched so callers can tell whether another page exists.
         Args:
             dataset (str): The dataset to query.
-            conditions (str): WHERE clause.
+            conditions (str): WHERE clause with named placeholders.
+            params (dict): Bound parameters.
             order_clause (str): ORDER BY clause.
-            limit_clause (str): LIMIT clause.
+            limit (int): Page size.
+            offset (int): Rows to skip (only used without a cursor).
         Returns:
-            tuple: A list of results and the total count.
+            list: Up to limit + 1 result rows.
         """
         try:
-            query = f"""
-                SELECT * FROM {dataset} WHERE {conditions} {order_clause} {limit_clause};
-            """
-            results = self.db.execute_query(query)
+            query = f"SELECT * FROM {dataset} WHERE {conditions} {order_clause} LIMIT :limit OFFSET :offset"
+            return self.db.execute_query(query, {**params, "limit": limit + 1, "offset": offset})
+        except Exception as e:
+            raise SearchError(f"Database query failed: {e}")
 
-            count_query = f"SELECT COUNT(*) AS total_count FROM {dataset} WHERE {conditions};"
-            total_count = self.db.execute_query(count_query)[0]["total_count"]
+    def count_results(
+        self, dataset: str, conditions: str, params: Dict[str, Any], mode: str = "exact"
+    ) -> Optional[int]:
+        """
+        Total number of matches for the search predicate.
+        Exact counts are cached per normalized predicate for COUNT_CACHE_TTL seconds.
+        Args:
+            dataset (str): The dataset to query.
+            conditions (str): WHERE clause (without any cursor predicate).
+            params (dict): Bound parameters.
+            mode (str): "exact", "estimated" or "none".
+        Returns:
+            int: The (possibly estimated) count, or None when counting is disabled.
+        """
+        if mode == "none":
+            return None
+        if mode == "estimated":
+            return self.estimate_count(dataset, conditions, params)
 
-            return results, total_count
+        key = CountCache.make_key(dataset, conditions, params)
+        total_count = self.count_cache.get(key)
+        if total_count is not None:
+            return total_count
+        try:
+            count_query = f"SELECT COUNT(*) AS total_count FROM {dataset} WHERE {conditions}"
+            total_count = self.db.execute_query(count_query, params)[0]["total_count"]
         except Exception as e:
             raise SearchError(f"Database query failed: {e}")
+        self.count_cache.set(key, total_count)
+        return total_count
+
+    def estimate_count(self, dataset: str, conditions: str, params: Dict[str, Any]) -> int:
+        """
+        Estimate the match count from planner statistics (EXPLAIN rows x filtered %) instead of scanning.
+        Args:
+            dataset (str): The dataset to query.
+            conditions (str): WHERE clause.
+            params (dict): Bound parameters.
+        Returns:
+            int: Estimated number of matching rows.
+        """
+        try:
+            plan = self.db.execute_query(f"EXPLAIN SELECT 1 FROM {dataset} WHERE {conditions}", params)
+        except Exception as e:
+            raise SearchError(f"Database query failed: {e}")
+        if not plan:
+            return 0
+        rows = float(plan[0].get("rows") or 0)
+        filtered = float(plan[0].get("filtered") or 100.0)
+        return int(round(rows * filtered / 100.0))
 
     def advanced_filtering(self, data: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -169,12 +462,17 @@ if __name__ == "__main__":
             "keywords": "analytics",
             "filters": {"platform": ["YouTube", "TikTok"], "status": "active"},
             "sort": {"created_at": "desc"},
-            "pagination": {"offset": 0, "limit": 20},
+            "pagination": {"limit": 20, "count": "exact"},
         }
 
         results = search_service.perform_search(query_params, "content_data")
         print("Search Results:", results)
 
+        # Fetch the next page with the returned keyset cursor
+        if results["next_cursor"]:
+            query_params["pagination"] = {"limit": 20, "cursor": results["next_cursor"], "count": "none"}
+            print("Next Page:", search_service.perform_search(query_params, "content_data"))
+
     except SearchError as e:
         print(f"Search Error: {e}")
     except Exception as ex:
@@ -0,0 +1,77 @@
+import unittest
+from types import SimpleNamespace
+from scrapy.utils.test import get_crawler
+from RLG_scraper import AdaptiveBackoutController, Slot
+
+SETTINGS = {
+    "SCRAPER_ADAPTIVE_BACKOUT_ENABLED": True,
+    "SCRAPER_ADAPTIVE_MAX_ITEMPROC": 100,
+    "SCRAPER_ADAPTIVE_TARGET_RSS_MB": 0,
+    "CONCURRENT_REQUESTS": 16,
+}
+
+
+class TestAdaptiveBackoutController(unittest.TestCase):
+    def setUp(self):
+        self.crawler = get_crawler(settings_dict=SETTINGS)
+        self.downloader = SimpleNamespace(total_concurrency=16)
+        self.crawler.engine = SimpleNamespace(downloader=self.downloader)
+        self.slot = Slot(max_active_size=6400000)
+        self.controller = AdaptiveBackoutController.from_crawler(self.crawler, self.slot)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(AdaptiveBackoutController.from_crawler(get_crawler(), Slot()))
+
+    def test_itemproc_backlog_cuts_multiplicatively(self):
+        self.slot.itemproc_size = 101
+        self.assertEqual(self.controller.adjust(), "decrease:itemproc")
+        self.assertEqual(self.slot.max_active_size, 3200000)
+        self.assertEqual(self.downloader.total_concurrency, 8)
+        stats = self.crawler.stats
+        self.assertEqual(stats.get_value("scraper/adaptive/decrease_count"), 1)
+        self.assertEqual(stats.get_value("scraper/adaptive/reason/itemproc"), 1)
+        self.assertEqual(stats.get_value("scraper/adaptive/last_decision"), "decrease:itemproc")
+
+    def test_decrease_stops_at_floors(self):
+        self.slot.itemproc_size = 101
+        for _ in range(20):
+            self.controller.adjust()
+        self.assertEqual(self.slot.max_active_size, self.controller.min_active_size)
+        self.assertEqual(self.downloader.total_concurrency, 1)
+
+    def test_recovers_additively_up_to_the_ceilings(self):
+        self.slot.itemproc_size = 101
+        self.controller.adjust()
+        self.slot.itemproc_size = 0
+        self.assertEqual(self.controller.adjust(), "increase")
+        self.assertEqual(self.slot.max_active_size, 3200000 + self.controller.active_step)
+        self.assertEqual(self.downloader.total_concurrency, 9)
+        for _ in range(50):
+            self.controller.adjust()
+        self.assertEqual(self.slot.max_active_size, 6400000)
+        self.assertEqual(self.downloader.total_concurrency, 16)
+
+    def test_latency_spike_is_congestion_and_history_is_reset(self):
+        self.controller.observe("download", 0.1)
+        for _ in range(10):
+            self.controller.observe("download", 2.0)
+        self.assertEqual(self.controller.adjust(), "decrease:latency/download")
+        self.assertEqual(self.controller.latency, {})
+        self.assertEqual(self.controller.adjust(), "increase")
+
+    def test_fast_outlier_ages_out_of_the_baseline(self):
+        self.controller.observe("callback", 0.01)
+        decisions = []
+        for _ in range(20):
+            for _ in range(5):
+                self.controller.observe("callback", 1.0)
+            decisions.append(self.controller.adjust())
+        self.assertEqual(decisions[0], "decrease:latency/callback")
+        # Once the 12-interval window has passed, steady latency is the new baseline
+        self.assertEqual(decisions[-5:], ["increase"] * 5)
+        self.assertEqual(self.controller.baseline("callback"), 1.0)
+        self.assertGreater(self.downloader.total_concurrency, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+import data_access_audit_trail
+from data_access_audit_trail import DataAccessAuditTrail
+
+
+class TestDataAccessAuditTrail(unittest.TestCase):
+    def setUp(self):
+        self.db_file = os.path.join(tempfile.mkdtemp(), "audit.db")
+        self.trail = DataAccessAuditTrail(db_file=self.db_file, checkpoint_every=10, signing_key="test-key")
+        for i in range(25):
+            self.trail.log_access(
+                f"U{i % 3}", f"user{i % 3}", "analyst", "view", f"D{i}",
+                "report", "Audit test", "10.0.0.1", "South Africa"
+            )
+        self.trail.flush()
+
+    def tearDown(self):
+        self.trail.close()
+
+    def _execute(self, sql, params=()):
+        with sqlite3.connect(self.db_file) as conn:
+            conn.execute(sql, params)
+
+    def test_clean_log_verifies_incrementally(self):
+        self.assertEqual(self.trail.detect_tampering(), [])
+        self.assertEqual(self.trail.last_verification_scanned, 25)
+        self.assertEqual(self.trail.detect_tampering(), [])
+        # Resumes from the checkpoint at entry 20
+        self.assertEqual(self.trail.last_verification_scanned, 5)
+
+    def test_deleted_row_breaks_chain(self):
+        self._execute("DELETE FROM audit_log WHERE id = 23")
+        issues = [log["issue"] for log in self.trail.detect_tampering()]
+        self.assertTrue(any("chain broken" in issue for issue in issues))
+
+    def test_deleted_first_rows_detected_on_full_scan(self):
+        self._execute("DELETE FROM audit_log WHERE id IN (1, 2)")
+        issues = [log["issue"] for log in self.trail.detect_tampering(full=True)]
+        self.assertTrue(any("chain broken" in issue for issue in issues))
+
+    def test_deleted_newest_rows_detected(self):
+        self._execute("DELETE FROM audit_log WHERE id > 23")
+        issues = [log["issue"] for log in self.trail.detect_tampering()]
+        self.assertTrue(any("chain head mismatch" in issue for issue in issues))
+
+    def test_failed_batch_is_rolled_back_and_retried(self):
+        insert_checkpoint = self.trail._insert_checkpoint
+        failures = []
+
+        def failing_checkpoint(cursor, last_hash):
+            if not failures:
+                failures.append(last_hash)
+                raise sqlite3.OperationalError("disk I/O error")
+            insert_checkpoint(cursor, last_hash)
+
+        self.trail._insert_checkpoint = failing_checkpoint
+        for i in range(10):
+            self.trail.log_access("U9", "user9", "analyst", "view", f"R{i}", "report", "Retry test", "10.0.0.1", "Kenya")
+        self.trail.flush()
+
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(len(self.trail.get_logs(limit=None)), 35)
+        self.assertEqual(self.trail.detect_tampering(full=True), [])
+
+    def test_edited_row_detected(self):
+        self._execute("UPDATE audit_log SET action = 'export' WHERE id = 5")
+        tampered = self.trail.detect_tampering(full=True)
+        self.assertEqual([log["id"] for log in tampered], [5])
+
+    def test_get_logs_filters_by_user(self):
+        logs = self.trail.get_logs(limit=None, user_id="U1")
+        self.assertEqual(len(logs), 8)
+        self.assertTrue(all(log["user_id"] == "U1" for log in logs))
+
+
+    def test_unsigned_trail_never_resumes_from_a_checkpoint(self):
+        os.environ.pop("AUDIT_CHECKPOINT_KEY", None)
+        trail = DataAccessAuditTrail(db_file=os.path.join(tempfile.mkdtemp(), "unsigned.db"), checkpoint_every=10)
+        for i in range(25):
+            trail.log_access("U1", "user1", "analyst", "view", f"D{i}", "report", "Audit test", "10.0.0.1", "South Africa")
+        self.assertEqual(trail.detect_tampering(), [])
+        # Anyone can sign a checkpoint with the public fallback key, so none is trusted
+        self.assertEqual(trail.detect_tampering(), [])
+        self.assertEqual(trail.last_verification_scanned, 25)
+        trail.close()
+
+    def test_queued_events_are_flushed_at_exit(self):
+        script = (
+            "from data_access_audit_trail import DataAccessAuditTrail\n"
+            f"trail = DataAccessAuditTrail(db_file={self.db_file!r}, flush_interval=5, signing_key='test-key')\n"
+            "for i in range(50):\n"
+            "    trail.log_access('U9', 'user9', 'analyst', 'view', f'E{i}', 'report', 'Exit test', '10.0.0.1', 'South Africa')\n"
+        )
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(data_access_audit_trail.__file__))
+        subprocess.run([sys.executable, "-c", script], check=True, env=env, cwd=os.path.dirname(self.db_file))
+        self.assertEqual(len(self.trail.get_logs(limit=None, user_id="U9")), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
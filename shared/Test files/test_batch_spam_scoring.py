@@ -0,0 +1,95 @@
+import unittest
+import numpy as np
+from RLG_Batch_Spam_Scoring_Engine import (
+    SPAM_LABELS,
+    PostBatch,
+    classify_texts,
+    engagement_ratios,
+    fake_engagement_mask,
+    text_spam_mask,
+)
+
+POSTS = [
+    {"likes": 5000, "comments": 10, "retweets": 300, "text": "Huge launch today"},
+    {"likes": 120, "comments": 30, "retweets": 4, "text": "Great coverage of the event"},
+    {"likes": 900, "comments": 0, "retweets": 0, "text": "CLICK HERE to win a prize!!!"},
+    {"likes": 10, "text": "Check https://a.io https://b.io https://c.io"},
+]
+
+
+class TestEngagementScoring(unittest.TestCase):
+    def test_matches_per_post_heuristic(self):
+        expected = [
+            (post.get("likes", 0) + post.get("retweets", 0)) / max(1, post.get("comments", 1)) > 50
+            for post in POSTS
+        ]
+        mask = fake_engagement_mask(PostBatch.from_posts(POSTS), amplifiers=("retweets",))
+        self.assertEqual(mask.tolist(), expected)
+
+    def test_columnar_payload(self):
+        batch = PostBatch.from_columns({"likes": [100, 10], "comments": [0, 5], "shares": [0, 0]})
+        np.testing.assert_allclose(engagement_ratios(batch, amplifiers=("shares",)), [100.0, 2.0])
+
+    def test_mismatched_columns_rejected(self):
+        with self.assertRaises(ValueError):
+            PostBatch(likes=[1, 2, 3], comments=[1, 2])
+
+    def test_invalid_columnar_payloads_rejected(self):
+        required = ("likes", "comments", "shares")
+        for payload in (
+            None,
+            [1, 2],
+            {"likes": [1], "comments": [1]},
+            {"likes": ["many"], "comments": [1], "shares": [0]},
+            {"likes": [1, None], "comments": [1, 2], "shares": [0, 0]},
+            {"likes": [[1]], "comments": [1], "shares": [0]},
+            {"likes": [{"n": 1}], "comments": [1], "shares": [0]},
+            {"likes": 5, "comments": [1], "shares": [0]},
+            {"likes": [1, 2], "comments": [1], "shares": [0, 0]},
+        ):
+            with self.assertRaises(ValueError, msg=payload):
+                PostBatch.from_columns(payload, required=required)
+
+
+class KeywordZeroShotClassifier:
+    """Stands in for the zero-shot pipeline: ranks "spam" first for texts containing "click"."""
+
+    def __init__(self):
+        self.calls = []
+
+    def _classify(self, text, candidate_labels):
+        top = "spam" if "click" in text.lower() else "not spam"
+        labels = [top] + [label for label in candidate_labels if label != top]
+        return {"sequence": text, "labels": labels, "scores": [0.9] + [0.1 / (len(labels) - 1)] * (len(labels) - 1)}
+
+    def __call__(self, texts, candidate_labels, batch_size=None):
+        self.calls.append((texts, batch_size))
+        if isinstance(texts, str):
+            return self._classify(texts, candidate_labels)
+        return [self._classify(text, candidate_labels) for text in texts]
+
+
+class TestTextSpamScoring(unittest.TestCase):
+    def test_batch_is_scored_in_one_classifier_call(self):
+        classifier = KeywordZeroShotClassifier()
+        mask = text_spam_mask([post["text"] for post in POSTS], classifier, batch_size=8)
+        self.assertEqual(mask.tolist(), [False, False, True, False])
+        self.assertEqual(len(classifier.calls), 1)
+        self.assertEqual(classifier.calls[0][1], 8)
+
+    def test_batch_verdicts_match_single_text_calls(self):
+        classifier = KeywordZeroShotClassifier()
+        texts = [post["text"] for post in POSTS]
+        labels, confidences = classify_texts(texts, classifier)
+        single = [classifier(text, candidate_labels=SPAM_LABELS) for text in texts]
+        self.assertEqual(labels.tolist(), [result["labels"][0] for result in single])
+        self.assertEqual(confidences.tolist(), [round(result["scores"][0], 4) for result in single])
+
+    def test_empty_batch(self):
+        classifier = KeywordZeroShotClassifier()
+        self.assertEqual(len(text_spam_mask([], classifier)), 0)
+        self.assertEqual(classifier.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
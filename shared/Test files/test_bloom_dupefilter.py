@@ -0,0 +1,59 @@
+import hashlib
+import tempfile
+import unittest
+from RLG_dupefilters import BloomDupeFilter, BloomFilter
+
+
+def fingerprint(value):
+    return hashlib.sha1(str(value).encode()).digest()
+
+
+class FakeFingerprinter:
+    def fingerprint(self, request):
+        return fingerprint(request)
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_false_positive_rate_near_target(self):
+        bloom = BloomFilter(capacity=20000, error_rate=0.01)
+        for i in range(20000):
+            bloom.add(fingerprint(i))
+        self.assertTrue(all(fingerprint(i) in bloom for i in range(20000)))
+        false_positives = sum(fingerprint(f"other-{i}") in bloom for i in range(20000))
+        self.assertLess(false_positives / 20000, 0.02)
+
+    def test_reopen_from_file(self):
+        path = tempfile.mkdtemp() + "/requests.bloom"
+        bloom = BloomFilter(capacity=1000, error_rate=0.01, path=path)
+        bloom.add(fingerprint("a"))
+        bloom.close()
+
+        resumed = BloomFilter(capacity=10, error_rate=0.5, path=path)
+        self.assertIn(fingerprint("a"), resumed)
+        self.assertEqual(resumed.count, 1)
+        self.assertEqual(resumed.num_bits, bloom.num_bits)
+        resumed.close()
+
+
+class TestBloomDupeFilter(unittest.TestCase):
+    def test_exact_check_rescues_false_positives(self):
+        # A tiny filter saturates quickly, so most probable hits are false positives
+        dupefilter = BloomDupeFilter(fingerprinter=FakeFingerprinter(), capacity=8, error_rate=0.5)
+        self.assertEqual(sum(dupefilter.request_seen(i) for i in range(500)), 0)
+        self.assertEqual(sum(dupefilter.request_seen(i) for i in range(500)), 500)
+        dupefilter.close("finished")
+
+    def test_resume_from_jobdir(self):
+        jobdir = tempfile.mkdtemp()
+        dupefilter = BloomDupeFilter(jobdir, fingerprinter=FakeFingerprinter(), capacity=1000)
+        dupefilter.request_seen("https://example.com/")
+        dupefilter.close("shutdown")
+
+        resumed = BloomDupeFilter(jobdir, fingerprinter=FakeFingerprinter(), capacity=1000)
+        self.assertTrue(resumed.request_seen("https://example.com/"))
+        self.assertFalse(resumed.request_seen("https://example.com/new"))
+        resumed.close("finished")
+
+
+if __name__ == "__main__":
+    unittest.main()
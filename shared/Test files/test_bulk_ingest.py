@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import create_engine
+from db_helpers import DatabaseError, _BulkStatement, _copy_value, _executemany_batch, bulk_ingest
+
+
+class TestBulkIngest(unittest.TestCase):
+    def setUp(self):
+        path = os.path.join(tempfile.mkdtemp(), "bulk.db")
+        self.engine = create_engine(f"sqlite:///{path}")
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, score REAL)")
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def _fetch(self, sql):
+        with self.engine.connect() as conn:
+            return conn.exec_driver_sql(sql).fetchall()
+
+    def test_rows_are_written_in_batches(self):
+        rows = ({"id": i, "name": f"item {i}", "score": i / 2} for i in range(25000))
+        counts = bulk_ingest("items", rows, max_batch_rows=10000, bind=self.engine)
+        self.assertEqual(counts, [10000, 10000, 5000])
+        self.assertEqual(self._fetch("SELECT COUNT(*) FROM items"), [(25000,)])
+
+    def test_batched_upsert_keeps_last_duplicate(self):
+        bulk_ingest("items", [(1, "old", 0.0)], columns=["id", "name", "score"], bind=self.engine)
+        rows = [(1, "first", 1.0), (1, "last", 2.0), (2, "new", 3.0)]
+        counts = bulk_ingest("items", rows, columns=["id", "name", "score"], conflict_columns=["id"], bind=self.engine)
+        self.assertEqual(counts, [2])
+        self.assertEqual(self._fetch("SELECT id, name FROM items ORDER BY id"), [(1, "last"), (2, "new")])
+
+    def test_failing_batch_raises_database_error(self):
+        bulk_ingest("items", [(1, "a", 0.0)], columns=["id", "name", "score"], bind=self.engine)
+        with self.assertRaises(DatabaseError):
+            bulk_ingest("items", [(1, "a", 0.0)], columns=["id", "name", "score"], bind=self.engine)
+
+
+    def test_atomic_ingest_rolls_back_every_batch(self):
+        bulk_ingest("items", [(1, "a", 0.0)], columns=["id", "name", "score"], bind=self.engine)
+        rows = [(i, "b", 0.0) for i in range(2, 12)] + [(1, "duplicate", 0.0)]
+        with self.assertRaises(DatabaseError):
+            bulk_ingest("items", rows, columns=["id", "name", "score"], max_batch_rows=5, bind=self.engine, atomic=True)
+        self.assertEqual(self._fetch("SELECT COUNT(*) FROM items"), [(1,)])
+        with self.assertRaises(DatabaseError):
+            bulk_ingest("items", rows, columns=["id", "name", "score"], max_batch_rows=5, bind=self.engine)
+        self.assertEqual(self._fetch("SELECT COUNT(*) FROM items"), [(11,)])
+
+class RecordingCursor:
+    def executemany(self, sql, params):
+        self.sql, self.params = sql, params
+
+
+class TestBulkIngestHelpers(unittest.TestCase):
+    def test_executemany_uses_driver_paramstyle(self):
+        expected = {
+            "qmark": ("(?, ?)", (1, "a")),
+            "numeric": ("(:1, :2)", (1, "a")),
+            "format": ("(%s, %s)", (1, "a")),
+            "named": ("(:p0, :p1)", {"p0": 1, "p1": "a"}),
+            "pyformat": ("(%(p0)s, %(p1)s)", {"p0": 1, "p1": "a"}),
+        }
+        for paramstyle, (values, params) in expected.items():
+            cursor = RecordingCursor()
+            statement = _BulkStatement("items", ["id", "name"], [], [], False, paramstyle)
+            self.assertEqual(_executemany_batch(cursor, statement, [(1, "a")]), 1)
+            self.assertTrue(cursor.sql.endswith(f"VALUES {values}"))
+            self.assertEqual(cursor.params, [params])
+
+    def test_copy_value_encodes_bytes_as_bytea_hex(self):
+        self.assertEqual(_copy_value(b"\x00\xff"), "\\\\x00ff")
+        self.assertEqual(_copy_value("a\tb"), "a\\tb")
+        self.assertEqual(_copy_value(None), "\\N")
+
+
+if __name__ == "__main__":
+    unittest.main()
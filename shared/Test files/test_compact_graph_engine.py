@@ -0,0 +1,53 @@
+import unittest
+import networkx as nx
+import numpy as np
+from RLG_Compact_Graph_Engine import CompactGraph
+
+MENTIONS = [
+    ("alice", "bob"), ("bob", "carol"), ("alice", "carol"),
+    ("dave", "erin"), ("erin", "frank"), ("dave", "frank"),
+]
+
+
+class TestCompactGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = CompactGraph()
+        self.graph.add_edges_from(MENTIONS)
+
+    def test_incremental_appends_accumulate_weight(self):
+        self.graph.add_edge("alice", "bob")
+        self.assertEqual(self.graph.number_of_edges(), len(MENTIONS))
+        self.assertEqual(self.graph.degree("alice"), 2)
+        self.assertEqual(self.graph.degree("alice", weighted=True), 3.0)
+
+    def test_pagerank_matches_networkx(self):
+        reference = nx.pagerank(self.graph.to_networkx(), weight="weight")
+        scores = self.graph.pagerank()
+        for label, score in reference.items():
+            self.assertAlmostEqual(scores[self.graph.node_id(label)], score, places=4)
+        self.assertAlmostEqual(float(np.sum(scores)), 1.0, places=6)
+
+    def test_communities_split_disconnected_triangles(self):
+        groups = sorted(sorted(group) for group in self.graph.community_members())
+        self.assertEqual(groups, [["alice", "bob", "carol"], ["dave", "erin", "frank"]])
+
+    def test_networkx_export_keeps_attributes(self):
+        self.graph.add_node("alice", label="User")
+        self.graph.add_edge("alice", "gina", label="related")
+        G = self.graph.to_networkx()
+        self.assertEqual(G.nodes["alice"]["label"], "User")
+        self.assertEqual(G.edges["alice", "gina"]["label"], "related")
+        self.assertEqual(G.number_of_edges(), self.graph.number_of_edges())
+
+    def test_edges_from_ids_are_bounds_checked(self):
+        alice, bob = self.graph.node_id("alice"), self.graph.node_id("bob")
+        self.graph.add_edges_from_ids([alice], [bob], [2.0])
+        self.assertEqual(self.graph.degree("alice", weighted=True), 4.0)
+        with self.assertRaises(ValueError):
+            self.graph.add_edges_from_ids([alice], [self.graph.number_of_nodes()])
+        with self.assertRaises(ValueError):
+            self.graph.add_edges_from_ids([-1], [bob])
+
+
+if __name__ == "__main__":
+    unittest.main()
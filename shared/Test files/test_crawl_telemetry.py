@@ -0,0 +1,138 @@
+import time
+
+from twisted.internet.defer import inlineCallbacks
+from twisted.trial import unittest
+from scrapy import Request, Spider
+from scrapy.crawler import Crawler
+from RLG_debug import CrawlTelemetry, LatencyHistogram
+from RLG_engine import MultiSpiderExecutionEngine
+
+SETTINGS = {
+    "TWISTED_REACTOR": None,
+    "LOG_LEVEL": "WARNING",
+    "TELNETCONSOLE_ENABLED": False,
+    "TELEMETRY_ENABLED": True,
+    "TELEMETRY_PORT": [0],
+    "EXTENSIONS": {
+        "scrapy.extensions.logstats.LogStats": None,
+        "RLG_debug.CrawlTelemetry": 0,
+    },
+    "ITEM_PIPELINES": {"test_crawl_telemetry.PassThroughPipeline": 100},
+}
+
+
+class PassThroughPipeline:
+    def process_item(self, item, spider):
+        return item
+
+
+class SlowPipeline:
+    def process_item(self, item, spider):
+        time.sleep(0.05)
+        return item
+
+
+class PagesSpider(Spider):
+    name = "pages"
+
+    def start_requests(self):
+        for i in range(4):
+            yield Request(f"data:,page-{i}")
+
+    def parse(self, response):
+        yield {"page": response.text}
+
+
+class SlowGeneratorSpider(PagesSpider):
+    name = "slow_generator"
+
+    def parse(self, response):
+        for i in range(2):
+            time.sleep(0.05)
+            yield {"page": response.text, "part": i}
+
+
+class BackoutSpider(SlowGeneratorSpider):
+    name = "backout"
+
+    def closed(self, reason):
+        scraper = self.crawler.engine.slots[self].scraper
+        self.callback_latency = scraper.backout_controller.latency["callback"]
+
+
+class TelemetryCrawler(Crawler):
+    def _create_engine(self):
+        return MultiSpiderExecutionEngine(self, lambda _: self.stop())
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_are_within_bucket_precision(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+        self.assertEqual(histogram.count, 1000)
+        # Buckets keep about 5% relative precision
+        for q in (0.5, 0.9, 0.99):
+            self.assertLessEqual(abs(histogram.percentile(q) - q), q * 0.05)
+        self.assertEqual(histogram.max, 1.0)
+        self.assertLessEqual(histogram.percentile(1.0), histogram.max)
+        self.assertEqual(LatencyHistogram().percentile(0.5), 0.0)
+
+
+class TestCrawlTelemetry(unittest.TestCase):
+    @inlineCallbacks
+    def test_every_stage_hook_records_latency(self):
+        crawler = TelemetryCrawler(PagesSpider, SETTINGS)
+        yield crawler.crawl()
+
+        telemetry = crawler.telemetry
+        self.assertIsInstance(telemetry, CrawlTelemetry)
+        counts = {stage: histogram.count for stage, histogram in telemetry.histograms.items()}
+        self.assertEqual(counts, {
+            "scheduler_wait": 4,
+            "download": 4,
+            "spider_middleware": 4,
+            "callback": 4,
+            "item_pipeline": 4,
+        })
+
+    @inlineCallbacks
+    def test_sample_and_prometheus_report_the_stages(self):
+        crawler = TelemetryCrawler(PagesSpider, SETTINGS)
+        yield crawler.crawl()
+
+        telemetry = crawler.telemetry
+        telemetry.sample()
+        self.assertIsNotNone(crawler.stats.get_value("telemetry/latency/download/p50"))
+        text = telemetry.prometheus()
+        for stage in CrawlTelemetry.STAGES:
+            self.assertIn(f'rlg_scrapy_stage_latency_seconds_count{{stage="{stage}"}} 4', text)
+        self.assertEqual(telemetry.status()["latency"]["callback"]["count"], 4)
+
+    @inlineCallbacks
+    def test_generator_callback_time_is_not_booked_to_spider_middleware(self):
+        settings = dict(SETTINGS, ITEM_PIPELINES={"test_crawl_telemetry.SlowPipeline": 100})
+        crawler = TelemetryCrawler(SlowGeneratorSpider, settings)
+        yield crawler.crawl()
+
+        histograms = crawler.telemetry.histograms
+        # Two 50ms steps per page are spent inside the generator
+        self.assertGreaterEqual(histograms["callback"].percentile(0.0), 0.095)
+        # ...and the 2 x 50ms of item processing is not counted again in the middleware
+        self.assertLess(histograms["spider_middleware"].max, 0.05)
+        self.assertGreaterEqual(histograms["item_pipeline"].percentile(0.0), 0.045)
+
+    @inlineCallbacks
+    def test_backout_callback_latency_excludes_item_processing(self):
+        settings = dict(
+            SETTINGS,
+            TELEMETRY_ENABLED=False,
+            SCRAPER_ADAPTIVE_BACKOUT_ENABLED=True,
+            ITEM_PIPELINES={"test_crawl_telemetry.SlowPipeline": 100},
+        )
+        crawler = TelemetryCrawler(BackoutSpider, settings)
+        yield crawler.crawl()
+
+        # 2 x 50ms in the callback, not another 2 x 50ms in the pipeline
+        self.assertGreaterEqual(crawler.spider.callback_latency, 0.095)
+        self.assertLess(crawler.spider.callback_latency, 0.15)
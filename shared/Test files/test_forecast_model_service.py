@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from RLG_Forecast_Model_Service import XGB_MAX_ESTIMATORS, ForecastModelService
+
+
+class TestForecastModelService(unittest.TestCase):
+    def setUp(self):
+        self.service = ForecastModelService(model_dir=tempfile.mkdtemp(), refit_min_new_points=10)
+        self.series = list(np.random.RandomState(42).randint(50, 100, 50))
+
+    def test_reuses_model_until_enough_new_points(self):
+        self.service.forecast("keyword_ai", "xgboost", self.series)
+        self.service.forecast("keyword_ai", "xgboost", self.series + [75, 80])
+
+        stats = self.service.get_metrics()["keyword_ai:xgboost"]
+        self.assertEqual(stats["fits"], 1)
+        self.assertEqual(stats["cache_hits"], 1)
+
+    def test_refit_is_warm_started(self):
+        self.service.get_model("keyword_ai", "xgboost", self.series)
+        _, metadata = self.service.get_model("keyword_ai", "xgboost", self.series + [70] * 10)
+        self.assertTrue(metadata["warm_start"])
+        self.assertEqual(metadata["fitted_points"], 60)
+
+    def test_warm_starts_do_not_grow_the_booster_without_bound(self):
+        series = self.series
+        for _ in range(15):
+            series = series + [70] * 10
+            model, _ = self.service.get_model("keyword_ai", "xgboost", series)
+            self.assertLessEqual(model.get_booster().num_boosted_rounds(), XGB_MAX_ESTIMATORS)
+
+    def test_model_dir_is_created_on_first_save(self):
+        model_dir = os.path.join(tempfile.mkdtemp(), "models")
+        service = ForecastModelService(model_dir=model_dir)
+        self.assertFalse(os.path.exists(model_dir))
+        service.forecast("keyword_ai", "xgboost", self.series)
+        self.assertTrue(os.path.isdir(model_dir))
+
+    def test_model_persists_across_service_instances(self):
+        self.service.forecast("keyword_ai", "xgboost", self.series)
+        restarted = ForecastModelService(model_dir=self.service.store.model_dir, refit_min_new_points=10)
+        restarted.forecast("keyword_ai", "xgboost", self.series)
+        self.assertEqual(restarted.get_metrics()["keyword_ai:xgboost"]["fits"], 0)
+
+    def test_changed_data_of_same_length_is_refit(self):
+        low = self.service.forecast("keyword_ai", "xgboost", [10] * 50)
+        high = self.service.forecast("keyword_ai", "xgboost", [1000] * 50)
+        self.assertEqual(self.service.get_metrics()["keyword_ai:xgboost"]["fits"], 2)
+        self.assertNotEqual(list(low), list(high))
+
+    def test_sliding_window_is_refit(self):
+        self.service.forecast("keyword_ai", "xgboost", self.series)
+        self.service.forecast("keyword_ai", "xgboost", self.series[5:] + [75] * 5)
+        self.assertEqual(self.service.get_metrics()["keyword_ai:xgboost"]["fits"], 2)
+
+    def test_forecast_length(self):
+        forecast = self.service.forecast("keyword_ai", "xgboost", self.series, steps=5)
+        self.assertEqual(len(forecast), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import threading
+import unittest
+import joblib
+import numpy as np
+from sklearn.ensemble import IsolationForest
+from fraud_scoring import FRAUD_FEATURES, MicroBatchScorer, UserActivityAggregates, is_fitted, load_anomaly_model
+
+
+class SumModel:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, rows):
+        self.batch_sizes.append(len(rows))
+        return np.where(rows.sum(axis=1) > 100, -1, 1)
+
+
+class TestUserActivityAggregates(unittest.TestCase):
+    def test_decayed_profile_and_features(self):
+        aggregates = UserActivityAggregates(half_life_seconds=10)
+        aggregates.record("u1", 10.0, now=100.0)
+        aggregates.record("u1", 30.0, now=110.0)
+        profile = aggregates.profile("u1", now=120.0)
+        self.assertEqual(profile["request_count"], 2)
+        # 1 request decayed by one half-life plus a new one, then another half-life
+        self.assertAlmostEqual(profile["recent_requests"], 0.75)
+        self.assertAlmostEqual(profile["recent_mean_amount"], (5.0 + 30.0) / 1.5, places=4)
+        features = aggregates.features("u1", 50.0, now=120.0)
+        self.assertEqual(len(features), len(FRAUD_FEATURES))
+        self.assertEqual(features[:2], [50.0, 2])
+        self.assertEqual(aggregates.features("unknown", 5.0), [5.0, 0, 0.0, 0.0])
+
+    def test_concurrent_records_get_distinct_slots(self):
+        aggregates = UserActivityAggregates(initial_capacity=2)
+        threads = [
+            threading.Thread(target=lambda t=t: [aggregates.record(f"user-{t}-{i}", 1.0, now=1.0) for i in range(500)])
+            for t in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(aggregates.index), 4000)
+        self.assertEqual(sorted(aggregates.index.values()), list(range(4000)))
+        self.assertEqual(int(aggregates.request_count[:4000].sum()), 4000)
+
+
+class TestMicroBatchScorer(unittest.TestCase):
+    def test_concurrent_rows_are_scored_in_batches(self):
+        model = SumModel()
+        scorer = MicroBatchScorer(model, max_batch=64)
+        futures = [scorer.submit([float(i), 0.0, 0.0, 0.0]) for i in range(200)]
+        predictions = [future.result(timeout=5) for future in futures]
+        self.assertEqual(predictions, [1 if i <= 100 else -1 for i in range(200)])
+        self.assertEqual(sum(model.batch_sizes), 200)
+        self.assertLessEqual(max(model.batch_sizes), 64)
+
+
+class TestLoadAnomalyModel(unittest.TestCase):
+    def _saved_model(self, n_features):
+        path = os.path.join(tempfile.mkdtemp(), "fraud_model.pkl")
+        model = IsolationForest(n_estimators=10, random_state=0).fit(np.random.RandomState(0).rand(50, n_features))
+        joblib.dump(model, path)
+        return path
+
+    def test_model_trained_on_current_features_is_reused(self):
+        model = load_anomaly_model(self._saved_model(len(FRAUD_FEATURES)))
+        self.assertTrue(is_fitted(model))
+        self.assertEqual(len(model.predict(np.zeros((2, len(FRAUD_FEATURES))))), 2)
+
+    def test_model_trained_on_old_features_is_replaced(self):
+        model = load_anomaly_model(self._saved_model(3))
+        self.assertFalse(is_fitted(model))
+        model.fit(np.random.RandomState(1).rand(50, len(FRAUD_FEATURES)))
+        self.assertTrue(is_fitted(model))
+
+    def test_missing_model_file_gives_unfitted_model(self):
+        self.assertFalse(is_fitted(load_anomaly_model(os.path.join(tempfile.mkdtemp(), "missing.pkl"))))
+
+
+if __name__ == "__main__":
+    unittest.main()
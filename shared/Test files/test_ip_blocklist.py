@@ -0,0 +1,117 @@
+import json
+import time
+import unittest
+from ip_blocklist import CIDRBlocklist, RedisBlocklistSync
+
+
+class TestCIDRBlocklist(unittest.TestCase):
+    def test_longest_prefix_match(self):
+        blocklist = CIDRBlocklist()
+        blocklist.add("10.0.0.0/8", reason="feed")
+        blocklist.add("10.1.2.0/24", reason="scraper")
+        self.assertEqual(blocklist.match("10.1.2.3")["reason"], "scraper")
+        self.assertEqual(blocklist.match("10.9.9.9")["network"], "10.0.0.0/8")
+        self.assertNotIn("11.0.0.1", blocklist)
+        self.assertNotIn("not-an-ip", blocklist)
+
+    def test_ipv6_and_ipv4_mapped(self):
+        blocklist = CIDRBlocklist()
+        blocklist.add("2001:db8::/32")
+        blocklist.add("192.0.2.1")
+        self.assertIn("2001:db8:1::5", blocklist)
+        self.assertNotIn("2001:db9::1", blocklist)
+        self.assertIn("::ffff:192.0.2.1", blocklist)
+
+    def test_ttl_remove_and_bulk_load(self):
+        blocklist = CIDRBlocklist()
+        blocklist.add("198.51.100.7", expires_at=time.time() - 1)
+        self.assertNotIn("198.51.100.7", blocklist)
+        self.assertEqual(blocklist.purge_expired(), 1)
+        self.assertEqual(blocklist.bulk_load(["203.0.113.0/24", "bogus", ("198.51.100.0/25", 60, "feed")]), 2)
+        self.assertEqual(len(blocklist), 2)
+        self.assertTrue(blocklist.remove("203.0.113.0/24"))
+        self.assertFalse(blocklist.remove("203.0.113.0/24"))
+        self.assertNotIn("203.0.113.9", blocklist)
+
+    def test_match_survives_a_table_removed_concurrently(self):
+        blocklist = CIDRBlocklist()
+        blocklist.add("10.0.0.0/8")
+        blocklist.add("10.1.2.0/24")
+        # As if remove() ran between reading _lengths and probing the table
+        del blocklist._tables[4][24]
+        self.assertEqual(blocklist.match("10.1.2.3")["network"], "10.0.0.0/8")
+
+    def test_normalize(self):
+        self.assertEqual(CIDRBlocklist.normalize("1.2.3.4"), "1.2.3.4/32")
+        self.assertEqual(CIDRBlocklist.normalize("10.1.2.3/8"), "10.0.0.0/8")
+        self.assertEqual(CIDRBlocklist.normalize("::ffff:192.0.2.1"), "192.0.2.1/32")
+
+
+class RecordingRedis:
+    def __init__(self):
+        self.commands = []
+
+    def pipeline(self):
+        return self
+
+    def hset(self, key, field, value):
+        self.commands.append(("hset", field))
+
+    def hdel(self, key, field):
+        self.commands.append(("hdel", field))
+
+    def publish(self, channel, message):
+        self.commands.append(("publish", json.loads(message)["op"]))
+
+    def execute(self):
+        self.commands.append(("execute",))
+
+
+class TestRedisBlocklistSync(unittest.TestCase):
+    def test_writes_are_published_to_redis(self):
+        blocklist = CIDRBlocklist()
+        redis_client = RecordingRedis()
+        sync = RedisBlocklistSync(blocklist, redis_client)
+        self.assertEqual(sync.bulk_block(["192.0.2.0/24", "bogus", ("198.51.100.7", 60, "feed")]), 2)
+        self.assertIn("192.0.2.10", blocklist)
+        self.assertEqual(blocklist.match("198.51.100.7")["reason"], "feed")
+        self.assertEqual(redis_client.commands, [
+            ("hset", "192.0.2.0/24"), ("publish", "add"),
+            ("hset", "198.51.100.7/32"), ("publish", "add"), ("execute",),
+        ])
+        redis_client.commands.clear()
+        self.assertTrue(sync.unblock("192.0.2.0/24"))
+        self.assertNotIn("192.0.2.10", blocklist)
+        self.assertEqual(redis_client.commands, [("hdel", "192.0.2.0/24"), ("publish", "remove"), ("execute",)])
+
+    def test_redis_keys_are_normalized(self):
+        blocklist = CIDRBlocklist()
+        redis_client = RecordingRedis()
+        sync = RedisBlocklistSync(blocklist, redis_client)
+        sync.block("1.2.3.4/32")
+        self.assertTrue(sync.unblock("1.2.3.4"))
+        self.assertEqual(redis_client.commands, [
+            ("hset", "1.2.3.4/32"), ("publish", "add"), ("execute",),
+            ("hdel", "1.2.3.4/32"), ("publish", "remove"), ("execute",),
+        ])
+
+    def test_writes_without_redis_stay_local(self):
+        blocklist = CIDRBlocklist()
+        sync = RedisBlocklistSync(blocklist, redis_client=None)
+        sync.block("203.0.113.5", ttl=60, reason="fraud")
+        self.assertIn("203.0.113.5", blocklist)
+        self.assertTrue(sync.unblock("203.0.113.5"))
+        self.assertFalse(sync.unblock("203.0.113.5"))
+
+    def test_change_notifications_are_applied(self):
+        blocklist = CIDRBlocklist()
+        sync = RedisBlocklistSync(blocklist, redis_client=None)
+        sync._on_message({"data": json.dumps({"op": "add", "cidr": "192.0.2.0/24", "expires_at": None})})
+        self.assertIn("192.0.2.10", blocklist)
+        sync._on_message({"data": json.dumps({"op": "remove", "cidr": "192.0.2.0/24"})})
+        self.assertNotIn("192.0.2.10", blocklist)
+        sync._on_message({"data": "not json"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest import mock
+import joblib
+import numpy as np
+import pandas as pd
+from model_server import CURRENT_MODEL_FILE, MODEL_VERSION_FILE, ModelServer
+
+
+class RowSumModel:
+    def predict(self, features):
+        return np.asarray(features, dtype=float).sum(axis=1)
+
+
+class TestModelServer(unittest.TestCase):
+    def setUp(self):
+        self.model_path = tempfile.mkdtemp()
+        joblib.dump(RowSumModel(), os.path.join(self.model_path, CURRENT_MODEL_FILE))
+        with open(os.path.join(self.model_path, MODEL_VERSION_FILE), "w") as version_file:
+            version_file.write("3")
+        patcher = mock.patch("model_server.load_feature_pipeline", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.server = ModelServer(model_path=self.model_path, max_batch_wait_ms=20, poll_interval=60)
+
+    def _predict_group(self, inputs):
+        group = [(features, Future(), 0.0) for features in inputs]
+        self.server._predict_group(RowSumModel(), 3, group)
+        return [future for _, future, _ in group]
+
+    def test_concurrent_requests_share_the_model(self):
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        requests = [pd.DataFrame({"a": [i, i], "b": [1, 1]}) for i in range(8)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda features: self.server.predict(features, timeout=5), requests))
+        for i, (predictions, version) in enumerate(results):
+            self.assertEqual(list(predictions), [i + 1, i + 1])
+            self.assertEqual(version, 3)
+        self.assertEqual(self.server.get_metrics()["3"]["requests"], 8)
+
+    def test_server_can_be_restarted_after_stop(self):
+        self.server.start()
+        self.server.stop()
+        self.assertEqual(self.server._threads, [])
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        predictions, version = self.server.predict([[1.0, 2.0]], timeout=5)
+        self.assertEqual(list(predictions), [3.0])
+
+    def test_malformed_request_only_fails_itself(self):
+        good = pd.DataFrame({"a": [1.0], "b": [2.0]})
+        bad = pd.DataFrame({"a": ["not a number"], "b": [2.0]})
+        futures = self._predict_group([good, bad, good])
+        self.assertEqual(list(futures[0].result()[0]), [3.0])
+        self.assertIsInstance(futures[1].exception(), ValueError)
+        self.assertEqual(list(futures[2].result()[0]), [3.0])
+
+    def test_requests_are_only_stacked_with_matching_columns(self):
+        self.assertNotEqual(ModelServer._signature(pd.DataFrame({"a": [1]})), ModelServer._signature(pd.DataFrame({"b": [1]})))
+        self.assertEqual(ModelServer._signature(np.ones((2, 3))), ModelServer._signature(np.zeros((5, 3))))
+
+    def test_invalid_input_is_rejected_before_batching(self):
+        with self.assertRaises(ValueError):
+            self.server.predict([1, 2, 3])
+        with self.assertRaises(ValueError):
+            self.server.predict(pd.DataFrame({"a": []}))
+        self.assertTrue(self.server._requests.empty())
+
+
+if __name__ == "__main__":
+    unittest.main()
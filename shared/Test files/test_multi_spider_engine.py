@@ -0,0 +1,69 @@
+from twisted.internet.defer import inlineCallbacks
+from twisted.trial import unittest
+from scrapy import Request, Spider, signals
+from scrapy.crawler import Crawler
+from RLG_engine import MultiSpiderExecutionEngine
+
+SETTINGS = {
+    "TWISTED_REACTOR": None,
+    "LOG_LEVEL": "WARNING",
+    "TELNETCONSOLE_ENABLED": False,
+    # LogStats keeps a single logging task per crawler
+    "EXTENSIONS": {"scrapy.extensions.logstats.LogStats": None},
+}
+
+
+class FollowUpSpider(Spider):
+    def start_requests(self):
+        for i in range(3):
+            yield Request(f"data:,{self.name}-{i}")
+
+    def parse(self, response):
+        page = response.text
+        yield {"spider": self.name, "page": page}
+        if not page.endswith("-next"):
+            yield Request(f"data:,{page}-next")
+
+
+class SpiderA(FollowUpSpider):
+    name = "a"
+
+
+class SpiderB(FollowUpSpider):
+    name = "b"
+
+
+class MultiSpiderCrawler(Crawler):
+    def _create_engine(self):
+        return MultiSpiderExecutionEngine(self, lambda _: self.stop())
+
+
+class TestMultiSpiderExecutionEngine(unittest.TestCase):
+    @inlineCallbacks
+    def test_two_spiders_with_follow_up_requests(self):
+        crawler = MultiSpiderCrawler(SpiderA, SETTINGS)
+        scraped = []
+        errors = []
+
+        def open_second_spider():
+            spider = SpiderB.from_crawler(crawler)
+            return crawler.engine.open_spider(spider, spider.start_requests())
+
+        def item_scraped(item, spider):
+            scraped.append((spider.name, item["spider"], item["page"]))
+
+        crawler.signals.connect(open_second_spider, signal=signals.engine_started)
+        crawler.signals.connect(item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(lambda failure, **kwargs: errors.append(failure), signal=signals.spider_error)
+        yield crawler.crawl()
+
+        self.assertEqual(errors, [])
+        # Every item is reported for the spider that yielded it
+        self.assertTrue(all(signal_spider == item_spider for signal_spider, item_spider, _ in scraped))
+        for name in ("a", "b"):
+            pages = sorted(page for spider, _, page in scraped if spider == name)
+            expected = sorted([f"{name}-{i}" for i in range(3)] + [f"{name}-{i}-next" for i in range(3)])
+            self.assertEqual(pages, expected)
+            self.assertEqual(crawler.stats.get_value(f"spiders/{name}/item_scraped_count"), 6)
+            self.assertEqual(crawler.stats.get_value(f"spiders/{name}/finish_reason"), "finished")
+        self.assertEqual(crawler.engine.slots, {})
@@ -0,0 +1,84 @@
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import spacy
+from nlp_processor import NLPProcessor
+
+TEXTS = [
+    "  Fans LOVE the new RLG Data   release!",
+    "RLG Fans is trending in London today.",
+    "Nothing much happened.",
+    "Terrible outage at RLG Data, fans are angry.",
+]
+
+
+def build_pipeline(path):
+    """Small on-disk pipeline: lemma rules, a rule-based "ner" and a component batch mode does not need."""
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("attribute_ruler")
+    ruler.add([[{"LOWER": "fans"}]], {"LEMMA": "fan"})
+    entities = nlp.add_pipe("entity_ruler", name="ner")
+    entities.add_patterns([
+        {"label": "ORG", "pattern": [{"LOWER": "rlg"}, {"LOWER": {"IN": ["data", "fans"]}}]},
+        {"label": "GPE", "pattern": "london"},
+    ])
+    nlp.add_pipe("sentencizer")
+    nlp.to_disk(path)
+
+
+class TestNLPProcessorBatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model_dir = tempfile.mkdtemp()
+        build_pipeline(cls.model_dir)
+        cls.processor = NLPProcessor(language_model=cls.model_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.model_dir)
+
+    def test_batch_matches_per_text_processing(self):
+        expected = [self.processor.process_text(text) for text in TEXTS]
+        self.assertEqual(self.processor.batch_process_texts(TEXTS, batch_size=2), expected)
+        self.assertIn("fan", expected[0]["tokens"])
+        self.assertEqual(expected[1]["entities"], [{"text": "rlg fans", "label": "ORG"}, {"text": "london", "label": "GPE"}])
+
+    def test_each_text_is_parsed_once_through_pipe(self):
+        with mock.patch.object(self.processor.nlp, "pipe", wraps=self.processor.nlp.pipe) as pipe, \
+                mock.patch.object(type(self.processor.nlp), "__call__", side_effect=AssertionError("per-text parse")):
+            results = self.processor.batch_process_texts(TEXTS, batch_size=3)
+        self.assertEqual(pipe.call_count, 1)
+        self.assertEqual(pipe.call_args.kwargs["batch_size"], 3)
+        self.assertEqual(pipe.call_args.kwargs["disable"], ["sentencizer"])
+        self.assertEqual([result["cleaned_text"] for result in results],
+                         [self.processor.clean_text(text) for text in TEXTS])
+
+    def test_only_known_unneeded_components_are_disabled(self):
+        nlp = spacy.blank("en")
+        for name in ("transformer", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"):
+            nlp.add_pipe("sentencizer", name=name)
+        with mock.patch.object(self.processor, "nlp", nlp):
+            self.assertEqual(self.processor.disabled_components(), ["parser"])
+
+    def test_iter_process_texts_is_lazy(self):
+        consumed = []
+
+        def texts():
+            for text in TEXTS:
+                consumed.append(text)
+                yield text
+
+        results = self.processor.iter_process_texts(texts(), batch_size=1)
+        self.assertEqual(consumed, [])
+        self.assertEqual(next(results)["cleaned_text"], self.processor.clean_text(TEXTS[0]))
+        self.assertLess(len(consumed), len(TEXTS))
+
+    def test_pipe_failure_falls_back_to_per_text(self):
+        with mock.patch.object(self.processor.nlp, "pipe", side_effect=RuntimeError("worker died")):
+            results = self.processor.batch_process_texts(TEXTS)
+        self.assertEqual(results, [self.processor.process_text(text) for text in TEXTS])
+
+
+if __name__ == "__main__":
+    unittest.main()
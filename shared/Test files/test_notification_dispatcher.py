@@ -0,0 +1,61 @@
+import smtplib
+import unittest
+from notification_dispatcher import LocalSMTPSink, NotificationDispatcher, SMTPConnectionPool, is_transient_error
+
+
+class TestNotificationDispatcher(unittest.TestCase):
+    def test_emails_reuse_pooled_smtp_sessions(self):
+        with LocalSMTPSink() as sink:
+            pool = SMTPConnectionPool(sink.server_address[0], sink.port, use_tls=False)
+            dispatcher = NotificationDispatcher(smtp_pool=pool, sender="noreply@example.com",
+                                                concurrency={"email": 2}, email_batch_size=10)
+            recipients = [f"user{i}@example.com" for i in range(45)]
+            results = dispatcher.submit_emails(recipients, "Subject", "Body").result(timeout=30)
+            dispatcher.close()
+        self.assertEqual(results, dict.fromkeys(recipients, True))
+        self.assertEqual(sink.messages, 45)
+        self.assertLessEqual(pool.connections_opened, 2)
+
+    def test_transient_failures_are_retried(self):
+        dispatcher = NotificationDispatcher(retries=2, base_delay=0.001)
+        attempts = []
+
+        def flaky_send():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise smtplib.SMTPServerDisconnected("connection dropped")
+
+        self.assertTrue(dispatcher.call_with_retries(flaky_send))
+        self.assertEqual(len(attempts), 3)
+        dispatcher.close()
+
+    def test_permanent_failures_are_not_retried(self):
+        dispatcher = NotificationDispatcher(retries=2, base_delay=0.001)
+        attempts = []
+
+        def rejected_send():
+            attempts.append(1)
+            raise smtplib.SMTPDataError(550, b"mailbox unavailable")
+
+        self.assertFalse(dispatcher.call_with_retries(rejected_send))
+        self.assertEqual(len(attempts), 1)
+        self.assertTrue(is_transient_error(smtplib.SMTPDataError(451, b"try again later")))
+        dispatcher.close()
+
+    def test_submit_calls_uses_the_given_send_function(self):
+        dispatcher = NotificationDispatcher(retries=0, concurrency={"sms": 2})
+        sent = []
+
+        def send_sms(to, message):
+            sent.append((to, message))
+            return to != "+15550002"
+
+        recipients = ["+15550001", "+15550002", "+15550003"]
+        results = dispatcher.submit_calls("sms", send_sms, recipients, "Hello").result(timeout=30)
+        dispatcher.close()
+        self.assertEqual(results, {"+15550001": True, "+15550002": False, "+15550003": True})
+        self.assertEqual(sorted(sent), [(recipient, "Hello") for recipient in recipients])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import json
+import tempfile
+import unittest
+import RLG_ONNX_Inference_Backend as backend_module
+from RLG_ONNX_Inference_Backend import (
+    BACKEND_PYTORCH,
+    BACKEND_ONNX_INT8,
+    ONNXClassificationPipeline,
+    build_inference_pipeline,
+    compare_backends,
+    get_backend_for_model,
+)
+
+SENTIMENT_MODEL = "nlptown/bert-base-multilingual-uncased-sentiment"
+
+PARITY_TEXTS = [
+    "I love the RLG Super Tool, it makes my job so much easier!",
+    "The compliance system is terrible and slow.",
+    "Not sure how I feel about this platform.",
+    "This is the best media monitoring service I have used!",
+    "Why is the scraping tool not working as expected?",
+    "Fantastic service, highly recommended.",
+    "Worst experience ever, do not recommend.",
+    "It works, nothing special.",
+]
+
+
+class TestBackendSelection(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.tmp_dir, "backends.json")
+        self.original_config_file = backend_module.INFERENCE_CONFIG_FILE
+        backend_module.INFERENCE_CONFIG_FILE = self.config_file
+
+    def tearDown(self):
+        backend_module.INFERENCE_CONFIG_FILE = self.original_config_file
+        os.environ.pop("RLG_INFERENCE_BACKENDS", None)
+
+    def test_backend_from_config_file(self):
+        with open(self.config_file, "w") as f:
+            json.dump({SENTIMENT_MODEL: BACKEND_ONNX_INT8}, f)
+        self.assertEqual(get_backend_for_model(SENTIMENT_MODEL), BACKEND_ONNX_INT8)
+
+    def test_environment_overrides_config_file(self):
+        with open(self.config_file, "w") as f:
+            json.dump({SENTIMENT_MODEL: BACKEND_ONNX_INT8}, f)
+        os.environ["RLG_INFERENCE_BACKENDS"] = f"{SENTIMENT_MODEL}={BACKEND_PYTORCH}"
+        self.assertEqual(get_backend_for_model(SENTIMENT_MODEL), BACKEND_PYTORCH)
+
+    def test_unknown_backend_falls_back_to_pytorch(self):
+        with open(self.config_file, "w") as f:
+            json.dump({SENTIMENT_MODEL: "tensorrt"}, f)
+        self.assertEqual(get_backend_for_model(SENTIMENT_MODEL), BACKEND_PYTORCH)
+
+
+class TestONNXAccuracyParity(unittest.TestCase):
+    def test_int8_matches_eager_labels(self):
+        report = compare_backends(SENTIMENT_MODEL, PARITY_TEXTS, backend=BACKEND_ONNX_INT8)
+        self.assertGreaterEqual(report["label_agreement"], 0.85)
+        self.assertLess(report["max_score_diff"], 0.1)
+
+    def test_output_format_matches_pipeline(self):
+        pipe = build_inference_pipeline("sentiment-analysis", SENTIMENT_MODEL, backend=BACKEND_ONNX_INT8, fallback=False)
+        self.assertIsInstance(pipe, ONNXClassificationPipeline)
+        result = pipe(PARITY_TEXTS[0])
+        self.assertEqual(len(result), 1)
+        self.assertIn("label", result[0])
+        self.assertIn("score", result[0])
+        self.assertEqual(len(pipe(PARITY_TEXTS)), len(PARITY_TEXTS))
+
+
+if __name__ == "__main__":
+    unittest.main()
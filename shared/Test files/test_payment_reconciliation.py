@@ -0,0 +1,61 @@
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+from payment_reconciliation_services import PaymentReconciliationService
+
+PROVIDER_TRANSACTIONS = [
+    {"transaction_id": "1", "amount": 100.0},
+    {"transaction_id": "2", "amount": 50.0},
+    {"transaction_id": "3", "amount": 25.0},
+]
+SYSTEM_TRANSACTIONS = [
+    {"transaction_id": "1", "amount": 100, "provider": "Stripe"},
+    {"transaction_id": "2", "amount": 60.0, "provider": "Stripe"},
+    {"transaction_id": "4", "amount": Decimal("10.00"), "provider": "Stripe", "created_at": datetime(2025, 1, 3)},
+]
+
+
+class TestPaymentReconciliation(unittest.TestCase):
+    def _reconcile(self, service):
+        with patch.object(service, "fetch_transactions", return_value=PROVIDER_TRANSACTIONS):
+            return service.reconcile_transactions("Stripe", SYSTEM_TRANSACTIONS)
+
+    def test_detects_missing_extra_and_mismatched(self):
+        report = self._reconcile(PaymentReconciliationService())
+        self.assertEqual([t["transaction_id"] for t in report["missing_in_system"]], ["3"])
+        self.assertEqual([t["transaction_id"] for t in report["extra_in_system"]], ["4"])
+        self.assertEqual([m["transaction_id"] for m in report["amount_mismatches"]], ["2"])
+        self.assertEqual(len(report["mismatched_transactions"]), 2)
+        self.assertEqual(report["reconciliation_status"], "Issues Found")
+
+    def test_spilled_join_matches_in_memory(self):
+        in_memory = self._reconcile(PaymentReconciliationService())
+        spilled = self._reconcile(PaymentReconciliationService(max_in_memory=1))
+        for key in ("missing_in_system", "extra_in_system", "amount_mismatches"):
+            self.assertEqual(spilled[key], in_memory[key])
+        self.assertIsInstance(spilled["extra_in_system"][0]["amount"], Decimal)
+        self.assertIsInstance(spilled["extra_in_system"][0]["created_at"], datetime)
+
+    def test_system_transactions_filtered_by_provider(self):
+        service = PaymentReconciliationService()
+        system = [dict(t, provider="Stripe") for t in PROVIDER_TRANSACTIONS] + [
+            {"transaction_id": "9", "amount": 5.0, "provider": "PayPal"}
+        ]
+        with patch.object(service, "fetch_transactions", return_value=PROVIDER_TRANSACTIONS):
+            report = service.reconcile_transactions("Stripe", system)
+        self.assertEqual(report["reconciliation_status"], "Complete")
+
+
+    def test_untagged_system_transactions_are_not_extra_for_other_providers(self):
+        service = PaymentReconciliationService()
+        system = PROVIDER_TRANSACTIONS[:1] + [{"transaction_id": "9", "amount": 5.0}]
+        with patch.object(service, "fetch_transactions", return_value=PROVIDER_TRANSACTIONS[:1]):
+            reports = service.generate_reconciliation_report(["Stripe", "PayPal"], system)
+        for report in reports:
+            self.assertEqual(report["extra_in_system"], [])
+            self.assertEqual(report["reconciliation_status"], "Complete")
+
+
+if __name__ == "__main__":
+    unittest.main()
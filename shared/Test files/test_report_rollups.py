@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from database_manager import DatabaseManager, RLGData, RLGFans
+from report_rollups import RollupManager
+
+NOW = datetime(2025, 3, 10, 12, 0, 0)
+
+
+class TestReportRollups(unittest.TestCase):
+    def setUp(self):
+        db_path = os.path.join(tempfile.mkdtemp(), "rollups.db")
+        self.db = DatabaseManager(db_url=f"sqlite:///{db_path}")
+        self.rollups = RollupManager(self.db)
+
+    def _insert(self, *records):
+        session = self.db.get_session()
+        session.add_all(records)
+        session.commit()
+        session.close()
+
+    def _fans(self, engagement, days_ago, region="us"):
+        return RLGFans(content="post", engagement=engagement, region=region, scraped_at=NOW - timedelta(days=days_ago))
+
+    def test_incremental_refresh_matches_full_recompute(self):
+        self._insert(self._fans(10.0, 2), self._fans(20.0, 2), self._fans(5.0, 1, region="eu"))
+        self.assertEqual(self.rollups.refresh("rlg_fans"), 3)
+        self._insert(self._fans(30.0, 2), self._fans(1.0, 1))
+        self.assertEqual(self.rollups.refresh("rlg_fans"), 2)
+        self.assertEqual(self.rollups.refresh("rlg_fans"), 0)
+        self.assertEqual(self.rollups.verify("rlg_fans"), [])
+
+    def test_rows_committed_out_of_id_order_are_folded_later(self):
+        # Row 2 belongs to a transaction that commits after the refresh scanned past it
+        self._insert(RLGFans(id=1, content="post", engagement=10.0, region="us", scraped_at=NOW - timedelta(days=1)),
+                     RLGFans(id=3, content="post", engagement=30.0, region="us", scraped_at=NOW - timedelta(days=1)))
+        self.assertEqual(self.rollups.refresh("rlg_fans"), 2)
+        self.assertEqual(self.rollups.verify("rlg_fans"), [])
+
+        self._insert(RLGFans(id=2, content="post", engagement=20.0, region="us", scraped_at=NOW - timedelta(days=1)))
+        self.assertEqual(self.rollups.refresh("rlg_fans"), 1)
+        self.assertEqual(self.rollups.refresh("rlg_fans"), 0)
+        self.assertEqual(self.rollups.verify("rlg_fans"), [])
+        totals, _ = self.rollups.summarize("rlg_fans", as_of=NOW)
+        self.assertEqual(totals.record_count, 3)
+
+    def test_summary_combines_rollups_with_live_day(self):
+        self._insert(self._fans(10.0, 2), self._fans(20.0, 1))
+        self.rollups.refresh("rlg_fans")
+        # Today's row is not refreshed yet; it is read from the raw table.
+        self._insert(self._fans(30.0, 0))
+        totals, daily = self.rollups.summarize("rlg_fans", region="us", as_of=NOW)
+        self.assertEqual(totals.record_count, 3)
+        self.assertAlmostEqual(totals.engagement_mean, 20.0)
+        self.assertEqual(totals.engagement_max, 30.0)
+        self.assertEqual(len(daily), 3)
+
+    def test_sentiment_distribution_and_backfill(self):
+        self._insert(
+            RLGData(title="a", sentiment="positive", region="us", scraped_at=NOW - timedelta(days=1)),
+            RLGData(title="b", sentiment="negative", region="us", scraped_at=NOW - timedelta(days=1)),
+            RLGData(title="c", sentiment="positive", region="us", scraped_at=NOW - timedelta(days=1)),
+        )
+        self.rollups.refresh("rlg_data")
+        totals, _ = self.rollups.summarize("rlg_data", region="us", as_of=NOW)
+        self.assertEqual(totals.sentiment_counts, {"positive": 2, "negative": 1})
+
+        # Editing an already rolled-up row is detected, and backfill repairs it.
+        record = self.db.query_rlg_data(region="us")[1]
+        self.db.update_rlg_data_sentiment(record.id, "positive")
+        self.assertEqual(len(self.rollups.verify("rlg_data")), 1)
+        self.rollups.backfill("rlg_data")
+        self.assertEqual(self.rollups.verify("rlg_data"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
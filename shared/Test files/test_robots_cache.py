@@ -0,0 +1,70 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from scraping_utils import RobotsCache, RobotsPolicy
+
+ROBOTS_TXT = """
+User-agent: *
+Disallow: /private/
+Allow: /private/press*.html$
+Crawl-delay: 2
+
+User-agent: RLGBot
+Disallow: /
+"""
+
+
+class CountingSession:
+    def __init__(self, status_code=200, text=ROBOTS_TXT, headers=None):
+        self.calls = 0
+        self.response = SimpleNamespace(status_code=status_code, text=text, headers=headers or {})
+
+    def get(self, url, timeout=None):
+        self.calls += 1
+        time.sleep(0.05)
+        return self.response
+
+
+class TestRobotsPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = RobotsPolicy.parse(ROBOTS_TXT)
+
+    def test_longest_match_wins(self):
+        self.assertFalse(self.policy.can_fetch("*", "https://example.com/private/report"))
+        self.assertTrue(self.policy.can_fetch("*", "https://example.com/private/press-1.html"))
+        self.assertTrue(self.policy.can_fetch("*", "https://example.com/news"))
+
+    def test_agent_specific_group_and_crawl_delay(self):
+        self.assertFalse(self.policy.can_fetch("RLGBot/1.0", "https://example.com/news"))
+        self.assertEqual(self.policy.crawl_delay("Mozilla/5.0"), 2.0)
+
+
+class TestRobotsCache(unittest.TestCase):
+    def test_single_flight_per_host(self):
+        session = CountingSession()
+        cache = RobotsCache(session=session)
+        threads = [
+            threading.Thread(target=cache.can_fetch, args=(f"https://example.com/page{i}",))
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(session.calls, 1)
+
+    def test_expired_policy_is_refetched(self):
+        session = CountingSession(headers={"Cache-Control": "max-age=0"})
+        cache = RobotsCache(session=session)
+        cache.can_fetch("https://example.com/a")
+        cache.can_fetch("https://example.com/b")
+        self.assertEqual(session.calls, 2)
+
+    def test_missing_robots_allows_everything(self):
+        cache = RobotsCache(session=CountingSession(status_code=404, text=""))
+        self.assertTrue(cache.can_fetch("https://example.com/private/report"))
+
+
+if __name__ == "__main__":
+    unittest.main()
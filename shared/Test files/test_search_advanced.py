@@ -0,0 +1,89 @@
+import sqlite3
+import unittest
+from exceptions import SearchError
+from search_advanced import AdvancedSearch
+
+SCORES = [5, None, 3, 5, None, 1, 3, None, 2, 5, None, 4]
+
+
+class SQLiteConnection:
+    """Runs the search SQL on SQLite; MySQL full-text MATCH is mapped to a substring test."""
+
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.row_factory = sqlite3.Row
+
+    def execute_query(self, query, params):
+        query = query.replace("MATCH(content) AGAINST(:keywords)", "instr(content, :keywords) > 0")
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+
+class TestKeysetPagination(unittest.TestCase):
+    def setUp(self):
+        self.db = SQLiteConnection()
+        for table, key in (("posts", "id"), ("mentions", "mention_id")):
+            self.db.conn.execute(f"CREATE TABLE {table} ({key} INTEGER PRIMARY KEY, content TEXT, score INTEGER)")
+            self.db.conn.executemany(
+                f"INSERT INTO {table} VALUES (?, ?, ?)",
+                [(i + 1, f"media post {i}", score) for i, score in enumerate(SCORES)],
+            )
+
+    def _page_through(self, search, dataset, sort, limit=3):
+        query = {"keywords": "media", "filters": {}, "sort": sort, "pagination": {"limit": limit, "count": "none"}}
+        rows = []
+        while True:
+            page = search.perform_search(query, dataset)
+            rows.extend(page["results"])
+            if not page["next_cursor"]:
+                return rows
+            query["pagination"] = {"limit": limit, "cursor": page["next_cursor"], "count": "none"}
+
+    def _expected(self, key, descending):
+        rows = [(score, i + 1) for i, score in enumerate(SCORES)]
+        non_null = sorted((row for row in rows if row[0] is not None), reverse=descending)
+        nulls = sorted((row for row in rows if row[0] is None), reverse=descending)
+        return [{key: row_id, "score": score} for score, row_id in non_null + nulls]
+
+    def test_pages_cover_rows_with_null_sort_values_once(self):
+        search = AdvancedSearch(self.db)
+        for direction in ("asc", "desc"):
+            rows = self._page_through(search, "posts", {"score": direction})
+            self.assertEqual([{"id": row["id"], "score": row["score"]} for row in rows],
+                             self._expected("id", direction == "desc"))
+
+    def test_dataset_with_its_own_key_column(self):
+        search = AdvancedSearch(self.db, key_columns={"mentions": "mention_id"})
+        rows = self._page_through(search, "mentions", {"score": "desc"}, limit=5)
+        self.assertEqual([{"mention_id": row["mention_id"], "score": row["score"]} for row in rows],
+                         self._expected("mention_id", True))
+
+    def test_dataset_without_key_column_is_paged_by_offset(self):
+        search = AdvancedSearch(self.db, key_columns={"posts": None})
+        query = {"keywords": "media", "filters": {}, "sort": {"score": "asc"}, "pagination": {"limit": 5, "offset": 5}}
+        page = search.perform_search(query, "posts")
+        self.assertEqual(len(page["results"]), 5)
+        self.assertTrue(page["has_more"])
+        self.assertIsNone(page["next_cursor"])
+        query["pagination"] = {"limit": 5, "cursor": "anything"}
+        with self.assertRaises(SearchError):
+            search.perform_search(query, "posts")
+
+    def test_non_numeric_pagination_is_a_search_error(self):
+        search = AdvancedSearch(self.db)
+        for pagination in ({"limit": "ten"}, {"limit": 5, "offset": [1]}):
+            query = {"keywords": "media", "filters": {}, "sort": {"score": "asc"}, "pagination": pagination}
+            with self.assertRaises(SearchError):
+                search.perform_search(query, "posts")
+
+    def test_cursor_from_another_search_is_rejected(self):
+        search = AdvancedSearch(self.db)
+        query = {"keywords": "media", "filters": {}, "sort": {"score": "asc"}, "pagination": {"limit": 2}}
+        cursor = search.perform_search(query, "posts")["next_cursor"]
+        query["sort"] = {"score": "desc"}
+        query["pagination"] = {"limit": 2, "cursor": cursor}
+        with self.assertRaises(SearchError):
+            search.perform_search(query, "posts")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from pathlib import Path
+from scrapy.http import Request
+from RLG_squeues import SegmentDiskQueue
+
+
+class TestSegmentDiskQueue(unittest.TestCase):
+    def _queue(self, path, **kwargs):
+        kwargs.setdefault("commit_interval", 3600)
+        kwargs.setdefault("fsync", False)
+        return SegmentDiskQueue(path, **kwargs)
+
+    def test_fifo_across_segments_and_resume(self):
+        path = tempfile.mkdtemp()
+        queue = self._queue(path, segment_bytes=256, commit_bytes=128)
+        for i in range(50):
+            queue.push(Request(f"https://example.com/{i}", meta={"depth": i}))
+        popped = [queue.pop().url for _ in range(20)]
+        queue.close()
+
+        resumed = self._queue(path, segment_bytes=256, commit_bytes=128)
+        self.assertEqual(len(resumed), 30)
+        while (request := resumed.pop()) is not None:
+            popped.append(request.url)
+        self.assertEqual(popped, [f"https://example.com/{i}" for i in range(50)])
+        resumed.close()
+        self.assertEqual(list(Path(path).iterdir()), [])
+
+    def test_resume_after_crash_mid_segment(self):
+        path = tempfile.mkdtemp()
+        queue = self._queue(path, segment_bytes=256, commit_bytes=128)
+        for i in range(50):
+            queue.push(Request(f"https://example.com/{i}"))
+        queue.commit()
+        self.assertGreater(queue.tail_segment, 1)
+        for _ in range(20):
+            queue.pop()
+        # Crash: the pops past the first segment were never committed
+
+        resumed = self._queue(path, segment_bytes=256, commit_bytes=128)
+        self.assertEqual(len(resumed), 50)
+        self.assertEqual(resumed.pop().url, "https://example.com/0")
+        for _ in range(19):
+            resumed.pop()
+        resumed.commit()
+        self.assertFalse(Path(path, "segment-00000000.dat").exists())
+        resumed.close()
+
+    def test_pushes_are_group_committed(self):
+        path = tempfile.mkdtemp()
+        queue = self._queue(path)
+        queue.push(Request("https://example.com/", priority=5, dont_filter=True))
+        self.assertEqual(queue.tail_length, 0)
+        queue.commit()
+        self.assertGreater(queue.tail_length, 0)
+        request = queue.pop()
+        self.assertEqual((request.priority, request.dont_filter), (5, True))
+        queue.close()
+
+    def test_unserializable_request_raises_value_error(self):
+        queue = self._queue(tempfile.mkdtemp())
+        with self.assertRaises(ValueError):
+            queue.push(Request("https://example.com/", meta={"callback": lambda: None}))
+        queue.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import tempfile
+import unittest
+from pathlib import Path
+from scrapy import Spider
+from RLG_spiderstate import SpiderState
+
+
+class TestSpiderState(unittest.TestCase):
+    def _open(self, jobdir):
+        state = SpiderState(jobdir)
+        spider = Spider(name="state")
+        state.spider_opened(spider)
+        return state, spider
+
+    def test_checkpoint_journal_is_replayed_after_crash(self):
+        jobdir = tempfile.mkdtemp()
+        state, spider = self._open(jobdir)
+        spider.state.update(pages=10, seen=["a"], cursor="x")
+        state.checkpoint(spider)
+        spider.state["pages"] = 20
+        del spider.state["cursor"]
+        state.checkpoint(spider)
+        self.assertFalse(Path(state.statefn).exists())
+        # Crash: spider_closed never writes the snapshot
+
+        _, resumed = self._open(jobdir)
+        self.assertEqual(resumed.state, {"pages": 20, "seen": ["a"]})
+
+    def test_torn_tail_is_truncated_so_resume_survives_a_second_crash(self):
+        jobdir = tempfile.mkdtemp()
+        state, spider = self._open(jobdir)
+        spider.state["pages"] = 1
+        state.checkpoint(spider)
+        # Crash in the middle of appending a record
+        with Path(state.journalfn).open("ab") as f:
+            f.write(b"\xff\x00\x00\x00\x80\x04garbage")
+
+        state, resumed = self._open(jobdir)
+        self.assertEqual(resumed.state, {"pages": 1})
+        resumed.state["pages"] = 2
+        state.checkpoint(resumed)
+        resumed.state["seen"] = ["a"]
+        state.checkpoint(resumed)
+        # Second crash, then resume again
+
+        _, resumed = self._open(jobdir)
+        self.assertEqual(resumed.state, {"pages": 2, "seen": ["a"]})
+
+    def test_unchanged_keys_are_not_journaled(self):
+        state, spider = self._open(tempfile.mkdtemp())
+        spider.state["pages"] = 1
+        state.checkpoint(spider)
+        size = Path(state.journalfn).stat().st_size
+        state.checkpoint(spider)
+        self.assertEqual(Path(state.journalfn).stat().st_size, size)
+
+    def test_snapshot_on_close_folds_the_journal(self):
+        jobdir = tempfile.mkdtemp()
+        state, spider = self._open(jobdir)
+        spider.state["pages"] = 1
+        state.checkpoint(spider)
+        spider.state["pages"] = 2
+        state.spider_closed(spider)
+        self.assertFalse(Path(state.journalfn).exists())
+
+        _, resumed = self._open(jobdir)
+        self.assertEqual(resumed.state, {"pages": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
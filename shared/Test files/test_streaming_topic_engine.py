@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+import RLG_Streaming_Topic_Engine
+from RLG_Streaming_Topic_Engine import StreamingTopicEngine, get_topic_engine
+
+MENTIONS = [
+    f"{text} post{i}"
+    for i in range(10)
+    for text in (
+        "AI is transforming the media industry",
+        "Privacy laws are affecting data scraping",
+        "Social media trends change every week",
+        "GDPR compliance is a growing concern for media companies",
+        "New AI features launched for media monitoring",
+    )
+]
+
+
+class TestStreamingTopicEngine(unittest.TestCase):
+    def setUp(self):
+        self.model_file = os.path.join(tempfile.mkdtemp(), "topics.joblib")
+
+    def test_update_returns_named_topics(self):
+        engine = StreamingTopicEngine(num_topics=3, model_file=self.model_file)
+        topics = engine.update(MENTIONS)
+        self.assertEqual(len(topics), 3)
+        self.assertTrue(all(topic.startswith("Topic ") for topic in topics))
+        self.assertIn("media", " ".join(topics))
+
+    def test_incremental_updates_accumulate(self):
+        engine = StreamingTopicEngine(num_topics=3, model_file=self.model_file)
+        engine.update(MENTIONS[:25])
+        engine.update(MENTIONS[25:])
+        self.assertEqual(engine.documents_seen, len(MENTIONS))
+
+    def test_resent_texts_are_not_folded_in_again(self):
+        engine = StreamingTopicEngine(num_topics=3, model_file=self.model_file)
+        engine.update(MENTIONS[:25])
+        engine.update(MENTIONS[:25] + MENTIONS[:25])
+        self.assertEqual(engine.documents_seen, 25)
+        engine.update(MENTIONS)
+        self.assertEqual(engine.documents_seen, len(MENTIONS))
+
+    def test_engines_are_kept_per_region(self):
+        model_dir = os.path.dirname(self.model_file)
+        original = RLG_Streaming_Topic_Engine.TOPIC_MODEL_FILE
+        RLG_Streaming_Topic_Engine.TOPIC_MODEL_FILE = os.path.join(model_dir, "topics.joblib")
+        try:
+            usa = get_topic_engine(3, region="USA")
+            uk = get_topic_engine(3, region="UK")
+        finally:
+            RLG_Streaming_Topic_Engine.TOPIC_MODEL_FILE = original
+        self.assertIsNot(usa, uk)
+        self.assertIs(get_topic_engine(3, region="USA"), usa)
+        self.assertNotEqual(usa.model_file, uk.model_file)
+        usa.update(MENTIONS)
+        self.assertEqual(uk.documents_seen, 0)
+
+    def test_saves_are_periodic_and_atomic(self):
+        engine = StreamingTopicEngine(num_topics=3, model_file=self.model_file)
+        engine.update(MENTIONS)
+        self.assertFalse(engine.save_if_due(interval=3600))
+        self.assertTrue(engine.save_if_due(interval=0))
+        self.assertFalse(engine.save_if_due(interval=0))
+        self.assertEqual(os.listdir(os.path.dirname(self.model_file)), ["topics.joblib"])
+
+    def test_state_survives_restart(self):
+        engine = StreamingTopicEngine(num_topics=3, model_file=self.model_file)
+        engine.update(MENTIONS)
+        engine.save()
+
+        restored = StreamingTopicEngine.load(model_file=self.model_file, num_topics=3)
+        self.assertEqual(restored.get_trending_topics(), engine.get_trending_topics())
+        self.assertEqual(restored.documents_seen, engine.documents_seen)
+        restored.update(MENTIONS)
+        self.assertEqual(restored.documents_seen, engine.documents_seen)
+
+
+if __name__ == "__main__":
+    unittest.main()